@@ -103,14 +103,34 @@ class MainWindow(GW.QMainWindow):
         # Write the current GuiPy configuration to file
         CONFIG.write_config()
 
+        # Recover previous sessions once the main window is running
+        QC.QTimer.singleShot(0, self.recover_sessions)
+
     # Override closeEvent to automatically close all plugins
-    def closeEvent(self, *args, **kwargs):
+    def closeEvent(self, event):
+        # If any plugin cannot be closed, ignore the event
+        if not all(plugin.can_close() for plugin in self.plugins.values()):
+            event.ignore()
+            return
+
         # Close all plugins in plugins dict
         for plugin in self.plugins.values():
             plugin.close()
 
         # Call super event
-        super().closeEvent(*args, **kwargs)
+        super().closeEvent(event)
+
+    # This function recovers previous sessions that ended unexpectedly
+    @QC.Slot()
+    def recover_sessions(self):
+        """
+        Offers the user to recover all previous sessions of *GuiPy* that ended
+        unexpectedly, for all plugins.
+
+        """
+
+        for plugin in self.plugins.values():
+            plugin.recover_sessions()
 
     # This function creates the statusbar in the viewer
     def create_statusbar(self):
@@ -58,6 +58,30 @@ class BasePlugin(object):
     def get_option(self, section, option):
         return(self.config_pages[section].get_option(option))
 
+    # This function checks if this plugin can be closed
+    def can_close(self):
+        """
+        Returns whether this plugin can be closed, allowing for the plugin to
+        ask the user what to do with unsaved changes first.
+
+        By default, *True* is returned.
+
+        """
+
+        return(True)
+
+    # This function recovers the sessions that ended unexpectedly
+    def recover_sessions(self):
+        """
+        Offers the user to recover the state this plugin had in previous
+        sessions that ended unexpectedly, if there are any.
+
+        By default, nothing is recovered.
+
+        """
+
+        pass
+
 
 # Define base class for making plugin widgets
 class BasePluginWidget(GW.QWidget, BasePlugin):
@@ -13,10 +13,10 @@ from . import plugin
 from .plugin import *
 
 # Import subpackages
-from . import formatters, widgets
+from . import backends, formatters, widgets
 
 # All declaration
-__all__ = ['formatters', 'plugin', 'widgets']
+__all__ = ['backends', 'formatters', 'plugin', 'widgets']
 __all__.extend(plugin.__all__)
 
 # Author declaration
@@ -0,0 +1,716 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Autosave
+===================
+Provides the definition of the autosave system of the data table plugin,
+which periodically saves snapshots of all modified data tables and records
+all changes made in between, such that they can be recovered if *GuiPy* was
+not closed properly.
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import count
+import os
+from os import path
+import pickle
+import shutil
+import struct
+import tempfile
+import zlib
+
+# Package imports
+import pandas as pd
+from qtpy import QtCore as QC
+
+# GuiPy imports
+from guipy import CONFIG_DIR
+from guipy.plugins.data_table.project import (
+    PROJECT_EXT, ProjectFile, snapshot_table, write_project)
+
+# All declaration
+__all__ = ['AutoSaver', 'find_sessions', 'load_session', 'remove_session']
+
+
+# %% GLOBALS
+# Name of the directory in the config directory that holds all sessions
+RECOVERY_DIR = 'recovery'
+
+# Names of the lock, snapshot and journal files of a session
+LOCK_NAME = 'session.lock'
+SNAPSHOT_NAME = 'autosave'+PROJECT_EXT
+JOURNAL_PREFIX = 'journal_'
+
+# Header of every entry in a journal, formatted as (size, checksum)
+RECORD = struct.Struct('<II')
+
+# Number of bytes the arguments of a change may use before the change is not
+# journaled, but a new snapshot of its data table is taken instead
+JOURNAL_LIMIT = 2**24
+
+# Number of milliseconds after which a snapshot is taken of data tables whose
+# changes cannot be journaled
+STALE_DELAY = 1000
+
+
+# %% CLASS DEFINITIONS
+# Define class that automatically saves all modified data tables
+class AutoSaver(QC.QObject):
+    """
+    Automatically saves all modified data tables of a session, such that they
+    can be recovered with :func:`~load_session` if the session ends
+    unexpectedly.
+
+    Every :attr:`~interval` minutes, a snapshot is taken of all modified data
+    tables. Taking a snapshot only freezes the chunks of all columns (see
+    :meth:`~guipy.plugins.data_table.backends.BaseBackend.freeze_chunks`),
+    which is cheap, after which the snapshot is written to the project file of
+    the session by a worker thread. As this project file is saved
+    incrementally, only chunks that were modified since the last snapshot are
+    written.
+
+    All changes made to the data tables in a snapshot are appended to a
+    journal in between, which is written by another worker thread. Recovering
+    a session replays the journal onto the last snapshot. Changes that are too
+    large to be journaled, like importing data, cause a new snapshot of their
+    data table to be taken instead.
+
+    Every session is stored in its own directory, which is locked while the
+    session is running. The directory is removed when the session is closed
+    properly.
+
+    """
+
+    # Signals
+    failed = QC.Signal(str)
+
+    # Number of minutes between snapshots (0 to disable autosaving)
+    interval = 5
+
+    # Initialize AutoSaver class
+    def __init__(self, get_sections, parent=None):
+        """
+        Initialize an instance of the :class:`~AutoSaver` class.
+
+        Parameters
+        ----------
+        get_sections : callable
+            Function that is called with the list of all data tables in a
+            snapshot, and returns the sections of all other plugins that must
+            be stored with it, as used by
+            :func:`~guipy.plugins.data_table.project.write_project`.
+
+        Optional
+        --------
+        parent : :obj:`~PyQt5.QtCore.QObject` object or None. Default: None
+            The parent object of this autosaver.
+
+        """
+
+        # Call super constructor
+        super().__init__(parent)
+
+        # Save provided get_sections
+        self._get_sections = get_sections
+
+        # Create and lock the directory of this session
+        root = recovery_dir()
+        os.makedirs(root, exist_ok=True)
+        self.dirpath = tempfile.mkdtemp(prefix='session_', dir=root)
+        self._lock = QC.QLockFile(path.join(self.dirpath, LOCK_NAME))
+        self._lock.tryLock(0)
+
+        # Create the worker threads that write the journal and snapshots
+        self._journal_worker = ThreadPoolExecutor(1)
+        self._snapshot_worker = ThreadPoolExecutor(1)
+
+        # Initialize the registered data tables as {id: data_table}
+        self._ids = count()
+        self._tables = {}
+
+        # Initialize the data tables in the last snapshot whose changes are
+        # journaled, and the column properties that were journaled for them
+        self._journaled = set()
+        self._properties = {}
+
+        # Initialize the journal
+        self._entries = []
+        self._journal_id = 0
+        self._journal = self._open_journal()
+
+        # Initialize the snapshots
+        self._project = None
+        self._snapshot = None
+        self._changed = False
+        self._failed = False
+
+        # Initialize the directories of recovered sessions
+        self._recovered = []
+
+        # Create timer that takes a snapshot periodically
+        self._timer = QC.QTimer(self)
+        self._timer.timeout.connect(self.autosave)
+
+        # Create timer that takes a snapshot soon
+        self._stale_timer = QC.QTimer(self)
+        self._stale_timer.setSingleShot(True)
+        self._stale_timer.setInterval(STALE_DELAY)
+        self._stale_timer.timeout.connect(self.autosave)
+
+        # Create timer that writes all new changes to the journal once
+        # control returns to the event loop
+        self._flush_timer = QC.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+
+        # Disable autosaving if it fails
+        self.failed.connect(self._fail)
+
+        # Set the interval between snapshots
+        self.setInterval(self.interval)
+
+    # This function opens the current journal
+    def _open_journal(self):
+        return(open(path.join(self.dirpath, "%s%i" % (JOURNAL_PREFIX,
+                                                      self._journal_id)),
+                    'ab'))
+
+    # This function sets the interval between snapshots
+    @QC.Slot(int)
+    def setInterval(self, interval):
+        """
+        Sets the number of minutes between snapshots to `interval`. If
+        `interval` is zero, autosaving is disabled.
+
+        """
+
+        # Save interval
+        self.interval = interval
+
+        # Start or stop autosaving
+        self._setEnabled(bool(interval) and not self._failed)
+
+    # This function enables or disables autosaving
+    def _setEnabled(self, enabled):
+        # Save whether autosaving is enabled
+        self._enabled = enabled
+
+        # If autosaving is enabled, take snapshots, starting with one soon
+        if enabled:
+            self._timer.start(self.interval*60000)
+            self._stale_timer.start()
+
+        # Else, stop taking snapshots and journaling all data tables
+        else:
+            self._timer.stop()
+            self._stale_timer.stop()
+            self._journaled.clear()
+
+    # This function registers a data table
+    def addTable(self, data_table):
+        """
+        Registers the provided `data_table`, such that it is autosaved
+        whenever it is modified.
+
+        """
+
+        # Give the data table an id and report all its changes
+        table_id = next(self._ids)
+        self._tables[table_id] = data_table
+        data_table.model.setJournal(
+            lambda method, args: self.record(table_id, method, args))
+
+        # If the data table is modified already, take a snapshot soon
+        if data_table.model.isModified():
+            self._changed = True
+            self._startStaleTimer()
+
+    # This function unregisters a data table
+    def removeTable(self, data_table):
+        """
+        Unregisters the provided `data_table`, after which it is no longer
+        autosaved.
+
+        """
+
+        # Obtain the id of this data table
+        table_id = next(table_id for table_id, table in self._tables.items()
+                        if table is data_table)
+
+        # Stop reporting its changes
+        data_table.model.setJournal(None)
+        del self._tables[table_id]
+        self._changed = True
+
+        # Record that it was closed if its changes are journaled
+        if table_id in self._journaled:
+            self._journaled.discard(table_id)
+            self._append(table_id, 'close', ())
+
+    # This function records a change made to a data table
+    def record(self, table_id, method, args):
+        """
+        Records that the backend `method` was called with `args` on the data
+        table with the provided `table_id`, as reported by its
+        :class:`~guipy.plugins.data_table.backends.JournalBackend`.
+
+        """
+
+        # Save that a data table changed
+        self._changed = True
+
+        # If this data table is not in the last snapshot, take a snapshot soon
+        if table_id not in self._journaled:
+            self._startStaleTimer()
+
+        # Else, if the change is too large, take a new snapshot soon
+        elif(estimate_nbytes(args) > JOURNAL_LIMIT):
+            self._journaled.discard(table_id)
+            self._append(table_id, 'stale', ())
+            self._startStaleTimer()
+
+        # Else, append the change to the journal
+        else:
+            self._append(table_id, method, args)
+
+    # This function appends an entry to the journal
+    def _append(self, table_id, method, args):
+        # Encode the entry and write it once control returns to the event loop
+        self._entries.append(pickle.dumps((table_id, method, args),
+                                          pickle.HIGHEST_PROTOCOL))
+        self._flush_timer.start()
+
+    # This function starts the stale timer if it is not active yet
+    def _startStaleTimer(self):
+        if self._enabled and not self._stale_timer.isActive():
+            self._stale_timer.start()
+
+    # This function writes all new entries to the journal
+    @QC.Slot()
+    def flush(self):
+        """
+        Writes all changes that were recorded since the last call to the
+        journal, together with the column properties of all journaled data
+        tables whose properties changed.
+
+        The journal is written by a worker thread.
+
+        """
+
+        # Record the column properties of all data tables that changed
+        for table_id in sorted(self._journaled):
+            properties = get_properties(self._tables[table_id].model)
+            if(properties != self._properties[table_id]):
+                self._properties[table_id] = properties
+                self._append(table_id, 'properties', properties)
+
+        # If there are no new entries, return
+        if not self._entries:
+            return
+
+        # Write all entries with their headers
+        data = b''.join(RECORD.pack(len(entry), zlib.crc32(entry))+entry
+                        for entry in self._entries)
+        self._entries.clear()
+        self._submit(self._journal_worker, write_journal, self._journal, data)
+
+    # This function submits a task to a worker thread
+    def _submit(self, worker, func, *args):
+        # Submit task and report if it fails
+        future = worker.submit(func, *args)
+        future.add_done_callback(self._check)
+        return(future)
+
+    # This function checks if a task of a worker thread failed
+    def _check(self, future):
+        # Emit failed signal if the task raised an exception
+        # As this function is called by the worker, the signal is queued
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(str(error))
+
+    # This function handles failures of the worker threads
+    @QC.Slot(str)
+    def _fail(self, message):
+        # Disable autosaving for the rest of this session
+        self._failed = True
+        self._setEnabled(False)
+
+    # This function takes a snapshot of all modified data tables
+    @QC.Slot()
+    def autosave(self):
+        """
+        Takes a snapshot of all modified data tables, which is written to the
+        project file of this session by a worker thread, and starts a new
+        journal.
+
+        Nothing happens if no data table changed since the last snapshot. If
+        the last snapshot is still being written, a snapshot is taken once
+        that has finished.
+
+        """
+
+        # If autosaving is disabled, return
+        if not self._enabled:
+            return
+
+        # If the last snapshot is still being written, try again later
+        if self._snapshot is not None and not self._snapshot.done():
+            self._stale_timer.start()
+            return
+
+        # Write all changes and properties that were journaled so far
+        self.flush()
+
+        # Determine which data tables are modified
+        tables = {table_id: data_table
+                  for table_id, data_table in self._tables.items()
+                  if data_table.model.isModified()}
+
+        # If no data table changed since the last snapshot, return
+        if not self._changed and (tables.keys() == self._journaled):
+            return
+        self._changed = False
+
+        # Take the snapshot and obtain the sections of all other plugins
+        snapshot = [snapshot_table(data_table.tab_name, data_table.model,
+                                   frozen=True)
+                    for data_table in tables.values()]
+        sections = self._get_sections(list(tables.values()))
+
+        # Start a new journal, closing the old one once it has been written
+        closed = self._journal_worker.submit(self._journal.close)
+        self._journal_id += 1
+        self._journal = self._open_journal()
+        sections['autosave'] = {'journal': self._journal_id,
+                                'tables': list(tables)}
+
+        # Journal the changes of all data tables in the snapshot
+        self._journaled = set(tables)
+        self._properties = {table_id: get_properties(data_table.model)
+                            for table_id, data_table in tables.items()}
+
+        # Write the snapshot
+        self._snapshot = self._submit(
+            self._snapshot_worker, self._writeSnapshot, snapshot, sections,
+            self._journal_id, closed)
+
+    # This function writes a snapshot
+    def _writeSnapshot(self, snapshot, sections, journal_id, closed):
+        # Write the snapshot to the project file of this session
+        self._project = write_project(
+            path.join(self.dirpath, SNAPSHOT_NAME), snapshot, sections,
+            self._project)
+
+        # Remove all journals that are included in the snapshot
+        closed.result()
+        for old_id, filepath in get_journals(self.dirpath):
+            if(old_id < journal_id):
+                os.remove(filepath)
+
+    # This function adopts the directory of a recovered session
+    def adopt(self, dirpath, lock, project):
+        """
+        Adopts the directory at `dirpath` of a recovered session, which is
+        locked by the provided `lock`, such that it is removed when this
+        session is closed.
+
+        Data tables that were recovered from this session may still read from
+        its snapshot `project` until then, which is closed before the
+        directory is removed.
+
+        """
+
+        self._recovered.append((dirpath, lock, project))
+
+    # This function waits for the last snapshot to be written
+    def wait(self):
+        """
+        Waits until the last snapshot has been written, such that it no
+        longer reads from any data table.
+
+        """
+
+        if self._snapshot is not None:
+            wait([self._snapshot])
+
+    # This function closes this autosaver
+    def close(self):
+        """
+        Stops autosaving, waits for the worker threads to finish and removes
+        the directory of this session and all adopted directories.
+
+        """
+
+        # Stop all timers
+        self._timer.stop()
+        self._stale_timer.stop()
+        self._flush_timer.stop()
+
+        # Wait for the worker threads to finish
+        self._journal_worker.submit(self._journal.close)
+        self._journal_worker.shutdown()
+        self._snapshot_worker.shutdown()
+        if self._project is not None:
+            self._project.close()
+
+        # Remove the directories of this session and all recovered sessions,
+        # closing their snapshots first
+        remove_session(self.dirpath, self._lock)
+        for dirpath, lock, project in self._recovered:
+            project.close()
+            remove_session(dirpath, lock)
+
+
+# %% FUNCTION DEFINITIONS
+# This function returns the directory that holds all sessions
+def recovery_dir():
+    """
+    Returns the path to the directory that holds the autosaved data of all
+    sessions.
+
+    """
+
+    return(path.join(path.expanduser('~'), CONFIG_DIR, RECOVERY_DIR))
+
+
+# This function returns the column properties of a data table
+def get_properties(model):
+    """
+    Returns the precisions and formulas of all columns of the provided
+    `model`, as used by
+    :func:`~guipy.plugins.data_table.project.set_properties`.
+
+    """
+
+    return(([model.columnPrecision(col) for col in range(model.columnCount())],
+            [model.columnFormula(col) for col in range(model.columnCount())]))
+
+
+# This function estimates the number of bytes used by a value
+def estimate_nbytes(value):
+    """
+    Returns an estimate of the number of bytes the provided `value` uses,
+    which solely takes arrays and data frames into account.
+
+    """
+
+    # Add the sizes of all values in containers
+    if isinstance(value, (list, tuple)):
+        return(sum(map(estimate_nbytes, value)))
+
+    # Obtain the size of data frames and arrays
+    elif isinstance(value, pd.DataFrame):
+        return(int(value.memory_usage(index=False).sum()))
+    else:
+        return(getattr(value, 'nbytes', 0))
+
+
+# This function writes data to a journal
+def write_journal(file, data):
+    """
+    Appends the provided `data` to the given journal `file`, and makes sure
+    that it is written to disk.
+
+    """
+
+    file.write(data)
+    file.flush()
+    os.fsync(file.fileno())
+
+
+# This function reads all entries in a journal
+def read_journal(filepath):
+    """
+    Reads the journal at the provided `filepath`, and returns a list with all
+    `(table_id, method, args)` entries in it.
+
+    Reading stops at the first entry that was not written completely.
+
+    """
+
+    # Read the journal
+    with open(filepath, 'rb') as file:
+        data = file.read()
+
+    # Decode all entries that are intact
+    entries = []
+    offset = 0
+    while(offset+RECORD.size <= len(data)):
+        size, checksum = RECORD.unpack_from(data, offset)
+        entry = data[offset+RECORD.size:offset+RECORD.size+size]
+        if(len(entry) != size or zlib.crc32(entry) != checksum):
+            break
+        entries.append(pickle.loads(entry))
+        offset += RECORD.size+size
+
+    # Return entries
+    return(entries)
+
+
+# This function returns all journals of a session
+def get_journals(dirpath):
+    """
+    Returns a sorted list with the id and path of every journal in the session
+    directory at `dirpath`.
+
+    """
+
+    return(sorted(
+        (int(name[len(JOURNAL_PREFIX):]), path.join(dirpath, name))
+        for name in os.listdir(dirpath) if name.startswith(JOURNAL_PREFIX)))
+
+
+# This function finds all sessions that can be recovered
+def find_sessions():
+    """
+    Finds all sessions that ended unexpectedly and have data tables that can
+    be recovered, and returns a list with a `(dirpath, lock)` tuple for every
+    such session, where `lock` is the lock of the session directory at
+    `dirpath`, which is held until the session is removed or adopted.
+
+    Sessions that have nothing to recover are removed.
+
+    """
+
+    # If there are no sessions, return
+    root = recovery_dir()
+    if not path.isdir(root):
+        return([])
+
+    # Check all sessions that are not running anymore
+    sessions = []
+    for name in sorted(os.listdir(root)):
+        # Try to lock this session, which fails if it is running
+        dirpath = path.join(root, name)
+        lock = QC.QLockFile(path.join(dirpath, LOCK_NAME))
+        lock.setStaleLockTime(0)
+        if not path.isdir(dirpath) or not lock.tryLock(0):
+            continue
+
+        # Check if this session has a snapshot with data tables
+        try:
+            project = ProjectFile(path.join(dirpath, SNAPSHOT_NAME))
+        except OSError:
+            recoverable = False
+        else:
+            recoverable = bool(project.tables)
+            project.close()
+
+        # Add this session if it can be recovered, or remove it otherwise
+        if recoverable:
+            sessions.append((dirpath, lock))
+        else:
+            remove_session(dirpath, lock)
+
+    # Return sessions
+    return(sessions)
+
+
+# This function loads a session
+def load_session(dirpath):
+    """
+    Loads the session in the directory at `dirpath`, by replaying its
+    journals onto its last snapshot.
+
+    Returns
+    -------
+    tables : list of tuple or None
+        List containing a `(name, backend, properties)` tuple for every data
+        table in the snapshot, where `properties` is a `(precisions,
+        formulas)` tuple. Data tables that were closed are *None*.
+    sections : dict
+        The sections of all other plugins that were stored in the snapshot,
+        referring to data tables by their index in `tables`.
+    project : :obj:`~guipy.plugins.data_table.project.ProjectFile` object
+        The snapshot of the session, which the backends in `tables` read
+        their chunks from until it is closed.
+
+    """
+
+    # Open the snapshot and load the session from it
+    project = ProjectFile(path.join(dirpath, SNAPSHOT_NAME))
+    try:
+        tables, sections = replay_session(dirpath, project)
+
+    # If that fails, close the snapshot and reraise
+    except Exception:
+        project.close()
+        raise
+
+    # Return the recovered data tables, sections and snapshot
+    return(tables, sections, project)
+
+
+# This function replays the journals of a session onto its snapshot
+def replay_session(dirpath, project):
+    """
+    Loads all data tables in the snapshot `project` of the session in the
+    directory at `dirpath`, replays its journals onto them, and returns them
+    together with the sections of all other plugins, as described in
+    :func:`~load_session`.
+
+    """
+
+    # Load all data tables in the snapshot
+    sections = dict(project.sections)
+    info = sections.pop('autosave')
+    tables = {}
+    for i, (table_id, table) in enumerate(zip(info['tables'],
+                                              project.tables)):
+        columns = table['columns']
+        tables[table_id] = [
+            table['name'], project.load_backend(i),
+            ([column['precision'] for column in columns],
+             [column['formula'] for column in columns])]
+
+    # Replay all journals that were written after the snapshot was taken
+    replayed = set(tables)
+    for journal_id, filepath in get_journals(dirpath):
+        if(journal_id < info['journal']):
+            continue
+        for table_id, method, args in read_journal(filepath):
+            # Skip data tables that are not in the snapshot or not replayed
+            if table_id not in replayed:
+                continue
+
+            # If the data table was closed, remove it
+            if(method == 'close'):
+                tables[table_id] = None
+                replayed.discard(table_id)
+
+            # If the data table changed too much, stop replaying it
+            elif(method == 'stale'):
+                replayed.discard(table_id)
+
+            # If the column properties changed, save them
+            elif(method == 'properties'):
+                tables[table_id][2] = args
+
+            # Else, repeat the change, stopping if that fails
+            else:
+                try:
+                    getattr(tables[table_id][1], method)(*args)
+                except Exception:
+                    replayed.discard(table_id)
+
+    # Return the recovered data tables and sections
+    return([None if table is None else tuple(table)
+            for table in tables.values()], sections)
+
+
+# This function removes a session
+def remove_session(dirpath, lock):
+    """
+    Removes the session directory at `dirpath`, which is locked by the
+    provided `lock`.
+
+    """
+
+    lock.unlock()
+    shutil.rmtree(dirpath, ignore_errors=True)
@@ -0,0 +1,1492 @@
+# -*- coding: utf-8 -*-
+
+"""
+Base Backends
+=============
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+import abc
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+import os
+
+# Package imports
+import numpy as np
+import pandas as pd
+
+# All declaration
+__all__ = ['CATEGORY_DTYPE', 'BaseBackend', 'CategoryDictionary',
+           'ConversionError', 'JournalBackend', 'categorize_frame',
+           'categorize_values', 'compact_int_dtype', 'constant_array',
+           'convert_categories', 'convert_chunks', 'convert_values',
+           'find_invalid_values', 'get_conversion_dtype', 'is_category',
+           'is_constant', 'is_nullable',
+           'mask_to_ranges', 'mask_values', 'nullable_dtype', 'split_chunks',
+           'to_masked', 'unmask_values']
+
+
+# %% GLOBALS
+# Number of threads that are used for converting the values of a column
+CONVERT_THREADS = os.cpu_count() or 1
+
+# Number of values that are converted at once by a single thread
+CONVERT_CHUNK_ROWS = 2**16
+
+# Counter that provides every modification of a chunk with a unique version
+CHUNK_VERSIONS = count(1)
+
+# Data type of dictionary-encoded columns and of the codes of their values
+CATEGORY_DTYPE = pd.CategoricalDtype()
+CODES_DTYPE = np.dtype(np.int32)
+
+# Minimum number of rows a string column must have to be dictionary-encoded
+# on import, and the maximum fraction of its values that can be unique
+CATEGORY_MIN_ROWS = 2**10
+CATEGORY_RATIO = 0.1
+
+# Integer dtypes from small to large, preferring signed integers
+COMPACT_INT_DTYPES = [np.dtype(dtype) for dtype in (
+    'int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32', 'int64', 'uint64')]
+
+
+# %% HELPER DEFINITIONS
+# Define exception that is raised when values cannot be converted
+class ConversionError(ValueError):
+    """
+    Raised when the values of a column cannot be converted to a requested
+    data type.
+
+    The `rows` attribute holds the indices of all values that cannot be
+    converted.
+
+    """
+
+    # Initialize ConversionError class
+    def __init__(self, message, rows):
+        # Call super constructor
+        super().__init__(message)
+
+        # Save provided rows
+        self.rows = np.asarray(rows, dtype=np.int64)
+
+
+# %% CLASS DEFINITIONS
+# Define BaseBackend abstract base class
+class BaseBackend(object, metaclass=abc.ABCMeta):
+    """
+    Provides an abstract base class definition that must be subclassed by all
+    data table storage backends.
+
+    A backend stores the columns of a single data table and is the only object
+    that is allowed to touch the underlying data.
+    The :class:`~guipy.plugins.data_table.widgets.DataTableModel` class
+    delegates all its data operations to the backend it was given.
+
+    All columns in a backend are referred to by their integer index, while the
+    names of the columns are solely stored (and never generated) by the
+    backend.
+
+    """
+
+    # Whether empty regions of columns are stored implicitly, such that
+    # inserting many empty rows or columns takes up almost no memory
+    IMPLICIT_EMPTY = True
+
+    # Name property (e.g., 'DataFrame')
+    @property
+    def name(self):
+        # Return name if it is defined, or raise error if not
+        if hasattr(self, 'NAME'):
+            return(self.NAME)
+        else:
+            raise NotImplementedError("Class attribute 'NAME' must be set by "
+                                      "BaseBackend subclass!")
+
+    # Define from_frame abstract class method
+    @classmethod
+    @abc.abstractmethod
+    def from_frame(cls, data_frame):
+        """
+        Creates a new backend that stores the data in the provided
+        `data_frame`, and returns it.
+
+        Parameters
+        ----------
+        data_frame : :obj:`~pandas.DataFrame` object
+            The data frame that contains all the data that must be stored.
+            Its column labels are used as the names of the columns.
+
+        Returns
+        -------
+        backend : :obj:`~BaseBackend` object
+            The created backend.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # This function releases all resources held by this backend
+    def close(self):
+        """
+        Releases all resources held by this backend.
+
+        After this method has been called, the backend should no longer be
+        used.
+
+        """
+
+        pass
+
+    # Define row_count abstract method
+    @abc.abstractmethod
+    def row_count(self):
+        """
+        Returns the number of rows that are stored in this backend.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define column_count abstract method
+    @abc.abstractmethod
+    def column_count(self):
+        """
+        Returns the number of columns that are stored in this backend.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define column_names abstract method
+    @abc.abstractmethod
+    def column_names(self):
+        """
+        Returns a list with the names of all columns in this backend.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define set_column_names abstract method
+    @abc.abstractmethod
+    def set_column_names(self, names):
+        """
+        Sets the names of all columns in this backend to `names`.
+
+        Parameters
+        ----------
+        names : list of str
+            List containing the new name of every column.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # This function returns the name of a single column
+    def column_name(self, col):
+        """
+        Returns the name of the column with index `col`.
+
+        An empty name means that the column uses its default name.
+
+        """
+
+        return(self.column_names()[col])
+
+    # Define column_dtype abstract method
+    @abc.abstractmethod
+    def column_dtype(self, col):
+        """
+        Returns the :obj:`~numpy.dtype` of the column with index `col`, a
+        :obj:`~pandas.CategoricalDtype` object if it is dictionary-encoded, or
+        a nullable pandas dtype (like :obj:`~pandas.Int64Dtype`) if it is a
+        nullable column (see :meth:`~get_validity`).
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define set_column_dtype abstract method
+    @abc.abstractmethod
+    def set_column_dtype(self, col, dtype, progress=None):
+        """
+        Converts the column with index `col` to the provided `dtype`.
+
+        Only the requested column is touched, and its values are converted
+        chunk by chunk with :func:`~convert_chunks`. If any value cannot be
+        converted, the column is left unchanged.
+        Converting a column to :attr:`~CATEGORY_DTYPE` (or 'category')
+        dictionary-encodes it, while a dictionary-encoded column is converted
+        by converting its categories with :func:`~convert_categories`.
+        Converting a column that holds empty values to an integer or boolean
+        `dtype` makes it a nullable column (see
+        :func:`~get_conversion_dtype`).
+
+        Parameters
+        ----------
+        col : int
+            The index of the column that must be converted.
+        dtype : str or :obj:`~numpy.dtype` object
+            The data type the column must be converted to.
+
+        Optional
+        --------
+        progress : callable or None. Default: None
+            If not *None*, a function that is called with the number of
+            chunks that have been converted and the total number of chunks.
+
+        Raises
+        ------
+        ConversionError
+            If any value in the column cannot be converted to `dtype`.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define set_column abstract method
+    @abc.abstractmethod
+    def set_column(self, col, values):
+        """
+        Replaces all values in the column with index `col` by the provided
+        `values`, using the data type of `values` for the column.
+        If `values` is a :obj:`~pandas.Categorical` object, the column is
+        dictionary-encoded, and if it is a masked pandas array (like
+        :obj:`~pandas.arrays.IntegerArray`), the column is nullable.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define get_column abstract method
+    @abc.abstractmethod
+    def get_column(self, col):
+        """
+        Returns the data of the column with index `col` as a 1D
+        :obj:`~numpy.ndarray` object.
+
+        The returned array must be treated as read-only, as it may be a view of
+        the data stored in this backend. The values of nullable columns are
+        returned like :func:`~unmask_values` does.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define get_block abstract method
+    @abc.abstractmethod
+    def get_block(self, row, col, n_rows, n_cols):
+        """
+        Returns the rectangular block of data that starts at the given `row`
+        and `col` and has the shape `(n_rows, n_cols)`.
+
+        Parameters
+        ----------
+        row, col : int
+            The indices of the top-left cell of the requested block.
+        n_rows, n_cols : int
+            The number of rows and columns in the requested block.
+
+        Returns
+        -------
+        block : list of :obj:`~numpy.ndarray` objects
+            List containing the requested section of every requested column.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define set_block abstract method
+    @abc.abstractmethod
+    def set_block(self, row, col, block):
+        """
+        Sets the rectangular block of data that starts at the given `row` and
+        `col` to the provided `block`.
+
+        Parameters
+        ----------
+        row, col : int
+            The indices of the top-left cell of the block that must be set.
+        block : list of array_like
+            List containing the new values for every column in the block.
+            All values are cast to the data type of their column.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # This function returns a copy of a column
+    def copy_column(self, col):
+        """
+        Returns a copy of the data of the column with index `col` as a 1D
+        :obj:`~numpy.ndarray` object, which is not affected by any later
+        changes to this backend.
+
+        Backends that copy their data before modifying it may return the data
+        without copying it, and constant arrays are never copied.
+        Dictionary-encoded columns are returned as a :obj:`~pandas.Categorical`
+        object and nullable columns as a masked pandas array, such that they
+        keep their storage when they are restored with :meth:`~set_column`.
+
+        """
+
+        # If this column is dictionary-encoded or nullable, copy its array
+        values = self.get_categorical(col)
+        if values is None:
+            values = self.get_masked(col)
+        if values is not None:
+            return(values.copy())
+
+        # Else, copy its values, unless they are constant and thus read-only
+        values = self.get_column(col)
+        return(values if is_constant(values) else np.array(values))
+
+    # This function returns the chunks a column is stored in
+    def get_chunks(self, col):
+        """
+        Returns a list with the data of the column with index `col`, split into
+        consecutive chunks.
+
+        Every chunk is either a 1D :obj:`~numpy.ndarray` object, or an object
+        with a length and a `load` method that returns its values, for chunks
+        that are stored elsewhere and have not been loaded yet. This allows for
+        such chunks to be copied without loading them.
+
+        """
+
+        # Split the column into views
+        return(split_chunks(self.get_column(col)))
+
+    # This function returns the versions of the chunks of a column
+    def get_chunk_versions(self, col):
+        """
+        Returns a list with the version of every chunk returned by
+        :meth:`~get_chunks` for the column with index `col`, or *None* if this
+        backend does not keep track of them.
+
+        The version of a chunk is unique for its current values, and changes
+        whenever they change. This allows for chunks that did not change since
+        they were saved to not be saved again. By default, *None* is returned.
+
+        """
+
+        return(None)
+
+    # This function returns the chunks of a column that do not change anymore
+    def freeze_chunks(self, col):
+        """
+        Returns the chunks of the column with index `col` like
+        :meth:`~get_chunks`, but guarantees that they are not affected by any
+        later changes to this backend, such that they can be used by another
+        thread.
+
+        By default, all chunks are copied. Backends that copy their data
+        before modifying it can return the chunks without copying them.
+
+        """
+
+        return([np.array(chunk) if isinstance(chunk, np.ndarray) else chunk
+                for chunk in self.get_chunks(col)])
+
+    # This function returns the unique-value table of a column
+    def get_categories(self, col):
+        """
+        Returns the unique values of the column with index `col` as a 1D
+        :obj:`~numpy.ndarray` object of objects if it is dictionary-encoded,
+        or *None* if it is not.
+
+        A dictionary-encoded column has the data type
+        :attr:`~CATEGORY_DTYPE`, and stores every value as the integer code
+        of its position in this table, using -1 for empty values. Its chunks
+        returned by :meth:`~get_chunks` hold these codes. By default, no
+        column is dictionary-encoded.
+
+        """
+
+        return(None)
+
+    # This function returns the codes of a dictionary-encoded column
+    def get_codes(self, col):
+        """
+        Returns the codes of all values in the dictionary-encoded column with
+        index `col` as a 1D :obj:`~numpy.ndarray` object of
+        :attr:`~CODES_DTYPE`, where every code is the position of the value in
+        :meth:`~get_categories`.
+
+        The returned array must be treated as read-only, as it may be a view of
+        the data stored in this backend.
+
+        """
+
+        # Encode the values of the column with its categories
+        return(pd.Categorical(self.get_column(col),
+                              self.get_categories(col)).codes.astype(
+                                  CODES_DTYPE))
+
+    # This function returns a dictionary-encoded column as a categorical
+    def get_categorical(self, col):
+        """
+        Returns the values of the column with index `col` as a
+        :obj:`~pandas.Categorical` object if it is dictionary-encoded, or
+        *None* if it is not.
+
+        Comparing a categorical with a value only compares its codes, which is
+        much faster than comparing all values.
+
+        """
+
+        # If this column is not dictionary-encoded, return None
+        categories = self.get_categories(col)
+        if categories is None:
+            return(None)
+
+        # Create the categorical from the codes and categories of the column
+        return(pd.Categorical.from_codes(self.get_codes(col), categories,
+                                         validate=False))
+
+    # This function returns the validity mask of a nullable column
+    def get_validity(self, col):
+        """
+        Returns which values of the column with index `col` are not empty as
+        a 1D :obj:`~numpy.ndarray` object of bools if it is nullable, or
+        *None* if it is not.
+
+        A nullable column stores integers or booleans, which cannot be empty
+        by themselves, together with this validity mask, instead of promoting
+        them to floats or objects that can hold NaN. Its chunks returned by
+        :meth:`~get_chunks` hold the integers or booleans, where empty values
+        are zero. By default, no column is nullable.
+
+        The returned array must be treated as read-only, as it may be a view of
+        the data stored in this backend.
+
+        """
+
+        return(None)
+
+    # This function returns a nullable column as a masked array
+    def get_masked(self, col):
+        """
+        Returns the values of the column with index `col` as a masked pandas
+        array (like :obj:`~pandas.arrays.IntegerArray`) if it is nullable, or
+        *None* if it is not.
+
+        """
+
+        # If this column is not nullable, return None
+        validity = self.get_validity(col)
+        if validity is None:
+            return(None)
+
+        # Create the masked array from the data and validity of the column
+        data = np.concatenate([
+            chunk if isinstance(chunk, np.ndarray) else chunk.load()
+            for chunk in self.get_chunks(col)] or [np.empty(0)])
+        return(to_masked(data.astype(self.column_dtype(col).numpy_dtype),
+                         validity))
+
+    # This function returns the values of a given set of rows
+    def get_rows(self, rows, col, n_cols):
+        """
+        Returns the values in the provided `rows` of the `n_cols` columns
+        starting at the given `col`.
+
+        Parameters
+        ----------
+        rows : 1D array_like of int
+            The indices of the requested rows, in the requested order.
+        col : int
+            The index of the first requested column.
+        n_cols : int
+            The number of requested columns.
+
+        Returns
+        -------
+        block : list of :obj:`~numpy.ndarray` objects
+            List containing the requested values of every requested column.
+
+        """
+
+        # Take the requested rows from every requested column
+        return([self.get_column(i)[rows] for i in range(col, col+n_cols)])
+
+    # This function sets the values of a given set of rows
+    def set_rows(self, rows, col, block):
+        """
+        Sets the values in the provided `rows` of the columns starting at the
+        given `col` to the provided `block`.
+
+        Parameters
+        ----------
+        rows : 1D array_like of int
+            The indices of the rows whose values must be set. Every index may
+            only be given once.
+        col : int
+            The index of the first column whose values must be set.
+        block : list of array_like
+            List containing the new values for every column, in the order
+            given by `rows`.
+
+        """
+
+        # Sort the rows and their values
+        rows = np.asarray(rows, dtype=np.int64)
+        order = np.argsort(rows, kind='stable')
+        rows = rows[order]
+        block = [np.asarray(values)[order] for values in block]
+
+        # Set the values of every contiguous range of rows in one go
+        splits = np.flatnonzero(np.diff(rows) != 1)+1
+        for start, stop in zip([0, *splits.tolist()],
+                               [*splits.tolist(), len(rows)]):
+            self.set_block(int(rows[start]), col,
+                           [values[start:stop] for values in block])
+
+    # Define insert_rows abstract method
+    @abc.abstractmethod
+    def insert_rows(self, row, count):
+        """
+        Inserts `count` empty rows before the given `row`.
+
+        If :attr:`~IMPLICIT_EMPTY` is *True*, the inserted cells should take
+        up almost no memory until they are set.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define remove_rows abstract method
+    @abc.abstractmethod
+    def remove_rows(self, row, count):
+        """
+        Removes `count` rows starting at the given `row`.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # This function appends the rows of a data frame
+    def append_frame(self, data_frame):
+        """
+        Appends all rows in the provided `data_frame` to the end of this
+        backend.
+
+        Parameters
+        ----------
+        data_frame : :obj:`~pandas.DataFrame` object
+            The data frame that contains the rows that must be appended.
+            Its columns are matched with the columns in this backend by their
+            position, and their values are cast to the data type of the
+            corresponding column when required.
+
+        """
+
+        # Insert the required number of rows and set their values
+        row = self.row_count()
+        self.insert_rows(row, len(data_frame))
+        self.set_block(row, 0, [values.to_numpy()
+                                for _, values in data_frame.items()])
+
+    # This function removes all rows indicated by a mask
+    def remove_rows_mask(self, mask):
+        """
+        Removes all rows for which the provided boolean `mask` is *True*.
+
+        Backends should override this method with a single vectorized pass
+        over their data.
+
+        Parameters
+        ----------
+        mask : 1D array_like of bool
+            Array with the length of the number of rows in this backend,
+            containing *True* for every row that must be removed.
+
+        """
+
+        # Remove all contiguous ranges of rows, starting at the back
+        for start, stop in reversed(mask_to_ranges(mask)):
+            self.remove_rows(start, stop-start)
+
+    # Define insert_columns abstract method
+    @abc.abstractmethod
+    def insert_columns(self, col, names):
+        """
+        Inserts an empty column for every name in `names` before the given
+        `col`.
+
+        If :attr:`~IMPLICIT_EMPTY` is *True*, the inserted cells should take
+        up almost no memory until they are set.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # Define remove_columns abstract method
+    @abc.abstractmethod
+    def remove_columns(self, col, count):
+        """
+        Removes `count` columns starting at the given `col`.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "BaseBackend subclass!")
+
+    # This function returns the value of a single cell
+    def get_value(self, row, col):
+        """
+        Returns the value stored in the cell at the given `row` and `col`.
+
+        """
+
+        return(self.get_block(row, col, 1, 1)[0][0])
+
+    # This function sets the value of a single cell
+    def set_value(self, row, col, value):
+        """
+        Sets the value stored in the cell at the given `row` and `col` to
+        `value`.
+
+        """
+
+        self.set_block(row, col, [[value]])
+
+    # This function clears rows starting at given row
+    def clear_rows(self, row, count):
+        """
+        Clears all values in the `count` rows starting at the given `row`.
+
+        """
+
+        # Clear every column in the requested rows
+        n_cols = self.column_count()
+        self.set_block(row, 0, [np.full(count, np.nan)]*n_cols)
+
+    # This function clears columns starting at given col
+    def clear_columns(self, col, count):
+        """
+        Clears all values in the `count` columns starting at the given `col`.
+
+        """
+
+        # Clear all rows in the requested columns
+        n_rows = self.row_count()
+        self.set_block(0, col, [np.full(n_rows, np.nan)]*count)
+
+    # This function returns all data in this backend as a data frame
+    def to_frame(self):
+        """
+        Returns all data stored in this backend as a :obj:`~pandas.DataFrame`
+        object.
+
+        """
+
+        # Create data frame from all columns
+        # Dictionary-encoded columns are added as categoricals, and nullable
+        # columns as masked arrays
+        columns = {}
+        for i in range(self.column_count()):
+            values = self.get_categorical(i)
+            if values is None:
+                values = self.get_masked(i)
+            columns[i] = self.get_column(i) if values is None else values
+        data_frame = pd.DataFrame(columns, copy=False)
+
+        # Set the proper column names
+        data_frame.columns = self.column_names()
+
+        # Return data_frame
+        return(data_frame)
+
+
+# Define class that records all changes that are made to a backend
+class JournalBackend(object):
+    """
+    Wraps a backend and reports every change that is made to its data to a
+    provided `journal` function, after the change was made successfully.
+
+    The `journal` function is called with the name of the backend method that
+    made the change and a tuple with the arguments it was called with, such
+    that the change can be repeated on a copy of the backend later by calling
+    the same method with the same arguments.
+    All other attributes are obtained from the wrapped backend.
+
+    """
+
+    # Initialize JournalBackend class
+    def __init__(self, backend, journal):
+        # Save provided backend and journal
+        self.backend = backend
+        self.journal = journal
+
+    # Override __getattr__ to obtain all other attributes from the backend
+    def __getattr__(self, name):
+        return(getattr(self.backend, name))
+
+    # This function calls a method of the backend and records it
+    def _record(self, method, *args):
+        getattr(self.backend, method)(*args)
+        self.journal(method, args)
+
+    # Override set_column_names method
+    def set_column_names(self, names):
+        self._record('set_column_names', list(names))
+
+    # Override set_column_dtype method
+    def set_column_dtype(self, col, dtype, progress=None):
+        # The progress function is not recorded, as it cannot be repeated
+        self.backend.set_column_dtype(col, dtype, progress)
+        self.journal('set_column_dtype', (col, dtype))
+
+    # Override set_column method
+    def set_column(self, col, values):
+        self._record('set_column', col, values)
+
+    # Override set_block method
+    def set_block(self, row, col, block):
+        self._record('set_block', row, col, block)
+
+    # Override set_rows method
+    def set_rows(self, rows, col, block):
+        self._record('set_rows', rows, col, block)
+
+    # Override insert_rows method
+    def insert_rows(self, row, count):
+        self._record('insert_rows', row, count)
+
+    # Override remove_rows method
+    def remove_rows(self, row, count):
+        self._record('remove_rows', row, count)
+
+    # Override append_frame method
+    def append_frame(self, data_frame):
+        self._record('append_frame', data_frame)
+
+    # Override remove_rows_mask method
+    def remove_rows_mask(self, mask):
+        self._record('remove_rows_mask', mask)
+
+    # Override insert_columns method
+    def insert_columns(self, col, names):
+        self._record('insert_columns', col, list(names))
+
+    # Override remove_columns method
+    def remove_columns(self, col, count):
+        self._record('remove_columns', col, count)
+
+    # Override set_value method
+    def set_value(self, row, col, value):
+        self._record('set_value', row, col, value)
+
+    # Override clear_rows method
+    def clear_rows(self, row, count):
+        self._record('clear_rows', row, count)
+
+    # Override clear_columns method
+    def clear_columns(self, col, count):
+        self._record('clear_columns', col, count)
+
+
+# Define class that holds the unique values of a dictionary-encoded column
+class CategoryDictionary(object):
+    """
+    Holds the unique values (categories) of a single dictionary-encoded
+    column, and converts values to and from their integer codes.
+
+    Values are given the next code the first time they are encoded, such that
+    the codes of values never change. Empty values have code -1.
+
+    """
+
+    # Initialize CategoryDictionary class
+    def __init__(self, categories=()):
+        # Save provided categories and the code of every category
+        self._categories = list(categories)
+        self._codes = {value: code
+                       for code, value in enumerate(self._categories)}
+
+        # Initialize the cached table used for decoding codes
+        self._table = None
+
+    # Override __len__ to return the number of categories
+    def __len__(self):
+        return(len(self._categories))
+
+    # This function returns the categories as an array
+    def categories(self):
+        """
+        Returns all categories in this dictionary as a 1D
+        :obj:`~numpy.ndarray` object of objects, ordered by their codes.
+
+        """
+
+        return(self._get_table()[:-1])
+
+    # This function returns the table used for decoding codes
+    def _get_table(self):
+        # If the table is not cached, create it
+        # The last value is the empty value, such that code -1 decodes to it
+        if self._table is None:
+            self._table = np.empty(len(self._categories)+1, dtype=object)
+            self._table[:-1] = self._categories
+            self._table[-1] = np.nan
+
+        # Return table
+        return(self._table)
+
+    # This function converts values to their codes
+    def encode(self, values):
+        """
+        Returns the codes of the provided `values` as a :obj:`~numpy.ndarray`
+        object of :attr:`~CODES_DTYPE`, adding all values that are not in this
+        dictionary yet.
+
+        Raises
+        ------
+        ConversionError
+            If any value cannot be dictionary-encoded, as it is not hashable.
+
+        """
+
+        # Convert values to a NumPy array
+        values = np.asarray(values)
+        if values.dtype.kind in 'SUV':
+            values = values.astype(object)
+
+        # Determine the unique values and where each of them is used
+        try:
+            codes, uniques = pd.factorize(values)
+        except TypeError as error:
+            raise ConversionError(str(error), find_invalid_values(
+                values, CATEGORY_DTYPE))
+
+        # Determine the code of every unique value, adding new ones
+        # The last entry maps the empty values to -1
+        mapping = np.full(len(uniques)+1, -1, dtype=CODES_DTYPE)
+        for i, value in enumerate(uniques.tolist()):
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self._categories)
+                self._categories.append(value)
+                self._table = None
+            mapping[i] = code
+
+        # Return the codes of all values
+        return(mapping[codes])
+
+    # This function converts codes to their values
+    def decode(self, codes):
+        """
+        Returns the values of the provided `codes` as a :obj:`~numpy.ndarray`
+        object of objects.
+
+        """
+
+        return(self._get_table()[codes])
+
+
+# %% FUNCTION DEFINITIONS
+# This function checks if a dtype is the dtype of dictionary-encoded columns
+def is_category(dtype):
+    """
+    Returns whether the provided `dtype` requests or describes a
+    dictionary-encoded column.
+
+    """
+
+    return(isinstance(dtype, pd.CategoricalDtype) or
+           (isinstance(dtype, str) and dtype == 'category'))
+
+
+# This function dictionary-encodes the suitable columns of a data frame
+def categorize_frame(data_frame):
+    """
+    Returns the provided `data_frame` with all its string columns that have
+    at least :attr:`~CATEGORY_MIN_ROWS` rows and few unique values converted
+    to categoricals, such that they are dictionary-encoded when stored.
+
+    A column is only converted if at most a fraction :attr:`~CATEGORY_RATIO`
+    of its values is unique, which is first checked on its first rows to not
+    waste time on columns with mostly unique values.
+
+    """
+
+    # Determine which columns must be converted
+    columns = {}
+    for i, (_, values) in enumerate(data_frame.items()):
+        values = categorize_values(values)
+        if values is not None:
+            columns[i] = values
+
+    # If any column must be converted, replace it in a copy of the data frame
+    if columns:
+        data_frame = data_frame.copy(deep=False)
+        for i, values in columns.items():
+            data_frame.isetitem(i, values)
+
+    # Return data_frame
+    return(data_frame)
+
+
+# This function dictionary-encodes a column if it has few unique values
+def categorize_values(values):
+    """
+    Returns the provided :obj:`~pandas.Series` object of `values` converted
+    to a categorical if it is a string column that has at least
+    :attr:`~CATEGORY_MIN_ROWS` rows and few unique values, or *None* if it is
+    not.
+
+    A column is only converted if at most a fraction :attr:`~CATEGORY_RATIO`
+    of its values is unique, which is first checked on its first rows to not
+    waste time on columns with mostly unique values.
+
+    """
+
+    # Only check string columns that are not encoded yet and large enough
+    n_rows = len(values)
+    if((values.dtype.kind != 'O') or is_category(values.dtype) or
+       (n_rows < CATEGORY_MIN_ROWS)):
+        return(None)
+
+    # Check the first rows of the column
+    sample = values.iloc[:CONVERT_CHUNK_ROWS]
+    if((sample.nunique() > CATEGORY_RATIO*len(sample)) or
+       (pd.api.types.infer_dtype(sample, skipna=True) != 'string')):
+        return(None)
+
+    # Check the entire column
+    try:
+        values = values.astype(CATEGORY_DTYPE)
+    except TypeError:
+        return(None)
+    if(len(values.cat.categories) <= CATEGORY_RATIO*n_rows):
+        return(values)
+    else:
+        return(None)
+
+
+# This function checks if a dtype is the dtype of a nullable column
+def is_nullable(dtype):
+    """
+    Returns whether the provided `dtype` describes a nullable column, which
+    stores integers or booleans together with a validity mask.
+
+    """
+
+    return(isinstance(dtype, pd.api.extensions.ExtensionDtype) and
+           not is_category(dtype) and (dtype.kind in 'biu'))
+
+
+# This function returns the nullable dtype belonging to a NumPy dtype
+def nullable_dtype(dtype):
+    """
+    Returns the nullable pandas dtype (like :obj:`~pandas.Int64Dtype`) that
+    stores values of the provided integer or boolean NumPy `dtype`.
+
+    """
+
+    return(pd.array(np.empty(0, dtype=dtype)).dtype)
+
+
+# This function determines the dtype that values are converted to
+def get_conversion_dtype(chunks, dtype):
+    """
+    Returns the dtype that the provided `chunks` of values must be converted
+    to when `dtype` is requested.
+
+    If `dtype` is an integer or boolean dtype, which cannot hold empty
+    values, and any of the values is empty, the corresponding nullable dtype
+    is returned. Otherwise, `dtype` is returned.
+
+    """
+
+    # If dtype can hold empty values, return it
+    target = pd.Series([], dtype=dtype).dtype
+    if not isinstance(target, np.dtype) or (target.kind not in 'biu'):
+        return(dtype)
+
+    # Else, check if any chunk contains empty values
+    # NumPy integers and booleans cannot be empty, so they are skipped
+    for chunk in chunks:
+        chunk_dtype = getattr(chunk, 'dtype', None)
+        if(isinstance(chunk_dtype, np.dtype) and chunk_dtype.kind in 'biu'):
+            continue
+        if pd.isna(chunk).any():
+            return(nullable_dtype(target))
+
+    # Return dtype
+    return(dtype)
+
+
+# This function splits values into data and a validity mask
+def mask_values(values):
+    """
+    Splits the provided `values` into their data and which of them are not
+    empty, and returns both as :obj:`~numpy.ndarray` objects.
+
+    Empty values are replaced by zero in the data, which has the dtype of a
+    masked pandas array, or the dtype NumPy infers for the values that are
+    not empty otherwise.
+
+    """
+
+    # If values is a masked array, obtain its data and mask
+    if is_nullable(values.dtype):
+        valid = ~np.asarray(pd.isna(values))
+        dtype = values.dtype.numpy_dtype
+        return(values.to_numpy(dtype, na_value=dtype.type(0)), valid)
+
+    # If no value is empty, return the values themselves
+    values = np.asarray(values)
+    valid = ~pd.isna(values)
+    if valid.all():
+        return(values, valid)
+
+    # Else, replace the empty values by zero
+    present = values[valid]
+    if(present.dtype.kind == 'O'):
+        present = np.array(present.tolist())
+    data = np.zeros(len(values), dtype=present.dtype)
+    data[valid] = present
+    return(data, valid)
+
+
+# This function merges data and a validity mask into regular values
+def unmask_values(data, valid):
+    """
+    Returns the provided integer or boolean `data` with all values that are
+    not `valid` replaced by NaN, as a :obj:`~numpy.ndarray` object.
+
+    If all values are valid, `data` is returned. Otherwise, integers are
+    promoted to floats and booleans to objects.
+
+    """
+
+    # If all values are valid, return data
+    if valid.all():
+        return(data)
+
+    # Else, promote the data and set the empty values
+    values = data.astype(np.float64 if data.dtype.kind in 'iuf' else object)
+    values[~valid] = np.nan
+    return(values)
+
+
+# This function creates a masked array from data and a validity mask
+def to_masked(data, valid):
+    """
+    Returns the provided integer or boolean `data` with its `valid` mask as a
+    masked pandas array (like :obj:`~pandas.arrays.IntegerArray`).
+
+    """
+
+    # Create the array class belonging to the data
+    if(data.dtype.kind == 'b'):
+        return(pd.arrays.BooleanArray(data, ~valid))
+    else:
+        return(pd.arrays.IntegerArray(data, ~valid))
+
+
+# This function determines the smallest integer dtype for a range of values
+def compact_int_dtype(min_value, max_value):
+    """
+    Returns the smallest integer :obj:`~numpy.dtype` that can hold all values
+    between `min_value` and `max_value`, preferring signed integers, or
+    *None* if there is none.
+
+    """
+
+    # Return the first dtype that can hold both values
+    for dtype in COMPACT_INT_DTYPES:
+        info = np.iinfo(dtype)
+        if(info.min <= min_value and max_value <= info.max):
+            return(dtype)
+    return(None)
+
+
+# This function checks if values can be stored with a given dtype
+def can_store(values, dtype):
+    """
+    Returns whether the provided `values` can be stored in a column of the
+    given NumPy `dtype` without upcasting it, where integers must also fit in
+    an integer `dtype` instead of overflowing.
+
+    Integral floats are treated as the integers they represent.
+
+    """
+
+    # Integral floats stored with an integer dtype are treated as integers
+    if((dtype.kind in 'iu') and (values.dtype.kind == 'f') and len(values) and
+       np.all(np.isfinite(values)) and np.all(values == np.round(values))):
+        int_dtype = compact_int_dtype(values.min(), values.max())
+        values = values if int_dtype is None else values.astype(int_dtype)
+
+    # If the values cannot be cast to dtype at all, return False
+    if not np.can_cast(values.dtype, dtype, 'same_kind'):
+        return(False)
+
+    # If the values are not integers being stored as integers, return True
+    if((values.dtype.kind not in 'iu') or (dtype.kind not in 'iu') or
+       not len(values) or np.can_cast(values.dtype, dtype, 'safe')):
+        return(True)
+
+    # Else, check the smallest and largest value
+    info = np.iinfo(dtype)
+    return(bool((info.min <= values.min()) and (values.max() <= info.max)))
+
+
+# This function converts the categories of a dictionary-encoded column
+def convert_categories(categories, codes, dtype):
+    """
+    Converts the provided `categories` of a dictionary-encoded column with the
+    given `codes` to the provided `dtype` with :func:`~convert_values`, and
+    returns them followed by the converted empty value.
+
+    As every category is converted only once, taking the returned table at
+    the codes converts the values of the column much faster than converting
+    them directly, while giving the same values. Categories (and the empty
+    value) that are not used by any code are not converted, such that they
+    cannot cause the conversion to fail.
+
+    Raises
+    ------
+    ConversionError
+        If any category cannot be converted to `dtype`. Its `rows` attribute
+        holds the indices of all values in `codes` that use such a category.
+
+    """
+
+    # Create the table of all categories followed by the empty value
+    codes = np.asarray(codes)
+    table = np.empty(len(categories)+1, dtype=object)
+    table[:-1] = categories
+    table[-1] = np.nan
+
+    # Determine which entries of the table are used
+    # As the empty value is last, code -1 refers to it
+    used = np.zeros(len(table), dtype=bool)
+    used[codes] = True
+    used = np.flatnonzero(used)
+
+    # Convert the used entries
+    try:
+        values = convert_values(table[used], dtype)
+
+    # If that fails, determine which values use the invalid entries
+    except ConversionError as error:
+        invalid = used[error.rows]
+        invalid[invalid == len(categories)] = -1
+        raise ConversionError(str(error), np.flatnonzero(np.isin(
+            codes, invalid)))
+
+    # Return the converted table, in which unused entries are never taken
+    # Tables of nullable values are masked arrays
+    if is_nullable(values.dtype):
+        data, valid = mask_values(values)
+        converted = np.zeros(len(table), dtype=data.dtype)
+        converted[used] = data
+        mask = np.zeros(len(table), dtype=bool)
+        mask[used] = valid
+        return(to_masked(converted, mask))
+    converted = np.zeros(len(table), dtype=values.dtype)
+    converted[used] = values
+    return(converted)
+
+
+# This function converts an array of values to a given dtype
+def convert_values(values, dtype):
+    """
+    Converts the provided `values` to the provided `dtype` using pandas
+    conversion rules, and returns them as a :obj:`~numpy.ndarray` object.
+
+    If `values` must be stored in a nullable column (see
+    :func:`~get_conversion_dtype`), they are returned as a masked pandas
+    array instead. Integers that do not fit in an integer `dtype` cannot be
+    converted, instead of overflowing.
+
+    Raises
+    ------
+    ConversionError
+        If any value cannot be converted to `dtype`.
+
+    """
+
+    # Try to convert the values
+    dtype = get_conversion_dtype([values], dtype)
+    try:
+        series = pd.Series(values, copy=False)
+        check_int_range(series, dtype)
+        series = series.astype(dtype)
+
+    # If that fails, determine which values could not be converted
+    except (TypeError, ValueError, OverflowError) as error:
+        raise ConversionError(str(error), find_invalid_values(values, dtype))
+
+    # Return masked arrays as they are
+    if is_nullable(series.dtype):
+        return(series.array)
+
+    # Return values, using objects for all dtypes that NumPy does not know
+    return(series.to_numpy(dtype=(None if isinstance(series.dtype, np.dtype)
+                                  else object)))
+
+
+# This function checks if numbers fit in an integer dtype
+def check_int_range(series, dtype):
+    """
+    Checks if all numbers in the provided `series` fit in the given `dtype`
+    if it is an integer dtype.
+
+    Raises
+    ------
+    OverflowError
+        If any number does not fit in `dtype`.
+
+    """
+
+    # If the values are not numbers or dtype is not an integer dtype, return
+    dtype = pd.Series([], dtype=dtype).dtype
+    dtype = getattr(dtype, 'numpy_dtype', dtype)
+    if((series.dtype.kind not in 'iuf') or not isinstance(dtype, np.dtype) or
+       (dtype.kind not in 'iu')):
+        return
+
+    # Check if the smallest and largest number fit in dtype
+    info = np.iinfo(dtype)
+    if((series.min() < info.min) or (series.max() > info.max)):
+        raise OverflowError("Values do not fit in %s!" % (dtype))
+
+
+# This function determines which values cannot be converted to a given dtype
+def find_invalid_values(values, dtype):
+    """
+    Returns the indices of all provided `values` that cannot be converted to
+    the provided `dtype`.
+
+    """
+
+    # If the values must become numbers, check which of them are numbers
+    # Nullable columns store their numbers with the dtype of their data
+    dtype = pd.Series([], dtype=dtype).dtype
+    dtype = getattr(dtype, 'numpy_dtype', dtype)
+    if(isinstance(dtype, np.dtype) and dtype.kind in 'iuf'):
+        numbers = pd.to_numeric(pd.Series(values, copy=False),
+                                errors='coerce').to_numpy(np.float64)
+        invalid = np.isnan(numbers) & ~pd.isna(values)
+
+        # Integers must be finite, integral and fit in dtype
+        if(dtype.kind in 'iu'):
+            info = np.iinfo(dtype)
+            invalid |= ~np.isfinite(numbers) & ~pd.isna(values)
+            invalid[np.isfinite(numbers)] |= (
+                numbers[np.isfinite(numbers)] % 1 != 0)
+            invalid |= (numbers < info.min) | (numbers > info.max)
+
+        # Return the indices of all invalid values
+        return(np.flatnonzero(invalid))
+
+    # Else, try to convert every value separately
+    invalid = []
+    for i, value in enumerate(values):
+        try:
+            pd.Series([value]).astype(dtype)
+        except (TypeError, ValueError, OverflowError):
+            invalid.append(i)
+
+    # Return the indices of all invalid values
+    return(np.array(invalid, dtype=np.int64))
+
+
+# This function converts chunks of values to a given dtype in parallel
+def convert_chunks(chunks, dtype, progress=None):
+    """
+    Converts all provided `chunks` of values to the provided `dtype` on a pool
+    of threads, and yields the converted chunks in order.
+
+    Only a few chunks are converted ahead of the chunk that is yielded, such
+    that the converted values never have to be held in memory all at once.
+    If the values must be stored in a nullable column (see
+    :func:`~get_conversion_dtype`), all chunks are converted to masked pandas
+    arrays.
+    If any chunk cannot be converted, all remaining chunks are still checked
+    without being yielded, after which a single error is raised for all values
+    that cannot be converted.
+
+    Parameters
+    ----------
+    chunks : list of 1D array_like
+        The chunks of values that must be converted.
+    dtype : str or :obj:`~numpy.dtype` object
+        The data type the values must be converted to.
+
+    Optional
+    --------
+    progress : callable or None. Default: None
+        If not *None*, a function that is called with the number of chunks
+        that have been converted and the total number of chunks.
+
+    Yields
+    ------
+    values : :obj:`~numpy.ndarray` object or masked pandas array
+        The converted values of every chunk, all with the same dtype.
+
+    Raises
+    ------
+    ConversionError
+        If any value cannot be converted to `dtype`. Its `rows` attribute
+        holds the indices of these values in the concatenated chunks.
+
+    """
+
+    # Determine the dtype all chunks are converted to
+    dtype = get_conversion_dtype(chunks, dtype)
+
+    # Initialize the offset of the current chunk and all invalid values
+    offset = 0
+    invalid = []
+    message = None
+    result_dtype = None
+
+    # Convert the chunks in batches, keeping all threads busy
+    batch_size = 2*CONVERT_THREADS
+    with ThreadPoolExecutor(CONVERT_THREADS) as executor:
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start+batch_size]
+            futures = [executor.submit(convert_values, chunk, dtype)
+                       for chunk in batch]
+
+            # Handle the converted chunks in order
+            for i, (chunk, future) in enumerate(zip(batch, futures), start):
+                # Obtain the converted values of this chunk
+                try:
+                    values = future.result()
+
+                # If that fails, save which values could not be converted
+                except ConversionError as error:
+                    invalid.append(error.rows+offset)
+                    message = message or str(error)
+
+                # Else, yield the values if all previous chunks succeeded
+                else:
+                    if not invalid:
+                        result_dtype = result_dtype or values.dtype
+                        yield(values.astype(result_dtype, copy=False))
+
+                # Report the progress
+                offset += len(chunk)
+                if progress is not None:
+                    progress(i+1, len(chunks))
+
+    # If any value could not be converted, raise error
+    if invalid:
+        raise ConversionError(message, np.concatenate(invalid))
+
+
+# This function splits an array into chunks that can be converted
+def split_chunks(values):
+    """
+    Splits the provided `values` into views of at most
+    :attr:`~CONVERT_CHUNK_ROWS` values, for use in :func:`~convert_chunks`.
+
+    """
+
+    return([values[i:i+CONVERT_CHUNK_ROWS]
+            for i in range(0, len(values), CONVERT_CHUNK_ROWS)])
+
+
+# This function creates an array that holds a single value many times
+def constant_array(length, value, dtype):
+    """
+    Returns a read-only :obj:`~numpy.ndarray` object of the given `length`
+    and `dtype` where every item is `value`, which takes up the memory of a
+    single item regardless of its length.
+
+    Such arrays represent regions of a column that were never written to,
+    like rows that were inserted but not set yet.
+
+    """
+
+    return(np.broadcast_to(np.array(value, dtype=dtype), (length,)))
+
+
+# This function checks if an array was created by constant_array
+def is_constant(values):
+    """
+    Returns whether the provided `values` are a (view of a) constant array
+    created by :func:`~constant_array`, whose items all share their memory.
+
+    """
+
+    return(isinstance(values, np.ndarray) and (values.ndim == 1) and
+           (values.strides[0] == 0))
+
+
+# This function converts a boolean mask into contiguous ranges
+def mask_to_ranges(mask):
+    """
+    Converts the provided boolean `mask` into a list of all contiguous ranges
+    of *True* values, and returns it.
+
+    Parameters
+    ----------
+    mask : 1D array_like of bool
+        The boolean mask that must be converted.
+
+    Returns
+    -------
+    ranges : list of tuple
+        List containing a `(start, stop)` tuple for every range of *True*
+        values in `mask`, in increasing order.
+
+    """
+
+    # Determine where the mask changes from False to True or vice versa
+    mask = np.asarray(mask, dtype=bool)
+    edges = np.flatnonzero(np.diff(mask, prepend=False, append=False))
+
+    # Every pair of edges is the start and stop of a range
+    return(list(zip(edges[0::2].tolist(), edges[1::2].tolist())))
+
+
+# This function creates new chunk versions
+def new_versions(count):
+    """
+    Returns a list of `count` new chunk versions, for chunks that were just
+    created or modified.
+
+    """
+
+    return([next(CHUNK_VERSIONS) for _ in range(count)])
@@ -0,0 +1,1655 @@
+# -*- coding: utf-8 -*-
+
+"""
+Columnar Backend
+================
+
+"""
+
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import (
+    CATEGORY_DTYPE, BaseBackend, CategoryDictionary, ConversionError,
+    constant_array, convert_categories, convert_chunks, get_conversion_dtype,
+    is_category, is_constant, is_nullable, mask_values, nullable_dtype,
+    split_chunks, to_masked, unmask_values)
+from guipy.plugins.data_table.backends.base import (
+    CHUNK_VERSIONS, CODES_DTYPE, CONVERT_CHUNK_ROWS, can_store, new_versions)
+
+# All declaration
+__all__ = ['ColumnarBackend']
+
+
+# %% HELPER DEFINITIONS
+# Define list that loads the chunks it holds when they are first accessed
+class ChunkList(list):
+    """
+    List of the chunks of a :class:`~ChunkedColumn`, where every chunk that
+    has not been loaded yet is an object with a `load` method that returns
+    its values.
+
+    Such a chunk is loaded and replaced by its values the first time it is
+    accessed, such that columns can be used without reading all their values.
+    Removing or replacing a chunk does not load it.
+
+    """
+
+    # Override __getitem__ to load chunks that are accessed
+    def __getitem__(self, index):
+        # If index is a slice, return all requested chunks
+        if isinstance(index, slice):
+            return([self[i] for i in range(*index.indices(len(self)))])
+
+        # Obtain the requested chunk and load it if required
+        chunk = super().__getitem__(index)
+        if not isinstance(chunk, np.ndarray):
+            chunk = chunk.load()
+            super().__setitem__(index, chunk)
+
+        # Return chunk
+        return(chunk)
+
+    # Override __iter__ to load chunks that are iterated over
+    def __iter__(self):
+        return(self[i] for i in range(len(self)))
+
+
+# Define class that stores a single column as a list of NumPy arrays
+class ChunkedColumn(object):
+    """
+    Stores the data of a single data table column as a list of NumPy arrays
+    (chunks), where every chunk has some spare capacity at its end.
+
+    Appending values fills up the spare capacity of the last chunk before a
+    new chunk is allocated, making appends amortized *O(1)*.
+    Inserting or removing values in the middle of the column only touches the
+    chunks that contain the affected rows.
+
+    Chunks can be shared with the contiguous array returned by
+    :meth:`~to_array`, in which case they are copied before they are modified
+    (copy-on-write).
+
+    Inserting many values that are all equal, like the empty rows added when
+    resizing a data table, only adds constant chunks (see
+    :func:`~guipy.plugins.data_table.backends.constant_array`) that take up no
+    memory. Such a chunk is only allocated once any of its values is set,
+    such that mostly empty columns only store the chunks that hold values.
+
+    Every chunk also has a version, which changes whenever the chunk is
+    modified, such that saving the column again only has to write the chunks
+    that were modified (see :meth:`~get_chunk_versions`).
+
+    """
+
+    # Number of rows a chunk can hold by default
+    CHUNK_SIZE = 2**16
+
+    # Initialize ChunkedColumn class
+    def __init__(self, dtype):
+        # Save the dtype of this column
+        self.dtype = np.dtype(dtype)
+
+        # Initialize empty lists of chunks, their lengths, ownership and
+        # versions
+        self._chunks = []
+        self._lengths = []
+        self._owned = []
+        self._versions = []
+
+        # Initialize the chunk offsets and contiguous array cache
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._array = None
+
+    # This function creates a column that wraps a given array
+    @classmethod
+    def from_array(cls, array):
+        """
+        Creates a new column that wraps the provided `array` without copying
+        it, and returns it.
+
+        """
+
+        # Convert array to a NumPy array that can be stored in a column
+        array = np.asarray(array)
+        if array.dtype.kind in 'SUV':
+            array = array.astype(object)
+
+        # Create column and split the array into shared chunks
+        column = cls(array.dtype)
+        column._set_shared(array)
+
+        # Return column
+        return(column)
+
+    # This function creates a column from a list of chunks
+    @classmethod
+    def from_chunks(cls, dtype, chunks):
+        """
+        Creates a new column with the given `dtype` that consists of the
+        provided `chunks`, and returns it.
+
+        Every chunk is either a :obj:`~numpy.ndarray` object that is shared
+        with the column, or an object with a length and a `load` method that
+        returns its values. The latter are only loaded once they are accessed.
+
+        """
+
+        # Create column and add the chunks to it
+        column = cls(dtype)
+        column._chunks = ChunkList(chunks)
+        column._lengths = [len(chunk) for chunk in chunks]
+        column._owned = [False]*len(chunks)
+        column._versions = new_versions(len(chunks))
+        column._update_offsets()
+
+        # Return column
+        return(column)
+
+    # This function creates a column filled with a single value
+    @classmethod
+    def full(cls, length, fill_value=np.nan, dtype=np.float64):
+        """
+        Creates a new column with the given `length` that is filled with
+        `fill_value`, and returns it.
+
+        """
+
+        # Create column and append the required values
+        column = cls(dtype)
+        column.insert(0, length, fill_value)
+
+        # Return column
+        return(column)
+
+    # Override __len__ to return the number of values in this column
+    def __len__(self):
+        return(int(self._offsets[-1]))
+
+    # This function updates the chunk offsets
+    def _update_offsets(self):
+        # Calculate the row at which every chunk starts
+        self._offsets = np.zeros(len(self._lengths)+1, dtype=np.int64)
+        np.cumsum(self._lengths, out=self._offsets[1:])
+
+        # Invalidate the contiguous array cache
+        self._array = None
+
+    # This function splits a given array into chunks that share its memory
+    def _set_shared(self, array):
+        # Split array into views with the size of a chunk
+        size = self.CHUNK_SIZE
+        self._chunks = [array[i:i+size] for i in range(0, len(array), size)]
+        self._lengths = [len(chunk) for chunk in self._chunks]
+        self._owned = [False]*len(self._chunks)
+        self._versions = new_versions(len(self._chunks))
+        self._update_offsets()
+
+    # This function makes sure a chunk is owned by this column
+    def _own(self, index, capacity=None):
+        # Obtain the length of this chunk
+        length = self._lengths[index]
+
+        # If chunk is owned and large enough, return
+        if self._owned[index] and (capacity is None or
+                                   len(self._chunks[index]) >= capacity):
+            return
+
+        # Else, copy the chunk into a new array with spare capacity
+        chunk = np.empty(max(self.CHUNK_SIZE, length, capacity or 0),
+                         dtype=self.dtype)
+        chunk[:length] = self._chunks[index][:length]
+        self._chunks[index] = chunk
+        self._owned[index] = True
+
+    # This function checks if a chunk can hold more values without splitting
+    def _has_capacity(self, index):
+        return(self._lengths[index] < max(len(self._chunks[index]),
+                                          self.CHUNK_SIZE))
+
+    # This function returns the chunk index and local row of a given row
+    def _locate(self, row):
+        # Obtain the chunk that contains this row
+        index = int(np.searchsorted(self._offsets, row, 'right'))-1
+        index = min(index, len(self._chunks)-1)
+
+        # Return index and the row within this chunk
+        return(index, row-int(self._offsets[index]))
+
+    # This function releases the storage of this column
+    def close(self):
+        """
+        Releases the storage of this column. As all chunks of this column are
+        stored in memory, nothing has to be done.
+
+        """
+
+        pass
+
+    # This function returns the value that represents an empty cell
+    def empty_value(self):
+        """
+        Returns the value that is used for representing empty cells in this
+        column, or *None* if this column cannot store empty cells.
+
+        """
+
+        # Return the empty value belonging to the dtype of this column
+        if self.dtype.kind in 'fcO':
+            return(np.nan)
+        elif self.dtype.kind in 'mM':
+            return(np.datetime64('NaT'))
+        else:
+            return(None)
+
+    # This function returns the value that new cells are filled with
+    def _get_fill_value(self, fill_value):
+        # If no fill_value was provided, use the empty value
+        if fill_value is None:
+            fill_value = self.empty_value()
+
+            # If this column cannot store empty values, upcast it
+            if fill_value is None:
+                self.astype(object if self.dtype.kind == 'b' else np.float64)
+                fill_value = np.nan
+
+        # Make sure that fill_value can be stored in this column
+        return(self._coerce([fill_value])[0])
+
+    # This function converts given values to the dtype of this column
+    def _coerce(self, values):
+        # Convert values to a NumPy array
+        values = np.asarray(values)
+        if values.dtype.kind in 'SUV':
+            values = values.astype(object)
+
+        # If there are no values, return them with the dtype of this column
+        if not len(values):
+            return(values.astype(self.dtype, copy=False))
+
+        # If values can be safely cast to this dtype, do so
+        if can_store(values, self.dtype):
+            return(values.astype(self.dtype, copy=False))
+
+        # Else, this column must be upcast to be able to hold the values
+        if(values.dtype.kind == 'O' or self.dtype.kind in 'mM'):
+            self.astype(object)
+        else:
+            self.astype(np.result_type(self.dtype, values.dtype))
+        return(values.astype(self.dtype, copy=False))
+
+    # This function converts this column to a given dtype
+    def astype(self, dtype, progress=None):
+        """
+        Converts this column to the provided `dtype`, using
+        :func:`~guipy.plugins.data_table.backends.convert_chunks`.
+
+        If the conversion fails, the column is left unchanged.
+
+        """
+
+        # Convert the values in all chunks, using pandas conversion rules
+        chunks = list(convert_chunks(
+            [chunk[:length] for chunk, length in zip(self._chunks,
+                                                     self._lengths)],
+            dtype, progress))
+
+        # Determine the new dtype of this column
+        dtype = chunks[0].dtype if chunks else pd.Series([], dtype=dtype).dtype
+        dtype = dtype if isinstance(dtype, np.dtype) else np.dtype(object)
+
+        # Replace all chunks with the converted ones
+        self.dtype = dtype
+        self._chunks = [chunk.astype(dtype, copy=False) for chunk in chunks]
+        self._owned = [False]*len(chunks)
+        self._versions = new_versions(len(chunks))
+        self._update_offsets()
+
+    # This function returns the values in a given range
+    def get_range(self, start, stop):
+        """
+        Returns the values between `start` and `stop` as a
+        :obj:`~numpy.ndarray` object.
+
+        """
+
+        # If the range is empty, return an empty array
+        if(stop <= start):
+            return(np.empty(0, dtype=self.dtype))
+
+        # Determine which chunks contain the requested range
+        first, start_local = self._locate(start)
+        last, stop_local = self._locate(stop-1)
+
+        # If the range is contained in a single chunk, return a view
+        if(first == last):
+            return(self._chunks[first][start_local:stop_local+1])
+
+        # Else, gather the values from all chunks
+        pieces = [self._chunks[first][start_local:self._lengths[first]]]
+        pieces.extend(self._chunks[i][:self._lengths[i]]
+                      for i in range(first+1, last))
+        pieces.append(self._chunks[last][:stop_local+1])
+        return(join_chunks(pieces, self.dtype))
+
+    # This function returns the value in a given row
+    def get_value(self, row):
+        """
+        Returns the value in the given `row`.
+
+        """
+
+        # Obtain the chunk that contains row and return the value
+        index, local = self._locate(row)
+        return(self._chunks[index][local])
+
+    # This function returns the values in a given set of rows
+    def take(self, rows):
+        """
+        Returns the values in the provided `rows` as a :obj:`~numpy.ndarray`
+        object.
+
+        """
+
+        # If many rows are requested, take them from the contiguous array
+        rows = np.asarray(rows, dtype=np.int64)
+        if self._array is not None or (len(rows) > self.CHUNK_SIZE):
+            return(self.to_array()[rows])
+
+        # Else, take the values from the chunks that contain these rows
+        index = np.searchsorted(self._offsets, rows, 'right')-1
+        values = np.empty(len(rows), dtype=self.dtype)
+        for i in np.unique(index).tolist():
+            select = (index == i)
+            values[select] = self._chunks[i][rows[select]-self._offsets[i]]
+
+        # Return values
+        return(values)
+
+    # This function sets the values in a given range
+    def set_range(self, start, values):
+        """
+        Sets the values starting at `start` to the provided `values`.
+
+        """
+
+        # Convert values to the proper dtype
+        values = self._coerce(values)
+        stop = start+len(values)
+
+        # Loop over all chunks that contain the range and set their values
+        # Chunks that are set entirely to constant values become constant
+        while(start < stop):
+            index, local = self._locate(start)
+            n = min(self._lengths[index]-local, stop-start)
+            if is_constant(values) and (n == self._lengths[index]):
+                self._chunks[index] = values[:n]
+                self._owned[index] = False
+            else:
+                self._own(index)
+                self._chunks[index][local:local+n] = values[:n]
+            self._versions[index] = next(CHUNK_VERSIONS)
+            values = values[n:]
+            start += n
+
+        # Invalidate the contiguous array cache
+        self._array = None
+
+    # This function inserts values before a given row
+    def insert(self, row, count, fill_value=None):
+        """
+        Inserts `count` values before the given `row`, which are all set to
+        `fill_value`.
+        If `fill_value` is *None*, the empty value of this column is used.
+
+        """
+
+        # If count is zero, return
+        if not count:
+            return
+
+        # Obtain the value the new cells must be filled with
+        fill_value = self._get_fill_value(fill_value)
+
+        # If row is at the end of this column, append the values
+        if(row == len(self)):
+            self._append(count, fill_value)
+            return
+
+        # Determine the chunk that contains row
+        index, local = self._locate(row)
+        length = self._lengths[index]
+
+        # If many values are inserted, split this chunk around constant chunks
+        # Both parts of this chunk are copied before they are modified
+        if(count >= self.CHUNK_SIZE):
+            chunks, lengths = self._constant_chunks(count, fill_value)
+            if local:
+                chunks.insert(0, self._chunks[index][:local])
+                lengths.insert(0, local)
+            chunks.append(self._chunks[index][local:length])
+            lengths.append(length-local)
+            self._chunks[index:index+1] = chunks
+            self._lengths[index:index+1] = lengths
+            self._owned[index:index+1] = [False]*len(chunks)
+            self._versions[index:index+1] = new_versions(len(chunks))
+
+        # Else, if this chunk is constant and holds the same value, lengthen it
+        elif(length+count <= self.CHUNK_SIZE and
+             is_constant(list.__getitem__(self._chunks, index)) and
+             self._is_chunk_value(self._chunks[index], fill_value)):
+            self._chunks[index] = constant_array(self.CHUNK_SIZE, fill_value,
+                                                 self.dtype)
+            self._lengths[index] += count
+            self._versions[index] = next(CHUNK_VERSIONS)
+
+        # Else, if the values fit in this chunk, shift its tail and fill them
+        elif(length+count <= len(self._chunks[index]) or
+             length+count <= self.CHUNK_SIZE):
+            self._own(index, length+count)
+            chunk = self._chunks[index]
+            chunk[local+count:length+count] = chunk[local:length]
+            chunk[local:local+count] = fill_value
+            self._lengths[index] += count
+            self._versions[index] = next(CHUNK_VERSIONS)
+
+        # Else, split this chunk into new chunks with spare capacity
+        else:
+            # Create the combined values of this chunk
+            chunk = self._chunks[index]
+            values = np.empty(length+count, dtype=self.dtype)
+            values[:local] = chunk[:local]
+            values[local:local+count] = fill_value
+            values[local+count:] = chunk[local:length]
+
+            # Split them into chunks that are filled for three-quarters
+            size = (3*self.CHUNK_SIZE)//4
+            new_chunks = []
+            for i in range(0, len(values), size):
+                new_chunk = np.empty(self.CHUNK_SIZE, dtype=self.dtype)
+                n = min(size, len(values)-i)
+                new_chunk[:n] = values[i:i+n]
+                new_chunks.append((new_chunk, n))
+
+            # Replace the old chunk with the new chunks
+            self._chunks[index:index+1] = [c for c, _ in new_chunks]
+            self._lengths[index:index+1] = [n for _, n in new_chunks]
+            self._owned[index:index+1] = [True]*len(new_chunks)
+            self._versions[index:index+1] = new_versions(len(new_chunks))
+
+        # Update the chunk offsets
+        self._update_offsets()
+
+    # This function appends values to the end of this column
+    def _append(self, count, fill_value):
+        # Obtain the last chunk without loading it
+        index = len(self._chunks)-1
+        chunk = list.__getitem__(self._chunks, index) if self._chunks else None
+
+        # If the last chunk is constant and holds the same value, lengthen it
+        if(chunk is not None and is_constant(chunk) and
+           self._has_capacity(index) and
+           self._is_chunk_value(chunk, fill_value)):
+            n = min(self.CHUNK_SIZE-self._lengths[index], count)
+            self._chunks[index] = constant_array(self.CHUNK_SIZE, fill_value,
+                                                 self.dtype)
+            self._lengths[index] += n
+            self._versions[index] = next(CHUNK_VERSIONS)
+            count -= n
+
+        # Else, if the last chunk is owned and has spare capacity for all
+        # values, fill them in, such that appending a few rows is cheap
+        elif(chunk is not None and self._owned[index] and
+             self._lengths[index]+count <= len(chunk)):
+            length = self._lengths[index]
+            chunk[length:length+count] = fill_value
+            self._lengths[index] += count
+            self._versions[index] = next(CHUNK_VERSIONS)
+            count = 0
+
+        # Add constant chunks for the remaining values
+        chunks, lengths = self._constant_chunks(count, fill_value)
+        self._chunks.extend(chunks)
+        self._lengths.extend(lengths)
+        self._owned.extend([False]*len(chunks))
+        self._versions.extend(new_versions(len(chunks)))
+
+        # Update the chunk offsets
+        self._update_offsets()
+
+    # This function checks if a constant chunk holds a given value
+    def _is_chunk_value(self, chunk, value):
+        return(bool(chunk[0] == value) or
+               bool(pd.isna(chunk[0]) and pd.isna(value)))
+
+    # This function creates constant chunks holding a single value
+    def _constant_chunks(self, count, fill_value):
+        # All chunks are views of the same constant array
+        chunk = constant_array(self.CHUNK_SIZE, fill_value, self.dtype)
+        lengths = [min(self.CHUNK_SIZE, count-i)
+                   for i in range(0, count, self.CHUNK_SIZE)]
+
+        # Return the chunks and their lengths
+        return([chunk]*len(lengths), lengths)
+
+    # This function appends given values to the end of this column
+    def extend(self, values):
+        """
+        Appends the provided `values` to the end of this column.
+
+        """
+
+        # Convert values to the proper dtype
+        values = self._coerce(values)
+
+        # If the last chunk has spare capacity, fill it up first
+        index = len(self._chunks)-1
+        if self._chunks and self._has_capacity(index) and len(values):
+            length = self._lengths[index]
+            self._own(index)
+            n = min(len(self._chunks[index])-length, len(values))
+            self._chunks[index][length:length+n] = values[:n]
+            self._lengths[index] += n
+            self._versions[index] = next(CHUNK_VERSIONS)
+            values = values[n:]
+
+        # Store the remaining values in new chunks
+        for i in range(0, len(values), self.CHUNK_SIZE):
+            n = min(self.CHUNK_SIZE, len(values)-i)
+            chunk = np.empty(self.CHUNK_SIZE, dtype=self.dtype)
+            chunk[:n] = values[i:i+n]
+            self._chunks.append(chunk)
+            self._lengths.append(n)
+            self._owned.append(True)
+            self._versions.append(next(CHUNK_VERSIONS))
+
+        # Update the chunk offsets
+        self._update_offsets()
+
+    # This function removes values starting at a given row
+    def delete(self, row, count):
+        """
+        Removes `count` values starting at the given `row`.
+
+        """
+
+        # Loop over all chunks that contain the range and remove the values
+        index, local = self._locate(row)
+        while(count and index < len(self._chunks)):
+            length = self._lengths[index]
+            n = min(length-local, count)
+
+            # If the entire chunk is removed, drop it
+            if(n == length):
+                del self._chunks[index]
+                del self._lengths[index]
+                del self._owned[index]
+                del self._versions[index]
+
+            # Else, shift the tail of the chunk over the removed values
+            # Constant chunks only have to be shortened
+            else:
+                chunk = list.__getitem__(self._chunks, index)
+                if not is_constant(chunk):
+                    self._own(index)
+                    chunk = self._chunks[index]
+                    chunk[local:length-n] = chunk[local+n:length]
+                self._lengths[index] -= n
+                self._versions[index] = next(CHUNK_VERSIONS)
+                index += 1
+
+            # Continue with the start of the next chunk
+            count -= n
+            local = 0
+
+        # Update the chunk offsets
+        self._update_offsets()
+
+    # This function removes all values indicated by a mask
+    def delete_mask(self, mask):
+        """
+        Removes all values for which the provided boolean `mask` is *True*.
+
+        Only chunks that contain values that must be removed are modified.
+
+        """
+
+        # Loop over all chunks and remove the values that are masked
+        for index in reversed(range(len(self._chunks))):
+            length = self._lengths[index]
+            start = self._offsets[index]
+            chunk_mask = mask[start:start+length]
+
+            # If the entire chunk is removed, drop it
+            if chunk_mask.all():
+                del self._chunks[index]
+                del self._lengths[index]
+                del self._owned[index]
+                del self._versions[index]
+
+            # Else, if any value in this chunk is removed, compress it
+            # Constant chunks only have to be shortened
+            elif chunk_mask.any():
+                chunk = list.__getitem__(self._chunks, index)
+                if is_constant(chunk):
+                    self._lengths[index] -= int(np.count_nonzero(chunk_mask))
+                else:
+                    self._chunks[index] = chunk = (
+                        self._chunks[index][:length][~chunk_mask])
+                    self._lengths[index] = len(chunk)
+                    self._owned[index] = True
+                self._versions[index] = next(CHUNK_VERSIONS)
+
+        # Update the chunk offsets
+        self._update_offsets()
+
+    # This function returns the chunks of this column without loading them
+    def get_chunks(self):
+        """
+        Returns a list with the values in every chunk of this column, without
+        loading chunks that were not loaded yet.
+
+        """
+
+        # Obtain all chunks without loading them
+        chunks = [list.__getitem__(self._chunks, i)
+                  for i in range(len(self._chunks))]
+
+        # Return the used part of every loaded chunk
+        return([chunk[:length] if isinstance(chunk, np.ndarray) else chunk
+                for chunk, length in zip(chunks, self._lengths)])
+
+    # This function returns the versions of the chunks of this column
+    def get_chunk_versions(self):
+        """
+        Returns a list with the version of every chunk returned by
+        :meth:`~get_chunks`.
+
+        """
+
+        return(list(self._versions))
+
+    # This function returns the chunks of this column that do not change
+    def freeze_chunks(self):
+        """
+        Returns the chunks of this column like :meth:`~get_chunks`, and makes
+        sure that they are copied before they are modified afterward.
+
+        """
+
+        # Obtain the chunks and stop owning all of them
+        chunks = self.get_chunks()
+        self._owned = [False]*len(self._chunks)
+
+        # Return chunks
+        return(chunks)
+
+    # This function returns all values in this column as a contiguous array
+    def to_array(self):
+        """
+        Returns all values in this column as a contiguous, read-only
+        :obj:`~numpy.ndarray` object.
+
+        The returned array shares its memory with this column. Chunks that are
+        shared with the array are copied before they are modified. If all
+        values are equal because none of them were set, like in a column that
+        was just inserted, a constant array is returned instead.
+
+        """
+
+        # If the contiguous array is not cached, create it
+        if self._array is None:
+            # If there is a single chunk, use it directly
+            if(len(self._chunks) == 1):
+                array = self._chunks[0][:self._lengths[0]]
+                self._owned[0] = False
+
+            # Else, concatenate all chunks
+            else:
+                array = self.get_range(0, len(self))
+
+                # Share the chunks with the array if it is not constant
+                # The chunks keep holding the same rows and thus their versions
+                # Constant chunks are kept, as they take up no memory
+                if not is_constant(array):
+                    self._chunks = [
+                        chunk if is_constant(chunk)
+                        else array[start:start+length]
+                        for chunk, start, length in zip(
+                            self.get_chunks(), self._offsets.tolist(),
+                            self._lengths)]
+                    self._owned = [False]*len(self._chunks)
+
+            # Create read-only view of the array and cache it
+            self._array = array.view()
+            self._array.flags.writeable = False
+
+        # Return the contiguous array
+        return(self._array)
+
+
+# Define class that stores a single column as the codes of its unique values
+class DictionaryColumn(object):
+    """
+    Stores the data of a single dictionary-encoded data table column as the
+    integer codes of its values in a
+    :class:`~guipy.plugins.data_table.backends.CategoryDictionary`, which are
+    stored in a column of another column class, like :class:`~ChunkedColumn`.
+
+    Every value only takes up the four bytes of its code instead of a Python
+    object, which makes columns with few unique values (like statuses or
+    labels) many times smaller. Values are decoded when they are read, such
+    that this column can be used like any other column.
+
+    """
+
+    # Initialize DictionaryColumn class
+    def __init__(self, codes, dictionary):
+        # Save provided codes and dictionary
+        self.codes = codes
+        self.dictionary = dictionary
+
+        # Save the dtype of this column
+        self.dtype = CATEGORY_DTYPE
+
+    # This function creates a column that encodes given values
+    @classmethod
+    def from_values(cls, values, column_class, progress=None):
+        """
+        Creates a new column that dictionary-encodes the provided `values`,
+        storing their codes in a column of the given `column_class`, and
+        returns it.
+
+        If `values` is a :obj:`~pandas.Categorical` object, its codes and
+        categories are used directly. Otherwise, the values are encoded chunk
+        by chunk, calling `progress` (if not *None*) with the number of
+        chunks that have been encoded and the total number of chunks.
+
+        Raises
+        ------
+        ConversionError
+            If any value cannot be dictionary-encoded.
+
+        """
+
+        # If values is a categorical, use its codes and categories
+        if isinstance(values, pd.Categorical):
+            return(cls(column_class.from_array(values.codes.astype(
+                CODES_DTYPE)), CategoryDictionary(values.categories.tolist())))
+
+        # Else, encode the values chunk by chunk
+        values = np.asarray(values)
+        dictionary = CategoryDictionary()
+        codes = column_class(CODES_DTYPE)
+        starts = range(0, len(values), CONVERT_CHUNK_ROWS)
+        invalid = []
+        message = None
+        for i, start in enumerate(starts):
+            # Try to encode this chunk, saving the values that cannot be
+            try:
+                chunk = dictionary.encode(
+                    values[start:start+CONVERT_CHUNK_ROWS])
+            except ConversionError as error:
+                invalid.append(error.rows+start)
+                message = message or str(error)
+
+            # Store the codes if all previous chunks succeeded
+            else:
+                if not invalid:
+                    codes.extend(chunk)
+
+            # Report the progress
+            if progress is not None:
+                progress(i+1, len(starts))
+
+        # If any value could not be encoded, raise error
+        if invalid:
+            codes.close()
+            raise ConversionError(message, np.concatenate(invalid))
+
+        # Create column
+        return(cls(codes, dictionary))
+
+    # This function creates an empty column
+    @classmethod
+    def full(cls, length, column_class):
+        """
+        Creates a new column of the given `length` that only contains empty
+        values, storing its codes in a column of the given `column_class`, and
+        returns it.
+
+        """
+
+        return(cls(column_class.full(length, -1, CODES_DTYPE),
+                   CategoryDictionary()))
+
+    # Override __len__ to return the number of values in this column
+    def __len__(self):
+        return(len(self.codes))
+
+    # This function releases the storage of this column
+    def close(self):
+        """
+        Releases the storage of the codes of this column.
+
+        """
+
+        self.codes.close()
+
+    # This function returns the value that represents an empty cell
+    def empty_value(self):
+        """
+        Returns the value that is used for representing empty cells in this
+        column.
+
+        """
+
+        return(np.nan)
+
+    # This function converts this column to a given dtype
+    def convert(self, dtype, column_class, progress=None):
+        """
+        Converts the values of this column to the provided `dtype`, and
+        returns them as a new column of the given `column_class`.
+
+        Only the categories are converted, using
+        :func:`~guipy.plugins.data_table.backends.convert_categories`, after
+        which the values are decoded chunk by chunk.
+
+        """
+
+        # Convert the categories of this column
+        table = convert_categories(self.dictionary.categories(),
+                                   self.codes.to_array(), dtype)
+
+        # Decode the values of this column into a new column
+        column = empty_column(table.dtype, column_class)
+        starts = range(0, len(self), CONVERT_CHUNK_ROWS)
+        for i, start in enumerate(starts):
+            column.extend(table[self.codes.get_range(
+                start, min(start+CONVERT_CHUNK_ROWS, len(self)))])
+
+            # Report the progress
+            if progress is not None:
+                progress(i+1, len(starts))
+
+        # Return column
+        return(column)
+
+    # This function returns the values in a given range
+    def get_range(self, start, stop):
+        """
+        Returns the values between `start` and `stop` as a
+        :obj:`~numpy.ndarray` object.
+
+        """
+
+        return(self.dictionary.decode(self.codes.get_range(start, stop)))
+
+    # This function returns the value in a given row
+    def get_value(self, row):
+        """
+        Returns the value in the given `row`.
+
+        """
+
+        return(self.dictionary.decode(self.codes.get_value(row)))
+
+    # This function returns the values in a given set of rows
+    def take(self, rows):
+        """
+        Returns the values in the provided `rows` as a :obj:`~numpy.ndarray`
+        object.
+
+        """
+
+        return(self.dictionary.decode(self.codes.take(rows)))
+
+    # This function sets the values in a given range
+    def set_range(self, start, values):
+        """
+        Sets the values starting at `start` to the provided `values`.
+
+        """
+
+        self.codes.set_range(start, self.dictionary.encode(values))
+
+    # This function inserts values before a given row
+    def insert(self, row, count, fill_value=None):
+        """
+        Inserts `count` values before the given `row`, which are all set to
+        `fill_value`.
+        If `fill_value` is *None*, the values are empty.
+
+        """
+
+        # Determine the code of fill_value
+        if fill_value is None:
+            code = -1
+        else:
+            code = int(self.dictionary.encode([fill_value])[0])
+
+        # Insert the codes
+        self.codes.insert(row, count, code)
+
+    # This function appends given values to the end of this column
+    def extend(self, values):
+        """
+        Appends the provided `values` to the end of this column.
+
+        """
+
+        self.codes.extend(self.dictionary.encode(values))
+
+    # This function removes values starting at a given row
+    def delete(self, row, count):
+        """
+        Removes `count` values starting at the given `row`.
+
+        """
+
+        self.codes.delete(row, count)
+
+    # This function removes all values indicated by a mask
+    def delete_mask(self, mask):
+        """
+        Removes all values for which the provided boolean `mask` is *True*.
+
+        """
+
+        self.codes.delete_mask(mask)
+
+    # This function returns the chunks of the codes of this column
+    def get_chunks(self):
+        """
+        Returns a list with the codes in every chunk of this column.
+
+        """
+
+        return(self.codes.get_chunks())
+
+    # This function returns the versions of the chunks of this column
+    def get_chunk_versions(self):
+        """
+        Returns a list with the version of every chunk returned by
+        :meth:`~get_chunks`.
+
+        As the codes of values never change, the versions of the chunks do not
+        depend on the categories.
+
+        """
+
+        return(self.codes.get_chunk_versions())
+
+    # This function returns the chunks of the codes that do not change
+    def freeze_chunks(self):
+        """
+        Returns the chunks of this column like :meth:`~get_chunks`, such that
+        they are not affected by any later changes to this column.
+
+        """
+
+        return(self.codes.freeze_chunks())
+
+    # This function returns all values in this column as an array
+    def to_array(self):
+        """
+        Returns all values in this column as a :obj:`~numpy.ndarray` object,
+        which is decoded from the codes of this column.
+
+        """
+
+        return(self.dictionary.decode(self.codes.to_array()))
+
+
+# Define class that stores a single column of integers or booleans with gaps
+class MaskedColumn(object):
+    """
+    Stores the data of a single nullable data table column, which holds
+    integers or booleans that can be empty, as the data of its values and a
+    validity mask stating which values are not empty. Both are stored in a
+    column of another column class, like :class:`~ChunkedColumn`.
+
+    Empty values are zero in the data, such that integers and booleans keep
+    their dtype and size instead of being promoted to floats or objects that
+    can hold NaN. Values are promoted when they are read with
+    :func:`~guipy.plugins.data_table.backends.unmask_values`, such that this
+    column can be used like any other column.
+
+    """
+
+    # Initialize MaskedColumn class
+    def __init__(self, values, valid):
+        # Save provided data and validity mask
+        self.values = values
+        self.valid = valid
+
+    # This property returns the dtype of this column
+    @property
+    def dtype(self):
+        return(nullable_dtype(self.values.dtype))
+
+    # This function creates a column that holds given values
+    @classmethod
+    def from_values(cls, values, column_class):
+        """
+        Creates a new column that holds the provided `values`, which are
+        usually a masked pandas array, storing its data and validity mask in
+        columns of the given `column_class`, and returns it.
+
+        """
+
+        # Split the values into data and a validity mask
+        data, valid = mask_values(values)
+        return(cls(column_class.from_array(data),
+                   column_class.from_array(valid)))
+
+    # This function creates a column from a column without empty values
+    @classmethod
+    def from_column(cls, column, column_class):
+        """
+        Creates a new column that uses the provided integer or boolean
+        `column` as its data, in which no value is empty yet, storing its
+        validity mask in a column of the given `column_class`, and returns it.
+
+        """
+
+        return(cls(column, column_class.full(len(column), np.True_, bool)))
+
+    # This function creates an empty column
+    @classmethod
+    def full(cls, length, dtype, column_class):
+        """
+        Creates a new column of the given `length` and integer or boolean
+        `dtype` that only contains empty values, storing its data and
+        validity mask in columns of the given `column_class`, and returns it.
+
+        """
+
+        dtype = np.dtype(dtype)
+        return(cls(column_class.full(length, dtype.type(0), dtype),
+                   column_class.full(length, np.False_, bool)))
+
+    # Override __len__ to return the number of values in this column
+    def __len__(self):
+        return(len(self.values))
+
+    # This function releases the storage of this column
+    def close(self):
+        """
+        Releases the storage of the data and validity mask of this column.
+
+        """
+
+        self.values.close()
+        self.valid.close()
+
+    # This function returns the value that represents an empty cell
+    def empty_value(self):
+        """
+        Returns the value that is used for representing empty cells in this
+        column when they are read.
+
+        """
+
+        return(np.nan)
+
+    # This function returns whether this column still needs its mask
+    def is_masked(self):
+        """
+        Returns whether the data of this column still consists of integers or
+        booleans. Setting values that do not fit in them upcasts the data to
+        floats or objects, which can hold empty values themselves.
+
+        """
+
+        return(self.values.empty_value() is None)
+
+    # This function converts this column to a given dtype
+    def convert(self, dtype, column_class, progress=None):
+        """
+        Converts the values of this column to the provided `dtype`, and
+        returns them as a new column of the given `column_class`.
+
+        """
+
+        return(convert_column(
+            [self.get_range(start, min(start+CONVERT_CHUNK_ROWS, len(self)))
+             for start in range(0, len(self), CONVERT_CHUNK_ROWS)],
+            dtype, column_class, progress))
+
+    # This function converts this column to a column without a mask
+    def unmask(self, column_class):
+        """
+        Returns the values of this column as a column of the given
+        `column_class`, in which the empty values are stored as NaN.
+
+        """
+
+        return(column_class.from_array(self.to_array()))
+
+    # This function splits given values into data and a validity mask
+    def _split(self, values):
+        # If no value is valid, use zeros with the dtype of this column
+        data, valid = mask_values(values)
+        if not valid.any():
+            data = np.zeros(len(valid), dtype=self.values.dtype)
+
+        # Return data and valid
+        return(data, valid)
+
+    # This function returns the values in a given range
+    def get_range(self, start, stop):
+        """
+        Returns the values between `start` and `stop` as a
+        :obj:`~numpy.ndarray` object.
+
+        """
+
+        return(unmask_values(self.values.get_range(start, stop),
+                             self.valid.get_range(start, stop)))
+
+    # This function returns the value in a given row
+    def get_value(self, row):
+        """
+        Returns the value in the given `row`.
+
+        """
+
+        if self.valid.get_value(row):
+            return(self.values.get_value(row))
+        else:
+            return(np.nan)
+
+    # This function returns the values in a given set of rows
+    def take(self, rows):
+        """
+        Returns the values in the provided `rows` as a :obj:`~numpy.ndarray`
+        object.
+
+        """
+
+        return(unmask_values(self.values.take(rows), self.valid.take(rows)))
+
+    # This function sets the values in a given range
+    def set_range(self, start, values):
+        """
+        Sets the values starting at `start` to the provided `values`.
+
+        """
+
+        data, valid = self._split(values)
+        self.values.set_range(start, data)
+        self.valid.set_range(start, valid)
+
+    # This function inserts values before a given row
+    def insert(self, row, count, fill_value=None):
+        """
+        Inserts `count` values before the given `row`, which are all set to
+        `fill_value`.
+        If `fill_value` is *None*, the values are empty.
+
+        """
+
+        # Insert the data and whether it is valid
+        if fill_value is None:
+            self.values.insert(row, count, self.values.dtype.type(0))
+            self.valid.insert(row, count, np.False_)
+        else:
+            self.values.insert(row, count, fill_value)
+            self.valid.insert(row, count, np.True_)
+
+    # This function appends given values to the end of this column
+    def extend(self, values):
+        """
+        Appends the provided `values` to the end of this column.
+
+        """
+
+        data, valid = self._split(values)
+        self.values.extend(data)
+        self.valid.extend(valid)
+
+    # This function removes values starting at a given row
+    def delete(self, row, count):
+        """
+        Removes `count` values starting at the given `row`.
+
+        """
+
+        self.values.delete(row, count)
+        self.valid.delete(row, count)
+
+    # This function removes all values indicated by a mask
+    def delete_mask(self, mask):
+        """
+        Removes all values for which the provided boolean `mask` is *True*.
+
+        """
+
+        self.values.delete_mask(mask)
+        self.valid.delete_mask(mask)
+
+    # This function returns the chunks of the data of this column
+    def get_chunks(self):
+        """
+        Returns a list with the data in every chunk of this column, in which
+        empty values are zero.
+
+        """
+
+        return(self.values.get_chunks())
+
+    # This function returns the versions of the chunks of this column
+    def get_chunk_versions(self):
+        """
+        Returns a list with the version of every chunk returned by
+        :meth:`~get_chunks`.
+
+        """
+
+        return(self.values.get_chunk_versions())
+
+    # This function returns the chunks of the data that do not change
+    def freeze_chunks(self):
+        """
+        Returns the chunks of this column like :meth:`~get_chunks`, such that
+        they are not affected by any later changes to this column.
+
+        """
+
+        return(self.values.freeze_chunks())
+
+    # This function returns all values in this column as an array
+    def to_array(self):
+        """
+        Returns all values in this column as a :obj:`~numpy.ndarray` object,
+        in which empty values are NaN.
+
+        """
+
+        return(unmask_values(self.values.to_array(), self.valid.to_array()))
+
+    # This function returns all values in this column as a masked array
+    def to_masked(self):
+        """
+        Returns all values in this column as a masked pandas array.
+
+        """
+
+        return(to_masked(self.values.to_array(), self.valid.to_array()))
+
+
+# %% CLASS DEFINITIONS
+# Define backend that stores every column as chunks of NumPy arrays
+class ColumnarBackend(BaseBackend):
+    # Class attributes
+    NAME = "Columnar"
+
+    # Class used for storing a single column
+    COLUMN = ChunkedColumn
+
+    # Initialize ColumnarBackend class
+    def __init__(self, columns=(), names=(), n_rows=0):
+        # Save provided columns and names
+        self._columns = list(columns)
+        self._names = list(names)
+        self._n_rows = n_rows
+
+    # Define from_frame class method
+    @classmethod
+    def from_frame(cls, data_frame):
+        # Wrap every column of the data frame in a chunked column
+        # Categorical columns are stored dictionary-encoded, and columns with
+        # a nullable dtype with a validity mask
+        columns = [cls._create_column(
+            column.array if(is_category(column.dtype) or
+                            is_nullable(column.dtype))
+            else column.to_numpy())
+            for _, column in data_frame.items()]
+
+        # Create backend
+        return(cls(columns, data_frame.columns, len(data_frame)))
+
+    # This function creates a column holding given values
+    @classmethod
+    def _create_column(cls, values):
+        # If values is a categorical, create a dictionary-encoded column
+        if isinstance(values, pd.Categorical):
+            return(DictionaryColumn.from_values(values, cls.COLUMN))
+
+        # If values is a masked array, create a nullable column
+        if is_nullable(values.dtype):
+            return(MaskedColumn.from_values(values, cls.COLUMN))
+
+        # Else, wrap the values in a regular column
+        return(cls.COLUMN.from_array(values))
+
+    # Define row_count method
+    def row_count(self):
+        # Return row count
+        if self._columns:
+            return(self._n_rows)
+        else:
+            return(0)
+
+    # Define column_count method
+    def column_count(self):
+        return(len(self._columns))
+
+    # Define column_names method
+    def column_names(self):
+        return(list(self._names))
+
+    # Override column_name method
+    def column_name(self, col):
+        return(self._names[col])
+
+    # Define set_column_names method
+    def set_column_names(self, names):
+        self._names = list(names)
+
+    # Define column_dtype method
+    def column_dtype(self, col):
+        return(self._columns[col].dtype)
+
+    # Define set_column_dtype method
+    def set_column_dtype(self, col, dtype, progress=None):
+        # If the column must be dictionary-encoded, encode its values
+        column = self._columns[col]
+        # Nullable columns are encoded without promoting their integers
+        if is_category(dtype):
+            if isinstance(column, MaskedColumn):
+                self._columns[col] = DictionaryColumn.from_values(
+                    column.to_masked(), self.COLUMN, progress)
+            elif not isinstance(column, DictionaryColumn):
+                self._columns[col] = DictionaryColumn.from_values(
+                    column.to_array(), self.COLUMN, progress)
+
+        # Else, if the column is dictionary-encoded or nullable, convert it
+        # into a new column
+        elif isinstance(column, (DictionaryColumn, MaskedColumn)):
+            self._columns[col] = column.convert(dtype, self.COLUMN, progress)
+
+        # Else, if the column becomes nullable, convert it into a new column
+        # Otherwise, convert the column itself
+        else:
+            chunks = split_chunks(column.to_array())
+            if is_nullable(get_conversion_dtype(chunks, dtype)):
+                self._columns[col] = convert_column(chunks, dtype, self.COLUMN,
+                                                    progress)
+            else:
+                column.astype(dtype, progress)
+
+    # Define set_column method
+    def set_column(self, col, values):
+        self._columns[col] = self._create_column(values)
+
+    # Define get_column method
+    def get_column(self, col):
+        return(self._columns[col].to_array())
+
+    # Override copy_column method
+    # Chunks shared with the array are copied before they are modified
+    def copy_column(self, col):
+        # Dictionary-encoded and nullable columns are copied as categoricals
+        # and masked arrays
+        if isinstance(self._columns[col], (DictionaryColumn, MaskedColumn)):
+            return(super().copy_column(col))
+
+        # Return the values of the column
+        return(self.get_column(col))
+
+    # Override get_chunks method
+    def get_chunks(self, col):
+        return(self._columns[col].get_chunks())
+
+    # Override get_chunk_versions method
+    def get_chunk_versions(self, col):
+        return(self._columns[col].get_chunk_versions())
+
+    # Override freeze_chunks method
+    def freeze_chunks(self, col):
+        return(self._columns[col].freeze_chunks())
+
+    # Override get_categories method
+    def get_categories(self, col):
+        # Return the categories if the column is dictionary-encoded
+        column = self._columns[col]
+        if isinstance(column, DictionaryColumn):
+            return(column.dictionary.categories())
+        else:
+            return(None)
+
+    # Override get_codes method
+    def get_codes(self, col):
+        return(self._columns[col].codes.to_array())
+
+    # Override get_validity method
+    def get_validity(self, col):
+        # Return the validity mask if the column is nullable
+        column = self._columns[col]
+        if isinstance(column, MaskedColumn):
+            return(column.valid.to_array())
+        else:
+            return(None)
+
+    # Override get_masked method
+    def get_masked(self, col):
+        # Return the masked array if the column is nullable
+        column = self._columns[col]
+        if isinstance(column, MaskedColumn):
+            return(column.to_masked())
+        else:
+            return(None)
+
+    # This function makes a column nullable if it must hold empty values
+    def _make_nullable(self, col, values=None):
+        """
+        Makes the column with index `col` nullable if it cannot hold empty
+        values itself, and the provided `values` that are about to be stored
+        in it contain empty values. If `values` is *None*, empty values are
+        always about to be stored. Returns the column.
+
+        """
+
+        # Check if the column cannot hold the empty values
+        column = self._columns[col]
+        if((column.empty_value() is None) and
+           (values is None or pd.isna(values).any())):
+            column = MaskedColumn.from_column(column, self.COLUMN)
+            self._columns[col] = column
+
+        # Return column
+        return(column)
+
+    # This function removes the mask of a column that no longer needs it
+    def _check_masked(self, col):
+        """
+        Replaces the nullable column with index `col` by a column without a
+        validity mask if its data was upcast to a dtype that can hold empty
+        values itself.
+
+        """
+
+        # Replace the column if it no longer needs its mask
+        column = self._columns[col]
+        if isinstance(column, MaskedColumn) and not column.is_masked():
+            self._columns[col] = column.unmask(self.COLUMN)
+            column.close()
+
+    # Define get_block method
+    def get_block(self, row, col, n_rows, n_cols):
+        return([column.get_range(row, row+n_rows)
+                for column in self._columns[col:col+n_cols]])
+
+    # Define set_block method
+    def set_block(self, row, col, block):
+        # Loop over all columns in the block and set their values
+        for i, values in zip(range(col, self.column_count()), block):
+            self._make_nullable(i, values).set_range(row, values)
+            self._check_masked(i)
+
+    # Override get_rows method
+    def get_rows(self, rows, col, n_cols):
+        return([column.take(rows) for column in self._columns[col:col+n_cols]])
+
+    # Override get_value method
+    def get_value(self, row, col):
+        return(self._columns[col].get_value(row))
+
+    # Define insert_rows method
+    def insert_rows(self, row, count):
+        # Insert the rows into every column
+        # Columns that cannot hold empty values become nullable
+        for i in range(self.column_count()):
+            self._make_nullable(i).insert(row, count)
+
+        # Update the number of rows
+        self._n_rows += count
+
+    # Override append_frame method
+    def append_frame(self, data_frame):
+        # Append the values of every column
+        for i, (_, values) in enumerate(data_frame.items()):
+            values = (values.array if is_nullable(values.dtype)
+                      else values.to_numpy())
+            self._make_nullable(i, values).extend(values)
+            self._check_masked(i)
+
+        # Update the number of rows
+        self._n_rows += len(data_frame)
+
+    # Define remove_rows method
+    def remove_rows(self, row, count):
+        # Remove the rows from every column
+        for column in self._columns:
+            column.delete(row, count)
+
+        # Update the number of rows
+        self._n_rows -= count
+
+    # Override remove_rows_mask method
+    def remove_rows_mask(self, mask):
+        # Remove the rows from every column
+        mask = np.asarray(mask, dtype=bool)
+        for column in self._columns:
+            column.delete_mask(mask)
+
+        # Update the number of rows
+        self._n_rows -= int(np.count_nonzero(mask))
+
+    # Define insert_columns method
+    def insert_columns(self, col, names):
+        # Create an empty column for every name
+        self._columns[col:col] = [self.COLUMN.full(self._n_rows)
+                                  for _ in names]
+        self._names[col:col] = names
+
+    # Define remove_columns method
+    def remove_columns(self, col, count):
+        del self._columns[col:col+count]
+        del self._names[col:col+count]
+
+    # Override clear_columns method
+    def clear_columns(self, col, count):
+        # Replace every column with an empty one
+        # Dictionary-encoded columns stay encoded, with an empty dictionary
+        # Integer and boolean columns become nullable, keeping their dtype
+        for i in range(col, col+count):
+            dtype = self._columns[i].dtype
+            if isinstance(self._columns[i], DictionaryColumn):
+                self._columns[i] = DictionaryColumn.full(self._n_rows,
+                                                         self.COLUMN)
+            elif(isinstance(self._columns[i], MaskedColumn) or
+                 dtype.kind in 'biu'):
+                self._columns[i] = MaskedColumn.full(
+                    self._n_rows, getattr(dtype, 'numpy_dtype', dtype),
+                    self.COLUMN)
+            else:
+                dtype = dtype if dtype.kind in 'fOM' else np.float64
+                self._columns[i] = self.COLUMN.full(self._n_rows, None, dtype)
+
+
+# %% FUNCTION DEFINITIONS
+# This function concatenates the values of several chunks
+def join_chunks(chunks, dtype):
+    """
+    Concatenates the provided `chunks` of values with the given `dtype`, and
+    returns them as a single :obj:`~numpy.ndarray` object.
+
+    If all chunks are constant and hold the same value, a constant array is
+    returned instead, such that reading rows that were never set does not
+    allocate any memory.
+
+    """
+
+    # If all chunks hold the same value, return a constant array
+    if all(map(is_constant, chunks)):
+        values = np.array([chunk[0] for chunk in chunks if len(chunk)],
+                          dtype=dtype)
+        empty = pd.isna(values)
+        if(values == values[0]).all() or empty.all():
+            return(constant_array(sum(map(len, chunks)), values[0], dtype))
+
+    # Else, concatenate the chunks
+    return(np.concatenate(chunks))
+
+
+# This function creates an empty column for values of a given dtype
+def empty_column(dtype, column_class):
+    """
+    Creates a new empty column of the given `column_class` that can hold
+    values of the provided `dtype`, and returns it.
+
+    Nullable dtypes create a :class:`~MaskedColumn`.
+
+    """
+
+    # Create the column
+    if is_nullable(dtype):
+        return(MaskedColumn(column_class(dtype.numpy_dtype),
+                            column_class(bool)))
+    else:
+        return(column_class(dtype))
+
+
+# This function converts chunks of values into a new column
+def convert_column(chunks, dtype, column_class, progress=None):
+    """
+    Converts the provided `chunks` of values to the provided `dtype` with
+    :func:`~guipy.plugins.data_table.backends.convert_chunks`, and returns
+    them as a new column of the given `column_class`.
+
+    If the conversion fails, no column is created.
+
+    """
+
+    # Convert the values chunk by chunk into a new column
+    column = None
+    try:
+        for values in convert_chunks(chunks, dtype, progress):
+            # Append the chunk to the new column, creating it if required
+            if column is None:
+                column = empty_column(values.dtype, column_class)
+            column.extend(values)
+
+    # If the conversion fails, release the new column and reraise
+    except Exception:
+        if column is not None:
+            column.close()
+        raise
+
+    # If there are no values, create the new column directly
+    if column is None:
+        dtype = pd.Series([], dtype=dtype).dtype
+        column = empty_column(
+            dtype if(isinstance(dtype, np.dtype) or is_nullable(dtype))
+            else np.dtype(object), column_class)
+
+    # Return column
+    return(column)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Backends Core
+=============
+Collects all the registered storage backends for data tables into a single
+dict.
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from importlib import import_module
+import os
+from os import path
+
+# Package imports
+from sortedcontainers import SortedDict as sdict
+
+# All declaration
+__all__ = ['BACKENDS', 'DEFAULT_BACKEND', 'get_backend', 'import_backends',
+           'register_backend', 'set_default_backend']
+
+
+# %% GLOBALS
+# Define dict of data table backends
+BACKENDS = sdict()
+
+# Define the name of the backend that is used by default
+DEFAULT_BACKEND = 'Columnar'
+
+
+# %% FUNCTION DEFINITIONS
+# This function registers a data table backend
+def register_backend(backend_class):
+    """
+    Registers a provided data table backend `backend_class` for use in
+    *GuiPy*.
+
+    All data table backends must be registered with this function in order to
+    be used.
+
+    Parameters
+    ----------
+    backend_class : \
+        :class:`~guipy.plugins.data_table.backends.BaseBackend` subclass
+        The backend class to use for storing the data of a data table.
+
+    """
+
+    # Register the backend
+    BACKENDS[backend_class.NAME] = backend_class
+
+
+# This function imports all pre-defined backends and registers them
+def import_backends():
+    """
+    Imports and registers all pre-defined data table backends for use in
+    *GuiPy*.
+
+    """
+
+    # Obtain the path to this directory
+    dirpath = path.dirname(__file__)
+
+    # Obtain a list of all files in this directory
+    filenames = next(os.walk(dirpath))[2]
+
+    # Only keep the files that are Python modules
+    filenames = [filename for filename in filenames
+                 if filename.endswith('.py')]
+
+    # Remove __init__.py, base.py and core.py
+    filenames.remove('__init__.py')
+    filenames.remove('base.py')
+    filenames.remove('core.py')
+
+    # Loop over all modules and import their Backend class
+    for filename in filenames:
+        # Obtain full module name
+        modname = "%s.%s" % (__package__, filename[:-3])
+
+        # Import this module
+        mod = import_module(modname)
+
+        # Register everything in __all__ as a backend
+        for prop in mod.__all__:
+            backend = getattr(mod, prop)
+            register_backend(backend)
+
+
+# This function sets the backend that is used by default
+def set_default_backend(name):
+    """
+    Sets the data table backend that is used by default to the backend that
+    was registered with the provided `name`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the backend that must be used by default.
+
+    """
+
+    # Check that this backend exists
+    get_backend(name)
+
+    # Set it as the default backend
+    global DEFAULT_BACKEND
+    DEFAULT_BACKEND = name
+
+
+# This function returns the backend class registered with a given name
+def get_backend(name=None):
+    """
+    Returns the data table backend class that was registered with the provided
+    `name`.
+
+    Optional
+    --------
+    name : str or None. Default: None
+        The name of the backend that is requested.
+        If *None*, :attr:`~DEFAULT_BACKEND` is used.
+
+    Returns
+    -------
+    backend_class : \
+        :class:`~guipy.plugins.data_table.backends.BaseBackend` subclass
+        The backend class that is registered with `name`.
+
+    """
+
+    # If no backends have been registered yet, import them
+    if not BACKENDS:
+        import_backends()
+
+    # If name is None, use the default backend
+    if name is None:
+        name = DEFAULT_BACKEND
+
+    # Return the requested backend class
+    return(BACKENDS[name])
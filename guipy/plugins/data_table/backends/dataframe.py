@@ -0,0 +1,608 @@
+# -*- coding: utf-8 -*-
+
+"""
+DataFrame Backend
+=================
+
+"""
+
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import (
+    CATEGORY_DTYPE, BaseBackend, ConversionError, convert_categories,
+    convert_chunks, convert_values, find_invalid_values, is_category,
+    is_nullable, mask_values, nullable_dtype, split_chunks, to_masked,
+    unmask_values)
+from guipy.plugins.data_table.backends.base import (
+    CODES_DTYPE, CONVERT_CHUNK_ROWS, can_store, new_versions)
+
+# All declaration
+__all__ = ['DataFrameBackend']
+
+
+# %% GLOBALS
+# Whether pandas copies data before modifying it if it is shared (pandas>=3.0)
+COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+
+# %% HELPER DEFINITIONS
+# Define class that refers to a chunk of a column that does not change
+class FrozenChunk(object):
+    """
+    Refers to a range of values of a :obj:`~pandas.Series` object that shares
+    its data with a data frame, which pandas copies before modifying it
+    (copy-on-write) as long as this chunk exists.
+
+    Chunks of categorical columns hold the codes of their values, and chunks
+    of nullable columns hold their data.
+
+    """
+
+    # Initialize FrozenChunk class
+    def __init__(self, series, start, stop):
+        # Save the series and the range of values
+        self._series = series
+        self._start = start
+        self._stop = stop
+
+    # Override __len__ to return the number of values in this chunk
+    def __len__(self):
+        return(self._stop-self._start)
+
+    # This function loads the values of this chunk
+    def load(self):
+        """
+        Returns the values of this chunk as a :obj:`~numpy.ndarray` object.
+
+        """
+
+        # Obtain the values of this chunk
+        values = self._series.iloc[self._start:self._stop]
+
+        # Return the values, or their codes or data if they are categorical
+        # or nullable
+        if is_category(values.dtype):
+            return(values.cat.codes.to_numpy(dtype=CODES_DTYPE))
+        elif is_nullable(values.dtype):
+            return(mask_values(values.array)[0])
+        else:
+            return(values.to_numpy())
+
+
+# %% CLASS DEFINITIONS
+# Define backend that stores all data in a single pandas DataFrame
+class DataFrameBackend(BaseBackend):
+    """
+    Backend that stores all columns in a single :obj:`~pandas.DataFrame`
+    object.
+
+    Unlike the other backends, this backend stores empty regions of columns
+    like any other values, such that inserting many empty rows or columns
+    allocates all of their cells. The
+    :class:`~guipy.plugins.data_table.widgets.DataTableModel` class therefore
+    moves its data to the 'Columnar' backend before inserting very many
+    empty cells.
+
+    Every column is split into chunks of
+    :attr:`~guipy.plugins.data_table.backends.base.CONVERT_CHUNK_ROWS` rows,
+    whose versions are renewed whenever any of their rows is modified or
+    moved, such that saving the data again only has to write the chunks that
+    were modified (see :meth:`~get_chunk_versions`).
+
+    """
+
+    # Class attributes
+    NAME = "DataFrame"
+    IMPLICIT_EMPTY = False
+
+    # Initialize DataFrameBackend class
+    def __init__(self, data_frame=None):
+        # If data_frame is None, initialize an empty data frame
+        if data_frame is None:
+            data_frame = pd.DataFrame([])
+
+        # Save provided data_frame
+        self._data = data_frame
+
+        # Initialize the versions of the chunks of all columns
+        n_chunks = self._chunk_count()
+        self._versions = [new_versions(n_chunks)
+                          for _ in range(self.column_count())]
+
+    # Define from_frame class method
+    @classmethod
+    def from_frame(cls, data_frame):
+        return(cls(data_frame))
+
+    # Define row_count method
+    def row_count(self):
+        # Return row count
+        if self._data.empty:
+            return(0)
+        else:
+            return(self._data.shape[0])
+
+    # Define column_count method
+    def column_count(self):
+        return(self._data.shape[1])
+
+    # This function returns the number of chunks every column is split into
+    def _chunk_count(self):
+        return(-(-self.row_count()//CONVERT_CHUNK_ROWS))
+
+    # This function renews the versions of the chunks holding given rows
+    def _modify(self, cols, start=0, stop=None):
+        """
+        Renews the versions of the chunks of the columns with indices in
+        `cols` that hold any of the rows from `start` to `stop`.
+        If `stop` is *None*, the versions of all chunks from `start` onward
+        are renewed, as their rows have moved.
+
+        """
+
+        # Determine the chunks that must be renewed
+        n_chunks = self._chunk_count()
+        first = start//CONVERT_CHUNK_ROWS
+        last = n_chunks if stop is None else -(-stop//CONVERT_CHUNK_ROWS)
+        last = max(first, min(last, n_chunks))
+
+        # Renew them, adding or removing chunks at the end if required
+        for col in cols:
+            versions = self._versions[col][:n_chunks]
+            versions.extend(new_versions(n_chunks-len(versions)))
+            versions[first:last] = new_versions(last-first)
+            self._versions[col] = versions
+
+    # Define column_names method
+    def column_names(self):
+        return(list(self._data.columns))
+
+    # Override column_name method
+    def column_name(self, col):
+        return(self._data.columns[col])
+
+    # Define set_column_names method
+    def set_column_names(self, names):
+        self._data.columns = names
+
+    # Define column_dtype method
+    def column_dtype(self, col):
+        return(self._data.dtypes.iloc[col])
+
+    # Define set_column_dtype method
+    def set_column_dtype(self, col, dtype, progress=None):
+        # If the column must be dictionary-encoded, make it categorical
+        series = self._data.iloc[:, col]
+        if is_category(dtype):
+            if not is_category(series.dtype):
+                self._data.isetitem(col, to_categorical(series))
+                self._modify([col])
+            return
+
+        # If the column is categorical, only convert its categories
+        if is_category(series.dtype):
+            codes = series.cat.codes.to_numpy()
+            values = convert_categories(series.cat.categories.to_numpy(
+                dtype=object), codes, dtype)[codes]
+            self._data.isetitem(col, pd.Series(
+                values, index=self._data.index, dtype=values.dtype,
+                copy=False))
+            self._modify([col])
+            return
+
+        # Convert the values of this column only
+        values = self.get_column(col)
+        chunks = list(convert_chunks(split_chunks(values), dtype, progress))
+
+        # Replace the column with the converted values, keeping their dtype
+        values = (concat_values(chunks) if chunks
+                  else convert_values(values, dtype))
+        self._data.isetitem(col, pd.Series(
+            values, index=self._data.index, dtype=values.dtype, copy=False))
+        self._modify([col])
+
+    # Define set_column method
+    def set_column(self, col, values):
+        # Categoricals and masked arrays are stored as they are
+        if not(isinstance(values, pd.Categorical) or
+               is_nullable(values.dtype)):
+            values = np.asarray(values)
+        self._data.isetitem(col, pd.Series(
+            values, index=self._data.index, dtype=values.dtype, copy=False))
+        self._modify([col])
+
+    # Define get_column method
+    def get_column(self, col):
+        return(to_values(self._data.iloc[:, col]))
+
+    # Override get_chunks method
+    def get_chunks(self, col):
+        # Categorical columns are split into the chunks of their codes, and
+        # nullable columns into the chunks of their data
+        dtype = self._data.dtypes.iloc[col]
+        if is_category(dtype):
+            return(split_chunks(self.get_codes(col)))
+        elif is_nullable(dtype):
+            return(split_chunks(mask_values(self._data.iloc[:, col].array)[0]))
+        else:
+            return(super().get_chunks(col))
+
+    # Override get_chunk_versions method
+    def get_chunk_versions(self, col):
+        return(list(self._versions[col]))
+
+    # Override freeze_chunks method
+    def freeze_chunks(self, col):
+        # If pandas does not copy shared data before modifying it, copy it
+        if not COPY_ON_WRITE:
+            return(super().freeze_chunks(col))
+
+        # Else, refer to the chunks of the current values of the column
+        series = self._data.iloc[:, col]
+        n_rows = len(series)
+        return([FrozenChunk(series, i, min(i+CONVERT_CHUNK_ROWS, n_rows))
+                for i in range(0, n_rows, CONVERT_CHUNK_ROWS)])
+
+    # Override get_categories method
+    def get_categories(self, col):
+        # Return the categories if the column is categorical
+        dtype = self._data.dtypes.iloc[col]
+        if is_category(dtype):
+            return(dtype.categories.to_numpy(dtype=object))
+        else:
+            return(None)
+
+    # Override get_codes method
+    def get_codes(self, col):
+        return(self._data.iloc[:, col].cat.codes.to_numpy(dtype=CODES_DTYPE))
+
+    # Override get_categorical method
+    def get_categorical(self, col):
+        # Return the values if the column is categorical
+        series = self._data.iloc[:, col]
+        if is_category(series.dtype):
+            return(series.array)
+        else:
+            return(None)
+
+    # Override get_validity method
+    def get_validity(self, col):
+        # Return the validity mask if the column is nullable
+        series = self._data.iloc[:, col]
+        if is_nullable(series.dtype):
+            return(mask_values(series.array)[1])
+        else:
+            return(None)
+
+    # Override get_masked method
+    def get_masked(self, col):
+        # Return the values if the column is nullable
+        series = self._data.iloc[:, col]
+        if is_nullable(series.dtype):
+            return(series.array)
+        else:
+            return(None)
+
+    # This function makes a column nullable if it must hold empty values
+    def _make_nullable(self, col, values=None):
+        """
+        Makes the column with index `col` nullable if it holds integers or
+        booleans, and the provided `values` that are about to be stored in it
+        contain empty values. If `values` is *None*, empty values are always
+        about to be stored.
+
+        """
+
+        # Convert the column if it cannot hold the empty values
+        series = self._data.iloc[:, col]
+        if(isinstance(series.dtype, np.dtype) and
+           (series.dtype.kind in 'biu') and
+           (values is None or pd.isna(values).any())):
+            self._data.isetitem(col, series.astype(
+                nullable_dtype(series.dtype)))
+            self._modify([col])
+
+    # This function adds all new values of a categorical column as categories
+    def _add_categories(self, col, values):
+        # Determine which values are not a category yet
+        series = self._data.iloc[:, col]
+        values = pd.unique(pd.Series(values, dtype=object).dropna())
+        values = values[~pd.Index(values).isin(series.cat.categories)]
+
+        # Add these values as categories
+        if len(values):
+            self._data.isetitem(col, series.cat.add_categories(values))
+
+        # Return the new dtype of this column
+        return(self._data.dtypes.iloc[col])
+
+    # Define get_block method
+    def get_block(self, row, col, n_rows, n_cols):
+        # Obtain the requested block
+        block = self._data.iloc[row:row+n_rows, col:col+n_cols]
+
+        # Return it as a list of column arrays
+        return([to_values(column) for _, column in block.items()])
+
+    # Define set_block method
+    def set_block(self, row, col, block):
+        # Loop over all columns in the block and set their values
+        for i, values in enumerate(block, col):
+            values = np.asarray(values)
+
+            # If the column is categorical, add the new values as categories
+            # Else, if the column cannot hold these values, upcast it first
+            self._make_nullable(i, values)
+            dtype = self._data.dtypes.iloc[i]
+            if is_category(dtype):
+                self._add_categories(i, values)
+            else:
+                self._upcast(i, values)
+
+            # Set the values
+            self._data.iloc[row:row+len(values), i] = values
+            self._modify([i], row, row+len(values))
+
+    # This function upcasts a column that cannot hold given values
+    def _upcast(self, col, values):
+        """
+        Converts the column with index `col` to a dtype that can hold the
+        provided `values` if it cannot hold them yet.
+
+        Nullable columns are upcast through the dtype of their data.
+
+        """
+
+        # Obtain the values that are not empty
+        dtype = self._data.dtypes.iloc[col]
+        if is_nullable(dtype):
+            values, valid = mask_values(values)
+            values = values[valid]
+        numpy_dtype = getattr(dtype, 'numpy_dtype', dtype)
+        if not isinstance(numpy_dtype, np.dtype) or not len(values):
+            return
+
+        # If the column can hold the values, return
+        if can_store(values, numpy_dtype):
+            return
+
+        # Determine the dtype that can hold the values and convert the column
+        if(values.dtype.kind in 'OSU' or numpy_dtype.kind not in 'biuf'):
+            dtype = object
+        else:
+            dtype = np.result_type(numpy_dtype, values.dtype)
+            if(is_nullable(self._data.dtypes.iloc[col]) and
+               dtype.kind in 'biu'):
+                dtype = nullable_dtype(dtype)
+        series = self._data.iloc[:, col]
+        self._data.isetitem(col, pd.Series(
+            to_values(series), index=series.index, copy=False).astype(dtype))
+        self._modify([col])
+
+    # Override get_value method
+    def get_value(self, row, col):
+        # Empty values of nullable columns are returned as NaN
+        value = self._data.iat[row, col]
+        return(np.nan if value is pd.NA else value)
+
+    # Override set_value method
+    def set_value(self, row, col, value):
+        # If the column is categorical, add the value as a category
+        # Else, make sure that the column can hold the value
+        if is_category(self._data.dtypes.iloc[col]):
+            self._add_categories(col, [value])
+        else:
+            self._make_nullable(col, [value])
+            self._upcast(col, np.asarray([value]))
+
+        # Set the value
+        self._data.iat[row, col] = value
+        self._modify([col], row, row+1)
+
+    # Define insert_rows method
+    # Vaex: df.concat
+    def insert_rows(self, row, count):
+        # Create dataframe with the required shape
+        # All empty cells are allocated, as pandas cannot store them lazily
+        insert_df = pd.DataFrame(np.full((count, self.column_count()), np.nan),
+                                 columns=self._data.columns)
+
+        # Categorical columns must stay categorical, and integer and boolean
+        # columns become nullable
+        # Other columns that can hold empty values keep their dtype
+        for i in range(self.column_count()):
+            self._make_nullable(i)
+            dtype = self._data.dtypes.iloc[i]
+            if isinstance(dtype, np.dtype) and (dtype.kind in 'fmM'):
+                insert_df.isetitem(i, insert_df.iloc[:, i].astype(dtype))
+        self._match_categories(insert_df)
+        self._match_nullable(insert_df)
+
+        # Concatenate the current dataframe and insert_df
+        self._data = pd.concat([self._data[:row], insert_df, self._data[row:]],
+                               ignore_index=True)
+        self._modify(range(self.column_count()), row)
+
+    # Override append_frame method
+    def append_frame(self, data_frame):
+        # Use the column names of this backend for the appended rows
+        # Categorical columns must stay categorical
+        data_frame = data_frame.set_axis(self._data.columns, axis=1)
+        for i, (_, values) in enumerate(data_frame.items()):
+            self._make_nullable(i, values)
+        self._match_categories(data_frame)
+        self._match_nullable(data_frame)
+
+        # Concatenate the current dataframe and data_frame
+        row = self.row_count()
+        self._data = pd.concat([self._data, data_frame], ignore_index=True)
+        self._modify(range(self.column_count()), row)
+
+    # This function converts the columns of a data frame to categoricals
+    def _match_categories(self, data_frame):
+        """
+        Converts all columns of the provided `data_frame` that are categorical
+        in this backend to the same categorical dtype in place, adding all
+        their values as categories to this backend.
+
+        Data frames can only be concatenated with this backend without losing
+        its categoricals if their categories are equal.
+
+        """
+
+        # Convert every column that is categorical in this backend
+        for i, dtype in enumerate(self._data.dtypes):
+            if is_category(dtype):
+                values = data_frame.iloc[:, i]
+                dtype = self._add_categories(i, values.to_numpy())
+                data_frame.isetitem(i, values.astype(dtype))
+
+    # This function converts the columns of a data frame to nullable dtypes
+    def _match_nullable(self, data_frame):
+        """
+        Converts all columns of the provided `data_frame` that are nullable
+        in this backend to the same nullable dtype in place, upcasting the
+        columns of this backend first if they cannot hold their values.
+
+        Otherwise, concatenating them with this backend would promote its
+        nullable columns to floats.
+
+        """
+
+        # Convert every column that is nullable in this backend
+        for i in range(self.column_count()):
+            if is_nullable(self._data.dtypes.iloc[i]):
+                values = data_frame.iloc[:, i]
+                self._upcast(i, values)
+                dtype = self._data.dtypes.iloc[i]
+                if is_nullable(dtype):
+                    data_frame.isetitem(i, values.astype(dtype))
+
+    # Define remove_rows method
+    def remove_rows(self, row, count):
+        # Create mask of all rows that must be removed
+        mask = np.zeros(self.row_count(), dtype=bool)
+        mask[row:row+count] = True
+
+        # Remove the rows
+        self.remove_rows_mask(mask)
+
+    # Override remove_rows_mask method
+    def remove_rows_mask(self, mask):
+        # Take all rows that must be kept
+        mask = np.asarray(mask, dtype=bool)
+        self._data = self._data[~mask]
+        self._data.reset_index(drop=True, inplace=True)
+
+        # All chunks from the first removed row onward have changed
+        removed = np.flatnonzero(mask)
+        if len(removed):
+            self._modify(range(self.column_count()), int(removed[0]))
+
+    # Override clear_rows method
+    def clear_rows(self, row, count):
+        # Integer and boolean columns become nullable
+        for i in range(self.column_count()):
+            self._make_nullable(i)
+        self._data.iloc[row:row+count] = np.nan
+        self._modify(range(self.column_count()), row, row+count)
+
+    # Define insert_columns method
+    # Vaex: df.add_column
+    def insert_columns(self, col, names):
+        # Create all columns at once and concatenate them with the others
+        # All empty cells are allocated, as pandas cannot store them lazily
+        index = self._data.index
+        insert_df = pd.DataFrame(np.full((len(index), len(names)), np.nan),
+                                 index=index, columns=names)
+        self._data = pd.concat([self._data.iloc[:, :col], insert_df,
+                                self._data.iloc[:, col:]], axis=1)
+        n_chunks = self._chunk_count()
+        self._versions[col:col] = [new_versions(n_chunks) for _ in names]
+
+    # Define remove_columns method
+    # Vaex: df.drop
+    def remove_columns(self, col, count):
+        # Take all columns that must be kept
+        mask = np.ones(self.column_count(), dtype=bool)
+        mask[col:col+count] = False
+        self._data = self._data.iloc[:, mask]
+        del self._versions[col:col+count]
+
+    # Override clear_columns method
+    def clear_columns(self, col, count):
+        # Integer and boolean columns become nullable
+        for i in range(col, col+count):
+            self._make_nullable(i)
+        self._data.iloc[:, col:col+count] = np.nan
+        self._modify(range(col, col+count))
+
+    # Override to_frame method
+    def to_frame(self):
+        return(self._data)
+
+
+# %% FUNCTION DEFINITIONS
+# This function converts a series to a categorical series
+def to_categorical(series):
+    """
+    Returns the provided `series` converted to a categorical
+    :obj:`~pandas.Series` object.
+
+    Raises
+    ------
+    ConversionError
+        If any value cannot be dictionary-encoded, as it is not hashable.
+
+    """
+
+    # Try to convert the series
+    try:
+        return(series.astype(CATEGORY_DTYPE))
+
+    # If that fails, determine which values could not be converted
+    except TypeError as error:
+        raise ConversionError(str(error), find_invalid_values(
+            series.to_numpy(), CATEGORY_DTYPE))
+
+
+# This function returns the values of a series as an array
+def to_values(series):
+    """
+    Returns the values of the provided `series` as a :obj:`~numpy.ndarray`
+    object, in which the empty values of nullable columns are NaN (see
+    :func:`~guipy.plugins.data_table.backends.unmask_values`).
+
+    """
+
+    # Nullable columns are unmasked
+    if is_nullable(series.dtype):
+        return(unmask_values(*mask_values(series.array)))
+    else:
+        return(series.to_numpy())
+
+
+# This function concatenates converted chunks of values
+def concat_values(chunks):
+    """
+    Concatenates the provided `chunks` of values, as returned by
+    :func:`~guipy.plugins.data_table.backends.convert_chunks`, and returns
+    them.
+
+    Masked pandas arrays are concatenated through their data and validity
+    masks.
+
+    """
+
+    # Concatenate the data and validity masks of masked arrays
+    if is_nullable(chunks[0].dtype):
+        data, valid = zip(*map(mask_values, chunks))
+        return(to_masked(np.concatenate(data), np.concatenate(valid)))
+
+    # Else, concatenate the chunks themselves
+    return(np.concatenate(chunks))
@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memmap Backend
+==============
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+import tempfile
+from threading import Lock
+from weakref import WeakValueDictionary
+
+# Package imports
+import numpy as np
+import pandas as pd
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import (
+    BaseBackend, constant_array, convert_chunks, is_constant)
+from guipy.plugins.data_table.backends.base import (
+    CONVERT_CHUNK_ROWS, new_versions)
+from guipy.plugins.data_table.backends.columnar import (
+    ChunkedColumn, ColumnarBackend)
+
+# All declaration
+__all__ = ['MemmapBackend']
+
+
+# %% HELPER DEFINITIONS
+# Define class that refers to a frozen block of values of a column
+class FrozenBlock(object):
+    """
+    Refers to a block of values of a :class:`~MemmapColumn` that was returned
+    by :meth:`~MemmapColumn.freeze_chunks`.
+
+    The values are not copied, unless the column is about to modify them
+    while this block still exists, in which case the column calls
+    :meth:`~preserve` first.
+
+    """
+
+    # Initialize FrozenBlock class
+    def __init__(self, lock, values):
+        # Save the lock of the column and a view of the values
+        self._lock = lock
+        self._values = values
+
+    # Override __len__ to return the number of values in this block
+    def __len__(self):
+        return(len(self._values))
+
+    # This function copies the values of this block
+    def preserve(self):
+        """
+        Copies the values of this block, such that the column can modify
+        them.
+
+        """
+
+        with self._lock:
+            self._values = np.array(self._values)
+
+    # This function loads the values of this block
+    def load(self):
+        """
+        Returns a copy of the values of this block.
+
+        This function can be called from any thread.
+
+        """
+
+        with self._lock:
+            return(np.array(self._values))
+
+
+# Define class that stores a single column in a memory-mapped spill file
+class MemmapColumn(ChunkedColumn):
+    """
+    Stores the data of a single data table column in a contiguous
+    :obj:`~numpy.memmap` object, which is backed by a spill file in the
+    :attr:`~MemmapBackend.scratch_dir` directory.
+
+    All reads and writes go through the page cache of the OS, allowing for
+    columns to be much larger than the available memory.
+    The spill file is removed automatically when the column is closed.
+
+    Columns with an object dtype cannot be memory-mapped, and are stored in a
+    regular :obj:`~numpy.ndarray` object instead. Small columns are kept in
+    memory as well until they grow beyond :attr:`~SPILL_BYTES`, such that wide
+    tables do not need an open spill file for every column.
+
+    Every block of values returned by :meth:`~get_chunks` has a version,
+    which changes whenever it is modified. Inserting or removing values
+    modifies all blocks after them. Blocks returned by :meth:`~freeze_chunks`
+    are copied right before they are modified, as long as they are used.
+
+    Values that are inserted after the last stored value and are all equal,
+    like the empty rows added when resizing a data table, are not stored but
+    kept as an implicit tail. The tail is only stored up to the last value
+    that is set, such that resizing a data table does not write to the spill
+    files.
+
+    """
+
+    # Minimum number of values a column can hold
+    MIN_CAPACITY = 2**16
+
+    # Number of bytes a column can hold before it is moved to a spill file
+    SPILL_BYTES = 2**24
+
+    # Number of values that are moved or converted at once
+    BLOCK_SIZE = 2**20
+
+    # Initialize MemmapColumn class
+    def __init__(self, dtype):
+        # Save the dtype of this column
+        self.dtype = np.dtype(dtype)
+
+        # Initialize empty column without a spill file
+        self._length = 0
+        self._file = None
+        self._data = np.empty(0, dtype=self.dtype)
+
+        # Initialize the implicit tail of values that are not stored
+        self._tail = 0
+        self._tail_value = None
+
+        # Initialize the block versions and frozen blocks
+        self._versions = []
+        self._frozen = WeakValueDictionary()
+        self._lock = Lock()
+
+    # This function creates a column that contains a given array
+    @classmethod
+    def from_array(cls, array):
+        """
+        Creates a new column that contains a copy of the provided `array`, and
+        returns it.
+
+        """
+
+        # Convert array to a NumPy array that can be stored in a column
+        array = np.asarray(array)
+        if array.dtype.kind in 'SUV':
+            array = array.astype(object)
+
+        # Create column and append the array to it
+        column = cls(array.dtype)
+        column.extend(array)
+
+        # Return column
+        return(column)
+
+    # Override __len__ to return the number of values in this column
+    def __len__(self):
+        return(self._length+self._tail)
+
+    # This function stores the values of the tail up to a given row
+    def _materialize(self, stop):
+        # Determine how many values of the tail must be stored
+        count = min(stop, len(self))-self._length
+        if(count <= 0):
+            return
+
+        # Store the values
+        self._modify(self._length)
+        self._reserve(self._length+count)
+        self._data[self._length:self._length+count] = self._tail_value
+        self._length += count
+        self._tail -= count
+
+    # This function returns whether a value equals the value of the tail
+    def _is_tail_value(self, value):
+        return(bool(value == self._tail_value) or
+               bool(pd.isna(value) and pd.isna(self._tail_value)))
+
+    # This function makes sure this column can hold a given number of values
+    def _reserve(self, capacity):
+        # If this column is large enough already, return
+        if(capacity <= len(self._data)):
+            return
+
+        # Determine the new capacity, doubling it to make appends cheap
+        capacity = max(capacity, 2*len(self._data), self.MIN_CAPACITY)
+
+        # If this column holds objects or is small, store it in memory
+        if((self.dtype.kind == 'O') or (self._file is None and
+                                        capacity*self.dtype.itemsize <=
+                                        self.SPILL_BYTES)):
+            data = np.empty(capacity, dtype=self.dtype)
+            data[:self._length] = self._data[:self._length]
+
+        # Else, extend the spill file and map it into memory again
+        else:
+            # Create the spill file if this column does not have one yet
+            in_memory = self._file is None
+            if in_memory:
+                self._file = tempfile.TemporaryFile(
+                    prefix='guipy_', suffix='.bin',
+                    dir=MemmapBackend.scratch_dir)
+
+            # Map the spill file with its new size
+            data = np.memmap(self._file, dtype=self.dtype, mode='r+',
+                             shape=(capacity,)).view(np.ndarray)
+
+            # If the values were stored in memory, move them to the spill file
+            if in_memory:
+                data[:self._length] = self._data[:self._length]
+
+        # Save the new data
+        self._data = data
+
+    # This function moves values within this column
+    def _move(self, src, dst, count):
+        # Determine the order in which blocks must be moved
+        blocks = range(0, count, self.BLOCK_SIZE)
+        blocks = reversed(blocks) if(dst > src) else blocks
+
+        # Move all values block by block, to keep memory usage bounded
+        for i in blocks:
+            n = min(self.BLOCK_SIZE, count-i)
+            self._data[dst+i:dst+i+n] = self._data[src+i:src+i+n]
+
+    # This function prepares the blocks containing a range for modification
+    # This function must be called before the values are modified
+    def _modify(self, start, stop=None):
+        # If stop is None, all blocks starting at start are modified
+        first = start//CONVERT_CHUNK_ROWS
+        if stop is None:
+            last = None
+            del self._versions[first:]
+
+        # Else, only the blocks containing the range are modified
+        else:
+            last = -(-stop//CONVERT_CHUNK_ROWS)
+            self._versions[first:last] = new_versions(
+                len(self._versions[first:last]))
+
+        # Preserve all frozen blocks that are modified
+        for i in list(self._frozen.keys()):
+            if(i >= first and (last is None or i < last)):
+                block = self._frozen.pop(i, None)
+                if block is not None:
+                    block.preserve()
+
+    # This function releases the storage of this column
+    def close(self):
+        """
+        Releases the storage of this column and removes its spill file.
+
+        Arrays that were returned by :meth:`~to_array` stay valid.
+
+        """
+
+        # Release the data and spill file
+        # Frozen blocks keep using the released data, which is not modified
+        self._length = 0
+        self._tail = 0
+        self._data = np.empty(0, dtype=self.dtype)
+        self._versions = []
+        self._frozen = WeakValueDictionary()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Override astype method
+    def astype(self, dtype, progress=None):
+        # Split the values into blocks, storing the tail first
+        self._materialize(len(self))
+        blocks = [self._data[i:min(i+self.BLOCK_SIZE, self._length)]
+                  for i in range(0, self._length, self.BLOCK_SIZE)]
+
+        # Convert the values block by block into a new column
+        column = None
+        try:
+            for values in convert_chunks(blocks, dtype, progress):
+                # Append the block to the new column, creating it if required
+                if column is None:
+                    column = MemmapColumn(values.dtype)
+                column.extend(values)
+
+        # If the conversion fails, remove the new column and reraise
+        except Exception:
+            if column is not None:
+                column.close()
+            raise
+
+        # If this column is empty, create the new column directly
+        if column is None:
+            dtype = pd.Series([], dtype=dtype).dtype
+            column = MemmapColumn(
+                dtype if isinstance(dtype, np.dtype) else object)
+
+        # Replace the storage of this column with the new column
+        self.close()
+        self.dtype = column.dtype
+        self._length = column._length
+        self._file = column._file
+        self._data = column._data
+
+    # Override get_range method
+    def get_range(self, start, stop):
+        # If the range is stored, return a view of it
+        stop = max(start, min(stop, len(self)))
+        if(stop <= self._length):
+            return(self._data[start:stop])
+
+        # Else, add the values in the tail
+        tail = constant_array(stop-max(start, self._length), self._tail_value,
+                              self.dtype)
+        if(start >= self._length):
+            return(tail)
+        else:
+            return(np.concatenate([self._data[start:self._length], tail]))
+
+    # Override get_value method
+    def get_value(self, row):
+        return(self._data[row] if(row < self._length) else self._tail_value)
+
+    # Override take method
+    def take(self, rows):
+        # If there is no tail, take the values from the stored values
+        if not self._tail:
+            return(self._data[:self._length][rows])
+
+        # Else, take the stored values and use the tail for all others
+        rows = np.asarray(rows, dtype=np.int64)
+        values = np.full(len(rows), self._tail_value, dtype=self.dtype)
+        stored = (rows < self._length)
+        values[stored] = self._data[rows[stored]]
+        return(values)
+
+    # Override set_range method
+    def set_range(self, start, values):
+        # Convert values to the proper dtype
+        values = self._coerce(values)
+
+        # If the values are constant and equal to the tail, nothing changes
+        if(start >= self._length and is_constant(values) and len(values) and
+           self._is_tail_value(values[0])):
+            return
+
+        # Else, set the values
+        self._materialize(start+len(values))
+        self._modify(start, start+len(values))
+        self._data[start:start+len(values)] = values
+
+    # Override insert method
+    def insert(self, row, count, fill_value=None):
+        # If count is zero, return
+        if not count:
+            return
+
+        # Obtain the value the new cells must be filled with
+        fill_value = self._get_fill_value(fill_value)
+
+        # If the values are inserted into a tail holding the same value, or at
+        # the end of a column without a tail, add them to the tail
+        if(row >= self._length and
+           (not self._tail or self._is_tail_value(fill_value))):
+            self._tail_value = fill_value
+            self._tail += count
+            return
+
+        # Shift all values after row and fill in the new values
+        self._materialize(row)
+        self._modify(row)
+        self._reserve(self._length+count)
+        self._move(row, row+count, self._length-row)
+        self._data[row:row+count] = fill_value
+        self._length += count
+
+    # Override extend method
+    def extend(self, values):
+        # Convert values to the proper dtype
+        values = self._coerce(values)
+
+        # If the values are constant, add them to the tail if possible
+        if(is_constant(values) and len(values) and
+           (not self._tail or self._is_tail_value(values[0]))):
+            self._tail_value = values[0]
+            self._tail += len(values)
+            return
+
+        # Else, append the values to the end of this column
+        self._materialize(len(self))
+        self._modify(self._length)
+        self._reserve(self._length+len(values))
+        self._data[self._length:self._length+len(values)] = values
+        self._length += len(values)
+
+    # Override delete method
+    def delete(self, row, count):
+        # Remove the values that are in the tail
+        n_stored = max(0, min(count, self._length-row))
+        self._tail -= count-n_stored
+        if not n_stored:
+            return
+
+        # Shift all values after the removed values over them
+        self._modify(row)
+        self._move(row+n_stored, row, self._length-row-n_stored)
+        self._length -= n_stored
+
+    # Override delete_mask method
+    def delete_mask(self, mask):
+        # Remove the values that are in the tail
+        mask = np.asarray(mask, dtype=bool)
+        self._tail -= int(np.count_nonzero(mask[self._length:]))
+        mask = mask[:self._length]
+
+        # If no stored values must be removed, return
+        if not mask.any():
+            return
+
+        # Compress all values starting at the first value that is removed
+        start = write = int(np.argmax(mask))
+        self._modify(start)
+        for i in range(start, self._length, self.BLOCK_SIZE):
+            block = slice(i, min(i+self.BLOCK_SIZE, self._length))
+            values = self._data[block][~mask[block]]
+            self._data[write:write+len(values)] = values
+            write += len(values)
+
+        # Set the new length of this column
+        self._length = write
+
+    # Override get_chunks method
+    def get_chunks(self):
+        return([self.get_range(i, i+CONVERT_CHUNK_ROWS)
+                for i in range(0, len(self), CONVERT_CHUNK_ROWS)])
+
+    # Override get_chunk_versions method
+    def get_chunk_versions(self):
+        # Give all blocks that do not have a version yet a new version
+        n_blocks = -(-len(self)//CONVERT_CHUNK_ROWS)
+        self._versions.extend(new_versions(n_blocks-len(self._versions)))
+
+        # Return the versions of all blocks
+        return(self._versions[:n_blocks])
+
+    # Override freeze_chunks method
+    def freeze_chunks(self):
+        # Obtain a frozen block for every block of values
+        chunks = []
+        for i, start in enumerate(range(0, len(self), CONVERT_CHUNK_ROWS)):
+            # If this block contains values of the tail, it is not stored
+            values = self.get_range(start, start+CONVERT_CHUNK_ROWS)
+            if(start+len(values) > self._length):
+                chunks.append(values)
+                continue
+
+            # Reuse the frozen block if it was not modified since
+            block = self._frozen.get(i)
+            if block is None:
+                block = self._frozen[i] = FrozenBlock(self._lock, values)
+            chunks.append(block)
+
+        # Return chunks
+        return(chunks)
+
+    # Override to_array method
+    def to_array(self):
+        """
+        Returns all values in this column as a contiguous, read-only
+        :obj:`~numpy.ndarray` object.
+
+        The returned array is a view of the spill file of this column, so no
+        data is copied. Modifying this column may modify the returned array
+        as well. If no value of this column is stored, a constant array is
+        returned instead.
+
+        """
+
+        # If no value is stored, return the values of the tail
+        if not self._length:
+            return(self.get_range(0, len(self)))
+
+        # Create read-only view of all values in this column and return it
+        self._materialize(len(self))
+        array = self._data[:self._length].view()
+        array.flags.writeable = False
+        return(array)
+
+
+# %% CLASS DEFINITIONS
+# Define backend that stores every column in a memory-mapped spill file
+class MemmapBackend(ColumnarBackend):
+    """
+    Backend that stores every column in a :obj:`~numpy.memmap` object backed
+    by a spill file, such that data tables can be larger than the available
+    memory.
+
+    Reading a column does not copy its data, which allows for plots and
+    exporters to use the data directly from the page cache.
+
+    """
+
+    # Class attributes
+    NAME = "Memmap"
+
+    # Class used for storing a single column
+    COLUMN = MemmapColumn
+
+    # Directory in which spill files are created (None for system default)
+    scratch_dir = None
+
+    # Override close method
+    def close(self):
+        # Close all columns
+        for column in self._columns:
+            column.close()
+
+    # Override set_column_dtype method
+    def set_column_dtype(self, col, dtype, progress=None):
+        # Close the column if it is replaced
+        column = self._columns[col]
+        super().set_column_dtype(col, dtype, progress)
+        if self._columns[col] is not column:
+            column.close()
+
+    # Override set_column method
+    def set_column(self, col, values):
+        # Close the column that is replaced
+        column = self._columns[col]
+        super().set_column(col, values)
+        column.close()
+
+    # Override copy_column method
+    # The array of a column is a view of its spill file, so it must be copied
+    def copy_column(self, col):
+        return(BaseBackend.copy_column(self, col))
+
+    # Override remove_columns method
+    def remove_columns(self, col, count):
+        # Close all columns that are removed
+        for column in self._columns[col:col+count]:
+            column.close()
+
+        # Remove the columns
+        super().remove_columns(col, count)
+
+    # Override clear_columns method
+    def clear_columns(self, col, count):
+        # Obtain the columns that are cleared
+        columns = self._columns[col:col+count]
+
+        # Replace these columns with empty ones and close them
+        super().clear_columns(col, count)
+        for column in columns:
+            column.close()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Config
+=================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from ast import literal_eval
+from os import path
+import tempfile
+
+# Package imports
+from sortedcontainers import SortedDict as sdict
+
+# GuiPy imports
+from guipy import layouts as GL, plugins as GP, widgets as GW
+from guipy.plugins.data_table.autosave import AutoSaver
+from guipy.plugins.data_table.backends import (
+    BACKENDS, DEFAULT_BACKEND, get_backend, import_backends,
+    set_default_backend)
+from guipy.plugins.data_table.widgets import UndoStack
+
+# All declaration
+__all__ = ['StorageConfigPage']
+
+
+# %% CLASS DEFINITIONS
+# Define config page for setting how data tables store their data
+class StorageConfigPage(GP.PluginConfigPage):
+    # Define class attributes
+    NAME = 'Storage'
+
+    # This function sets up the Storage config page
+    def init(self):
+        # Make sure that all backends have been registered
+        if not BACKENDS:
+            import_backends()
+
+        # Create layout
+        layout = GL.QVBoxLayout(self)
+
+        # Create 'Storage' group box
+        storage_group = GW.QGroupBox("Storage")
+        layout.addWidget(storage_group)
+        storage_layout = GL.QFormLayout(storage_group)
+
+        # Add combobox for setting the default backend
+        backend_box = GW.QComboBox()
+        backend_box.addItems(BACKENDS.keys())
+        backend_box.setToolTip("Backend that is used for storing the data of "
+                               "new data tables")
+        self.add_config_entry('backend', backend_box)
+        storage_layout.addRow("Default backend", backend_box)
+
+        # Add spinbox for setting the file size that requires memory-mapping
+        memmap_box = GW.QSpinBox()
+        memmap_box.setRange(0, 9999999)
+        memmap_box.setSuffix(" MiB")
+        memmap_box.setSpecialValueText('never')
+        memmap_box.setToolTip("Files larger than this are imported into data "
+                              "tables whose columns are memory-mapped to "
+                              "spill files in the scratch directory")
+        self.add_config_entry('memmap_threshold', memmap_box)
+        storage_layout.addRow("Memory-map imports above", memmap_box)
+
+        # Add line edit for setting the scratch directory
+        scratch_box = GW.QLineEdit()
+        scratch_box.setPlaceholderText(tempfile.gettempdir())
+        scratch_box.setToolTip("Directory in which the spill files of "
+                               "memory-mapped data tables are stored. If "
+                               "empty, the system default is used")
+        self.add_config_entry('scratch_dir', scratch_box)
+        storage_layout.addRow("Scratch directory", scratch_box)
+
+        # Add spinbox for setting the memory limit of the undo history
+        undo_box = GW.QSpinBox()
+        undo_box.setRange(0, 9999999)
+        undo_box.setSuffix(" MiB")
+        undo_box.setSpecialValueText('disabled')
+        undo_box.setToolTip("Maximum amount of memory the undo history of a "
+                            "data table may use. When exceeded, the oldest "
+                            "changes can no longer be undone")
+        self.add_config_entry('undo_limit', undo_box)
+        storage_layout.addRow("Undo history limit", undo_box)
+
+        # Add spinbox for setting the interval between autosaves
+        autosave_box = GW.QSpinBox()
+        autosave_box.setRange(0, 9999)
+        autosave_box.setSuffix(" min")
+        autosave_box.setSpecialValueText('never')
+        autosave_box.setToolTip("Interval at which all modified data tables "
+                                "are saved in the background, such that they "
+                                "can be recovered if GuiPy is not closed "
+                                "properly")
+        self.add_config_entry('autosave_interval', autosave_box)
+        storage_layout.addRow("Autosave every", autosave_box)
+
+        # Add a stretcher
+        layout.addStretch()
+
+    # This function parses and processes a config section, and returns it
+    def decode_config(self, section_dict):
+        # Initialize empty dict of parsed config values
+        config_dict = sdict()
+
+        # Decode all values in section_dict
+        for key, value in section_dict.items():
+            # Add all values to config dict using literal_eval
+            config_dict[key] = literal_eval(value)
+
+        # Return config_dict
+        return(config_dict)
+
+    # This function returns a dict containing the default config values
+    def get_default_config(self):
+        return({'backend': DEFAULT_BACKEND,
+                'memmap_threshold': 1024,
+                'scratch_dir': '',
+                'undo_limit': 256,
+                'autosave_interval': 5})
+
+    # This function returns its config section, as required by config parser
+    def encode_config(self, config_dict):
+        # Initialize empty dict of section config values
+        section_dict = sdict()
+
+        # Loop over all arguments in config and encode them in
+        for key, value in config_dict.items():
+            section_dict[key] = '{!r}'.format(value)
+
+        # Return section_dict
+        return(section_dict)
+
+    # This function applies the currently stored config
+    def apply_config(self, config_dict):
+        # Set the default backend
+        set_default_backend(config_dict['backend'])
+
+        # Set the scratch directory if it exists, or use the system default
+        scratch_dir = config_dict['scratch_dir']
+        get_backend('Memmap').scratch_dir = (
+            scratch_dir if path.isdir(scratch_dir) else None)
+
+        # Set the memory limit of the undo history of new data tables
+        UndoStack.memory_limit = config_dict['undo_limit']*2**20
+
+        # Set the interval between autosaves
+        AutoSaver.interval = config_dict['autosave_interval']
+        autosaver = getattr(self.plugin, 'autosaver', None)
+        if autosaver is not None:
+            autosaver.setInterval(AutoSaver.interval)
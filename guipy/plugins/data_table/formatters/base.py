@@ -10,10 +10,11 @@ Base Formatters
 # %% IMPORTS
 # Built-in imports
 import abc
+import os
 
 
 # All declaration
-__all__ = ['BaseFormatter']
+__all__ = ['BaseFormatter', 'ChunkStream']
 
 
 # %% CLASS DEFINITIONS
@@ -25,6 +26,10 @@ class BaseFormatter(object, metaclass=abc.ABCMeta):
 
     """
 
+    # Number of rows in the first and all subsequent chunks of a stream
+    FIRST_CHUNK_ROWS = 1000
+    CHUNK_ROWS = 100000
+
     # File type property (e.g., 'Portable Document Format')
     @property
     def type(self):
@@ -93,3 +98,103 @@ class BaseFormatter(object, metaclass=abc.ABCMeta):
         # Raise NotImplementedError if only super() was called
         raise NotImplementedError("This method must be overridden in the "
                                   "BaseFormatter subclass!")
+
+    # This function imports a file in chunks
+    def streamer(self, filepath, parent=None):
+        """
+        Imports a %(ext)s-file with the provided `filepath` as a stream of
+        :obj:`~pandas.DataFrame` objects.
+
+        The first chunk should be small (about :attr:`~FIRST_CHUNK_ROWS` rows),
+        such that a data table can be shown as soon as possible.
+        All chunks after the first are read in a separate thread. If the
+        returned iterable has a `progress` method, like
+        :class:`~ChunkStream`, it is used to show how much has been read.
+        By default, the entire file is imported with :meth:`~importer` and
+        returned as a single chunk.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the %(ext)s-file.
+
+        Optional
+        --------
+        parent : :obj:`~PyQt5.QtWidgets.QWidget` object or None. Default: None
+            The parent that will be maintaining the data.
+            If *None*, no parent will be used.
+
+        Yields
+        ------
+        data_frame : :obj:`~pandas.DataFrame` object
+            The data frame that contains the next chunk of read-in data.
+
+        """
+
+        # Yield the entire file as a single chunk
+        yield self.importer(filepath, parent)
+
+
+# Define class for streams of chunks that are read from a file
+class ChunkStream(object):
+    """
+    Iterator over the :obj:`~pandas.DataFrame` chunks that are read from a
+    file, which keeps track of how much of the file has been read.
+
+    """
+
+    # Initialize ChunkStream class
+    def __init__(self, filepath, read_chunks):
+        """
+        Initialize an instance of the :class:`~ChunkStream` class.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the file that must be read.
+        read_chunks : callable
+            Function that takes the binary file object of `filepath` and
+            returns an iterator over the chunks that are read from it.
+
+        """
+
+        # Open the file and obtain its size
+        self._file = open(filepath, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+
+        # Obtain the chunks that are read from the file
+        self._chunks = iter(read_chunks(self._file))
+
+    # Make this object an iterator
+    def __iter__(self):
+        return(self)
+
+    # Return the next chunk
+    def __next__(self):
+        return(next(self._chunks))
+
+    # This function returns the fraction of the file that has been read
+    def progress(self):
+        """
+        Returns the fraction of the file that has been read so far.
+
+        """
+
+        # If the file is closed or empty, it has been read entirely
+        if self._file.closed or not self._size:
+            return(1.0)
+
+        # Else, return the position in the file relative to its size
+        return(min(1.0, self._file.tell()/self._size))
+
+    # This function closes the file
+    def close(self):
+        """
+        Stops reading chunks and closes the file.
+
+        """
+
+        # Close the chunks if possible and close the file
+        if hasattr(self._chunks, 'close'):
+            self._chunks.close()
+        self._file.close()
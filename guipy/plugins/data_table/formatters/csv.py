@@ -8,17 +8,46 @@ CSV Formatter
 
 
 # %% IMPORTS
+# Built-in imports
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from io import BytesIO, StringIO
+import os
+
 # Package imports
 import numpy as np
 import pandas as pd
 
 # GuiPy imports
-from guipy.plugins.data_table.formatters import BaseFormatter
+from guipy.plugins.data_table.formatters import BaseFormatter, ChunkStream
 
 # All declaration
 __all__ = ['CSVFormatter']
 
 
+# %% GLOBALS
+# Number of bytes at the start of a CSV-file that are used for sniffing it
+SNIFF_BYTES = 2**16
+
+# Delimiters that a CSV-file may use
+DELIMITERS = ',;\t|'
+
+# Markers of missing values that pandas does not recognize by default
+NA_MARKERS = ['-', '--', '?', '.', 'missing', 'Missing', 'MISSING', 'none',
+              'nil', 'NIL']
+
+# Number of threads that are used for parsing large CSV-files
+PARSE_THREADS = os.cpu_count() or 1
+
+# Number of bytes in every block of a large CSV-file that is parsed at once
+PARSE_BLOCK_BYTES = 2**24
+
+# Dtypes that columns of every kind are read with
+# Integer columns may contain missing values and are thus inferred by pandas
+READ_DTYPES = {'float': 'float64', 'str': object}
+
+
 # %% CLASS DEFINITIONS
 # Define Formatter for .csv-files
 class CSVFormatter(BaseFormatter):
@@ -26,29 +55,407 @@ class CSVFormatter(BaseFormatter):
     TYPE = "Comma-Separated Values"
     EXTS = ['.csv']
 
+    # Size in bytes above which CSV-files are parsed in parallel
+    PARALLEL_BYTES = 2**26
+
     # Define the export to csv function
     def exporter(self, data_table, filepath):
         # Obtain the data in the data table
-        data = data_table.model._data
+        data = data_table.model.dataFrame()
 
         # Export it as a CSV-file
         data.to_csv(filepath, index=False)
 
+    # This function returns the keyword arguments for reading a CSV-file
+    def get_read_kwargs(self, file):
+        """
+        Sniffs a sample from the start of the provided binary `file` object,
+        and returns the keyword arguments for reading it with
+        :func:`~pandas.read_csv`.
+
+        The file is rewound afterward, such that it can be read with the
+        returned keyword arguments.
+
+        """
+
+        # Read a sample from the start of the file and rewind it
+        sample = file.read(SNIFF_BYTES)
+        file.seek(0)
+
+        # Sniff the sample
+        return(sniff_csv(sample, len(sample) < SNIFF_BYTES))
+
     # Define the import from csv function
     def importer(self, filepath, parent=None):
-        # Read in the first 2 lines of the CSV-file twice
-        df_header = pd.read_csv(filepath, skipinitialspace=True, nrows=2)
-        df_no_header = pd.read_csv(filepath, skipinitialspace=True, nrows=2,
-                                   header=None)
-
-        # Read in the CSV-file as a data frame depending on if it has a header
-        if np.all(df_header.dtypes.values == df_no_header.dtypes.values):
-            # If corresponding columns share dtypes, then it has no header
-            data_frame = pd.read_csv(filepath, skipinitialspace=True,
-                                     header=None)
-        else:
-            # Else, it must have a header
-            data_frame = pd.read_csv(filepath, skipinitialspace=True)
-
-        # Return data_frame
-        return(data_frame)
+        # Read in the CSV-file as a single data frame
+        with open(filepath, 'rb') as file:
+            return(next(self.read_chunks(file), pd.DataFrame([])))
+
+    # Define the streaming import from csv function
+    def streamer(self, filepath, parent=None):
+        # Read the CSV-file in chunks, keeping track of how much was read
+        return(ChunkStream(filepath, lambda file: self.read_chunks(
+            file, self.FIRST_CHUNK_ROWS, self.CHUNK_ROWS)))
+
+    # This function reads the chunks of an opened CSV-file
+    def read_chunks(self, file, first_rows=None, chunk_rows=None):
+        """
+        Reads the provided binary `file` object as a CSV-file, yielding its
+        rows as :obj:`~pandas.DataFrame` chunks.
+
+        The file is sniffed with :meth:`~get_read_kwargs`, after which it is
+        read with the sniffed dtypes, such that pandas does not have to infer
+        them. If the rest of the file does not fit these dtypes, all rows that
+        were not yielded yet are read again while inferring their dtypes.
+
+        Files larger than :attr:`~PARALLEL_BYTES` are split into blocks of
+        rows that are parsed in parallel with :func:`~read_blocks`, in which
+        case every chunk holds a single block instead.
+
+        Optional
+        --------
+        first_rows, chunk_rows : int or None. Default: None
+            The number of rows in the first and all subsequent chunks.
+            If *None*, all remaining rows are read as a single chunk.
+
+        """
+
+        # Sniff how the file must be read
+        kwargs = self.get_read_kwargs(file)
+
+        # If the file is large, parse it in blocks on a pool of threads
+        if(os.fstat(file.fileno()).st_size > self.PARALLEL_BYTES and
+           PARSE_THREADS > 1):
+            # If the file is read in chunks, yield every block as a chunk
+            blocks = read_blocks(file, kwargs)
+            if chunk_rows is not None:
+                yield from blocks
+                return
+
+            # Else, combine all blocks, unless they disagree on which columns
+            # hold text, as that is only known after reading the entire file
+            blocks = list(blocks)
+            if not has_mixed_columns(blocks):
+                yield pd.concat(blocks, ignore_index=True)
+                return
+
+            # In that case, read the file again without splitting it
+            del blocks
+            file.seek(0)
+
+        # Else, read the file with the sniffed dtypes
+        dtype = kwargs.pop('dtype')
+
+        n_rows = 0
+        try:
+            with pd.read_csv(file, iterator=True, dtype=dtype,
+                             **kwargs) as reader:
+                for data_frame in iter_chunks(reader, first_rows, chunk_rows):
+                    n_rows += len(data_frame)
+                    yield data_frame
+
+        # If they do not fit, read the file again while inferring its dtypes
+        except (ValueError, TypeError, OverflowError):
+            file.seek(0)
+            with pd.read_csv(file, iterator=True, **kwargs) as reader:
+                # Skip all rows that were read already
+                while n_rows:
+                    n_rows -= len(reader.get_chunk(
+                        min(n_rows, chunk_rows or n_rows)))
+
+                # Yield all remaining rows
+                yield from iter_chunks(reader, chunk_rows, chunk_rows)
+
+
+# %% FUNCTION DEFINITIONS
+# This function checks if chunks of a CSV-file disagree on their columns
+def has_mixed_columns(data_frames):
+    """
+    Returns whether any column holds text in some of the provided
+    `data_frames`, but not in all of them.
+
+    """
+
+    # Determine which columns hold numbers or booleans in every data frame
+    numeric = [[pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes]
+               for df in data_frames if len(df)]
+
+    # Return whether any column differs between the data frames
+    return(any(len(set(column)) > 1 for column in zip(*numeric)))
+
+
+# This function finds the end of the last complete row in a CSV-file block
+def find_row_end(block):
+    """
+    Returns the index of the last line break in the provided `block` of
+    bytes from a CSV-file that ends a row, or -1 if there is none.
+
+    The block must start outside of quotes. Line breaks inside quoted values,
+    for which an odd number of quotes precede them, do not end a row.
+
+    """
+
+    # Search backward for a line break that is preceded by an even number of
+    # quotes
+    quotes = block.count(b'"')
+    end = block.rfind(b'\n')
+    while(end >= 0 and (quotes-block.count(b'"', end)) % 2):
+        end = block.rfind(b'\n', 0, end)
+
+    # Return end
+    return(end)
+
+
+# This function infers the kind of values in a column of a CSV-file
+def infer_kind(values):
+    """
+    Infers the kind of the provided `values`, which were read from a column
+    of a CSV-file as strings, and returns it.
+
+    Parameters
+    ----------
+    values : :obj:`~pandas.Series` object
+        The values in the column, with missing values set to NaN.
+
+    Returns
+    -------
+    kind : {'int', 'float', 'bool', 'str'} or None
+        The kind of values in the column.
+        If the column only holds missing values, *None* is returned.
+    markers : list of str
+        The strings in :attr:`~NA_MARKERS` that mark missing values in the
+        column. This list is only non-empty for numerical columns.
+
+    """
+
+    # Remove all missing values, including the ones with common markers
+    present = values.dropna().astype(str)
+    is_marker = present.isin(NA_MARKERS)
+    markers = sorted(set(present[is_marker]))
+    present = present[~is_marker]
+
+    # If no values are left, the kind is unknown
+    if not len(present):
+        return(None, [])
+
+    # If all values are booleans, the kind is bool
+    if present.str.lower().isin(['true', 'false']).all():
+        return('bool', [])
+
+    # If any value is not a number, the kind is str
+    numbers = pd.to_numeric(present, errors='coerce')
+    if numbers.isna().any():
+        return('str', [])
+
+    # Else, return whether the values are integers or floats
+    return('int' if(numbers.dtype.kind == 'i') else 'float', markers)
+
+
+# This function yields the chunks of a CSV-file reader
+def iter_chunks(reader, first_rows, chunk_rows):
+    """
+    Yields all chunks of the provided pandas CSV-file `reader`, with
+    `first_rows` rows in the first chunk and `chunk_rows` rows in all others.
+
+    """
+
+    # Keep yielding chunks until the file is exhausted
+    rows = first_rows
+    while True:
+        try:
+            yield reader.get_chunk(rows)
+        except StopIteration:
+            break
+        rows = chunk_rows
+
+
+# This function parses a block of a CSV-file
+def parse_block(block, kwargs):
+    """
+    Parses the provided `block` of bytes from a CSV-file with
+    :func:`~pandas.read_csv` using the provided `kwargs`, and returns it.
+
+    If the block does not fit the dtypes in `kwargs`, it is parsed again
+    while inferring its dtypes.
+
+    """
+
+    # Try to parse the block with the provided dtypes
+    try:
+        return(pd.read_csv(BytesIO(block), **kwargs))
+
+    # If that fails, parse it while inferring its dtypes
+    except (ValueError, TypeError, OverflowError):
+        return(pd.read_csv(BytesIO(block), **{**kwargs, 'dtype': None}))
+
+
+# This function reads a CSV-file in blocks and parses them in parallel
+def read_blocks(file, kwargs):
+    """
+    Reads the provided binary `file` object as a CSV-file in blocks of about
+    :attr:`~PARSE_BLOCK_BYTES` bytes, parses them with :func:`~parse_block`
+    on a pool of :attr:`~PARSE_THREADS` threads, and yields them in order as
+    :obj:`~pandas.DataFrame` objects.
+
+    The first block is small and is parsed right away, such that it can be
+    shown quickly. All other blocks use its column names and only a few are
+    parsed ahead of the block that is yielded.
+
+    Parameters
+    ----------
+    file : file object
+        The binary file object of the CSV-file, positioned at its start.
+    kwargs : dict
+        The keyword arguments for reading the file, as returned by
+        :func:`~sniff_csv`.
+
+    Yields
+    ------
+    data_frame : :obj:`~pandas.DataFrame` object
+        The parsed rows of the next block.
+
+    """
+
+    # Split the file into blocks of rows
+    blocks = split_blocks(file, SNIFF_BYTES, PARSE_BLOCK_BYTES)
+
+    # Parse the first block, which contains the header if there is one
+    data_frame = parse_block(next(blocks, b''), kwargs)
+    yield data_frame
+
+    # Parse all other blocks using the column names of the first block
+    kwargs = {**kwargs, 'header': None, 'names': list(data_frame.columns)}
+    futures = deque()
+    with ThreadPoolExecutor(PARSE_THREADS) as executor:
+        try:
+            # Keep a few blocks ahead of the block that is yielded
+            for block in blocks:
+                futures.append(executor.submit(parse_block, block, kwargs))
+                if(len(futures) >= 2*PARSE_THREADS):
+                    yield futures.popleft().result()
+
+            # Yield all remaining blocks
+            while futures:
+                yield futures.popleft().result()
+
+        # Cancel all blocks that were not parsed yet if reading stops
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+# This function splits a CSV-file into blocks of rows
+def split_blocks(file, first_bytes, block_bytes):
+    """
+    Reads the provided binary `file` object as a CSV-file, and yields blocks
+    of bytes that end at the end of a row.
+
+    The first block holds about `first_bytes` bytes and all others about
+    `block_bytes` bytes. Blocks end at the line breaks given by
+    :func:`~find_row_end`, such that they all start outside of quotes.
+
+    """
+
+    # Read the file until it is exhausted
+    rest = b''
+    size = first_bytes
+    while True:
+        # Read the next part of the file
+        data = file.read(size)
+
+        # If the file is exhausted, yield the remaining rows
+        if not data:
+            if rest:
+                yield rest
+            return
+
+        # Determine the last line break that is not inside quotes
+        block = rest+data
+        end = find_row_end(block)
+
+        # If there is none, read more of the file
+        if(end < 0):
+            rest = block
+            continue
+
+        # Else, yield all rows before it and keep the remainder
+        yield block[:end+1]
+        rest = block[end+1:]
+        size = block_bytes
+
+
+# This function sniffs the start of a CSV-file
+def sniff_csv(sample, complete=True):
+    """
+    Sniffs the provided `sample` from the start of a CSV-file, and returns
+    the keyword arguments for reading the file with :func:`~pandas.read_csv`.
+
+    The delimiter, whether the file has a header, the dtype of every column
+    and the strings that mark missing values are inferred from the sample.
+    The file is assumed to have a header if the first value in any column
+    that holds numbers or booleans is text.
+
+    Parameters
+    ----------
+    sample : bytes
+        The bytes at the start of the CSV-file.
+
+    Optional
+    --------
+    complete : bool. Default: True
+        Whether `sample` holds the entire file. If *False*, its last line is
+        assumed to be incomplete and is ignored.
+
+    Returns
+    -------
+    kwargs : dict
+        The keyword arguments for reading the file. Its `dtype` and
+        `na_values` entries are dicts that use the positions of the columns.
+
+    """
+
+    # Remove the last row of the sample if it may be incomplete
+    if not complete:
+        sample = sample[:find_row_end(sample)+1] or sample
+
+    # Decode the sample
+    text = sample.decode('utf-8', 'replace')
+
+    # Determine the delimiter, using a comma if this is not possible
+    try:
+        sep = csv.Sniffer().sniff(text, DELIMITERS).delimiter
+    except csv.Error:
+        sep = ','
+    kwargs = {'sep': sep, 'skipinitialspace': True}
+
+    # Parse the sample as strings without a header
+    try:
+        rows = pd.read_csv(StringIO(text), header=None, dtype=object,
+                           **kwargs)
+
+    # If that fails, let pandas infer everything
+    except ValueError:
+        return({**kwargs, 'header': 'infer', 'dtype': None, 'na_values': None})
+
+    # Infer the kinds of the values in all columns after the first row
+    kinds = [infer_kind(values.iloc[1:]) for _, values in rows.items()]
+
+    # The file has a header if a first value does not fit its column
+    header = any(
+        kind in ('int', 'float', 'bool') and
+        infer_kind(values.iloc[:1].replace(markers, np.nan))[0] == 'str'
+        for (kind, markers), (_, values) in zip(kinds, rows.items()))
+
+    # If the file has no header, infer the kinds again using all rows
+    if not header:
+        kinds = [infer_kind(values) for _, values in rows.items()]
+
+    # Determine the dtypes and markers of missing values of all columns
+    dtype = {i: READ_DTYPES[kind] for i, (kind, _) in enumerate(kinds)
+             if kind in READ_DTYPES}
+    na_values = {i: markers for i, (_, markers) in enumerate(kinds)
+                 if markers}
+
+    # Return the keyword arguments
+    return({**kwargs, 'header': 0 if header else None, 'dtype': dtype,
+            'na_values': na_values})
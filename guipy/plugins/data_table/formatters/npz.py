@@ -31,12 +31,12 @@ class NPZFormatter(BaseFormatter):
 
     # Define the export to npz function
     def exporter(self, data_table, filepath):
-        # Obtain the data in the data table
-        data = data_table.model._data
+        # Obtain the model of the data table
+        model = data_table.model
 
         # Make a dictionary that contains the data of all columns
-        data_dict = {"(%i, %r)" % (i, name): column.values
-                     for i, (name, column) in enumerate(data.items())}
+        data_dict = {"(%i, %r)" % (i, name): model.dataColumn(i).values
+                     for i, name in enumerate(model.columnNames())}
 
         # Save data table as NumPy Binary Archive
         np.savez(filepath, **data_dict)
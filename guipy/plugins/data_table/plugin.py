@@ -12,13 +12,20 @@ Data Table Plugin
 from os import path
 
 # Package imports
-from qtpy import QtCore as QC, QtWidgets as QW
+from qtpy import QtCore as QC, QtGui as QG, QtWidgets as QW
 
 # GuiPy imports
 from guipy import layouts as GL, plugins as GP, widgets as GW
-from guipy.config import FILE_FILTERS
+from guipy.config import FILE_FILTERS, register_file_format
+from guipy.plugins.data_table.autosave import (
+    AutoSaver, find_sessions, load_session, remove_session)
+from guipy.plugins.data_table.backends import import_backends
+from guipy.plugins.data_table.config import StorageConfigPage
 from guipy.plugins.data_table.formatters import import_formatters, FORMATTERS
-from guipy.plugins.data_table.widgets import DataTableWidget
+from guipy.plugins.data_table.project import (
+    PROJECT_EXT, PROJECT_TYPE, ProjectFile, set_properties, snapshot_table,
+    write_project)
+from guipy.plugins.data_table.widgets import DataTableWidget, ImportList
 from guipy.widgets import set_box_value
 
 # All declaration
@@ -31,6 +38,7 @@ class DataTable(GP.BasePluginWidget):
     # Properties
     TITLE = "Data table"
     LOCATION = QC.Qt.LeftDockWidgetArea
+    CONFIG_PAGES = [*GP.BasePluginWidget.CONFIG_PAGES, StorageConfigPage]
 
     # Initialize DataTable plugin
     def __init__(self, *args, **kwargs):
@@ -42,9 +50,25 @@ class DataTable(GP.BasePluginWidget):
 
     # This function sets up the data table plugin
     def init(self):
-        # Import all DataTable formatters
+        # Import all DataTable backends and formatters
+        import_backends()
         import_formatters()
 
+        # Register the project file format
+        register_file_format(PROJECT_TYPE, [PROJECT_EXT])
+
+        # Initialize the project file and the sections other plugins store in
+        # it, which are given as {name: (get_state, set_state)}
+        self.project = None
+        self.project_sections = {}
+
+        # Create the autosaver of all data tables
+        self.autosaver = AutoSaver(self.get_sections, self)
+        self.autosaver.failed.connect(self.show_autosave_error)
+
+        # Create the list of files that are being imported
+        self.import_list = ImportList(self.add_import_tab, self)
+
         # Create a layout
         layout = GL.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -57,7 +81,7 @@ class DataTable(GP.BasePluginWidget):
 
         # Connect tab widget signals
         tab_widget.tabTextChanged.connect(self.set_tab_name)
-        tab_widget.tabCloseRequested.connect(self.close_tab)
+        tab_widget.tabCloseRequested.connect(self.request_close_tab)
 
         # Add tab widget to layout
         self.tab_widget = tab_widget
@@ -66,6 +90,9 @@ class DataTable(GP.BasePluginWidget):
         # Add all actions to the proper menus and toolbars
         self.add_actions()
 
+        # Add all widgets to the status bar
+        self.add_status_widgets()
+
         # Add a tab to the plugin
         self.add_tab()
 
@@ -74,10 +101,21 @@ class DataTable(GP.BasePluginWidget):
         # Block all signals emitted by the tab widget while removing tabs
         self.tab_widget.blockSignals(True)
 
+        # Stop importing all files that have no tab yet
+        self.import_list.cancel_all()
+
         # Close all tabs
         for index in reversed(range(self.tab_widget.count())):
             self.close_tab(index)
 
+        # Stop autosaving, as the session ended properly
+        self.autosaver.close()
+
+        # Close the project file of this session
+        if self.project is not None:
+            self.project.close()
+            self.project = None
+
         # Call super event
         super().closeEvent(*args, **kwargs)
 
@@ -106,10 +144,9 @@ class DataTable(GP.BasePluginWidget):
         open_tabs_act = GW.QAction(
             self, '&Open...',
             shortcut=QC.Qt.CTRL + QC.Qt.Key_O,
-            tooltip="Open data table",
+            tooltip="Open data tables",
             triggered=self.open_tabs,
             role=GW.QAction.ApplicationSpecificRole)
-        open_tabs_act.setEnabled(False)
         self.MENU_ACTIONS['File'].append(open_tabs_act)
         self.TOOLBAR_ACTIONS['File'].append(open_tabs_act)
 
@@ -133,7 +170,6 @@ class DataTable(GP.BasePluginWidget):
             tooltip="Save current data table",
             triggered=self.save_tab,
             role=GW.QAction.ApplicationSpecificRole)
-        save_tab_act.setEnabled(False)
         self.MENU_ACTIONS['File'].append(save_tab_act)
         self.TOOLBAR_ACTIONS['File'].append(save_tab_act)
 
@@ -144,17 +180,15 @@ class DataTable(GP.BasePluginWidget):
             tooltip="Save current data table as...",
             triggered=self.save_as_tab,
             role=GW.QAction.ApplicationSpecificRole)
-        save_as_tab_act.setEnabled(False)
         self.MENU_ACTIONS['File'].append(save_as_tab_act)
 
         # Add save_all tab action to file menu/toolbar
         save_all_tabs_act = GW.QAction(
             self, 'Sav&e all',
             shortcut=QC.Qt.CTRL + QC.Qt.ALT + QC.Qt.Key_S,
-            tooltip="Save all data tables",
+            tooltip="Save all data tables and figures",
             triggered=self.save_all_tabs,
             role=GW.QAction.ApplicationSpecificRole)
-        save_all_tabs_act.setEnabled(False)
         self.MENU_ACTIONS['File'].append(save_all_tabs_act)
         self.TOOLBAR_ACTIONS['File'].append(save_all_tabs_act)
 
@@ -171,40 +205,234 @@ class DataTable(GP.BasePluginWidget):
         # Add separator to file menu
         self.MENU_ACTIONS['File'].append(None)
 
+    # This function adds all associated widgets to the status bar
+    def add_status_widgets(self):
+        # Create a label showing the statistics of the current column
+        stats_label = GW.QLabel()
+        stats_label.setToolTip("Statistics of the current column")
+        self.stats_label = stats_label
+
+        # Create a progress bar showing how much of the current data table
+        # has been loaded
+        load_bar = QW.QProgressBar()
+        load_bar.setRange(0, 1000)
+        load_bar.setFormat("Loading... %p%")
+        load_bar.setMaximumWidth(200)
+        load_bar.setToolTip("Rows that have been loaded into the current data "
+                            "table")
+        self.load_bar = load_bar
+
+        # If this theme has a 'cancel' icon, use it
+        if QG.QIcon.hasThemeIcon('cancel'):
+            cancel_icon = QG.QIcon.fromTheme('cancel')
+        # Else, use a standard icon
+        else:
+            cancel_icon = self.style().standardIcon(
+                QW.QStyle.SP_DialogCancelButton)
+
+        # Create a toolbutton for stopping loading the current data table
+        cancel_load_but = GW.QToolButton()
+        cancel_load_but.setToolTip("Stop loading the current data table, "
+                                   "keeping all rows loaded so far")
+        cancel_load_but.setIcon(cancel_icon)
+        cancel_load_but.clicked.connect(self.stop_loading_tab)
+        self.cancel_load_but = cancel_load_but
+        self.STATUS_WIDGETS = [stats_label, load_bar, cancel_load_but]
+
+        # Create a timer that updates this label once control returns to the
+        # event loop, such that many changes only cause a single update
+        stats_timer = QC.QTimer(self)
+        stats_timer.setSingleShot(True)
+        stats_timer.setInterval(0)
+        stats_timer.timeout.connect(self.update_stats_label)
+        self.stats_timer = stats_timer
+
+        # Update the widgets whenever another tab is shown
+        self.tab_widget.currentChanged.connect(stats_timer.start)
+        self.tab_widget.currentChanged.connect(self.update_load_bar)
+        self.update_load_bar()
+
+    # This function updates the statistics shown in the status bar
+    @QC.Slot()
+    def update_stats_label(self):
+        # Obtain the current column of the current data table
+        data_table = self.dataTable()
+        if data_table is None:
+            col = -1
+        else:
+            col = data_table.view.currentIndex().column()
+
+        # If there is no current column, show no statistics
+        if(col < 0):
+            set_box_value(self.stats_label, "")
+            return
+
+        # Obtain the name and statistics of this column
+        model = data_table.model
+        name = model.columnName(col)
+        stats = model.columnStatistics(col)
+
+        # Create the text describing these statistics
+        text = "%s: %i values, %i empty" % (
+            name, stats['count'], stats['nan_count'])
+        if stats['mean'] is not None:
+            std = 0 if stats['var'] is None else stats['var']**0.5
+            text += ", min %.6g, max %.6g, mean %.6g, std %.6g" % (
+                stats['min'], stats['max'], stats['mean'], std)
+
+        # Show the text
+        set_box_value(self.stats_label, text)
+
+    # This function updates the loading progress shown in the status bar
+    @QC.Slot()
+    @QC.Slot(int)
+    @QC.Slot(bool)
+    @QC.Slot(float)
+    def update_load_bar(self, *args):
+        # Obtain the current data table
+        data_table = self.dataTable()
+
+        # If it is still being loaded, show its progress
+        if data_table is not None and data_table.model.isFetching():
+            progress = data_table.model.fetchProgress()
+            if(progress < 0):
+                self.load_bar.setRange(0, 0)
+            else:
+                self.load_bar.setRange(0, 1000)
+                self.load_bar.setValue(int(progress*1000))
+            self.load_bar.setVisible(True)
+            self.cancel_load_but.setVisible(True)
+
+        # Else, hide the progress
+        else:
+            self.load_bar.setVisible(False)
+            self.cancel_load_but.setVisible(False)
+
+    # This function stops loading the current data table
+    @QC.Slot()
+    def stop_loading_tab(self):
+        # Stop loading the current data table, keeping all loaded rows
+        data_table = self.dataTable()
+        if data_table is not None:
+            data_table.model.stopFetching()
+
     # This function adds a new data table widget
     @QC.Slot()
-    def add_tab(self, name=None, import_func=None):
+    def add_tab(self, name=None, import_func=None, backend=None):
         # Create a new DataTableWidget
-        data_table = DataTableWidget(self, import_func)
+        data_table = DataTableWidget(self, import_func, backend)
+
+        # Save that this data table is not stored in a project file
+        data_table.project = None
 
         # If name is None, set it to default
         if name is None:
             name = "table_%i" % (self.tab_widget.count())
         data_table.tab_name = name
 
+        # Update the statistics in the status bar whenever the current column
+        # or the data of this data table changes
+        update = (lambda *args: self.stats_timer.start())
+        data_table.view.selectionModel().currentColumnChanged.connect(update)
+        data_table.model.dataChanged.connect(update)
+        data_table.model.rowCountChanged.connect(update)
+        data_table.model.columnCountChanged.connect(update)
+
+        # Update the loading progress whenever rows of this data table are
+        # loaded
+        data_table.model.fetchingChanged.connect(self.update_load_bar)
+        data_table.model.fetchProgressChanged.connect(self.update_load_bar)
+
+        # Autosave this data table whenever it is modified
+        self.autosaver.addTable(data_table)
+
         # Add data_table to the tab widget
         index = self.tab_widget.addTab(data_table, name)
 
         # Switch focus to the new tab
         set_box_value(self.tab_widget, index)
 
+        # Return data_table
+        return(data_table)
+
+    # This function closes a data table widget if the user agrees
+    @QC.Slot(int)
+    def request_close_tab(self, index):
+        # Close the data table if its unsaved changes can be discarded
+        if self.confirm_close([self.dataTable(index)]):
+            self.close_tab(index)
+
     # This function closes a data table widget
-    # TODO: Warn the user about closing a tab if it has unsaved changes
     @QC.Slot(int)
     def close_tab(self, index):
         # Obtain the DataTableWidget object associated with this index
         data_table = self.dataTable(index)
 
-        # Close this data_table
+        # Stop autosaving this data_table and close it
+        self.autosaver.removeTable(data_table)
         data_table.close()
 
+        # Close its project file once the last snapshot no longer reads it
+        if data_table.project is not None:
+            self.autosaver.wait()
+            data_table.project.close()
+            data_table.project = None
+
         # Remove this data_table from the tab widget
         self.tab_widget.removeTab(index)
 
-    # This function opens a data table widget
+    # This function opens data table widgets
     @QC.Slot()
     def open_tabs(self):
-        pass
+        # Open the file opening system
+        filepaths, _ = GW.getOpenFileNames(
+            parent=self,
+            caption="Open data tables",
+            filters=[PROJECT_EXT])
+
+        # Open every project file, informing the user if that fails
+        for filepath in filepaths:
+            try:
+                self.open_project(filepath)
+            except Exception as error:
+                GW.QMessageBox.warning(
+                    self, "Open error",
+                    "The file %r could not be opened: %s" % (filepath, error))
+
+    # This function opens a project file
+    def open_project(self, filepath):
+        """
+        Opens the project file at the provided `filepath`, adding all data
+        tables in it as new tabs and restoring all sections that were saved by
+        other plugins.
+
+        Only the description of the data tables is read. Their values are read
+        from the project file once they are accessed.
+
+        """
+
+        # Open the project file
+        project = ProjectFile(filepath)
+
+        # Add a tab for every data table in the project
+        data_tables = []
+        for i, table in enumerate(project.tables):
+            data_table = self.add_tab(
+                table['name'], lambda model, i=i: project.load_backend(i))
+            project.restore_properties(i, data_table.model)
+            data_tables.append(data_table)
+
+        # Restore all sections of other plugins
+        for name, state in project.sections.items():
+            if name in self.project_sections:
+                self.project_sections[name][1](state, data_tables)
+
+        # If the file solely holds a single data table, it belongs to it
+        if(len(data_tables) == 1 and not project.sections):
+            data_tables[0].project = project
+        # Else, it is the project file of this session
+        else:
+            self.project = project
 
     # This function imports a data table widget
     @QC.Slot()
@@ -215,28 +443,333 @@ class DataTable(GP.BasePluginWidget):
             caption="Import data tables",
             filters=FORMATTERS.keys())
 
-        # Loop over filepaths and make a tab for every entry
+        # Import every file, making a tab for every entry once it is read
         for filepath in filepaths:
-            # Obtain the name and extension of this data table
-            name, ext = path.splitext(path.basename(filepath))
+            ext = path.splitext(filepath)[1]
+            self.import_list.add_file(FORMATTERS[ext].streamer, filepath)
+
+    # This function adds a tab for a file that is being imported
+    def add_import_tab(self, filepath, import_func):
+        """
+        Adds a new tab for the file with the provided `filepath`, streaming
+        the data returned by `import_func` into it.
+
+        The tab is named after the file and uses memory-mapped storage if the
+        file is larger than the 'memmap_threshold' storage option.
+
+        """
+
+        # Obtain the name of this data table
+        name = path.splitext(path.basename(filepath))[0]
+
+        # Obtain the file size above which imports must be memory-mapped
+        threshold = self.get_option('Storage', 'memmap_threshold')*2**20
+
+        # Memory-map this data table if its file is too large
+        if threshold and (path.getsize(filepath) > threshold):
+            backend = 'Memmap'
+        else:
+            backend = None
 
-            # Add a new tab
-            self.add_tab(name, lambda x: FORMATTERS[ext].importer(filepath, x))
+        # Add a new tab, streaming the data into it
+        return(self.add_tab(name, import_func, backend))
 
     # This function saves a data table widget
     @QC.Slot()
     def save_tab(self):
-        pass
+        self.save_table(self.dataTable())
 
     # This function saves a data table widget with chosen name
     @QC.Slot()
     def save_as_tab(self):
-        pass
+        self.save_table_as(self.dataTable())
+
+    # This function saves a data table
+    def save_table(self, data_table):
+        """
+        Saves the provided `data_table` to its project file, asking the user
+        for one if it has none yet, and returns whether it was saved.
+
+        """
+
+        # If the data table has no file yet, ask for one
+        if data_table.project is None:
+            return(self.save_table_as(data_table))
+
+        # Else, save the data table to its file
+        # If its file is written completely, the old file is handed off to it
+        project = self.save_project(data_table.project.filepath, [data_table],
+                                    False, data_table.project)
+        if project is not None:
+            data_table.project = project
+        return(project is not None)
+
+    # This function saves a data table to a chosen file
+    def save_table_as(self, data_table):
+        """
+        Asks the user for the project file the provided `data_table` must be
+        saved to, saves it and returns whether it was saved.
+
+        """
+
+        # Ask for the file to save this data table to
+        name = data_table.tab_name
+        filepath = self.get_project_path("Save data table %r as..." % (name),
+                                         name)
+
+        # If filepath is not empty, save the data table to it
+        # The file it was stored in is handed off to the new file
+        project = filepath and self.save_project(
+            filepath, [data_table], False, data_table.project)
+        if project:
+            data_table.project = project
+        return(bool(project))
 
     # This function saves all data table widgets
     @QC.Slot()
     def save_all_tabs(self):
-        pass
+        """
+        Saves all data tables and the sections of all other plugins to the
+        project file of this session, asking the user for one if there is
+        none yet, and returns whether they were saved.
+
+        """
+
+        # If there is no project file yet, ask for one
+        if self.project is None:
+            filepath = self.get_project_path("Save all data tables to...",
+                                             "project")
+        else:
+            filepath = self.project.filepath
+
+        # If filepath is not empty, save all data tables to it
+        # If the file is written completely, the old file is handed off to it
+        data_tables = [self.dataTable(i)
+                       for i in range(self.tab_widget.count())]
+        project = filepath and self.save_project(filepath, data_tables, True,
+                                                 self.project)
+        if project:
+            self.project = project
+        return(bool(project))
+
+    # This function asks the user for the path of a project file
+    def get_project_path(self, caption, basedir):
+        # Open the file saving system
+        filepath, _ = GW.getSaveFileName(
+            parent=self,
+            caption=caption,
+            basedir=basedir,
+            filters=[PROJECT_EXT])
+
+        # If filepath has no extension, add it
+        if filepath and not path.splitext(filepath)[1]:
+            filepath += PROJECT_EXT
+
+        # Return filepath
+        return(filepath)
+
+    # This function saves data tables to a project file
+    def save_project(self, filepath, data_tables, sections, project=None):
+        """
+        Saves the provided `data_tables` to the project file at the given
+        `filepath`, and returns its :obj:`~ProjectFile` object, or *None* if
+        saving failed.
+
+        If `sections` is *True*, the sections of all other plugins are saved as
+        well. If `project` is the project file that was last written to
+        `filepath`, it is saved incrementally. Otherwise, `project` is the
+        project file the `data_tables` were stored in, which is closed once
+        its chunks have been copied to `filepath` (see
+        :func:`~guipy.plugins.data_table.project.write_project`). If saving
+        fails, the user is informed about it.
+
+        """
+
+        # Make sure that all rows of all data tables have been loaded
+        for data_table in data_tables:
+            data_table.model.fetchAll()
+
+        # Obtain the sections of all other plugins if requested
+        sections = self.get_sections(data_tables) if sections else None
+
+        # Try to save the project file
+        try:
+            project = write_project(
+                filepath, [snapshot_table(data_table.tab_name,
+                                          data_table.model)
+                           for data_table in data_tables], sections, project)
+
+        # If that fails, inform the user
+        except Exception as error:
+            GW.QMessageBox.warning(
+                self, "Save error",
+                "The file %r could not be saved: %s" % (filepath, error))
+            return(None)
+
+        # Else, mark all data tables as saved and return the project file
+        else:
+            for data_table in data_tables:
+                data_table.model.setModified(False)
+            return(project)
+
+    # This function returns the sections of all other plugins
+    def get_sections(self, data_tables):
+        """
+        Returns a dict with the sections of all other plugins that must be
+        stored in a project file holding the provided `data_tables`.
+
+        """
+
+        return({name: get_state(data_tables)
+                for name, (get_state, _) in self.project_sections.items()})
+
+    # This function asks the user what to do with unsaved changes
+    def confirm_close(self, data_tables):
+        """
+        Asks the user whether the unsaved changes of the provided
+        `data_tables` must be saved before they are closed, saving them if
+        requested, and returns whether the data tables can be closed.
+
+        """
+
+        # If no data table has unsaved changes, they can be closed
+        modified = [data_table for data_table in data_tables
+                    if data_table.model.isModified()]
+        if not modified:
+            return(True)
+
+        # Ask the user what to do with the unsaved changes
+        button = GW.QMessageBox.question(
+            self, "Unsaved changes",
+            "The data tables %s have unsaved changes. Do you want to save "
+            "them?" % (", ".join(repr(data_table.tab_name)
+                                 for data_table in modified)),
+            GW.QMessageBox.Save | GW.QMessageBox.Discard |
+            GW.QMessageBox.Cancel, GW.QMessageBox.Save)
+
+        # If the changes must be saved, only close if saving succeeded
+        if(button == GW.QMessageBox.Save):
+            return(all(self.save_table(data_table)
+                       for data_table in modified))
+
+        # Else, close if the changes must be discarded
+        else:
+            return(button == GW.QMessageBox.Discard)
+
+    # Override can_close method
+    def can_close(self):
+        return(self.confirm_close([self.dataTable(i)
+                                   for i in range(self.tab_widget.count())]))
+
+    # This function informs the user that autosaving failed
+    @QC.Slot(str)
+    def show_autosave_error(self, message):
+        GW.QMessageBox.warning(
+            self, "Autosave error",
+            "Autosaving data tables failed and has been disabled for this "
+            "session: %s" % (message))
+
+    # Override recover_sessions method
+    def recover_sessions(self):
+        # Find all sessions that can be recovered
+        sessions = find_sessions()
+        if not sessions:
+            return
+
+        # Ask the user whether they must be recovered
+        button = GW.QMessageBox.question(
+            self, "Recover data tables",
+            "GuiPy was not closed properly. Do you want to recover the data "
+            "tables that were not saved?",
+            GW.QMessageBox.Yes | GW.QMessageBox.No, GW.QMessageBox.Yes)
+
+        # Recover or remove all sessions
+        for dirpath, lock in sessions:
+            # If the sessions must not be recovered, remove this session
+            if(button != GW.QMessageBox.Yes):
+                remove_session(dirpath, lock)
+                continue
+
+            # Try to recover this session, keeping it until it is autosaved
+            try:
+                project = self.recover_session(dirpath)
+            except Exception as error:
+                GW.QMessageBox.warning(
+                    self, "Recovery error",
+                    "The data tables in %r could not be recovered: %s"
+                    % (dirpath, error))
+                remove_session(dirpath, lock)
+            else:
+                self.autosaver.adopt(dirpath, lock, project)
+
+    # This function recovers a session
+    def recover_session(self, dirpath):
+        """
+        Recovers the session in the directory at `dirpath`, adding all data
+        tables in it as new tabs, which are marked as modified, and restoring
+        all sections that were saved by other plugins.
+
+        Returns the snapshot of the session, which the recovered data tables
+        read from until it is closed.
+
+        """
+
+        # Load the session
+        tables, sections, project = load_session(dirpath)
+
+        # Try to add a tab for every data table in the session that was not
+        # closed
+        try:
+            data_tables = []
+            for table in tables:
+                if table is None:
+                    data_tables.append(None)
+                    continue
+                name, backend, (precisions, formulas) = table
+                data_table = self.add_tab(name, lambda model, b=backend: b)
+                set_properties(data_table.model, precisions, formulas)
+                data_table.model.setModified(True)
+                data_tables.append(data_table)
+
+            # Restore all sections of other plugins
+            for name, state in sections.items():
+                if name in self.project_sections:
+                    self.project_sections[name][1](state, data_tables)
+
+        # If that fails, close the snapshot and reraise
+        except Exception:
+            project.close()
+            raise
+
+        # Autosave the recovered data tables in this session
+        self.autosaver.autosave()
+
+        # Return the snapshot
+        return(project)
+
+    # This function registers a section that is stored in project files
+    def register_project_section(self, name, get_state, set_state):
+        """
+        Registers a section with the given `name` that must be stored in all
+        project files that hold all data tables, allowing other plugins to
+        store their state alongside the data tables.
+
+        Parameters
+        ----------
+        name : str
+            The name of the section.
+        get_state : callable
+            Function that is called with the list of all saved
+            :obj:`~guipy.plugins.data_table.widgets.DataTableWidget` objects,
+            and returns the JSON-serializable state of the section.
+            Data tables must be referred to by their index in this list.
+        set_state : callable
+            Function that is called with a state returned by `get_state` and
+            the list of all opened data tables, and restores the section.
+
+        """
+
+        self.project_sections[name] = (get_state, set_state)
 
     # This function exports a data table
     @QC.Slot()
@@ -0,0 +1,880 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Projects
+===================
+Provides the definition of the *GuiPy* project file format, which stores the
+data tables of a session as chunked columns.
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from itertools import repeat
+import json
+import os
+from os import path
+import struct
+import tempfile
+from threading import Lock
+from weakref import WeakSet
+import zlib
+
+# Package imports
+import numpy as np
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import (
+    CategoryDictionary, constant_array, get_backend, is_constant, is_nullable,
+    split_chunks)
+from guipy.plugins.data_table.backends.base import CODES_DTYPE
+from guipy.plugins.data_table.backends.columnar import (
+    DictionaryColumn, MaskedColumn)
+
+# All declaration
+__all__ = ['PROJECT_EXT', 'PROJECT_TYPE', 'ProjectFile', 'set_properties',
+           'snapshot_table', 'write_project']
+
+
+# %% GLOBALS
+# Type and extension of project files
+PROJECT_TYPE = "GuiPy Environment File"
+PROJECT_EXT = '.gpy'
+
+# Header every project file starts with, formatted as (magic, version)
+HEADER = struct.Struct('<8sI')
+HEADER_MAGIC = b'GUIPYPRJ'
+VERSION = 3
+
+# Commit slots following the header, which locate the index of the file
+# Every slot is formatted as (generation, index offset, index size, index
+# checksum), followed by the checksum of the slot itself
+SLOT = struct.Struct('<QQQI')
+SLOT_CHECKSUM = struct.Struct('<I')
+N_SLOTS = 2
+
+# Offset at which the data of a project file starts
+DATA_OFFSET = HEADER.size+N_SLOTS*(SLOT.size+SLOT_CHECKSUM.size)
+
+# Fraction of a project file that must still be used after saving it
+# incrementally, below which the file is written again completely instead
+COMPACT_RATIO = 0.5
+
+# Compression level that is used for all chunks
+COMPRESS_LEVEL = 1
+
+# Number of bytes at the start of a chunk that are compressed to test if the
+# chunk can be compressed, and the ratio the test must achieve
+PROBE_BYTES = 2**15
+PROBE_RATIO = 0.9
+
+
+# %% HELPER DEFINITIONS
+# Define class that refers to a single chunk stored in a project file
+class StoredChunk(object):
+    """
+    Refers to a single chunk of a column in a project file, whose
+    values are only read once they are requested with :meth:`~load`.
+
+    If the project file is closed with :meth:`~ProjectFile.hand_off`, the
+    chunk is moved to another project file, or its stored values are read
+    into memory.
+
+    """
+
+    # Initialize StoredChunk class
+    def __init__(self, project, offset, nbytes, compressed, length, dtype):
+        # Save where this chunk is stored
+        self.project = project
+        self.offset = offset
+        self.nbytes = nbytes
+        self.compressed = compressed
+
+        # Save the number of values and dtype of this chunk
+        self.length = length
+        self.dtype = dtype
+
+        # Initialize the stored values that were read into memory
+        self.data = None
+
+        # Register this chunk with its project file
+        project.chunks.add(self)
+
+    # Override __len__ to return the number of values in this chunk
+    def __len__(self):
+        return(self.length)
+
+    # This function reads the stored values of this chunk
+    def read(self):
+        """
+        Returns the values of this chunk as they are stored in the project
+        file.
+
+        """
+
+        # Read the values while the project file cannot be closed
+        project = self.project
+        with project.lock:
+            if self.data is not None:
+                return(self.data)
+            if self.project is project:
+                return(project.read(self.offset, self.nbytes, lock=False))
+
+        # If this chunk was moved to another project file, read it from there
+        return(self.read())
+
+    # This function loads the values of this chunk
+    def load(self):
+        """
+        Reads and decodes the values of this chunk, and returns them as
+        a :obj:`~numpy.ndarray` object.
+
+        """
+
+        return(decode_chunk(self.read(), self.compressed, self.dtype,
+                            self.length))
+
+
+# %% CLASS DEFINITIONS
+# Define class that provides access to a project file
+class ProjectFile(object):
+    """
+    Provides access to a *GuiPy* project file.
+
+    A project file starts with a header and two commit slots, followed by the
+    chunks of all columns of all data tables, which are compressed if that
+    saves space, and a compressed JSON index describing all data tables and
+    the sections saved by other plugins. The commit slot with the highest
+    generation locates the index that is used. Dictionary-encoded columns
+    store the codes of their values as chunks, and their categories in the
+    index. Nullable columns store the chunks of their validity mask next to
+    the chunks of their data.
+
+    A project file is only ever appended to. Saving it again appends all
+    modified chunks and a new index, after which the other commit slot is
+    updated to refer to this index. If saving is interrupted, the previous
+    commit slot is still valid.
+
+    Opening a project file only reads its index. The chunks of the columns
+    are read once they are accessed, which requires the file to stay open.
+    The file must therefore be closed explicitly, either with :meth:`~close`
+    once no data table uses it anymore, or with :meth:`~hand_off` once its
+    chunks were copied to another project file.
+
+    The `saved` attribute maps the versions of all chunks that are stored in
+    this project file to where they are stored, such that chunks that were
+    not modified do not have to be saved again (see
+    :meth:`~guipy.plugins.data_table.backends.BaseBackend.get_chunk_versions`).
+
+    """
+
+    # Initialize ProjectFile class
+    def __init__(self, filepath):
+        # Save the absolute path to the provided filepath
+        self.filepath = path.abspath(filepath)
+
+        # Open the file and create a lock for reading from it
+        self._file = open(self.filepath, 'rb')
+        self.lock = Lock()
+
+        # Initialize the set of chunks that are read from this file
+        self.chunks = WeakSet()
+
+        # Initialize the stored chunk versions
+        self.saved = {}
+
+        # Try to read the index of the file
+        try:
+            self._read_index()
+
+        # If that fails, close the file and reraise
+        except Exception:
+            self.close()
+            raise
+
+    # This function reads the index of this project file
+    def _read_index(self):
+        # Check if this file starts with the proper header
+        size = os.fstat(self._file.fileno()).st_size
+        if(size < DATA_OFFSET):
+            raise OSError("File %r is not a valid %s!"
+                          % (self.filepath, PROJECT_TYPE))
+        magic, version = HEADER.unpack(self.read(0, HEADER.size))
+        if(magic != HEADER_MAGIC):
+            raise OSError("File %r is not a valid %s!"
+                          % (self.filepath, PROJECT_TYPE))
+        if(version > VERSION):
+            raise OSError("File %r was saved with a newer version of GuiPy "
+                          "and cannot be opened!" % (self.filepath))
+        self.version = version
+
+        # Use the newest commit slot whose index is intact
+        for generation, offset, nbytes, checksum in read_slots(
+                self.read(HEADER.size, DATA_OFFSET-HEADER.size)):
+            if(offset+nbytes <= size):
+                data = self.read(offset, nbytes)
+                if(zlib.crc32(data) == checksum):
+                    break
+
+        # If there is no such slot, raise error
+        else:
+            raise OSError("File %r is damaged and cannot be opened!"
+                          % (self.filepath))
+
+        # Decode the index
+        index = json.loads(zlib.decompress(data))
+        self.generation = generation
+        self.tables = index['tables']
+        self.sections = index['sections']
+
+    # This function checks if a given file is this project file
+    def is_file(self, filepath):
+        """
+        Returns whether the file at the provided `filepath` is this project
+        file, and thus whether this project file was not replaced since it
+        was opened.
+
+        """
+
+        # Compare the file at filepath with the file that is open
+        try:
+            return(path.samestat(os.fstat(self._file.fileno()),
+                                 os.stat(filepath)))
+
+        # If either file cannot be accessed, it is not the same
+        except (OSError, ValueError):
+            return(False)
+
+    # This function reads bytes from this project file
+    def read(self, offset, nbytes, lock=True):
+        """
+        Reads `nbytes` bytes starting at `offset` from this project file, and
+        returns them.
+
+        This function can be called from any thread. If `lock` is *False*, the
+        caller must hold :attr:`~lock` already.
+
+        """
+
+        # If requested, read the bytes while holding the lock
+        if lock:
+            with self.lock:
+                return(self.read(offset, nbytes, False))
+
+        # Read the requested bytes
+        self._file.seek(offset)
+        data = self._file.read(nbytes)
+
+        # Check if all bytes could be read
+        if(len(data) != nbytes):
+            raise OSError("File %r is truncated!" % (self.filepath))
+
+        # Return data
+        return(data)
+
+    # This function closes this project file
+    def close(self):
+        """
+        Closes this project file. Chunks that were not loaded yet can no
+        longer be loaded afterward.
+
+        """
+
+        # Close the file once no chunk is being read from it
+        with self.lock:
+            self._file.close()
+
+    # This function closes this project file, handing off its chunks
+    def hand_off(self, moved, replace):
+        """
+        Closes this project file, calls `replace` and returns the
+        :obj:`~ProjectFile` object it returned.
+
+        All chunks that are still read from this project file are read from
+        the returned project file afterward if `moved` maps their offset to
+        their offset in it, and are read into memory before this file is
+        closed otherwise. As this file is closed before `replace` is called,
+        `replace` can replace it on every platform. If `replace` fails, this
+        file is opened again.
+
+        """
+
+        # Block reading chunks until they have all been handed off
+        with self.lock:
+            # Read all chunks that are not moved into memory
+            chunks = list(self.chunks)
+            for chunk in chunks:
+                if chunk.offset not in moved:
+                    chunk.data = self.read(chunk.offset, chunk.nbytes, False)
+
+            # Close this file and replace it
+            self._file.close()
+            try:
+                project = replace()
+            except BaseException:
+                self._file = open(self.filepath, 'rb')
+                raise
+
+            # Move all other chunks to the new project file
+            for chunk in chunks:
+                if chunk.offset in moved:
+                    chunk.offset = moved[chunk.offset]
+                    chunk.project = project
+                    project.chunks.add(chunk)
+            self.chunks.clear()
+
+        # Return project
+        return(project)
+
+    # This function creates a backend holding the data of a data table
+    def load_backend(self, index):
+        """
+        Returns a backend that holds the data of the data table with the
+        provided `index` in this project file.
+
+        The backend uses the 'Columnar' backend class, whose columns only read
+        their chunks from this project file once they are accessed.
+
+        """
+
+        # Obtain the description of the requested data table
+        table = self.tables[index]
+
+        # Create a column for every column in this data table
+        backend_class = get_backend('Columnar')
+        columns = []
+        for column in table['columns']:
+            dtype = np.dtype(column['dtype'])
+            values = backend_class.COLUMN.from_chunks(dtype, [
+                StoredChunk(self, offset, nbytes, compressed, length, dtype)
+                for offset, nbytes, compressed, length in column['chunks']])
+
+            # If the column is dictionary-encoded, its chunks hold codes
+            categories = column.get('categories')
+            if categories is not None:
+                values = DictionaryColumn(
+                    values, CategoryDictionary(categories))
+
+            # If the column is nullable, it also has a validity mask
+            elif column.get('valid') is not None:
+                valid_dtype = np.dtype(bool)
+                values = MaskedColumn(values, backend_class.COLUMN.from_chunks(
+                    valid_dtype, [
+                        StoredChunk(self, offset, nbytes, compressed, length,
+                                    valid_dtype)
+                        for offset, nbytes, compressed, length
+                        in column['valid']]))
+            columns.append(values)
+
+        # Create backend
+        backend = backend_class(columns, [column['name']
+                                          for column in table['columns']],
+                                table['n_rows'])
+
+        # Record that the chunks of the backend are stored in this file
+        for col, column in enumerate(table['columns']):
+            self.saved.update(zip(backend.get_chunk_versions(col),
+                                  column['chunks']))
+
+        # Return backend
+        return(backend)
+
+    # This function restores the column properties of a data table
+    def restore_properties(self, index, model):
+        """
+        Restores the precisions and formulas of all columns of the data table
+        with the provided `index` in this project file in the provided
+        `model`, whose data was obtained with :meth:`~load_backend`.
+
+        """
+
+        # Set the properties of all columns
+        columns = self.tables[index]['columns']
+        set_properties(model, [column['precision'] for column in columns],
+                       [column['formula'] for column in columns])
+
+
+# %% FUNCTION DEFINITIONS
+# This function converts the values of a chunk to bytes
+def encode_chunk(values):
+    """
+    Converts the provided `values` of a single chunk to bytes, and returns
+    them together with whether they were compressed.
+
+    Numerical values are stored as raw bytes, while objects are stored as a
+    JSON list, using their string representation if they cannot be stored in
+    JSON. Numerical values are only compressed if compressing the first
+    :attr:`~PROBE_BYTES` bytes saves enough space, such that no time is
+    wasted on values that are (nearly) incompressible, like noisy floats.
+    Constant chunks (see
+    :func:`~guipy.plugins.data_table.backends.constant_array`) only store
+    their single value.
+
+    """
+
+    # Convert the values to bytes
+    values = np.asarray(values)
+    if is_constant(values):
+        values = values[:1]
+    if(values.dtype.kind == 'O'):
+        data = json.dumps(values.tolist(), default=str).encode('utf-8')
+    else:
+        data = values.tobytes()
+
+        # If these bytes cannot be compressed well, return them as they are
+        probe = memoryview(data)[:PROBE_BYTES]
+        if(len(zlib.compress(probe, COMPRESS_LEVEL)) > PROBE_RATIO*len(probe)):
+            return(data, False)
+
+    # Compress the bytes and return them
+    return(zlib.compress(data, COMPRESS_LEVEL), True)
+
+
+# This function converts the bytes of a chunk back to its values
+def decode_chunk(data, compressed, dtype, length):
+    """
+    Converts the provided `data` of a single chunk holding `length` values of
+    the given `dtype` back to its values, and returns them.
+
+    If `data` only holds a single value, the chunk is a constant chunk, which
+    is returned as a constant array.
+
+    """
+
+    # Decompress the bytes if required
+    if compressed:
+        data = zlib.decompress(data)
+
+    # Convert the bytes to values
+    if(dtype.kind == 'O'):
+        values = np.fromiter(json.loads(data), dtype=object)
+    else:
+        values = np.frombuffer(data, dtype=dtype)
+
+    # If the chunk is constant, repeat its value
+    if(len(values) == 1) and (length != 1):
+        values = constant_array(length, values[0], dtype)
+
+    # Return values
+    return(values)
+
+
+# This function reads the valid commit slots of a project file
+def read_slots(data):
+    """
+    Reads all commit slots in the provided `data`, and returns a list of all
+    slots that are intact as `(generation, offset, nbytes, checksum)` tuples,
+    starting with the newest.
+
+    """
+
+    # Loop over all slots and check their checksums
+    slots = []
+    size = SLOT.size+SLOT_CHECKSUM.size
+    for i in range(0, N_SLOTS*size, size):
+        slot = data[i:i+SLOT.size]
+        checksum, = SLOT_CHECKSUM.unpack(data[i+SLOT.size:i+size])
+        if(zlib.crc32(slot) == checksum):
+            slots.append(SLOT.unpack(slot))
+
+    # Return the slots sorted on their generation
+    return(sorted(slots, reverse=True))
+
+
+# This function writes a commit slot to a project file
+def write_slot(file, generation, offset, nbytes, checksum):
+    """
+    Writes a commit slot with the provided `generation`, referring to an
+    index of `nbytes` bytes at `offset` with the given `checksum`, to the
+    provided `file`, and makes sure that it is written to disk.
+
+    Every generation is written to a different slot than the previous one,
+    such that the previous slot stays valid if this one is only partially
+    written.
+
+    """
+
+    # Make sure that everything the slot refers to is written to disk first
+    file.flush()
+    os.fsync(file.fileno())
+
+    # Write the slot and its checksum
+    slot = SLOT.pack(generation, offset, nbytes, checksum)
+    file.seek(HEADER.size+(generation % N_SLOTS)*(SLOT.size +
+                                                  SLOT_CHECKSUM.size))
+    file.write(slot+SLOT_CHECKSUM.pack(zlib.crc32(slot)))
+
+    # Make sure that the slot is written to disk
+    file.flush()
+    os.fsync(file.fileno())
+
+
+# This function sets the column properties of a data table
+def set_properties(model, precisions, formulas):
+    """
+    Sets the precisions and formulas of all columns of the provided `model` to
+    the given `precisions` and `formulas`.
+
+    Formulas are not evaluated again, and setting the properties is not
+    recorded in the history of `model`, nor does it mark `model` as modified.
+
+    """
+
+    # Set the properties of all columns
+    for col, (precision, formula) in enumerate(zip(precisions, formulas)):
+        model.setColumnPrecision(col, precision)
+        if formula is not None:
+            model.setColumnFormula(col, formula, evaluate=False)
+
+    # Remove setting the properties from the history
+    model.undoStack().clear()
+    model.setModified(False)
+
+
+# This function takes a snapshot of a data table
+def snapshot_table(name, model, frozen=False):
+    """
+    Takes a snapshot of the data table with the given `name` and `model`, and
+    returns it as a dict that can be written with :func:`~write_project`.
+
+    If `frozen` is *True*, the chunks of all columns are obtained with
+    :meth:`~guipy.plugins.data_table.backends.BaseBackend.freeze_chunks`,
+    such that the snapshot can be written by another thread while `model` is
+    modified. Otherwise, the snapshot must be written before `model` is
+    modified.
+
+    """
+
+    # Obtain the backend of the model
+    backend = model.backend()
+
+    # Describe every column
+    columns = []
+    for col in range(backend.column_count()):
+        # Obtain the dtype of this column, using objects for non-NumPy dtypes
+        # Dictionary-encoded columns store the codes of their categories
+        # Nullable columns store their data and their validity mask
+        dtype = backend.column_dtype(col)
+        categories = backend.get_categories(col)
+        valid = None
+        if categories is not None:
+            dtype = CODES_DTYPE
+            categories = categories.tolist()
+        elif is_nullable(dtype):
+            dtype = dtype.numpy_dtype
+            valid = backend.get_validity(col)
+            valid = split_chunks(np.array(valid) if frozen else valid)
+        elif not isinstance(dtype, np.dtype):
+            dtype = np.dtype(object)
+
+        # Add the description of this column
+        columns.append({
+            'name': backend.column_name(col),
+            'dtype': dtype.str,
+            'categories': categories,
+            'valid': valid,
+            'precision': model.columnPrecision(col),
+            'formula': model.columnFormula(col),
+            'chunks': (backend.freeze_chunks(col) if frozen
+                       else backend.get_chunks(col)),
+            'versions': backend.get_chunk_versions(col)})
+
+    # Return the snapshot of this data table
+    return({'name': name, 'n_rows': backend.row_count(), 'columns': columns})
+
+
+# This function writes a project file
+def write_project(filepath, tables, sections=None, project=None):
+    """
+    Writes the provided `tables` to a project file at the given `filepath`,
+    and returns the :obj:`~ProjectFile` object of the written file.
+
+    If `project` is the project file at `filepath`, it is saved
+    incrementally: only the chunks that were modified since they were saved
+    and a new index are appended to the file, which are then committed by
+    updating a single commit slot. Saving after modifying a single value thus
+    only writes a single chunk, regardless of the size of the data tables.
+    The file is written completely if it contains too much unused data, or
+    if it was written by an older version of GuiPy.
+
+    Otherwise, the file is first written to a temporary file, which replaces
+    the file at `filepath` once it has been written completely. Chunks that
+    are stored in another project file are copied without decoding them.
+    If `project` is provided, it is closed with :meth:`~ProjectFile.hand_off`
+    before the file is replaced, such that all of its chunks that are still
+    used are read from the written file afterward.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the project file that must be written.
+    tables : list of dict
+        List containing the snapshot of every data table, as returned by
+        :func:`~snapshot_table`.
+
+    Optional
+    --------
+    sections : dict or None. Default: None
+        Dict containing additional JSON-serializable sections that must be
+        stored in the project file, like the configurations of all figures.
+    project : :obj:`~ProjectFile` object or None. Default: None
+        The project file that the `tables` were last written to or opened
+        from, if any. If it is not the returned project file, it is closed.
+
+    Returns
+    -------
+    project : :obj:`~ProjectFile` object
+        The project file at `filepath`.
+
+    """
+
+    # Determine which chunks are stored in the file at filepath already
+    # Files of an older version are always written completely
+    filepath = path.abspath(filepath)
+    incremental = ((project is not None) and project.is_file(filepath) and
+                   (project.version == VERSION))
+    saved = project.saved if incremental else {}
+
+    # Determine how many bytes of the file are still used after saving
+    used = 0
+    added = 0
+    for chunk, version in iter_chunks(tables):
+        if version in saved:
+            used += saved[version][1]
+        else:
+            added += getattr(chunk, 'nbytes', 0)
+
+    # Write the project incrementally if enough of the file is still used
+    if incremental and (used+added >= COMPACT_RATIO *
+                        (path.getsize(filepath)+added)):
+        index = append_project(filepath, tables, sections, saved)
+        project._read_index()
+
+    # Else, write the project completely
+    else:
+        index, project = rewrite_project(filepath, tables, sections, project)
+
+    # Record where all chunks were saved
+    project.saved = {
+        version: chunk for table, stored in zip(tables, index['tables'])
+        for column, stored_column in zip(table['columns'], stored['columns'])
+        for version, chunk in zip(column['versions'] or (),
+                                  stored_column['chunks'])}
+
+    # Return project
+    return(project)
+
+
+# This function appends a project to an existing project file
+def append_project(filepath, tables, sections, saved):
+    """
+    Appends the provided `tables` to the existing project file at the given
+    `filepath`, commits them and returns the index describing them.
+
+    Chunks whose version is in `saved` are not written again.
+
+    """
+
+    # Open the project file for appending to it
+    with open(filepath, 'r+b') as file:
+        # Determine the generation of the index that is currently used
+        file.seek(HEADER.size)
+        slots = read_slots(file.read(DATA_OFFSET-HEADER.size))
+        generation = slots[0][0] if slots else 0
+
+        # Write all data tables and the index after the end of the file
+        file.seek(0, os.SEEK_END)
+        index, *slot = write_index(file, tables, sections, saved)
+
+        # Commit the new index
+        write_slot(file, generation+1, *slot)
+
+    # Return index
+    return(index)
+
+
+# This function writes a project to a new project file
+def rewrite_project(filepath, tables, sections, project=None):
+    """
+    Writes the provided `tables` to a new project file, which replaces the
+    file at the given `filepath` once it has been written completely, and
+    returns the index describing them and the :obj:`~ProjectFile` object of
+    the new file.
+
+    If `project` is provided, it is handed off to the new file before the
+    file at `filepath` is replaced (see :meth:`~ProjectFile.hand_off`).
+
+    """
+
+    # This function replaces the project file with the temporary file
+    def replace():
+        os.replace(temp_path, filepath)
+        return(ProjectFile(filepath))
+
+    # Create a temporary file next to the project file
+    fd, temp_path = tempfile.mkstemp(suffix=PROJECT_EXT+'.tmp',
+                                     dir=path.dirname(filepath))
+
+    # Write the project to the temporary file
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            # Write the header and reserve space for the commit slots
+            file.write(HEADER.pack(HEADER_MAGIC, VERSION))
+            file.write(bytes(DATA_OFFSET-HEADER.size))
+
+            # Write all data tables and the index, and commit it
+            index, *slot = write_index(file, tables, sections, {})
+            write_slot(file, 1, *slot)
+
+        # Replace the project file, handing off the chunks of project
+        if project is None:
+            project = replace()
+        else:
+            project = project.hand_off(
+                get_moved(project, tables, index), replace)
+
+    # If anything fails, remove the temporary file and reraise
+    except BaseException:
+        if path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # Return index and project
+    return(index, project)
+
+
+# This function determines where the chunks of a project file were copied to
+def get_moved(project, tables, index):
+    """
+    Returns a dict that maps the offset of every chunk of the provided
+    `project` that is in the given `tables` snapshots to the offset it was
+    written to, as described by `index`.
+
+    """
+
+    # Loop over the chunks and validity masks of all columns
+    moved = {}
+    for table, stored in zip(tables, index['tables']):
+        for column, stored_column in zip(table['columns'], stored['columns']):
+            for chunks, stored_chunks in [
+                    (column['chunks'], stored_column['chunks']),
+                    (column['valid'] or (), stored_column['valid'] or ())]:
+                # Record every chunk that was copied from project
+                for chunk, (offset, *_) in zip(chunks, stored_chunks):
+                    if(isinstance(chunk, StoredChunk) and
+                       chunk.project is project and chunk.data is None):
+                        moved[chunk.offset] = offset
+
+    # Return moved
+    return(moved)
+
+
+# This function writes all data tables and the index of a project
+def write_index(file, tables, sections, saved):
+    """
+    Writes the provided `tables` and the index describing them and the given
+    `sections` to the current position in `file`, and returns the index and
+    the offset, size and checksum of the written index.
+
+    Chunks whose version is in `saved` are not written again.
+
+    """
+
+    # Write all data tables
+    index = {
+        'tables': [write_table(file, table, saved) for table in tables],
+        'sections': {} if sections is None else sections}
+
+    # Write the index
+    # Categories that cannot be stored in JSON are stored as strings
+    data = zlib.compress(json.dumps(index, default=str).encode('utf-8'),
+                         COMPRESS_LEVEL)
+    offset = file.tell()
+    file.write(data)
+
+    # Return index and offset, size and checksum of the index
+    return(index, offset, len(data), zlib.crc32(data))
+
+
+# This function writes a data table to a project file
+def write_table(file, table, saved):
+    """
+    Writes the chunks of all columns of the provided `table` snapshot to the
+    current position in `file`, and returns the description of this data
+    table for the index.
+
+    Chunks whose version is in `saved` are not written again.
+
+    """
+
+    # Write every column chunk by chunk
+    # The validity masks of nullable columns have no versions
+    columns = []
+    for column in table['columns']:
+        valid = column['valid']
+        columns.append({
+            'name': column['name'],
+            'dtype': column['dtype'],
+            'categories': column['categories'],
+            'valid': (None if valid is None else
+                      write_chunks(file, valid, repeat(None), saved)),
+            'precision': column['precision'],
+            'formula': column['formula'],
+            'chunks': write_chunks(file, column['chunks'],
+                                   column['versions'] or repeat(None),
+                                   saved)})
+
+    # Return the description of this data table
+    return({'name': table['name'], 'n_rows': table['n_rows'],
+            'columns': columns})
+
+
+# This function writes the chunks of a column to a project file
+def write_chunks(file, chunks, versions, saved):
+    """
+    Writes the provided `chunks` with the given `versions` to the current
+    position in `file`, and returns where every chunk is stored.
+
+    Chunks whose version is in `saved` are not written again.
+
+    """
+
+    # Write every chunk
+    stored = []
+    for chunk, version in zip(chunks, versions):
+        # If this chunk is stored in the file already, refer to it
+        if version in saved:
+            stored.append(saved[version])
+            continue
+
+        # Else, obtain the stored values of this chunk
+        if isinstance(chunk, StoredChunk):
+            data, compressed = chunk.read(), chunk.compressed
+        elif isinstance(chunk, np.ndarray):
+            data, compressed = encode_chunk(chunk)
+        else:
+            data, compressed = encode_chunk(chunk.load())
+
+        # Write the values
+        stored.append((file.tell(), len(data), compressed, len(chunk)))
+        file.write(data)
+
+    # Return where all chunks are stored
+    return(stored)
+
+
+# This function iterates over all chunks of all columns of all data tables
+def iter_chunks(tables):
+    """
+    Iterates over all chunks of all columns in the provided `tables`
+    snapshots, yielding every chunk together with its version, which is
+    *None* if it is unknown.
+
+    """
+
+    for table in tables:
+        for column in table['columns']:
+            yield from zip(column['chunks'],
+                           column['versions'] or repeat(None))
+            yield from zip(column['valid'] or [], repeat(None))
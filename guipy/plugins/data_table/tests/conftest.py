@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table.backends.memmap import MemmapBackend
+from guipy.plugins.data_table.widgets import DataTableModel
+
+
+# %% PYTEST FIXTURES
+# Run every test that uses a backend on all backends
+@pytest.fixture(params=['Columnar', 'DataFrame', 'Memmap'])
+def backend(request, tmpdir, monkeypatch):
+    # Store all memory-mapped columns in the temporary directory
+    monkeypatch.setattr(MemmapBackend, 'scratch_dir', str(tmpdir))
+    return(request.param)
+
+
+# Create a data table model using the requested backend
+@pytest.fixture
+def model(qapp, backend):
+    model = DataTableModel(None, None, backend)
+    yield model
+    model.delete()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Built-in imports
+import os
+from os import path
+from types import SimpleNamespace
+
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table import autosave, project as project_module
+from guipy.plugins.data_table.autosave import (
+    AutoSaver, find_sessions, get_journals, load_session, remove_session)
+from guipy.plugins.data_table.project import ProjectFile
+
+
+# %% PYTEST FIXTURES
+# Create an autosaver that stores its sessions in the temporary directory
+@pytest.fixture
+def saver(qapp, tmpdir, monkeypatch):
+    monkeypatch.setattr(autosave, 'recovery_dir', lambda: str(tmpdir))
+    saver = AutoSaver(lambda data_tables: {'plugin': len(data_tables)})
+    yield saver
+    if saver._lock.isLocked():
+        for data_table in list(saver._tables.values()):
+            saver.removeTable(data_table)
+        saver.close()
+
+
+# Register a data table holding values with the autosaver
+@pytest.fixture
+def data_table(model, saver):
+    model.setDataBlock(0, 0, np.arange(25.0).reshape(5, 5))
+    data_table = SimpleNamespace(model=model, tab_name='table')
+    saver.addTable(data_table)
+    return(data_table)
+
+
+# %% HELPER FUNCTIONS
+# This function waits until the autosaver has written everything to disk
+def wait(saver):
+    if saver._snapshot is not None:
+        saver._snapshot.result()
+    saver.flush()
+    saver._journal_worker.submit(lambda: None).result()
+
+
+# This function stops an autosaver as if its session ended unexpectedly
+def crash(saver):
+    # Write everything and stop recording any further changes
+    wait(saver)
+    for data_table in saver._tables.values():
+        data_table.model.setJournal(None)
+    for timer in (saver._timer, saver._stale_timer, saver._flush_timer):
+        timer.stop()
+
+    # Close all files and release the lock of the session
+    saver._journal_worker.submit(saver._journal.close).result()
+    saver._journal_worker.shutdown()
+    saver._snapshot_worker.shutdown()
+    if saver._project is not None:
+        saver._project.close()
+    saver._lock.unlock()
+
+
+# This function recovers the only session that ended unexpectedly
+def recover():
+    sessions = find_sessions()
+    assert len(sessions) == 1
+    dirpath, lock = sessions[0]
+    tables, sections, project = load_session(dirpath)
+    return(tables, sections, (dirpath, lock, project))
+
+
+# This function closes the snapshot of a recovered session and removes it
+def remove(session):
+    dirpath, lock, project = session
+    project.close()
+    remove_session(dirpath, lock)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for autosaving and recovering data tables
+class Test_AutoSaver(object):
+    # Test if changes made after the last snapshot are recovered
+    def test_recover(self, data_table, saver):
+        model = data_table.model
+        saver.autosave()
+        model.insertRows(1, 2)
+        model.setDataBlock(0, 1, [[9.0, 8.0]])
+        model.removeColumns(3)
+        model.setColumnPrecision(2, 4)
+        crash(saver)
+
+        # Recover the session and compare it with the model
+        tables, sections, session = recover()
+        name, backend, (precisions, formulas) = tables[0]
+        assert name == 'table' and sections == {'plugin': 1}
+        assert precisions == [None, None, 4, None]
+        pd.testing.assert_frame_equal(
+            backend.to_frame().set_axis(model.columnNames(), axis=1),
+            model.dataFrame(), check_dtype=False)
+        backend.close()
+        remove(session)
+        assert not find_sessions()
+
+    # Test if a data table that was closed is not recovered
+    def test_closed(self, data_table, saver):
+        saver.autosave()
+        data_table.model.clearRows(0)
+        saver.removeTable(data_table)
+        crash(saver)
+        tables, _, session = recover()
+        assert tables == [None]
+        remove(session)
+
+    # Test if a change that is too large to journal is not replayed
+    def test_stale(self, data_table, saver, monkeypatch):
+        model = data_table.model
+        saver.autosave()
+        expected = model.dataFrame().copy()
+        monkeypatch.setattr(autosave, 'JOURNAL_LIMIT', 0)
+        model.setDataBlock(0, 0, np.ones((5, 5)))
+        crash(saver)
+        tables, _, session = recover()
+        backend = tables[0][1]
+        assert np.array_equal(backend.get_column(0), expected.iloc[:, 0])
+        backend.close()
+        remove(session)
+
+    # Test if reading a journal stops at an entry that was not written
+    # completely
+    def test_torn_journal(self, data_table, saver):
+        model = data_table.model
+        saver.autosave()
+        model.setDataBlock(0, 0, [[-1.0]])
+        wait(saver)
+        model.setDataBlock(1, 0, [[-2.0]])
+        crash(saver)
+
+        # Remove the last byte of the journal
+        filepath = get_journals(saver.dirpath)[-1][1]
+        with open(filepath, 'rb+') as file:
+            file.truncate(path.getsize(filepath)-1)
+        tables, _, session = recover()
+        backend = tables[0][1]
+        assert backend.get_column(0)[:2].tolist() == [-1.0, 5.0]
+        backend.close()
+        remove(session)
+
+    # Test if running sessions are not recovered, and closing one removes it
+    def test_close(self, data_table, saver):
+        saver.autosave()
+        wait(saver)
+        assert not find_sessions()
+        saver.removeTable(data_table)
+        saver.close()
+        assert not path.exists(saver.dirpath)
+        assert not os.listdir(autosave.recovery_dir())
+
+    # Test if writing the snapshot completely again closes the old snapshot
+    def test_compact(self, data_table, saver, monkeypatch):
+        monkeypatch.setattr(project_module, 'COMPACT_RATIO', 1)
+        saver.autosave()
+        wait(saver)
+        project = saver._project
+        data_table.model.setDataBlock(0, 0, [[-1.0]])
+        saver.autosave()
+        wait(saver)
+        assert saver._project is not project and project._file.closed
+        snapshot = ProjectFile(saver._project.filepath)
+        assert len(snapshot.tables) == 1
+        snapshot.close()
+
+    # Test if closing an autosaver closes the snapshots of adopted sessions
+    def test_adopt(self, data_table, saver):
+        saver.autosave()
+        crash(saver)
+        tables, _, (dirpath, lock, project) = recover()
+        new_saver = AutoSaver(lambda data_tables: {})
+        new_saver.adopt(dirpath, lock, project)
+        new_saver.close()
+        assert project._file.closed
+        assert not path.exists(dirpath)
+        tables[0][1].close()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import get_backend
+from guipy.plugins.data_table.backends.columnar import ChunkedColumn
+
+
+# %% GLOBALS
+# Number of rows in the backends, such that columns hold several chunks
+N_ROWS = 2*ChunkedColumn.CHUNK_SIZE+100
+
+
+# %% PYTEST FIXTURES
+# Create a backend holding a float, integer and text column
+@pytest.fixture
+def data_backend(backend):
+    rows = np.arange(N_ROWS)
+    data_backend = get_backend(backend).from_frame(pd.DataFrame({
+        'float': rows/2,
+        'int': rows,
+        'str': np.array(['a', 'bb', 'ccc'], dtype=object)[rows % 3]}))
+    yield data_backend
+    data_backend.close()
+
+
+# Create the expected values of all columns in the backend
+@pytest.fixture
+def columns():
+    rows = np.arange(N_ROWS)
+    return([(rows/2).astype(object), rows.astype(object),
+            np.array(['a', 'bb', 'ccc'], dtype=object)[rows % 3]])
+
+
+# %% HELPER FUNCTIONS
+# This function checks that a backend holds the expected columns
+def assert_columns(backend, columns):
+    assert backend.column_count() == len(columns)
+    assert backend.row_count() == len(columns[0])
+    for col, values in enumerate(columns):
+        actual = backend.get_column(col).astype(object)
+        is_na = pd.isna(values)
+        assert np.array_equal(pd.isna(actual), is_na)
+        assert np.array_equal(actual[~is_na], values[~is_na])
+
+
+# This function returns an object array of empty values
+def empty(count):
+    return(np.full(count, np.nan, dtype=object))
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for the operations that all backends provide
+class Test_Backend(object):
+    # Test if a data frame is stored and returned unchanged
+    def test_from_frame(self, data_backend, columns):
+        assert data_backend.column_names() == ['float', 'int', 'str']
+        assert_columns(data_backend, columns)
+        data_frame = data_backend.to_frame()
+        assert list(data_frame.columns) == ['float', 'int', 'str']
+        assert np.array_equal(data_frame['int'], columns[1].astype(int))
+
+    # Test if blocks spanning several chunks can be obtained and set
+    @pytest.mark.parametrize('row, n_rows', [
+        (0, 10), (ChunkedColumn.CHUNK_SIZE-5, 10), (100, N_ROWS-200)])
+    def test_block(self, data_backend, columns, row, n_rows):
+        block = data_backend.get_block(row, 1, n_rows, 2)
+        for values, expected in zip(block, columns[1:]):
+            assert np.array_equal(values.astype(object),
+                                  expected[row:row+n_rows])
+
+        # Set the block and check that only its values changed
+        data_backend.set_block(row, 0, [-np.arange(n_rows), ['x']*n_rows])
+        columns[0][row:row+n_rows] = -np.arange(n_rows)
+        columns[1][row:row+n_rows] = 'x'
+        assert_columns(data_backend, columns)
+
+    # Test if values of a set of rows can be obtained and set in any order
+    def test_rows(self, data_backend, columns):
+        rows = [N_ROWS-1, 3, ChunkedColumn.CHUNK_SIZE, 4]
+        block = data_backend.get_rows(rows, 0, 3)
+        for values, expected in zip(block, columns):
+            assert np.array_equal(values.astype(object), expected[rows])
+        data_backend.set_rows(rows, 0, [[1.5, 2.5, 3.5, 4.5]])
+        columns[0][rows] = [1.5, 2.5, 3.5, 4.5]
+        assert_columns(data_backend, columns)
+
+    # Test if empty rows can be inserted anywhere
+    @pytest.mark.parametrize('row, count', [
+        (0, 3), (ChunkedColumn.CHUNK_SIZE-1, 5), (N_ROWS, 10**5)])
+    def test_insert_rows(self, data_backend, columns, row, count):
+        data_backend.insert_rows(row, count)
+        columns = [np.concatenate([values[:row], empty(count), values[row:]])
+                   for values in columns]
+        assert_columns(data_backend, columns)
+
+        # Check that the inserted rows can be set
+        data_backend.set_value(row, 2, 'new')
+        columns[2][row] = 'new'
+        assert_columns(data_backend, columns)
+
+    # Test if rows spanning several chunks can be removed
+    @pytest.mark.parametrize('row, count', [
+        (0, 1), (ChunkedColumn.CHUNK_SIZE-10, ChunkedColumn.CHUNK_SIZE+20),
+        (N_ROWS-5, 5)])
+    def test_remove_rows(self, data_backend, columns, row, count):
+        data_backend.remove_rows(row, count)
+        columns = [np.delete(values, slice(row, row+count))
+                   for values in columns]
+        assert_columns(data_backend, columns)
+
+    # Test if non-contiguous rows are removed in a single call
+    def test_remove_rows_mask(self, data_backend, columns):
+        mask = np.random.default_rng(0).random(N_ROWS) < 0.3
+        mask[ChunkedColumn.CHUNK_SIZE:2*ChunkedColumn.CHUNK_SIZE] = True
+        data_backend.remove_rows_mask(mask)
+        assert_columns(data_backend, [values[~mask] for values in columns])
+
+    # Test if the rows of a data frame are appended
+    def test_append_frame(self, data_backend, columns):
+        data_backend.append_frame(pd.DataFrame({
+            'float': [0.25, np.nan], 'int': [7, 8], 'str': ['y', None]}))
+        columns = [np.concatenate([values, np.array(new, dtype=object)])
+                   for values, new in zip(
+                       columns, [[0.25, np.nan], [7, 8], ['y', np.nan]])]
+        assert_columns(data_backend, columns)
+
+    # Test if columns can be inserted and removed
+    def test_columns(self, data_backend, columns):
+        data_backend.insert_columns(1, ['x', 'y'])
+        assert data_backend.column_names() == ['float', 'x', 'y', 'int', 'str']
+        assert_columns(data_backend, [columns[0], empty(N_ROWS),
+                                      empty(N_ROWS), *columns[1:]])
+        data_backend.remove_columns(0, 3)
+        assert data_backend.column_names() == ['int', 'str']
+        assert_columns(data_backend, columns[1:])
+
+    # Test if rows and columns can be cleared
+    def test_clear(self, data_backend, columns):
+        data_backend.clear_rows(5, 10)
+        data_backend.clear_columns(2, 1)
+        for values in columns[:2]:
+            values[5:15] = np.nan
+        assert_columns(data_backend, [*columns[:2], empty(N_ROWS)])
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table.widgets.clipboard import (
+    ClipboardParser, block_to_text, text_to_frame)
+
+
+# %% PYTEST FIXTURES
+# Create a model holding floats, integers and text with special characters
+@pytest.fixture
+def filled_model(model):
+    model.setColumnDataType(2, 'str')
+    model.setDataBlock(0, 0, [
+        [0.1, np.nan, 1e20, -2.5, 3.0],
+        [1.0, 2.0, 3.0, 4.0, 5.0],
+        np.array(['a', 'tab\there', 'two\nlines', 'say "hi"', None],
+                 dtype=object)])
+    model.setColumnDataType(1, 'int')
+    return(model)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for copying and pasting blocks as text
+class Test_Clipboard(object):
+    # Test if a block is formatted with quotes where required
+    def test_copy(self, filled_model):
+        text = block_to_text(filled_model, 0, 0, 5, 3)
+        assert text.split('\n')[:2] == ['0.1\t1\ta', '\t2\t"tab\there"']
+        assert text.endswith('-2.5\t4\t"say ""hi"""\n3.0\t5\t')
+
+    # Test if copying and pasting a block gives the same values
+    @pytest.mark.parametrize('sep', ['\t', ','])
+    def test_round_trip(self, filled_model, sep):
+        text = block_to_text(filled_model, 0, 0, 5, 3, sep)
+        data_frame = text_to_frame(text, sep)
+        assert data_frame.shape == (5, 3)
+        assert np.array_equal(data_frame[0], filled_model.dataColumn(0),
+                              equal_nan=True)
+        assert data_frame[1].tolist() == [1, 2, 3, 4, 5]
+        assert data_frame[2].tolist()[:4] == filled_model.dataColumn(
+            2).tolist()[:4]
+
+    # Test if text from spreadsheets is parsed
+    @pytest.mark.parametrize('text, shape', [
+        ('1\t2\n3\t4\r\n', (2, 2)),
+        ('1,2\n3,4,5\n', (2, 3)),
+        ('1\t\n\t4', (2, 2)),
+        ('', (0, 0))])
+    def test_parse(self, text, shape):
+        assert text_to_frame(text).shape == shape
+
+    # Test if pasted text is parsed in a separate thread
+    def test_parser(self, qtbot):
+        parser = ClipboardParser('1\t2\n3\t4')
+        with qtbot.waitSignal(parser.parsed, timeout=10000) as blocker:
+            parser.start()
+        parser.wait()
+        pd.testing.assert_frame_equal(blocker.args[0],
+                                      pd.DataFrame([[1, 2], [3, 4]]))
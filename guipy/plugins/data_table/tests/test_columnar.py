@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import is_constant
+from guipy.plugins.data_table.backends.columnar import (
+    ChunkedColumn, ColumnarBackend)
+
+
+# %% HELPER FUNCTIONS
+# This function returns the number of bytes allocated by dense chunks
+def dense_bytes(chunks):
+    return(sum(chunk.nbytes for chunk in chunks if not is_constant(chunk)))
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for the ChunkedColumn class
+class Test_ChunkedColumn(object):
+    # Test if appending many empty values only adds constant chunks
+    def test_append_constant(self):
+        column = ChunkedColumn.full(5)
+        column.insert(len(column), 10**6)
+        assert len(column) == 10**6+5
+        assert dense_bytes(column.get_chunks()) == 0
+        assert len(column.get_chunks()) == -(-len(column)//column.CHUNK_SIZE)
+        assert pd.isna(column.get_range(0, len(column))).all()
+
+    # Test if appending many values after a set value only adds constant
+    # chunks
+    def test_append_after_values(self):
+        column = ChunkedColumn.from_array(np.arange(5, dtype=float))
+        column.insert(len(column), 10**6)
+        chunks = column.get_chunks()
+        assert dense_bytes(chunks) == 5*column.dtype.itemsize
+        assert np.array_equal(column.get_range(0, 5), np.arange(5))
+        assert pd.isna(column.get_range(5, len(column))).all()
+
+    # Test if appending a few values to an owned chunk uses its capacity
+    def test_append_capacity(self):
+        column = ChunkedColumn.from_array(np.arange(5, dtype=float))
+        column.set_range(0, np.ones(5))
+        for _ in range(10):
+            column.insert(len(column), 3)
+        assert len(column.get_chunks()) == 1
+        assert len(column) == 35
+
+    # Test if inserting empty values in an empty region keeps it constant
+    def test_insert_constant(self):
+        column = ChunkedColumn.full(10)
+        column.insert(5, 100)
+        assert len(column) == 110
+        assert dense_bytes(column.get_chunks()) == 0
+
+    # Test if setting a value only allocates the chunk that holds it
+    def test_set_value(self):
+        column = ChunkedColumn.full(10**6)
+        column.set_range(10**5, np.array([1.0]))
+        chunks = column.get_chunks()
+        assert sum(not is_constant(chunk) for chunk in chunks) == 1
+        assert column.get_value(10**5) == 1.0
+        assert np.isnan(column.get_value(10**5+1))
+
+    # Test if empty values can be appended to a constant chunk holding
+    # another value
+    def test_append_other_value(self):
+        column = ChunkedColumn.full(5, 1.0)
+        column.insert(len(column), 5)
+        assert dense_bytes(column.get_chunks()) == 0
+        values = column.get_range(0, 10)
+        assert (values[:5] == 1).all() and pd.isna(values[5:]).all()
+
+
+# Pytest class for the ColumnarBackend class
+class Test_ColumnarBackend(object):
+    # Test if resizing a table to many rows does not allocate its cells
+    @pytest.mark.parametrize('frame', [
+        pd.DataFrame({'A': [np.nan]*5, 'B': [np.nan]*5}),
+        pd.DataFrame({'A': np.arange(5.0), 'B': ['a', 'b', 'c', 'd', 'e']})])
+    def test_resize(self, frame):
+        backend = ColumnarBackend.from_frame(frame)
+        backend.insert_rows(5, 10**6)
+        backend.insert_columns(2, ['C', 'D'])
+        assert backend.row_count() == 10**6+5
+        for col in range(backend.column_count()):
+            assert dense_bytes(backend.get_chunks(col)) < 2**10
+        for values in backend.get_block(10**6, 0, 5, 4):
+            assert pd.isna(values).all()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Built-in imports
+from io import BytesIO
+from os import path
+
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table.formatters import csv as csv_module
+from guipy.plugins.data_table.formatters.csv import (
+    CSVFormatter, find_row_end, infer_kind, read_blocks, sniff_csv,
+    split_blocks)
+
+
+# %% GLOBALS
+# Values of a text column, of which some hold quotes, delimiters and newlines
+TEXT_VALUES = ['a', 'b,c', 'multi\nline "quoted"', 'x', '\n', '"']
+
+
+# %% PYTEST FIXTURES
+# Create the contents of a CSV-file that holds quoted newlines
+@pytest.fixture(params=[True, False], ids=['header', 'no_header'])
+def csv_bytes(request):
+    rng = np.random.default_rng(0)
+    n_rows = 5000
+    data_frame = pd.DataFrame({
+        'int': np.arange(n_rows),
+        'float': rng.random(n_rows),
+        'text': rng.choice(TEXT_VALUES, n_rows)})
+    return(data_frame.to_csv(index=False, header=request.param).encode())
+
+
+# Split files into many small blocks that are parsed on several threads
+@pytest.fixture
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(csv_module, 'SNIFF_BYTES', 2**10)
+    monkeypatch.setattr(csv_module, 'PARSE_BLOCK_BYTES', 2**12)
+    monkeypatch.setattr(csv_module, 'PARSE_THREADS', 3)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for sniffing CSV-files
+class Test_SniffCSV(object):
+    # Test if the kinds of values in a column are inferred
+    @pytest.mark.parametrize('values, kind', [
+        (['1', '2', None], ('int', [])),
+        (['1', '2.5', '-', '?'], ('float', ['-', '?'])),
+        (['True', 'false'], ('bool', [])),
+        (['1', 'x'], ('str', [])),
+        ([None, '-'], (None, []))])
+    def test_infer_kind(self, values, kind):
+        assert infer_kind(pd.Series(values, dtype=object)) == kind
+
+    # Test if the delimiter, header, dtypes and missing markers are sniffed
+    def test_header(self):
+        kwargs = sniff_csv(b'a;b;c\n1;2.5;x\n2;-;y\n')
+        assert kwargs['sep'] == ';'
+        assert kwargs['header'] == 0
+        assert kwargs['dtype'] == {1: 'float64', 2: object}
+        assert kwargs['na_values'] == {1: ['-']}
+        data_frame = pd.read_csv(BytesIO(b'a;b;c\n1;2.5;x\n2;-;y\n'),
+                                 **kwargs)
+        assert list(data_frame.columns) == ['a', 'b', 'c']
+        assert np.isnan(data_frame['b'][1])
+
+    # Test if a file without a header is sniffed using all of its rows
+    def test_no_header(self):
+        kwargs = sniff_csv(b'1\t2.5\tx\n2\t3\ty\n')
+        assert kwargs['sep'] == '\t'
+        assert kwargs['header'] is None
+        assert kwargs['dtype'] == {1: 'float64', 2: object}
+
+    # Test if the incomplete last row of a sample is ignored
+    def test_incomplete(self):
+        kwargs = sniff_csv(b'a,b\n1,2\n3,4\n5,x', complete=False)
+        assert kwargs['header'] == 0
+        assert kwargs['dtype'] == {}
+        assert sniff_csv(b'a,b\n1,2\n3,4\n5,x')['dtype'] == {1: object}
+
+    # Test if pandas infers everything if the sample cannot be parsed
+    def test_empty(self):
+        kwargs = sniff_csv(b'')
+        assert kwargs['header'] == 'infer' and kwargs['dtype'] is None
+
+    # Test if the formatter only sniffs a bounded sample and rewinds the file
+    def test_get_read_kwargs(self, monkeypatch):
+        monkeypatch.setattr(csv_module, 'SNIFF_BYTES', 16)
+        file = BytesIO(b'a,b\n1,2\n3,4\n5,6\n'+b'7,x\n'*100)
+        kwargs = CSVFormatter().get_read_kwargs(file)
+        assert file.tell() == 0
+        assert kwargs['header'] == 0 and kwargs['dtype'] == {}
+
+
+# Pytest class for splitting CSV-files into blocks
+class Test_SplitBlocks(object):
+    # Test if only line breaks outside of quotes end a row
+    def test_find_row_end(self):
+        assert find_row_end(b'a,b\n1,2\n') == 7
+        assert find_row_end(b'a,b\n1,"x\ny"') == 3
+        assert find_row_end(b'a,b\n1,"x\ny"\n2') == 11
+        assert find_row_end(b'a,"b\nc') == -1
+        assert find_row_end(b'a,b') == -1
+
+    # Test if blocks hold the entire file and all start outside of quotes
+    def test_split(self, csv_bytes):
+        blocks = list(split_blocks(BytesIO(csv_bytes), 100, 1000))
+        assert len(blocks) > 10
+        assert b''.join(blocks) == csv_bytes
+        for block in blocks:
+            assert block.endswith(b'\n')
+            assert not block.count(b'"') % 2
+
+
+# Pytest class for parsing CSV-files in parallel blocks
+class Test_ReadBlocks(object):
+    # Test if parsing a file in blocks equals parsing it serially
+    def test_read_blocks(self, csv_bytes, small_blocks):
+        kwargs = CSVFormatter().get_read_kwargs(BytesIO(csv_bytes))
+        blocks = list(read_blocks(BytesIO(csv_bytes), kwargs))
+        assert len(blocks) > 2*csv_module.PARSE_THREADS
+        data_frame = pd.concat(blocks, ignore_index=True)
+        expected = pd.read_csv(BytesIO(csv_bytes), **kwargs)
+        pd.testing.assert_frame_equal(data_frame, expected)
+
+    # Test if importing a large file in parallel equals importing it serially
+    def test_importer(self, csv_bytes, small_blocks, tmpdir):
+        filepath = path.join(str(tmpdir), 'data.csv')
+        with open(filepath, 'wb') as file:
+            file.write(csv_bytes)
+        formatter = CSVFormatter()
+        formatter.PARALLEL_BYTES = 2**40
+        expected = formatter.importer(filepath)
+        formatter.PARALLEL_BYTES = 0
+        pd.testing.assert_frame_equal(formatter.importer(filepath), expected)
+
+        # Streaming the file should yield the same rows in several chunks
+        chunks = list(formatter.streamer(filepath))
+        assert len(chunks) > 1
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                      expected)
+
+    # Test if a block that does not fit the sniffed dtypes is inferred again
+    def test_mixed_dtypes(self, small_blocks):
+        values = [str(i) for i in range(2000)]
+        values[-1] = 'text'
+        csv_bytes = ('value\n'+'\n'.join(values)+'\n').encode()
+        kwargs = CSVFormatter().get_read_kwargs(BytesIO(csv_bytes))
+        blocks = list(read_blocks(BytesIO(csv_bytes), kwargs))
+        assert pd.api.types.is_numeric_dtype(blocks[0]['value'])
+        assert blocks[-1]['value'].iloc[-1] == 'text'
+        assert sum(map(len, blocks)) == 2000
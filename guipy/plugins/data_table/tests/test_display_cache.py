@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pytest
+from qtpy import QtCore as QC
+
+# GuiPy imports
+from guipy.plugins.data_table.widgets.display_cache import DisplayCache
+
+
+# %% GLOBALS
+# Shape of the models, such that they span several blocks of the cache
+N_ROWS = 2*DisplayCache.BLOCK_ROWS+10
+N_COLS = DisplayCache.BLOCK_COLS+4
+
+
+# %% PYTEST FIXTURES
+# Create a model where every cell holds row+col/100
+@pytest.fixture
+def large_model(model):
+    model.insertRows(count=N_ROWS-5)
+    model.insertColumns(count=N_COLS-5)
+    rows, cols = np.mgrid[0:N_ROWS, 0:N_COLS]
+    model.setDataBlock(0, 0, rows+cols/100)
+    return(model)
+
+
+# %% HELPER FUNCTIONS
+# This function returns the shown display value of a cell
+def display(model, row, col):
+    value = model.data(model.index(row, col), QC.Qt.DisplayRole)
+    return(value.value() if hasattr(value, 'value') else value)
+
+
+# This function checks the display values of a few cells in every block
+def assert_display(model, fmt='%.6g'):
+    cols = model.columnCount()
+    for row in [0, DisplayCache.BLOCK_ROWS, model.rowCount()-1]:
+        for col in [0, DisplayCache.BLOCK_COLS, cols-1]:
+            value = model.dataBlock(row, col, 1, 1)[0][0]
+            expected = None if np.isnan(value) else fmt % value
+            assert display(model, row, col) == expected
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for the cache of display values
+class Test_DisplayCache(object):
+    # Test if cached values are updated by every change of the model
+    def test_invalidate(self, large_model):
+        assert_display(large_model)
+        large_model.setDataBlock(N_ROWS-1, N_COLS-1, [[-1.5]])
+        assert_display(large_model)
+        large_model.removeRows(0, 3)
+        assert_display(large_model)
+        large_model.insertColumns(0, 2)
+        assert_display(large_model)
+        large_model.removeColumns(0, 3)
+        assert_display(large_model)
+        large_model.sortByColumns([(0, QC.Qt.DescendingOrder)])
+        assert_display(large_model)
+
+    # Test if changing the precision of a column changes its display values
+    def test_precision(self, large_model):
+        assert display(large_model, 5, 3) == '5.03'
+        for col in range(N_COLS):
+            large_model.setColumnPrecision(col, 2)
+        assert display(large_model, 5, 3) == '5'
+        assert_display(large_model, '%.2g')
+
+    # Test if the number of cached blocks is limited
+    def test_limit(self, large_model, monkeypatch):
+        monkeypatch.setattr(DisplayCache, 'MAX_BLOCKS', 2)
+        assert_display(large_model)
+        assert len(large_model._display_cache._blocks) <= 2
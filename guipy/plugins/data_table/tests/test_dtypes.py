@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import ConversionError
+from guipy.plugins.data_table.backends.base import CONVERT_CHUNK_ROWS
+from guipy.plugins.data_table.widgets import DataTableModel
+
+
+# %% GLOBALS
+# Number of rows in the converted columns, such that they hold several chunks
+N_ROWS = 3*CONVERT_CHUNK_ROWS+10
+
+
+# %% PYTEST FIXTURES
+# Create a model with a float and a text column that span several chunks
+@pytest.fixture
+def large_model(model):
+    model.insertRows(count=N_ROWS-5)
+    model.setColumnDataType(1, 'str')
+    values = np.arange(N_ROWS).astype(str).astype(object)
+    model.setDataBlock(0, 0, [np.arange(N_ROWS, dtype=float), values])
+    return(model)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for converting the data types of columns
+class Test_Conversion(object):
+    # Test if every chunk of a column is converted
+    def test_convert(self, large_model):
+        progress = []
+        large_model.conversionProgress.connect(
+            lambda *args: progress.append(args))
+        large_model.setColumnDataType(1, 'int')
+        n_chunks = progress[-1][1]
+        assert progress == [(i+1, n_chunks) for i in range(n_chunks)]
+        assert str(large_model.backend().column_dtype(1)) == 'int64'
+        assert np.array_equal(large_model.dataColumn(1), np.arange(N_ROWS))
+        large_model.setColumnDataType(0, 'str')
+        assert large_model.dataColumn(0)[N_ROWS-1] == str(N_ROWS-1.0)
+
+    # Test if a failed conversion reports all rows and changes nothing
+    def test_failed(self, large_model):
+        bad_rows = [1, CONVERT_CHUNK_ROWS+2, N_ROWS-1]
+        large_model.setDataBlock(bad_rows[0], 1, [['x']])
+        large_model.setDataBlock(bad_rows[1], 1, [['y']])
+        large_model.setDataBlock(bad_rows[2], 1, [['z']])
+        with pytest.raises(ConversionError) as error:
+            large_model.setColumnDataType(1, 'float')
+        assert error.value.rows.tolist() == bad_rows
+        assert large_model.backend().column_dtype(1) == object
+        assert large_model.dataColumn(1)[2] == '2'
+
+        # Clearing the column first always succeeds
+        large_model.setColumnDataType(1, 'float', clear=True)
+        assert large_model.dataColumn(1).isna().all()
+
+    # Test if conversions can be undone, restoring rounded values
+    def test_undo(self, large_model):
+        large_model.setDataBlock(0, 0, [[0.5]])
+        large_model.setColumnDataType(0, 'int')
+        assert large_model.dataColumn(0)[0] == 0
+        large_model.undoStack().undo()
+        assert large_model.dataColumn(0)[0] == 0.5
+        assert large_model.backend().column_dtype(0) == np.float64
+
+
+# Pytest class for dictionary-encoded columns
+class Test_Categories(object):
+    # Test if text is stored as codes into a list of unique values
+    def test_encode(self, model):
+        model.setColumnDataType(1, 'str')
+        model.setDataBlock(0, 1, [np.array(['a', 'b', 'a', 'a', None],
+                                           dtype=object)])
+        model.setColumnDataType(1, 'category')
+        backend = model.backend()
+        assert backend.get_categories(1).tolist() == ['a', 'b']
+        assert backend.get_codes(1).tolist() == [0, 1, 0, 0, -1]
+        assert model.dataColumn(1).tolist()[:4] == ['a', 'b', 'a', 'a']
+
+        # Setting values adds new categories and keeps the other codes
+        model.setDataBlock(3, 1, [['new', None]])
+        assert backend.get_categories(1).tolist() == ['a', 'b', 'new']
+        assert backend.get_codes(1).tolist() == [0, 1, 0, 2, -1]
+
+    # Test if a categorical column is stored without converting it
+    def test_from_frame(self, qapp, backend):
+        data_frame = pd.DataFrame({'A': pd.Categorical(list('xyyx')*1000)})
+        model = DataTableModel(None, lambda model: data_frame, backend)
+        try:
+            assert model.backend().get_codes(0)[:4].tolist() == [0, 1, 1, 0]
+            assert isinstance(model.dataFrame()['A'].dtype,
+                              pd.CategoricalDtype)
+        finally:
+            model.delete()
+
+
+# Pytest class for compact and nullable data types
+class Test_CompactDtypes(object):
+    # Test if optimizing memory uses the smallest exact data types
+    def test_optimize(self, model):
+        model.setDataBlock(0, 0, [np.arange(5.0), np.arange(5.0)+0.1])
+        model.setColumnDataType(0, 'int')
+        model.setColumnDataType(2, 'int')
+        model.setDataBlock(0, 2, [[300.0]])
+        model.optimizeMemory()
+        dtypes = [str(model.backend().column_dtype(col)) for col in range(3)]
+        assert dtypes == ['int8', 'float64', 'Int16']
+        assert model.dataColumn(2)[0] == 300
+
+        # All conversions are undone at once
+        model.undoStack().undo()
+        dtypes = [str(model.backend().column_dtype(col)) for col in range(3)]
+        assert dtypes == ['int64', 'float64', 'Int64']
+
+    # Test if integer columns store empty values in a separate mask
+    def test_nullable(self, model):
+        model.setDataBlock(0, 0, [np.arange(5.0)])
+        model.setColumnDataType(0, 'int8')
+        model.setDataBlock(1, 0, [[None]])
+        assert str(model.backend().column_dtype(0)) == 'Int8'
+        assert model.backend().get_masked(0).isna().tolist() == [
+            False, True, False, False, False]
+        assert model.columnStatistics(0)['nan_count'] == 1
+
+    # Test if values that do not fit a compact data type widen it
+    def test_widen(self, model):
+        model.setDataBlock(0, 0, [np.arange(5.0)])
+        model.setColumnDataType(0, 'int8')
+        model.setDataBlock(0, 0, [[1000]])
+        assert model.backend().column_dtype(0).kind == 'i'
+        assert model.dataColumn(0).tolist() == [1000, 1, 2, 3, 4]
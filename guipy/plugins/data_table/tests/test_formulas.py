@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pytest
+
+
+# %% PYTEST FIXTURES
+# Create a model with values in A and B, C = A + B and D = C * 2
+@pytest.fixture
+def formula_model(model):
+    model.setDataBlock(0, 0, [np.arange(5.0), np.ones(5)])
+    model.setColumnFormula(2, 'A + B')
+    model.setColumnFormula(3, 'C * 2')
+    return(model)
+
+
+# %% HELPER FUNCTIONS
+# This function checks that the formula columns hold the proper values
+def assert_formulas(model):
+    values = [np.asarray(model.dataColumn(col)) for col in range(4)]
+    np.testing.assert_array_equal(values[2], values[0]+values[1])
+    np.testing.assert_array_equal(values[3], values[2]*2)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for formula columns
+class Test_Formulas(object):
+    # Test if formulas are computed when set
+    def test_compute(self, formula_model):
+        assert formula_model.columnFormula(2) == 'A + B'
+        assert formula_model.dataColumn(3).tolist() == [2, 4, 6, 8, 10]
+        assert_formulas(formula_model)
+
+    # Test if formulas that depend on changed values are recomputed
+    def test_recompute(self, formula_model):
+        formula_model.setDataBlock(1, 0, [[10.0, 20.0]])
+        assert_formulas(formula_model)
+        formula_model.insertRows(2, 2)
+        formula_model.setDataBlock(2, 1, [[3.0, 4.0]])
+        assert_formulas(formula_model)
+
+    # Test if a formula that depends on itself raises an error
+    def test_cycle(self, formula_model):
+        with pytest.raises(ValueError):
+            formula_model.setColumnFormula(0, 'D + 1')
+        assert formula_model.columnFormula(0) is None
+
+    # Test if a formula that cannot be computed keeps the old formula
+    def test_invalid(self, formula_model):
+        with pytest.raises(Exception):
+            formula_model.setColumnFormula(3, 'C *')
+        assert formula_model.columnFormula(3) == 'C * 2'
+        assert_formulas(formula_model)
+
+    # Test if removing a formula keeps the values of its column
+    def test_remove(self, formula_model):
+        formula_model.setColumnFormula(2, None)
+        formula_model.setDataBlock(0, 0, [[100.0]])
+        assert formula_model.dataColumn(2)[0] == 1.0
+        assert formula_model.dataColumn(3)[0] == 2.0
+
+    # Test if setting a formula can be undone
+    def test_undo(self, formula_model):
+        formula_model.undoStack().undo()
+        assert formula_model.columnFormula(3) is None
+        assert np.isnan(formula_model.dataColumn(3)).all()
+        formula_model.undoStack().redo()
+        assert_formulas(formula_model)
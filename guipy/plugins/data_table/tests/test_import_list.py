@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Built-in imports
+from threading import Event
+from types import SimpleNamespace
+
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# GuiPy imports
+from guipy import widgets as GW
+from guipy.plugins.data_table.widgets import (
+    DataTableModel, ImportList, PrefetchedStream)
+from guipy.plugins.data_table.widgets import import_list as import_module
+
+
+# %% GLOBALS
+# Number of chunks in every file and number of rows in every chunk
+N_CHUNKS = 5
+CHUNK_ROWS = 100
+
+
+# %% PYTEST FIXTURES
+# Create an import list that opens every file in a new model
+@pytest.fixture
+def import_list(qapp, backend):
+    tables = {}
+
+    # This function opens a model for a file
+    def open_tab(filepath, import_func):
+        tables[filepath] = SimpleNamespace(
+            model=DataTableModel(None, import_func, backend))
+        return(tables[filepath])
+
+    import_list = ImportList(open_tab)
+    import_list.tables = tables
+    yield import_list
+    import_list.cancel_all()
+    for data_table in tables.values():
+        data_table.model.delete()
+    import_list.deleteLater()
+
+
+# %% HELPER FUNCTIONS
+# This function returns the chunks of the file with the provided filepath
+def get_chunks(filepath):
+    offset = int(filepath[-1])*N_CHUNKS*CHUNK_ROWS
+    return([pd.DataFrame({'A': np.arange(offset+i*CHUNK_ROWS,
+                                         offset+(i+1)*CHUNK_ROWS)})
+            for i in range(N_CHUNKS)])
+
+
+# This function streams the chunks of a file after waiting for an event
+def blocking_streamer(event, n_chunks=0):
+    # This function yields the chunks of a file
+    def streamer(filepath):
+        chunks = get_chunks(filepath)
+        yield from chunks[:n_chunks]
+        event.wait(10)
+        yield from chunks[n_chunks:]
+
+    return(streamer)
+
+
+# This function waits until all files in the import list have been imported
+def wait_imported(import_list, qtbot):
+    qtbot.waitUntil(lambda: not import_list.entries, timeout=10000)
+    for data_table in import_list.tables.values():
+        qtbot.waitUntil(lambda: not data_table.model.isFetching(),
+                        timeout=10000)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for the PrefetchedStream class
+class Test_PrefetchedStream(object):
+    # Test if the first chunk is returned before all chunks in the stream
+    def test_iter(self):
+        chunks = get_chunks('file0')
+        stream = PrefetchedStream(chunks[0], iter(chunks[1:]))
+        assert list(stream) == chunks
+        assert stream.progress() == -1
+
+    # Test if the stream is closed with the prefetched stream
+    def test_close(self):
+        stream = blocking_streamer(Event())('file0')
+        PrefetchedStream(None, stream).close()
+        assert list(stream) == []
+
+
+# Pytest class for importing lists of files
+class Test_ImportList(object):
+    # Test if all files are imported into their own data table
+    @pytest.mark.parametrize('n_threads', [1, 4])
+    def test_import(self, import_list, n_threads, monkeypatch, qtbot):
+        monkeypatch.setattr(import_module, 'IMPORT_THREADS', n_threads)
+        filepaths = ['file%i' % (i) for i in range(3)]
+        for filepath in filepaths:
+            import_list.add_file(lambda x: iter(get_chunks(x)), filepath)
+        wait_imported(import_list, qtbot)
+        assert sorted(import_list.tables) == filepaths
+        for filepath, data_table in import_list.tables.items():
+            pd.testing.assert_frame_equal(
+                data_table.model.dataFrame(),
+                pd.concat(get_chunks(filepath), ignore_index=True),
+                check_dtype=False)
+        assert import_list.isHidden()
+
+    # Test if no more files are read at the same time than allowed
+    def test_threads(self, import_list, monkeypatch, qtbot):
+        monkeypatch.setattr(import_module, 'IMPORT_THREADS', 1)
+        event = Event()
+        import_list.add_file(blocking_streamer(event), 'file0')
+        import_list.add_file(blocking_streamer(event), 'file1')
+        assert import_list.entries[0].importer is not None
+        assert import_list.entries[1].importer is None
+        event.set()
+        wait_imported(import_list, qtbot)
+        assert len(import_list.tables) == 2
+
+    # Test if a file that cannot be read is reported and removed
+    def test_failed(self, import_list, monkeypatch, qtbot):
+        messages = []
+        monkeypatch.setattr(GW.QMessageBox, 'warning',
+                            lambda *args: messages.append(args[-1]))
+
+        # This function fails to read a file
+        def streamer(filepath):
+            raise OSError("File was removed")
+
+        import_list.add_file(streamer, 'file0')
+        import_list.add_file(lambda x: iter(get_chunks(x)), 'file1')
+        wait_imported(import_list, qtbot)
+        assert len(messages) == 1 and "File was removed" in messages[0]
+        assert list(import_list.tables) == ['file1']
+
+    # Test if cancelling a file that is being read does not open it
+    def test_cancel_reading(self, import_list, qapp):
+        event = Event()
+        import_list.add_file(blocking_streamer(event), 'file0')
+        import_list.cancel_entry(import_list.entries[0])
+        assert not import_list.entries
+        event.set()
+        import_list.cancel_all()
+        qapp.processEvents()
+        assert not import_list.tables
+
+    # Test if cancelling a file that is being loaded keeps its loaded rows
+    def test_cancel_loading(self, import_list, qtbot):
+        event = Event()
+        import_list.add_file(blocking_streamer(event, 2), 'file0')
+        entry = import_list.entries[0]
+        qtbot.waitUntil(lambda: entry.model is not None, timeout=10000)
+        import_list.cancel_entry(entry)
+        event.set()
+        wait_imported(import_list, qtbot)
+        model = import_list.tables['file0'].model
+        assert model.rowCount() < N_CHUNKS*CHUNK_ROWS
+        assert np.array_equal(model.dataColumn(0),
+                              np.arange(model.rowCount()))
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table.backends.base import CONVERT_CHUNK_ROWS
+from guipy.plugins.data_table.backends.memmap import (
+    FrozenBlock, MemmapBackend, MemmapColumn)
+
+
+# %% GLOBALS
+# Number of values in the columns, such that they hold several blocks
+N_ROWS = 2*CONVERT_CHUNK_ROWS+10
+
+
+# %% PYTEST FIXTURES
+# Create a column that is stored in a spill file in the temporary directory
+@pytest.fixture
+def column(tmpdir, monkeypatch):
+    monkeypatch.setattr(MemmapBackend, 'scratch_dir', str(tmpdir))
+    monkeypatch.setattr(MemmapColumn, 'SPILL_BYTES', 2**10)
+    column = MemmapColumn.from_array(np.arange(N_ROWS, dtype=float))
+    yield column
+    column.close()
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for the MemmapColumn class
+class Test_MemmapColumn(object):
+    # Test if a large column is stored in a spill file and read without copies
+    def test_spill(self, column):
+        assert column._file is not None
+        array = column.to_array()
+        assert not array.flags.writeable
+        assert np.shares_memory(array, column._data)
+        assert np.array_equal(array, np.arange(N_ROWS))
+
+    # Test if small and object columns are kept in memory
+    @pytest.mark.parametrize('values', [
+        np.arange(10.0), np.array(['a']*10**4, dtype=object)])
+    def test_in_memory(self, values):
+        column = MemmapColumn.from_array(values)
+        assert column._file is None
+        column.close()
+
+    # Test if frozen blocks keep their values while the column changes
+    def test_frozen(self, column):
+        chunks = column.freeze_chunks()
+        assert all(isinstance(chunk, FrozenBlock) for chunk in chunks[:-1])
+        column.set_range(5, np.array([-1.0]))
+        column.delete(0, 1)
+        assert chunks[0].load()[5] == 5
+        assert chunks[1].load()[0] == CONVERT_CHUNK_ROWS
+        assert column.get_value(4) == -1
+
+        # Blocks that were not modified are reused
+        column.set_range(CONVERT_CHUNK_ROWS+1, np.array([-2.0]))
+        new_chunks = column.freeze_chunks()
+        assert new_chunks[0] is not chunks[0]
+        assert new_chunks[0] is column.freeze_chunks()[0]
+
+    # Test if empty rows after the stored values are not written
+    def test_tail(self, column):
+        capacity = len(column._data)
+        column.insert(len(column), 10**8)
+        assert len(column) == N_ROWS+10**8
+        assert len(column._data) == capacity
+        assert np.isnan(column.get_value(N_ROWS+10**7))
+
+        # Setting a value only stores the tail up to that value
+        column.set_range(N_ROWS+10, np.array([1.0]))
+        assert column._length == N_ROWS+11
+        assert np.isnan(column.get_range(N_ROWS, N_ROWS+10)).all()
+
+    # Test if arrays stay valid after the column is closed
+    def test_close(self, column):
+        array = column.to_array()
+        column.close()
+        assert column._file is None and not len(column)
+        assert array[-1] == N_ROWS-1
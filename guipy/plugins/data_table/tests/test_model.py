@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+from qtpy import QtCore as QC
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import is_constant
+from guipy.plugins.data_table.widgets import model as model_module
+
+
+# %% HELPER FUNCTIONS
+# This function returns the value of a cell in the model
+def get_value(model, row, col):
+    value = model.data(model.index(row, col), QC.Qt.EditRole)
+    return(value.value() if hasattr(value, 'value') else value)
+
+
+# This function sets the value of a cell in the model
+def set_value(model, row, col, value):
+    model.setData(model.index(row, col), value, QC.Qt.EditRole)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for resizing a model
+class Test_Resize(object):
+    # Test if inserting many rows keeps all values and stores empty cells
+    # implicitly
+    def test_insert_many_rows(self, model, monkeypatch):
+        monkeypatch.setattr(model_module, 'MAX_DENSE_EMPTY_CELLS', 100)
+        set_value(model, 0, 0, 1.0)
+        model.insertRows(count=10**5)
+        assert model.rowCount() == 10**5+5
+        assert model.backend().IMPLICIT_EMPTY
+        assert get_value(model, 0, 0) == 1.0
+        assert pd.isna(model.dataColumn(0)[1:]).all()
+        if(model.backend().name != 'Columnar'):
+            return
+        for col in range(model.columnCount()):
+            chunks = model.backend().get_chunks(col)
+            assert sum(not is_constant(chunk) for chunk in chunks) <= 1
+
+    # Test if inserting many columns keeps all values
+    def test_insert_many_columns(self, model, monkeypatch):
+        monkeypatch.setattr(model_module, 'MAX_DENSE_EMPTY_CELLS', 100)
+        set_value(model, 1, 1, 2.0)
+        model.insertColumns(1, 50)
+        assert model.columnCount() == 55
+        assert model.backend().IMPLICIT_EMPTY
+        assert get_value(model, 1, 51) == 2.0
+        assert pd.isna(model.dataColumn(1)).all()
+
+    # Test if inserting a few rows keeps the backend of the model
+    def test_insert_few_rows(self, model, backend):
+        model.insertRows(2, 3)
+        assert model.backend().name == backend
+        assert model.rowCount() == 8
+
+    # Test if a resize can be undone and the model edited afterward
+    def test_undo_resize(self, model, monkeypatch):
+        monkeypatch.setattr(model_module, 'MAX_DENSE_EMPTY_CELLS', 100)
+        set_value(model, 0, 0, 1.0)
+        model.insertRows(count=10**4)
+        model.undoStack().undo()
+        assert model.rowCount() == 5
+        set_value(model, 3, 0, 4.0)
+        values = model.dataColumn(0)
+        assert values[0] == 1.0 and values[3] == 4.0
+        assert np.isnan(values[[1, 2, 4]]).all()
+
+
+# Pytest class for setting blocks of values in a model
+class Test_SetDataBlock(object):
+    # Test if a 2D array is interpreted as rows and columns
+    def test_array(self, model):
+        assert model.setDataBlock(1, 2, np.arange(6.0).reshape(3, 2))
+        assert np.array_equal(model.dataColumn(2)[1:4], [0, 2, 4])
+        assert np.array_equal(model.dataColumn(3)[1:4], [1, 3, 5])
+        assert pd.isna(model.dataColumn(2)[[0, 4]]).all()
+
+    # Test if lists and data frames are interpreted as columns
+    def test_columns(self, model):
+        model.setDataBlock(0, 0, [[1.0, 2.0], [3.0, 4.0]])
+        model.setDataBlock(3, 3, pd.DataFrame({'x': [5.0, 6.0]}))
+        assert model.dataBlock(0, 0, 2, 2)[1].tolist() == [3.0, 4.0]
+        assert model.dataColumn(3)[3:].tolist() == [5.0, 6.0]
+
+    # Test if text is converted to the dtype of a numerical column
+    def test_convert(self, model):
+        model.setDataBlock(0, 0, [np.array(['1.5', '2'], dtype=object)])
+        assert model.dataColumn(0)[:2].tolist() == [1.5, 2.0]
+        assert model.backend().column_dtype(0) == np.float64
+
+    # Test if a block that does not fit in the model raises an error
+    @pytest.mark.parametrize('top, left', [(4, 0), (0, 4), (-1, 0)])
+    def test_out_of_range(self, model, top, left):
+        with pytest.raises(IndexError):
+            model.setDataBlock(top, left, np.ones((2, 2)))
+
+    # Test if a block is set in the shown rows of a sorted model
+    def test_sorted(self, model):
+        model.setDataBlock(0, 0, [[4.0, 3.0, 2.0, 1.0, 0.0]])
+        model.sortByColumns([(0, QC.Qt.AscendingOrder)])
+        model.setDataBlock(0, 1, [[10.0, 11.0]])
+        assert get_value(model, 0, 1) == 10.0
+        assert model.dataColumn(1)[[4, 3]].tolist() == [10.0, 11.0]
+
+
+# Pytest class for inserting and removing columns in batches
+class Test_Columns(object):
+    # Test if default names continue beyond two letters
+    def test_many_columns(self, model):
+        model.insertColumns(count=1000)
+        names = model.columnNames()
+        assert len(names) == 1005
+        assert names[700:703] == ['ZY', 'ZZ', 'AAA']
+        assert len(set(names)) == len(names)
+
+    # Test if default names follow the position of a column
+    def test_default_names(self, model):
+        model.setColumnName(0, 'x')
+        set_value(model, 0, 2, 1.0)
+        model.insertColumns(1, 2)
+        assert model.columnNames() == ['x', 'B', 'C', 'D', 'E', 'F', 'G']
+        assert get_value(model, 0, 4) == 1.0
+        model.removeColumns(1, 3)
+        assert model.columnNames() == ['x', 'B', 'C', 'D']
+        assert get_value(model, 0, 1) == 1.0
+
+    # Test if columns holding values can be removed in a single batch
+    def test_remove_batch(self, model):
+        model.insertColumns(count=500)
+        model.setDataBlock(0, 0, np.arange(505.0*5).reshape(5, 505))
+        model.removeColumns(2, 500)
+        assert model.columnCount() == 5
+        assert model.dataBlock(0, 0, 5, 5)[2].tolist() == [
+            502, 1007, 1512, 2017, 2522]
+
+
+# Pytest class for removing sets of rows from a model
+class Test_RemoveRowSet(object):
+    # Test if rows given by indices or a mask are removed and can be restored
+    @pytest.mark.parametrize('rows', [
+        [0, 2, 3], [True, False, True, True, False]])
+    def test_remove(self, model, rows):
+        model.setDataBlock(0, 0, [np.arange(5.0)])
+        assert model.removeRowSet(rows)
+        assert model.rowCount() == 2
+        assert model.dataColumn(0).tolist() == [1.0, 4.0]
+        model.undoStack().undo()
+        assert model.dataColumn(0).tolist() == [0, 1, 2, 3, 4]
+
+    # Test if many ranges of rows are removed with a single reset
+    def test_many_ranges(self, model, monkeypatch, qtbot):
+        monkeypatch.setattr(model_module, 'MAX_REMOVE_RANGES', 2)
+        model.insertRows(count=15)
+        model.setDataBlock(0, 0, [np.arange(20.0)])
+        with qtbot.waitSignal(model.modelReset):
+            model.removeRowSet(np.arange(0, 20, 2))
+        assert model.dataColumn(0).tolist() == list(range(1, 20, 2))
+
+    # Test if the shown rows of a sorted model are removed
+    def test_sorted(self, model):
+        model.setDataBlock(0, 0, [[4.0, 3.0, 2.0, 1.0, 0.0]])
+        model.sortByColumns([(0, QC.Qt.AscendingOrder)])
+        model.removeRowSet([0, 1])
+        assert model.dataColumn(0).tolist() == [4.0, 3.0, 2.0]
+        assert get_value(model, 0, 0) == 2.0
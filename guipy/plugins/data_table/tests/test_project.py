@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Built-in imports
+import os
+from os import path
+
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+from qtpy import QtCore as QC
+
+# GuiPy imports
+from guipy.plugins.data_table import project as project_module
+from guipy.plugins.data_table.backends.base import CONVERT_CHUNK_ROWS
+from guipy.plugins.data_table.project import (
+    ProjectFile, snapshot_table, write_project)
+from guipy.plugins.data_table.widgets import DataTableModel
+
+
+# %% GLOBALS
+# Number of rows in the data frames that are saved
+N_ROWS = 4*CONVERT_CHUNK_ROWS
+
+
+# %% PYTEST FIXTURES
+# Create a model holding columns of every kind using the requested backend
+@pytest.fixture
+def data_model(qapp, backend):
+    rng = np.random.default_rng(0)
+    data_frame = pd.DataFrame({
+        'float': rng.random(N_ROWS),
+        'int': rng.integers(0, 100, N_ROWS),
+        'str': rng.choice(['a', 'bb', 'ccc'], N_ROWS).astype(object),
+        'nullable': pd.array(rng.integers(0, 5, N_ROWS), dtype='Int64'),
+        'date': pd.date_range('2000-01-01', periods=N_ROWS, freq='s')})
+    data_frame.loc[::7, 'nullable'] = pd.NA
+    data_frame['category'] = data_frame['str'].astype('category')
+    model = DataTableModel(None, lambda model: data_frame.copy(), backend)
+    model.insertRows(count=10)
+    yield model
+    model.delete()
+
+
+# %% HELPER FUNCTIONS
+# This function loads the first data table of a project into a new model
+def load_model(project):
+    model = DataTableModel(None, lambda model: project.load_backend(0))
+    project.restore_properties(0, model)
+    return(model)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for saving and loading project files
+class Test_Project(object):
+    # Test if a saved data table is loaded with the same data and properties
+    def test_round_trip(self, data_model, tmpdir):
+        data_model.setColumnPrecision(0, 3)
+        filepath = path.join(str(tmpdir), 'table.gpy')
+        project = write_project(filepath, [snapshot_table('x', data_model)])
+        project.close()
+
+        # Load the project and compare it with the saved model
+        project = ProjectFile(filepath)
+        model = load_model(project)
+        try:
+            assert project.tables[0]['name'] == 'x'
+            assert model.columnNames() == data_model.columnNames()
+            assert model.columnPrecision(0) == 3
+            pd.testing.assert_frame_equal(model.dataFrame(),
+                                          data_model.dataFrame(),
+                                          check_dtype=False)
+            for col in range(model.columnCount()):
+                assert (str(model.backend().column_dtype(col)) ==
+                        str(data_model.backend().column_dtype(col)))
+        finally:
+            model.delete()
+            project.close()
+
+    # Test if saving a modified data table again only appends its changes
+    def test_incremental_save(self, data_model, tmpdir):
+        filepath = path.join(str(tmpdir), 'table.gpy')
+        project = write_project(filepath, [snapshot_table('x', data_model)])
+        size = path.getsize(filepath)
+
+        # Modify a single value and save again
+        # Only the chunk holding the value and the index should be appended
+        data_model.setData(data_model.index(5, 0), 0.5, QC.Qt.EditRole)
+        project = write_project(filepath, [snapshot_table('x', data_model)],
+                                project=project)
+        assert path.getsize(filepath)-size < 2*CONVERT_CHUNK_ROWS*8
+
+        # Check that the modification was saved
+        model = load_model(project)
+        try:
+            assert model.dataColumn(0)[5] == 0.5
+            pd.testing.assert_frame_equal(model.dataFrame(),
+                                          data_model.dataFrame(),
+                                          check_dtype=False)
+        finally:
+            model.delete()
+            project.close()
+
+    # Test if modifying a value only changes the version of its chunk
+    def test_chunk_versions(self, data_model):
+        backend = data_model.backend()
+        versions = [backend.get_chunk_versions(col)
+                    for col in range(backend.column_count())]
+        assert all(len(versions[col]) == len(backend.get_chunks(col))
+                   for col in range(backend.column_count()))
+
+        # Modify a value in the second chunk of the first column
+        data_model.setData(data_model.index(CONVERT_CHUNK_ROWS+1, 0), 0.5,
+                           QC.Qt.EditRole)
+        new_versions = backend.get_chunk_versions(0)
+        assert [old != new for old, new in zip(versions[0], new_versions)
+                ].count(True) == 1
+        for col in range(1, backend.column_count()):
+            assert backend.get_chunk_versions(col) == versions[col]
+
+        # Remove the first row, which moves all rows after it
+        data_model.removeRows(0, 1)
+        assert backend.get_chunk_versions(1)[0] != versions[1][0]
+
+    # Test if writing a project file completely again closes the old file
+    # before replacing it, while lazily loaded columns can still be read
+    @pytest.mark.parametrize('compact', ['ratio', 'version', 'save_as'])
+    def test_hand_off(self, data_model, tmpdir, monkeypatch, compact):
+        filepath = path.join(str(tmpdir), 'table.gpy')
+        write_project(filepath, [snapshot_table('x', data_model)]).close()
+        project = ProjectFile(filepath)
+        model = load_model(project)
+
+        # Record whether the old file is closed whenever a file is replaced
+        closed = []
+        os_replace = os.replace
+
+        # This function replaces a file
+        def replace(src, dst):
+            closed.append(project._file.closed)
+            os_replace(src, dst)
+
+        monkeypatch.setattr(project_module.os, 'replace', replace)
+
+        # Make sure that saving the modified model writes a new file
+        if(compact == 'ratio'):
+            monkeypatch.setattr(project_module, 'COMPACT_RATIO', 1)
+        elif(compact == 'version'):
+            project.version -= 1
+        else:
+            filepath = path.join(str(tmpdir), 'copy.gpy')
+        model.setData(model.index(5, 0), 0.5, QC.Qt.EditRole)
+        new_project = write_project(
+            filepath, [snapshot_table('x', model)], project=project)
+
+        # Check that the old file was closed and all values can be read
+        try:
+            assert closed == [True] and project._file.closed
+            assert new_project is not project and new_project.chunks
+            data_model.setData(data_model.index(5, 0), 0.5, QC.Qt.EditRole)
+            pd.testing.assert_frame_equal(model.dataFrame(),
+                                          data_model.dataFrame(),
+                                          check_dtype=False)
+        finally:
+            model.delete()
+            new_project.close()
+
+    # Test if chunks that are not copied are read into memory
+    def test_hand_off_memory(self, data_model, tmpdir):
+        filepath = path.join(str(tmpdir), 'table.gpy')
+        project = write_project(filepath, [snapshot_table('x', data_model)])
+        model = load_model(project)
+        new_project = write_project(path.join(str(tmpdir), 'empty.gpy'), [],
+                                    project=project)
+        try:
+            assert project._file.closed and not new_project.chunks
+            pd.testing.assert_frame_equal(model.dataFrame(),
+                                          data_model.dataFrame(),
+                                          check_dtype=False)
+        finally:
+            model.delete()
+            new_project.close()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+from qtpy import QtCore as QC
+
+# GuiPy imports
+from guipy.plugins.data_table.widgets import row_filter
+from guipy.plugins.data_table.widgets.row_filter import (
+    evaluate_filter, get_expression_names)
+
+
+# %% GLOBALS
+# Columns that filter expressions are evaluated on
+COLUMNS = {'A': np.arange(10.0),
+           'B': np.arange(10)[::-1],
+           'my col': np.arange(10) % 2,
+           'C': pd.Categorical(list('xyzxyzxyzx'))}
+
+
+# %% PYTEST FIXTURES
+# Create a model holding the values 0 to 9 in its first column
+@pytest.fixture
+def filled_model(model):
+    model.insertRows(count=5)
+    model.setDataBlock(0, 0, [np.arange(10.0), np.arange(10.0)[::-1]])
+    return(model)
+
+
+# %% HELPER FUNCTIONS
+# This function filters the rows of a model and waits for it to finish
+def filter_rows(qtbot, model, expression):
+    model.filterRows(expression)
+    qtbot.waitUntil(lambda: not model.isFiltering(), timeout=10000)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for evaluating filter expressions
+class Test_EvaluateFilter(object):
+    # Test if expressions are evaluated for every row
+    @pytest.mark.parametrize('expression, rows', [
+        ('A > 3 & B > 3', [4, 5]),
+        ('`my col` == 1 | A < 1', [0, 1, 3, 5, 7, 9]),
+        ("C == 'x'", [0, 3, 6, 9]),
+        ('A > 100', [])])
+    def test_evaluate(self, expression, rows):
+        mask = evaluate_filter(expression, COLUMNS)
+        assert np.flatnonzero(mask).tolist() == rows
+
+    # Test if evaluating in chunks gives the same result
+    def test_chunks(self, monkeypatch):
+        expected = evaluate_filter('A % 3 == 0', COLUMNS)
+        monkeypatch.setattr(row_filter, 'FILTER_CHUNK_ROWS', 3)
+        assert np.array_equal(evaluate_filter('A % 3 == 0', COLUMNS),
+                              expected)
+
+    # Test if only the columns in an expression are used
+    def test_names(self):
+        assert get_expression_names('A > `my col` + AB', COLUMNS) == [
+            'A', 'my col']
+
+    # Test if an expression that does not give a mask raises an error
+    def test_not_boolean(self):
+        with pytest.raises(ValueError):
+            evaluate_filter('A + 1', COLUMNS)
+
+    # Test if the evaluation can be cancelled
+    def test_interrupted(self):
+        assert evaluate_filter('A > 3', COLUMNS, lambda: True) is None
+
+
+# Pytest class for filtering the rows of a model
+class Test_FilterRows(object):
+    # Test if only the rows passing the filter are shown
+    def test_filter(self, qtbot, filled_model):
+        filter_rows(qtbot, filled_model, 'A > 2 & B > 2')
+        assert filled_model.rowCount() == 4
+        assert [filled_model.mapToSource(row) for row in range(4)] == [
+            3, 4, 5, 6]
+
+        # Edit a shown row and remove the filter
+        filled_model.setDataBlock(1, 0, [[-4.0]])
+        filter_rows(qtbot, filled_model, '')
+        assert filled_model.rowCount() == 10
+        assert filled_model.dataColumn(0)[4] == -4.0
+
+    # Test if filtering can be combined with sorting
+    def test_sorted(self, qtbot, filled_model):
+        filled_model.sortByColumns([(1, QC.Qt.AscendingOrder)])
+        filter_rows(qtbot, filled_model, 'A < 3')
+        assert [filled_model.mapToSource(row) for row in range(3)] == [
+            2, 1, 0]
+
+    # Test if an invalid expression keeps the current filter
+    def test_failed(self, qtbot, filled_model):
+        filter_rows(qtbot, filled_model, 'A > 4')
+        with qtbot.waitSignal(filled_model.filterFailed, timeout=10000):
+            filled_model.filterRows('A +')
+        assert filled_model.rowCount() == 5
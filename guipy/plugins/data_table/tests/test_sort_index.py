@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+from qtpy import QtCore as QC
+
+
+# %% GLOBALS
+ASC = QC.Qt.AscendingOrder
+DESC = QC.Qt.DescendingOrder
+
+
+# %% HELPER FUNCTIONS
+# This function returns the stored indices of all rows in the shown order
+def shown_rows(model):
+    return([model.mapToSource(row) for row in range(model.rowCount())])
+
+
+# This function writes the provided values into a column of the model
+def set_column(model, col, values):
+    for row, value in enumerate(values):
+        model.setData(model.index(row, col), value, QC.Qt.EditRole)
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for sorting the rows of a model
+class Test_SortIndex(object):
+    # Test if a column without any values can be sorted in ascending order
+    def test_empty_ascending(self, model):
+        model.sortByColumns([(0, ASC)])
+        assert shown_rows(model) == [0, 1, 2, 3, 4]
+
+    # Test if a column without any values can be sorted in descending order
+    def test_empty_descending(self, model):
+        model.sortByColumns([(0, DESC)])
+        assert shown_rows(model) == [0, 1, 2, 3, 4]
+
+    # Test if a column without any values can be one of several keys
+    def test_empty_multi_key(self, model):
+        set_column(model, 1, [2.0, 1.0, 2.0, None, 1.0])
+        model.sortByColumns([(0, ASC), (1, DESC)])
+        assert shown_rows(model) == [0, 2, 1, 4, 3]
+        model.sortByColumns([(1, ASC), (0, DESC)])
+        assert shown_rows(model) == [1, 4, 0, 2, 3]
+
+    # Test if sorting is stable and keeps empty values at the end
+    def test_stable(self, model):
+        set_column(model, 0, [3.0, None, 1.0, 3.0, 1.0])
+        model.sortByColumns([(0, ASC)])
+        assert shown_rows(model) == [2, 4, 0, 3, 1]
+        model.sortByColumns([(0, DESC)])
+        assert shown_rows(model) == [0, 3, 2, 4, 1]
+
+    # Test if rows are shown in stored order again without sort keys
+    def test_unsort(self, model):
+        set_column(model, 0, [3.0, 2.0, 1.0, 0.0, -1.0])
+        model.sortByColumns([(0, ASC)])
+        assert shown_rows(model) == [4, 3, 2, 1, 0]
+        model.sortByColumns([])
+        assert shown_rows(model) == [0, 1, 2, 3, 4]
+        assert np.array_equal(model.dataColumn(0), [3, 2, 1, 0, -1])
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pytest
+
+# GuiPy imports
+from guipy.plugins.data_table.widgets.statistics import (
+    merge, summarize, unmerge)
+
+
+# %% GLOBALS
+# Changes that are made to the values of a model one after another
+CHANGES = [
+    lambda model: model.setDataBlock(3, 0, [[100.0, -100.0, np.inf]]),
+    lambda model: model.insertRows(10, 5),
+    lambda model: model.setDataBlock(10, 0, [[1e6, np.nan, 2.5]]),
+    lambda model: model.removeRows(0, 4),
+    lambda model: model.removeRowSet(np.arange(0, 40, 3)),
+    lambda model: model.clearRows(5, 3),
+    lambda model: model.undoStack().undo(),
+    lambda model: model.undoStack().undo(),
+    lambda model: model.undoStack().redo(),
+    lambda model: model.setDataBlock(0, 0, [np.full(20, 7.0)])]
+
+
+# %% PYTEST FIXTURES
+# Create a model holding random values in its first two columns
+@pytest.fixture
+def random_model(model):
+    rng = np.random.default_rng(0)
+    model.insertRows(count=95)
+    model.setDataBlock(0, 0, [rng.normal(size=100), rng.integers(0, 9, 100)])
+    return(model)
+
+
+# %% HELPER FUNCTIONS
+# This function checks the statistics of a column against its values
+def assert_statistics(model, col):
+    stats = model.columnStatistics(col)
+    values = np.asarray(model.dataColumn(col), dtype=float)
+    finite = values[np.isfinite(values)]
+    assert stats['count'] == np.count_nonzero(~np.isnan(values))
+    assert stats['nan_count'] == np.count_nonzero(np.isnan(values))
+    assert stats['min'] == finite.min()
+    assert stats['max'] == finite.max()
+    assert np.isclose(stats['mean'], finite.mean())
+    assert np.isclose(stats['var'], finite.var(ddof=1))
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for summarizing values
+class Test_Summarize(object):
+    # Test if merging and unmerging summaries gives the summary of the values
+    def test_merge_unmerge(self):
+        values = np.random.default_rng(1).normal(size=50)
+        a, b = summarize(values[:20]), summarize(values[20:])
+        total = summarize(values)
+        merged = merge(a, b)
+        for key in ('n_finite', 'mean', 'm2', 'min', 'max'):
+            assert np.isclose(merged[key], total[key])
+        assert np.isclose(unmerge(total, b)['m2'], a['m2'])
+        assert unmerge(total, b)['stale'] == (b['min'] == total['min'] or
+                                              b['max'] == total['max'])
+
+    # Test if empty and infinite values are counted but not summarized
+    def test_special_values(self):
+        stats = summarize([1.0, np.nan, np.inf, 3.0])
+        assert (stats['count'], stats['nan_count']) == (3, 1)
+        assert (stats['n_finite'], stats['mean']) == (2, 2.0)
+        stats = summarize(np.array(['a', None, 'b'], dtype=object))
+        assert not stats['numeric']
+        assert (stats['count'], stats['nan_count']) == (2, 1)
+
+
+# Pytest class for the statistics of the columns of a model
+class Test_ColumnStatistics(object):
+    # Test if the statistics stay correct while the values change
+    def test_incremental(self, random_model):
+        assert_statistics(random_model, 0)
+        assert_statistics(random_model, 1)
+        for change in CHANGES:
+            change(random_model)
+            assert_statistics(random_model, 0)
+            assert_statistics(random_model, 1)
+
+    # Test if the statistics of text and empty columns only count values
+    def test_non_numeric(self, random_model):
+        random_model.setDataBlock(0, 2, [np.array(['a', None, 'b'],
+                                                  dtype=object)])
+        stats = random_model.columnStatistics(2)
+        assert (stats['count'], stats['nan_count']) == (2, 98)
+        assert stats['mean'] is None and stats['min'] is None
+        stats = random_model.columnStatistics(3)
+        assert (stats['count'], stats['nan_count']) == (0, 100)
+        assert stats['var'] is None
+
+    # Test if only the versions of changed columns change
+    def test_versions(self, random_model):
+        versions = [random_model.columnVersion(col) for col in range(5)]
+        random_model.setDataBlock(0, 1, [[1.0]])
+        assert [random_model.columnVersion(col) for col in range(5)] == [
+            versions[0], random_model.columnVersion(1), *versions[2:]]
+        assert random_model.columnVersion(1) != versions[1]
+        random_model.removeRows(0, 1)
+        assert all(random_model.columnVersion(col) != versions[col]
+                   for col in range(5))
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Built-in imports
+from os import path
+
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+from qtpy import QtCore as QC
+
+# GuiPy imports
+from guipy.plugins.data_table.formatters.csv import CSVFormatter
+from guipy.plugins.data_table.widgets import DataTableModel
+
+
+# %% GLOBALS
+# Number of chunks in a stream and number of rows in every chunk
+N_CHUNKS = 10
+CHUNK_ROWS = 100
+
+
+# %% PYTEST FIXTURES
+# Create the chunks of a stream of data frames
+@pytest.fixture
+def chunks():
+    rng = np.random.default_rng(0)
+    return([pd.DataFrame({'A': rng.random(CHUNK_ROWS),
+                          'B': np.arange(i*CHUNK_ROWS, (i+1)*CHUNK_ROWS)})
+            for i in range(N_CHUNKS)])
+
+
+# Create models that load the provided stream of data frames
+@pytest.fixture
+def stream_model(qapp, backend):
+    models = []
+
+    # This function creates a model that loads a stream
+    def create_model(stream):
+        models.append(DataTableModel(None, lambda model: stream, backend))
+        return(models[-1])
+
+    yield create_model
+    for model in models:
+        model.delete()
+
+
+# Create a CSV-file holding all chunks and a formatter that streams it
+@pytest.fixture
+def csv_file(chunks, tmpdir):
+    filepath = path.join(str(tmpdir), 'data.csv')
+    pd.concat(chunks, ignore_index=True).to_csv(filepath, index=False)
+    formatter = CSVFormatter()
+    formatter.FIRST_CHUNK_ROWS = 10
+    formatter.CHUNK_ROWS = CHUNK_ROWS
+    return(formatter, filepath)
+
+
+# %% HELPER FUNCTIONS
+# This function yields the provided chunks and then raises an error
+def failing_stream(chunks):
+    yield from chunks
+    raise OSError("File was removed")
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for loading rows incrementally
+class Test_FetchRows(object):
+    # Test if all rows can be loaded at once
+    def test_fetch_all(self, stream_model, chunks):
+        model = stream_model(iter(chunks))
+        assert model.rowCount() == CHUNK_ROWS
+        assert model.canFetchMore() and model.isFetching()
+        model.fetchAll()
+        assert not model.isFetching() and model.fetchProgress() == 1
+        assert not model.isModified()
+        pd.testing.assert_frame_equal(
+            model.dataFrame(), pd.concat(chunks, ignore_index=True),
+            check_dtype=False)
+
+    # Test if rows are loaded in the background
+    def test_fetch_more(self, stream_model, chunks, qtbot):
+        model = stream_model(iter(chunks))
+        qtbot.waitUntil(lambda: not model.isFetching(), timeout=10000)
+        assert model.rowCount() == N_CHUNKS*CHUNK_ROWS
+        assert np.array_equal(model.dataColumn(1),
+                              np.arange(N_CHUNKS*CHUNK_ROWS))
+
+    # Test if rows that are loaded while sorted are sorted once all are loaded
+    def test_sorted(self, stream_model, chunks):
+        model = stream_model(iter(chunks))
+        model.sortByColumns([(1, QC.Qt.DescendingOrder)])
+        model.fetchAll()
+        assert [model.mapToSource(row) for row in range(3)] == [
+            N_CHUNKS*CHUNK_ROWS-1, N_CHUNKS*CHUNK_ROWS-2,
+            N_CHUNKS*CHUNK_ROWS-3]
+
+    # Test if stopping keeps all rows that were loaded
+    def test_stop(self, stream_model, chunks):
+        model = stream_model(iter(chunks))
+        model.stopFetching()
+        assert not model.canFetchMore() and model.fetchProgress() == 1
+        assert model.rowCount() == CHUNK_ROWS
+        assert np.array_equal(model.dataColumn(1), np.arange(CHUNK_ROWS))
+
+    # Test if an error while reading keeps all rows before it
+    def test_error(self, stream_model, chunks):
+        model = stream_model(failing_stream(chunks[:3]))
+        with pytest.raises(OSError):
+            model.fetchAll()
+        assert not model.isFetching()
+        assert model.rowCount() == 3*CHUNK_ROWS
+
+
+# Pytest class for streaming files into a model
+class Test_StreamFile(object):
+    # Test if a streamed file is loaded entirely while reporting progress
+    def test_stream(self, stream_model, csv_file, qtbot):
+        formatter, filepath = csv_file
+        stream = formatter.streamer(filepath)
+        model = stream_model(stream)
+        progress = []
+        model.fetchProgressChanged.connect(progress.append)
+        assert model.rowCount() == formatter.FIRST_CHUNK_ROWS
+        qtbot.waitUntil(lambda: not model.isFetching(), timeout=10000)
+        assert progress == sorted(progress) and progress[-1] == 1
+        pd.testing.assert_frame_equal(model.dataFrame(),
+                                      formatter.importer(filepath),
+                                      check_dtype=False)
+
+    # Test if cancelling a streamed file closes it
+    def test_cancel(self, stream_model, csv_file, qtbot):
+        formatter, filepath = csv_file
+        stream = formatter.streamer(filepath)
+        model = stream_model(stream)
+        model.stopFetching()
+        qtbot.waitUntil(lambda: stream._file.closed, timeout=10000)
+        assert model.rowCount() < N_CHUNKS*CHUNK_ROWS
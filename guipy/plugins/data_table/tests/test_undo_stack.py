@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# %% GLOBALS
+# Changes that can be made to a model, which must all be undoable
+CHANGES = {
+    'set_block': lambda model: model.setDataBlock(1, 1, np.ones((2, 2))),
+    'insert_rows': lambda model: model.insertRows(2, 3),
+    'remove_rows': lambda model: model.removeRows(1, 2),
+    'remove_row_set': lambda model: model.removeRowSet([0, 2, 4]),
+    'clear_rows': lambda model: model.clearRows(1, 2),
+    'insert_columns': lambda model: model.insertColumns(1, 2),
+    'remove_columns': lambda model: model.removeColumns(1, 2),
+    'clear_columns': lambda model: model.clearColumns(2, 2),
+    'rename_column': lambda model: model.setColumnName(3, 'x'),
+    'convert_column': lambda model: model.setColumnDataType(0, 'int'),
+    'set_precision': lambda model: model.setColumnPrecision(1, 2),
+    'remove_all_columns': lambda model: model.removeColumns(0, 5)}
+
+
+# %% PYTEST FIXTURES
+# Create a model holding values and an empty history
+@pytest.fixture
+def filled_model(model):
+    model.setDataBlock(0, 0, np.arange(25.0).reshape(5, 5))
+    model.setDataBlock(0, 4, [np.array(['a', 'b', None, 'd', 'e'],
+                                       dtype=object)])
+    model.undoStack().clear()
+    return(model)
+
+
+# %% HELPER FUNCTIONS
+# This function returns a copy of the entire state of a model
+# The data is copied, as some backends return views of their storage
+def get_state(model):
+    names = model.columnNames()
+    dtypes = [str(model.backend().column_dtype(col)) for col in
+              range(model.columnCount())]
+    precisions = [model.columnPrecision(col) for col in
+                  range(model.columnCount())]
+    return(names, dtypes, precisions, model.dataFrame().copy())
+
+
+# This function checks that two states of a model are equal
+def assert_state(state, expected):
+    assert state[:3] == expected[:3]
+    pd.testing.assert_frame_equal(state[3], expected[3])
+
+
+# %% PYTEST CLASSES AND FUNCTIONS
+# Pytest class for undoing and redoing changes to a model
+class Test_UndoStack(object):
+    # Test if every change can be undone and redone
+    @pytest.mark.parametrize('change', CHANGES.values(), ids=CHANGES.keys())
+    def test_undo_redo(self, filled_model, change):
+        stack = filled_model.undoStack()
+        before = get_state(filled_model)
+        change(filled_model)
+        after = get_state(filled_model)
+        assert stack.canUndo() and not stack.canRedo()
+
+        # Undo and redo the change twice
+        for _ in range(2):
+            stack.undo()
+            assert_state(get_state(filled_model), before)
+            stack.redo()
+            assert_state(get_state(filled_model), after)
+
+    # Test if several changes are undone in reverse order
+    def test_sequence(self, filled_model):
+        stack = filled_model.undoStack()
+        states = [get_state(filled_model)]
+        for change in CHANGES.values():
+            change(filled_model)
+            states.append(get_state(filled_model))
+        for state in reversed(states[:-1]):
+            stack.undo()
+            assert_state(get_state(filled_model), state)
+        assert not stack.canUndo()
+        for state in states[1:]:
+            stack.redo()
+            assert_state(get_state(filled_model), state)
+
+    # Test if a new change removes all changes that could be redone
+    def test_new_change(self, filled_model):
+        stack = filled_model.undoStack()
+        filled_model.insertRows(count=2)
+        stack.undo()
+        filled_model.removeRows(0, 1)
+        assert not stack.canRedo()
+        assert stack.undoText() == "Remove rows"
+
+    # Test if the oldest changes are removed when exceeding the memory limit
+    def test_memory_limit(self, filled_model):
+        stack = filled_model.undoStack()
+        for row in range(5):
+            filled_model.clearRows(row)
+        nbytes = stack.memoryUsage()
+        stack.setMemoryLimit(nbytes//2)
+        assert 0 < stack.memoryUsage() <= nbytes//2
+        while stack.canUndo():
+            stack.undo()
+        assert pd.isna(filled_model.dataColumn(0)[0])
+
+        # Check that no changes are recorded without a limit
+        stack.setMemoryLimit(0)
+        assert not stack.canUndo() and not stack.canRedo()
+        filled_model.clearRows(0)
+        assert not stack.canUndo()
@@ -9,19 +9,39 @@ Data Table Widgets
 
 # %% IMPORTS
 # Import base modules
-from . import data_table, headers, model, selection_model, view
+from . import (clipboard, data_table, display_cache, headers, import_list,
+               model, row_filter, selection_model, sort_index, statistics,
+               stream_reader, undo_stack, view)
+from .clipboard import *
 from .data_table import *
+from .display_cache import *
 from .headers import *
+from .import_list import *
 from .model import *
+from .row_filter import *
 from .selection_model import *
+from .sort_index import *
+from .statistics import *
+from .stream_reader import *
+from .undo_stack import *
 from .view import *
 
 # All declaration
-__all__ = ['data_table', 'headers', 'model', 'selection_model', 'view']
+__all__ = ['clipboard', 'data_table', 'display_cache', 'headers',
+           'import_list', 'model', 'row_filter', 'selection_model',
+           'sort_index', 'statistics', 'stream_reader', 'undo_stack', 'view']
+__all__.extend(clipboard.__all__)
 __all__.extend(data_table.__all__)
+__all__.extend(display_cache.__all__)
 __all__.extend(headers.__all__)
+__all__.extend(import_list.__all__)
 __all__.extend(model.__all__)
+__all__.extend(row_filter.__all__)
 __all__.extend(selection_model.__all__)
+__all__.extend(sort_index.__all__)
+__all__.extend(statistics.__all__)
+__all__.extend(stream_reader.__all__)
+__all__.extend(undo_stack.__all__)
 __all__.extend(view.__all__)
 
 # Author declaration
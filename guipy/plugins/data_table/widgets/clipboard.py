@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Clipboard
+====================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from io import StringIO
+from operator import methodcaller
+
+# Package imports
+import numpy as np
+import pandas as pd
+from qtpy import QtCore as QC
+
+# GuiPy imports
+
+# All declaration
+__all__ = ['ClipboardParser', 'block_to_text', 'text_to_frame']
+
+
+# %% CLASS DEFINITIONS
+# Define thread that parses clipboard text into a data frame
+class ClipboardParser(QC.QThread):
+    """
+    Parses text that was obtained from the clipboard into a
+    :obj:`~pandas.DataFrame` object in a separate thread, using
+    :func:`~text_to_frame`.
+
+    """
+
+    # Signals
+    parsed = QC.Signal(object)
+    failed = QC.Signal(str)
+
+    # Initialize ClipboardParser class
+    def __init__(self, text, parent=None):
+        # Call super constructor
+        super().__init__(parent)
+
+        # Save provided text
+        self.text = text
+
+    # Override run to parse the text
+    def run(self):
+        # Try to parse the text
+        try:
+            data_frame = text_to_frame(self.text)
+
+        # If that fails, emit the error message
+        except Exception as error:
+            self.failed.emit(str(error))
+
+        # Else, emit the parsed data frame
+        else:
+            self.parsed.emit(data_frame)
+
+
+# %% FUNCTION DEFINITIONS
+# This function formats a block of a data table model as text
+def block_to_text(model, row, col, n_rows, n_cols, sep='\t'):
+    """
+    Formats the rectangular block of the provided `model` that starts at the
+    given `row` and `col` and has the shape `(n_rows, n_cols)` as text, and
+    returns it.
+
+    Every column is formatted in a single pass. Empty cells are
+    formatted as empty strings.
+
+    Parameters
+    ----------
+    model : :obj:`~guipy.plugins.data_table.widgets.DataTableModel` object
+        The model that contains the block.
+    row, col : int
+        The indices of the top-left cell of the block.
+    n_rows, n_cols : int
+        The number of rows and columns in the block.
+
+    Optional
+    --------
+    sep : str. Default: '\\t'
+        The string that is used for separating the values in a row.
+
+    Returns
+    -------
+    text : str
+        The formatted block, with every row on a separate line.
+
+    """
+
+    # Obtain the block and format every column in it
+    columns = []
+    for values in model.dataBlock(row, col, n_rows, n_cols):
+        # If values are datetimes, format them as ISO strings
+        if(values.dtype.kind == 'M'):
+            strings = np.datetime_as_string(values, unit='auto').tolist()
+
+        # Else, if values are objects, quote the values that require it
+        elif(values.dtype.kind == 'O'):
+            strings = pd.Series(values, dtype=object, copy=False).astype(str)
+            quote = strings.str.contains('[%s\n"]' % (sep)).to_numpy()
+            strings[quote] = '"'+strings[quote].str.replace('"', '""')+'"'
+            strings = strings.tolist()
+
+        # Else, use the shortest representation of every value
+        else:
+            strings = list(map(repr if(values.dtype.kind == 'f') else str,
+                               values.tolist()))
+
+        # Replace all empty values with empty strings
+        for i in np.flatnonzero(pd.isna(values)).tolist():
+            strings[i] = ''
+        columns.append(strings)
+
+    # Join all values together and return them
+    return('\n'.join(map(sep.join, zip(*columns))))
+
+
+# This function parses text into a data frame
+def text_to_frame(text, sep=None):
+    """
+    Parses the provided `text` as delimited values, and returns it as a
+    :obj:`~pandas.DataFrame` object with integer column labels.
+
+    Parameters
+    ----------
+    text : str
+        The text that must be parsed, with every row on a separate line.
+
+    Optional
+    --------
+    sep : str or None. Default: None
+        The string that separates the values in a row.
+        If *None*, tabs are used if `text` contains any, and commas otherwise.
+
+    Returns
+    -------
+    data_frame : :obj:`~pandas.DataFrame` object
+        The data frame that contains all parsed values.
+
+    """
+
+    # Remove the line terminator that spreadsheets add to the last row
+    text = text.rstrip('\r\n')
+
+    # If text is empty, return an empty data frame
+    if not text:
+        return(pd.DataFrame([]))
+
+    # If no separator was given, use tabs if there are any, and commas if not
+    if sep is None:
+        sep = '\t' if '\t' in text else ','
+
+    # Parse the text
+    try:
+        data_frame = pd.read_csv(StringIO(text), sep=sep, header=None,
+                                 skip_blank_lines=False)
+
+    # If later rows are longer than the first, use the longest row instead
+    except pd.errors.ParserError:
+        n_cols = max(map(methodcaller('count', sep), text.splitlines()))+1
+        data_frame = pd.read_csv(StringIO(text), sep=sep, header=None,
+                                 names=range(n_cols), skip_blank_lines=False)
+
+    # Return data_frame
+    return(data_frame)
@@ -34,7 +34,7 @@ class DataTableWidget(GW.QWidget):
         self.init(*args, **kwargs)
 
     # This function sets up the data table widget
-    def init(self, import_func=None):
+    def init(self, import_func=None, backend=None):
         # Create a layout
         layout = GL.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -53,7 +53,7 @@ class DataTableWidget(GW.QWidget):
         n_rows_box.setRange(0, 9999999)
         n_rows_box.setToolTip("Number of rows in this data table (max. %i)"
                               % (n_rows_box.maximum()))
-        n_cols_box.setRange(0, 702)
+        n_cols_box.setRange(0, 999999)
         n_cols_box.setToolTip("Number of columns in this data table (max. %i)"
                               % (n_cols_box.maximum()))
         self.dimensions_box = dimensions_box
@@ -97,8 +97,30 @@ class DataTableWidget(GW.QWidget):
         # Add a stretcher
         dimensions_layout.addStretch()
 
+        # Create a filter layout
+        filter_layout = GL.QHBoxLayout()
+        layout.addLayout(filter_layout)
+
+        # Add a label to this layout
+        filter_layout.addWidget(GW.QLabel('Filter: '))
+
+        # Create line edit for setting the filter expression
+        filter_box = GW.QLineEdit()
+        filter_box.setPlaceholderText("e.g. A > 3 & B < 1e5")
+        filter_box.setClearButtonEnabled(True)
+        filter_box.setToolTip("Expression that the rows shown in this data "
+                              "table must satisfy. Column names that are not "
+                              "valid identifiers must be enclosed in "
+                              "backticks")
+        filter_layout.addWidget(filter_box)
+        self.filter_box = filter_box
+
+        # Create label for showing the state of the filter
+        self.filter_label = GW.QLabel()
+        filter_layout.addWidget(self.filter_label)
+
         # Create the DataTableView object
-        self.view = DataTableView(self, import_func)
+        self.view = DataTableView(self, import_func, backend)
 
         # Set initial values of the spinboxes
         self.revert_table_dimensions()
@@ -112,6 +134,16 @@ class DataTableWidget(GW.QWidget):
             lambda: n_rows_box.setEnabled(False))
         self.view.model().firstColumnInserted.connect(
             lambda: n_rows_box.setEnabled(True))
+        self.view.model().fetchingChanged.connect(self.set_fetching)
+        self.view.model().rowCountChanged.connect(self.update_filter_label)
+        self.view.model().filteringChanged.connect(self.update_filter_label)
+        self.view.model().filterFailed.connect(self.set_filter_error)
+
+        # Filter the rows whenever the filter expression is modified
+        get_modified_signal(filter_box).connect(self.view.model().filterRows)
+
+        # Check if rows are still being loaded into the model
+        self.set_fetching(self.view.model().isFetching())
 
         # Add data_table to the layout
         layout.addWidget(self.view)
@@ -139,6 +171,59 @@ class DataTableWidget(GW.QWidget):
         self.view.setRowCount(n_rows)
         self.view.setColumnCount(n_cols)
 
+    # This function informs the user if rows are still being loaded
+    @QC.Slot(bool)
+    def set_fetching(self, fetching):
+        """
+        Sets whether rows are still being loaded into the model of this data
+        table to `fetching`.
+
+        While rows are being loaded, the number of rows cannot be changed.
+
+        """
+
+        # Obtain the rows spinbox
+        n_rows_box = self.dimensions_box[0]
+
+        # If rows are still being loaded, disable the rows spinbox
+        if fetching:
+            n_rows_box.setEnabled(False)
+            n_rows_box.setSuffix(" (loading...)")
+        # Else, enable it again if there are any columns
+        else:
+            n_rows_box.setEnabled(bool(self.view.columnCount()))
+            n_rows_box.setSuffix("")
+            set_box_value(n_rows_box, self.view.rowCount())
+
+    # This function shows how many rows pass the filter
+    @QC.Slot()
+    @QC.Slot(int)
+    @QC.Slot(bool)
+    def update_filter_label(self, *args):
+        # Obtain the model
+        model = self.view.model()
+
+        # If the filter is being evaluated, state so
+        if model.isFiltering():
+            text = "filtering..."
+        # Else, if there is a filter, show how many rows pass it
+        elif model.rowFilter() is not None:
+            text = "%i of %i rows" % (model.rowCount(),
+                                      len(model.rowFilter()))
+        # Else, show nothing
+        else:
+            text = ""
+
+        # Set the label
+        self.filter_label.setText(text)
+        self.filter_label.setToolTip("")
+
+    # This function informs the user that the filter expression is invalid
+    @QC.Slot(str)
+    def set_filter_error(self, message):
+        self.filter_label.setText("invalid filter")
+        self.filter_label.setToolTip(message)
+
     # This function reverts the table dimensions back to their current values
     @QC.Slot()
     def revert_table_dimensions(self):
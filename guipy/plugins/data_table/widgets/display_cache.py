@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Display Cache
+========================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from collections import OrderedDict
+from functools import partial
+
+# Package imports
+import numpy as np
+import pandas as pd
+from qtpy import QtCore as QC
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import is_nullable
+
+# All declaration
+__all__ = ['DisplayCache']
+
+
+# %% GLOBALS
+# Number of significant digits used for floats if none was set for a column
+DEFAULT_PRECISION = 6
+
+
+# %% CLASS DEFINITIONS
+# Define class that caches the formatted display values of a model
+class DisplayCache(object):
+    """
+    Caches the display values of a
+    :class:`~guipy.plugins.data_table.widgets.DataTableModel` in rectangular
+    blocks.
+
+    Every block is obtained from the model in the order its rows are shown in
+    and formatted in a single step, after which requesting the display value
+    of a cell is solely a look-up.
+    Whenever a block is loaded, the neighbouring block in the direction the
+    view is scrolling in is prefetched as soon as the event loop is idle.
+
+    The cache is invalidated precisely by the signals the model emits.
+
+    """
+
+    # Shape of a single block
+    BLOCK_ROWS = 256
+    BLOCK_COLS = 16
+
+    # Maximum number of blocks that are cached
+    MAX_BLOCKS = 64
+
+    # Initialize DisplayCache class
+    def __init__(self, model):
+        # Save provided model
+        self.model = model
+
+        # Initialize empty cache
+        self._blocks = OrderedDict()
+        self._last_key = (0, 0)
+        self._generation = 0
+
+        # Connect signals of the model that invalidate the cache
+        model.dataChanged.connect(self.invalidate_data)
+        model.rowsInserted.connect(self.invalidate_rows)
+        model.rowsRemoved.connect(self.invalidate_rows)
+        model.columnsInserted.connect(self.invalidate_columns)
+        model.columnsRemoved.connect(self.invalidate_columns)
+        model.modelReset.connect(self.clear)
+        model.layoutChanged.connect(self.clear)
+
+    # This function returns the display value of a given cell
+    def value(self, row, col):
+        """
+        Returns the display value of the cell at the given `row` and `col`, or
+        *None* if this cell is empty.
+
+        """
+
+        # Determine the key of the block that contains this cell
+        key = (row//self.BLOCK_ROWS, col//self.BLOCK_COLS)
+
+        # Obtain this block, loading it if it is not cached yet
+        block = self._blocks.get(key)
+        if block is None:
+            block = self._load_block(key)
+            self._prefetch(key)
+        else:
+            self._blocks.move_to_end(key)
+
+        # Return the requested value
+        return(block[col % self.BLOCK_COLS][row % self.BLOCK_ROWS])
+
+    # This function loads a block into the cache
+    def _load_block(self, key):
+        # Determine the cells that are in this block
+        row = key[0]*self.BLOCK_ROWS
+        col = key[1]*self.BLOCK_COLS
+        n_rows = min(self.BLOCK_ROWS, self.model.rowCount()-row)
+        n_cols = min(self.BLOCK_COLS, self.model.columnCount()-col)
+
+        # Obtain the data in this block and format every column in it
+        block = self.model.dataBlock(row, col, n_rows, n_cols)
+        block = [self.format_column(i, values)
+                 for i, values in enumerate(block, col)]
+
+        # Add block to the cache, removing the oldest block if required
+        self._blocks[key] = block
+        if(len(self._blocks) > self.MAX_BLOCKS):
+            self._blocks.popitem(last=False)
+
+        # Return block
+        return(block)
+
+    # This function prefetches the next block in the scrolling direction
+    def _prefetch(self, key):
+        # Determine the scrolling direction
+        direction = tuple(np.sign(np.subtract(key, self._last_key)).tolist())
+        self._last_key = key
+
+        # If the view has not scrolled, return
+        if not any(direction):
+            return
+
+        # Load the next block once the event loop is idle
+        next_key = tuple(np.add(key, direction).tolist())
+        QC.QTimer.singleShot(0, partial(self._prefetch_block, next_key,
+                                        self._generation))
+
+    # This function loads a prefetched block if it is still valid
+    def _prefetch_block(self, key, generation):
+        # If the cache was invalidated in the meantime, return
+        if(generation != self._generation or key in self._blocks):
+            return
+
+        # If this block lies outside of the model, return
+        if((key[0] < 0) or (key[1] < 0) or
+           (key[0]*self.BLOCK_ROWS >= self.model.rowCount()) or
+           (key[1]*self.BLOCK_COLS >= self.model.columnCount())):
+            return
+
+        # Load the block
+        self._load_block(key)
+
+    # This function formats the values of a column for displaying
+    def format_column(self, col, values):
+        """
+        Formats the provided `values` of the column with index `col` for
+        displaying, and returns them as a list.
+
+        Floats are formatted using the precision of the column and the decimal
+        point of the default locale, unless they are read from a nullable
+        integer column. Empty values are returned as *None*.
+
+        """
+
+        # If values are read from a nullable integer column, format as integers
+        dtype = self.model.backend().column_dtype(col)
+        if is_nullable(dtype) and (values.dtype.kind == 'f'):
+            empty = np.isnan(values)
+            strings = np.where(empty, 0, values).astype(
+                dtype.numpy_dtype).tolist()
+
+        # Else, if values are floats, format them as strings
+        elif(values.dtype.kind == 'f'):
+            # Obtain the format that must be used
+            precision = self.model.columnPrecision(col)
+            if precision is None:
+                precision = DEFAULT_PRECISION
+            fmt = "%%.%ig" % (precision)
+
+            # Format all values
+            strings = list(map(fmt.__mod__, values.tolist()))
+
+            # Use the decimal point of the default locale
+            decimal_point = QC.QLocale().decimalPoint()
+            if(decimal_point != '.'):
+                table = str.maketrans('.', decimal_point)
+                strings = [string.translate(table) for string in strings]
+
+            # Obtain which values are empty
+            empty = np.isnan(values)
+
+        # Else, if values are datetimes, format them as ISO strings
+        elif(values.dtype.kind == 'M'):
+            strings = np.datetime_as_string(values, unit='auto').tolist()
+            empty = np.isnat(values)
+
+        # Else, use the values themselves
+        else:
+            strings = values.tolist()
+            empty = pd.isna(values) if values.dtype.kind in 'Om' else None
+
+        # Replace all empty values with None
+        if empty is not None:
+            for i in np.flatnonzero(empty).tolist():
+                strings[i] = None
+
+        # Return strings
+        return(strings)
+
+    # This function removes all blocks that satisfy a given condition
+    def _remove_blocks(self, condition):
+        # Remove all blocks for which the condition holds
+        for key in [key for key in self._blocks if condition(*key)]:
+            self._blocks.pop(key)
+
+        # Invalidate all pending prefetches
+        self._generation += 1
+
+    # This function invalidates all blocks that contain changed data
+    def invalidate_data(self, top_left, bottom_right, roles=None):
+        """
+        Invalidates all blocks that overlap with the rectangle spanned by
+        `top_left` and `bottom_right`.
+
+        """
+
+        # Determine the range of blocks that contain changed data
+        first_row = top_left.row()//self.BLOCK_ROWS
+        last_row = bottom_right.row()//self.BLOCK_ROWS
+        first_col = top_left.column()//self.BLOCK_COLS
+        last_col = bottom_right.column()//self.BLOCK_COLS
+
+        # Remove these blocks
+        self._remove_blocks(lambda row, col: (first_row <= row <= last_row and
+                                              first_col <= col <= last_col))
+
+    # This function invalidates all blocks after inserted/removed rows
+    def invalidate_rows(self, parent, first, last):
+        """
+        Invalidates all blocks that contain the row `first` or any row after
+        it.
+
+        """
+
+        # Remove all blocks with rows that have been shifted
+        first = first//self.BLOCK_ROWS
+        self._remove_blocks(lambda row, col: row >= first)
+
+    # This function invalidates all blocks after inserted/removed columns
+    def invalidate_columns(self, parent, first, last):
+        """
+        Invalidates all blocks that contain the column `first` or any column
+        after it.
+
+        """
+
+        # Remove all blocks with columns that have been shifted
+        first = first//self.BLOCK_COLS
+        self._remove_blocks(lambda row, col: col >= first)
+
+    # This function clears the entire cache
+    def clear(self):
+        """
+        Invalidates all blocks in this cache.
+
+        """
+
+        self._remove_blocks(lambda row, col: True)
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Import List
+======================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+import os
+from os import path
+
+# Package imports
+import pandas as pd
+from qtpy import QtCore as QC, QtGui as QG, QtWidgets as QW
+
+# GuiPy imports
+from guipy import layouts as GL, widgets as GW
+
+# All declaration
+__all__ = ['FileImporter', 'ImportEntry', 'ImportList', 'PrefetchedStream']
+
+
+# %% GLOBALS
+# Maximum number of files that are imported at the same time
+IMPORT_THREADS = os.cpu_count() or 1
+
+
+# %% CLASS DEFINITIONS
+# Define thread that starts importing a file
+class FileImporter(QC.QThread):
+    """
+    Opens the stream of :obj:`~pandas.DataFrame` chunks of a file and reads
+    its first chunk in a separate thread, such that the file can be shown in
+    a data table without waiting for it on the main thread.
+
+    Once the first chunk was read, the `imported` signal is emitted with a
+    :obj:`~PrefetchedStream` object holding it and all chunks after it.
+    The import can be cancelled with :meth:`~requestInterruption`, after which
+    neither of its signals is emitted and the stream is closed.
+
+    """
+
+    # Signals
+    imported = QC.Signal(object)
+    failed = QC.Signal(str)
+
+    # Initialize FileImporter class
+    def __init__(self, streamer, filepath, parent=None):
+        # Call super constructor
+        super().__init__(parent)
+
+        # Save provided streamer and filepath
+        self.streamer = streamer
+        self.filepath = filepath
+
+    # Override run to read the first chunk of the file
+    def run(self):
+        # Try to open the stream and read its first chunk
+        try:
+            stream = iter(self.streamer(self.filepath))
+            data_frame = next(stream, pd.DataFrame([]))
+
+        # If that fails, emit the error message unless cancelled
+        except Exception as error:
+            if not self.isInterruptionRequested():
+                self.failed.emit(str(error))
+
+        # Else, emit the stream unless cancelled
+        else:
+            stream = PrefetchedStream(data_frame, stream)
+            if self.isInterruptionRequested():
+                stream.close()
+            else:
+                self.imported.emit(stream)
+
+
+# Define class for an import entry in the import list
+class ImportEntry(GW.QWidget):
+    """
+    Shows the name of a file that is imported by an :obj:`~ImportList` object
+    together with how much of it has been imported, and a button for
+    cancelling its import.
+
+    """
+
+    # Signals
+    cancelled = QC.Signal()
+
+    # Initialize ImportEntry class
+    def __init__(self, streamer, filepath, parent=None):
+        # Call super constructor
+        super().__init__(parent)
+
+        # Save provided streamer and filepath
+        self.streamer = streamer
+        self.filepath = filepath
+
+        # Initialize the importer of the file and the model it is loaded into
+        self.importer = None
+        self.model = None
+
+        # Set up the import entry
+        self.init()
+
+    # This function sets up the import entry
+    def init(self):
+        # Create a layout
+        layout = GL.QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Create a label showing the name of the file
+        name_label = GW.QLabel(path.basename(self.filepath))
+        name_label.setToolTip(self.filepath)
+        layout.addWidget(name_label, 1)
+
+        # Create a progress bar showing how much of the file has been imported
+        progress_bar = QW.QProgressBar()
+        progress_bar.setRange(0, 1000)
+        progress_bar.setFormat("Waiting...")
+        progress_bar.setMaximumWidth(200)
+        layout.addWidget(progress_bar)
+        self.progress_bar = progress_bar
+
+        # If this theme has a 'cancel' icon, use it
+        if QG.QIcon.hasThemeIcon('cancel'):
+            cancel_icon = QG.QIcon.fromTheme('cancel')
+        # Else, use a standard icon
+        else:
+            cancel_icon = self.style().standardIcon(
+                QW.QStyle.SP_DialogCancelButton)
+
+        # Create a toolbutton for cancelling the import of the file
+        cancel_but = GW.QToolButton()
+        cancel_but.setToolTip("Stop importing this file, keeping all rows "
+                              "loaded so far")
+        cancel_but.setIcon(cancel_icon)
+        cancel_but.clicked.connect(self.cancelled)
+        layout.addWidget(cancel_but)
+
+    # This function shows that the first chunk of the file is being read
+    def set_reading(self):
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setFormat("Reading...")
+
+    # This function shows how much of the file has been loaded
+    @QC.Slot()
+    @QC.Slot(float)
+    def update_progress(self, *args):
+        # Obtain the progress of the model the file is loaded into
+        progress = self.model.fetchProgress()
+
+        # Show it, or show that it is unknown
+        if(progress < 0):
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(int(progress*1000))
+        self.progress_bar.setFormat("Loading... %p%")
+
+
+# Define dialog that imports a list of files
+class ImportList(GW.QDialog):
+    """
+    Imports a list of files into data tables, showing how much of every file
+    has been imported and allowing for the import of every file to be
+    cancelled.
+
+    At most :attr:`~IMPORT_THREADS` files are imported at the same time. The
+    first chunk of every file is read by a :obj:`~FileImporter` thread, after
+    which a data table is opened for it with the `open_tab` function that was
+    provided. All other chunks are then loaded by the model of that data
+    table, and the next file is imported once it has been loaded completely.
+
+    """
+
+    # Initialize ImportList class
+    def __init__(self, open_tab, parent=None):
+        """
+        Initialize an instance of the :class:`~ImportList` class.
+
+        Parameters
+        ----------
+        open_tab : callable
+            Function that takes the path to a file and a function returning
+            the stream of chunks read from it, and returns the
+            :obj:`~guipy.plugins.data_table.widgets.DataTableWidget` object
+            it opened for it.
+
+        Optional
+        --------
+        parent : :obj:`~PyQt5.QtWidgets.QWidget` object or None. Default: None
+            The parent widget to use for this dialog.
+            If *None*, no parent will be used.
+
+        """
+
+        # Call super constructor
+        super().__init__(parent)
+
+        # Save provided open_tab function
+        self.open_tab = open_tab
+
+        # Set up the import list
+        self.init()
+
+    # This function sets up the import list
+    def init(self):
+        # Initialize the list of all entries that have not been imported yet
+        self.entries = []
+
+        # Set dialog properties
+        self.setWindowTitle("Importing data tables")
+        self.setWindowFlags(
+            QC.Qt.MSWindowsOwnDC |
+            QC.Qt.Dialog |
+            QC.Qt.WindowTitleHint |
+            QC.Qt.WindowSystemMenuHint |
+            QC.Qt.WindowCloseButtonHint)
+
+        # Create a layout
+        layout = GL.QVBoxLayout(self)
+
+        # Create a widget holding all entries
+        entries_widget = GW.QWidget()
+        entries_layout = GL.QVBoxLayout(entries_widget)
+        entries_layout.addStretch()
+        self.entries_layout = entries_layout
+
+        # Create a scrollarea for all entries
+        scroll_area = GW.QScrollArea(self)
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(entries_widget)
+        layout.addWidget(scroll_area)
+
+        # Add a buttonbox
+        button_box = QW.QDialogButtonBox()
+        layout.addWidget(button_box)
+
+        # Add a 'Cancel all' button
+        cancel_but = button_box.addButton("Cancel all", button_box.RejectRole)
+        cancel_but.setToolTip("Stop importing all files, keeping all rows "
+                              "loaded so far")
+        cancel_but.clicked.connect(self.cancel_all)
+
+        # Set the minimum width of this dialog
+        self.setMinimumWidth(400)
+
+    # This function adds a file to the list of files to import
+    def add_file(self, streamer, filepath):
+        """
+        Adds the file with the provided `filepath` to the files that must be
+        imported, using the provided `streamer` function to read its chunks.
+
+        """
+
+        # Create an entry for this file
+        entry = ImportEntry(streamer, filepath)
+        entry.cancelled.connect(lambda: self.cancel_entry(entry))
+
+        # Add it to the list
+        self.entries_layout.insertWidget(len(self.entries), entry)
+        self.entries.append(entry)
+
+        # Start importing it if possible and show the list
+        self.start_imports()
+        self.show()
+
+    # This function starts importing files while possible
+    def start_imports(self):
+        # Obtain the entries that are waiting to be imported
+        waiting = [entry for entry in self.entries if entry.importer is None]
+
+        # Determine how many more files can be imported at the same time
+        n_free = max(0, IMPORT_THREADS-len(self.entries)+len(waiting))
+
+        # Start importing the waiting entries until there are no threads left
+        for entry in waiting[:n_free]:
+            importer = FileImporter(entry.streamer, entry.filepath, self)
+            importer.imported.connect(lambda x, e=entry: self.open_entry(e, x))
+            importer.failed.connect(lambda x, e=entry: self.show_error(e, x))
+            importer.finished.connect(importer.deleteLater)
+            entry.importer = importer
+            entry.set_reading()
+            importer.start()
+
+    # This function opens a data table for a file that was imported
+    def open_entry(self, entry, stream):
+        # If the import of this entry was cancelled, close the stream
+        if entry not in self.entries:
+            stream.close()
+            return
+
+        # Try to open a data table for the stream
+        try:
+            data_table = self.open_tab(entry.filepath, lambda model: stream)
+
+        # If that fails, show the error
+        except Exception as error:
+            stream.close()
+            self.show_error(entry, str(error))
+            return
+
+        # Obtain the model of the data table
+        entry.model = data_table.model
+
+        # If all rows have been loaded, the entry is done
+        if not entry.model.isFetching():
+            self.remove_entry(entry)
+
+        # Else, show how much of the file has been loaded until it is done
+        else:
+            entry.model.fetchProgressChanged.connect(entry.update_progress)
+            entry.model.fetchingChanged.connect(
+                lambda x: self.finish_entry(entry, x))
+            entry.update_progress()
+
+    # This function removes an entry once its file has been loaded
+    def finish_entry(self, entry, fetching):
+        # If the file is no longer being loaded, remove its entry
+        if not fetching:
+            self.remove_entry(entry)
+
+    # This function shows an error that occurred while importing a file
+    def show_error(self, entry, message):
+        # Remove the entry
+        self.remove_entry(entry)
+
+        # Inform the user about the error
+        GW.QMessageBox.warning(
+            self.parent(), "Import error",
+            "The file %r could not be imported: %s"
+            % (entry.filepath, message))
+
+    # This function cancels the import of a file
+    @QC.Slot()
+    def cancel_entry(self, entry):
+        """
+        Cancels the import of the provided `entry`.
+
+        If a data table was already opened for it, all rows that have been
+        loaded into it so far are kept.
+
+        """
+
+        # If a data table was opened for this entry, stop loading it
+        if entry.model is not None:
+            entry.model.stopFetching()
+
+        # Else, stop reading it if it is being read, and remove it
+        else:
+            if entry.importer is not None:
+                entry.importer.requestInterruption()
+            self.remove_entry(entry)
+
+    # This function cancels the import of all files
+    @QC.Slot()
+    def cancel_all(self):
+        """
+        Cancels the import of all files and waits until all files that were
+        being read have been closed.
+
+        """
+
+        # Cancel all entries
+        for entry in list(self.entries):
+            self.cancel_entry(entry)
+
+        # Wait for all importers to finish
+        for importer in self.findChildren(FileImporter):
+            importer.wait()
+
+    # This function removes an entry from the list
+    def remove_entry(self, entry):
+        # If this entry was already removed, return
+        if entry not in self.entries:
+            return
+
+        # Remove the entry
+        self.entries.remove(entry)
+        self.entries_layout.removeWidget(entry)
+        entry.deleteLater()
+
+        # Start importing the next files, or hide the list if there are none
+        if self.entries:
+            self.start_imports()
+        else:
+            self.hide()
+
+
+# Define class for a stream whose first chunk has already been read
+class PrefetchedStream(object):
+    """
+    Iterator over the provided first :obj:`~pandas.DataFrame` chunk followed
+    by all chunks in the provided stream, which exposes the `progress` and
+    `close` methods of that stream.
+
+    """
+
+    # Initialize PrefetchedStream class
+    def __init__(self, data_frame, stream):
+        # Save provided data frame and stream
+        self._data_frame = data_frame
+        self._stream = stream
+
+    # Make this object an iterator
+    def __iter__(self):
+        return(self)
+
+    # Return the next chunk
+    def __next__(self):
+        # If the first chunk has not been returned yet, return it
+        if self._data_frame is not None:
+            data_frame, self._data_frame = self._data_frame, None
+            return(data_frame)
+
+        # Else, return the next chunk in the stream
+        return(next(self._stream))
+
+    # This function returns the fraction of the stream that has been read
+    def progress(self):
+        # Return the progress of the stream if it has any
+        if hasattr(self._stream, 'progress'):
+            return(self._stream.progress())
+        else:
+            return(-1.0)
+
+    # This function closes the stream
+    def close(self):
+        # Close the stream if possible
+        if hasattr(self._stream, 'close'):
+            self._stream.close()
@@ -9,7 +9,6 @@ Data Table Model
 
 # %% IMPORTS
 # Built-in imports
-from itertools import chain
 import string
 
 # Package imports
@@ -18,6 +17,21 @@ import pandas as pd
 from qtpy import QtCore as QC, QtWidgets as QW
 
 # GuiPy imports
+from guipy.plugins.data_table.backends import (
+    CATEGORY_DTYPE, BaseBackend, ConversionError, JournalBackend,
+    categorize_frame, categorize_values, compact_int_dtype, convert_values,
+    get_backend, is_constant, is_nullable, mask_to_ranges, mask_values,
+    unmask_values)
+from guipy.plugins.data_table.widgets.display_cache import DisplayCache
+from guipy.plugins.data_table.widgets.row_filter import (
+    RowFilter, evaluate_expression, get_expression_names)
+from guipy.plugins.data_table.widgets.sort_index import SortIndex
+from guipy.plugins.data_table.widgets.statistics import ColumnStatistics
+from guipy.plugins.data_table.widgets.stream_reader import StreamReader
+from guipy.plugins.data_table.widgets.undo_stack import (
+    BlockCommand, ColumnCommand, ColumnPropertyCommand, DataTypeCommand,
+    InsertColumnsCommand, InsertRowsCommand, RemoveColumnsCommand,
+    RemoveRowsCommand, UndoStack)
 
 # All declaration
 __all__ = ['DataTableModel']
@@ -26,13 +40,28 @@ __all__ = ['DataTableModel']
 # %% GLOBALS
 base_26 = list(string.ascii_uppercase)
 
+# Maximum number of row ranges that are announced separately when removed
+MAX_REMOVE_RANGES = 32
+
+# Maximum number of empty cells that are inserted into a backend that does
+# not store them implicitly
+MAX_DENSE_EMPTY_CELLS = 2**24
+
+# Number of rows for which a formula is evaluated at once
+FORMULA_CHUNK_ROWS = 2**20
+
+# Data type conversions that can be undone by converting back
+# Conversions between numerical data types are checked separately
+LOSSLESS_CONVERSIONS = {('str', 'category'), ('category', 'str')}
+
+# Data types that must be requested from the backend under a different name
+DTYPE_ALIASES = {'datetime': 'datetime64[ns]'}
+
 
 # %% CLASS DEFINITIONS
 # Define model for the DataTable widget
 # HINT: https://doc.qt.io/qt-5/model-view-programming.html
-# TODO: Implement fetchMore system?
 # TODO: Implement drag/drop system (HINT+#using-drag-and-drop-with-item-views)
-# OPTIMIZE: Should Vaex be used for this instead of Pandas?
 class DataTableModel(QC.QAbstractTableModel):
     # Signals
     firstColumnInserted = QC.Signal()
@@ -40,6 +69,13 @@ class DataTableModel(QC.QAbstractTableModel):
     rowCountChanged = QC.Signal(int)
     columnCountChanged = QC.Signal(int)
     columnNameChanged = QC.Signal(int, str)
+    fetchingChanged = QC.Signal(bool)
+    fetchProgressChanged = QC.Signal(float)
+    sortKeysChanged = QC.Signal(list)
+    filteringChanged = QC.Signal(bool)
+    filterFailed = QC.Signal(str)
+    conversionProgress = QC.Signal(int, int)
+    modifiedChanged = QC.Signal(bool)
 
     # Initialize DataTableModel class
     def __init__(self, parent=None, *args, **kwargs):
@@ -52,11 +88,24 @@ class DataTableModel(QC.QAbstractTableModel):
     # Implement delete function
     @QC.Slot()
     def delete(self):
-        # Delete all columns in the column list
+        # Stop fetching rows that have not been loaded yet
+        self.stopFetching()
+
+        # Cancel all filters and stream readers and wait for them to finish
+        self._cancelRowFilter()
+        for thread in [*self.findChildren(RowFilter),
+                       *self.findChildren(StreamReader)]:
+            thread.wait()
+
+        # Delete all columns in the column list without recording it
+        self._undo_stack.setMemoryLimit(0)
         self.removeColumns(count=self.columnCount())
 
+        # Release all resources held by the backend
+        self._backend.close()
+
     # This function sets up the data table model
-    def init(self, import_func=None):
+    def init(self, import_func=None, backend=None):
         # Connect signals
         self.destroyed.connect(self.delete)
         self.columnsInserted.connect(self.emitColumnsInsertedSignals)
@@ -64,17 +113,63 @@ class DataTableModel(QC.QAbstractTableModel):
         self.rowsInserted.connect(self.emitRowsInsertedSignals)
         self.rowsRemoved.connect(self.emitRowsRemovedSignals)
 
+        # Set the number of removed rows that have not been announced yet
+        self._pending_rows = 0
+
+        # Set that this model is not modified and has no journal
+        self._modified = False
+        self._journal = None
+
+        # Initialize the order in which the rows are shown
+        # If None, all rows are shown in the order they are stored in
+        self._row_map = None
+        self._sort_keys = []
+
+        # Initialize the filter that determines which rows are shown
+        self._filter_mask = None
+        self._filter_expression = ''
+        self._row_filter = None
+
+        # Initialize the reader of the rows that have not been loaded yet
+        self._stream_reader = None
+
         # Make a look-up dict for dtypes
+        # Nullable integer and boolean dtypes use the type of their values
         self.dtypes = {
             np.bool_: 'bool',
-            np.float64: 'float',
+            np.int8: 'int8',
+            np.int16: 'int16',
+            np.int32: 'int32',
             np.int64: 'int',
-            np.object_: 'str'}
+            np.uint8: 'uint8',
+            np.uint16: 'uint16',
+            np.uint32: 'uint32',
+            np.uint64: 'uint64',
+            np.float32: 'float32',
+            np.float64: 'float',
+            np.datetime64: 'datetime',
+            np.object_: 'str',
+            CATEGORY_DTYPE.type: 'category'}
+
+        # Obtain the backend class that must be used for storing the data
+        backend_class = get_backend(backend)
+
+        # Initialize the display/sort caches and the precisions of all columns
+        self._display_cache = DisplayCache(self)
+        self._sort_index = SortIndex(self)
+        self._statistics = ColumnStatistics(self)
+        self._precisions = []
+
+        # Initialize the history of all changes made to this model
+        self._undo_stack = UndoStack(self, self)
+
+        # Initialize the formulas of all columns
+        self._formulas = []
 
         # If import_func is None, initialize an empty table
         if import_func is None:
             # Initialize an empty table
-            self._data = pd.DataFrame([])
+            self._backend = backend_class.from_frame(pd.DataFrame([]))
 
             # Initialize this data table with a 5x5 table
             self.insertColumns(count=5)
@@ -83,12 +178,43 @@ class DataTableModel(QC.QAbstractTableModel):
         # If import_func is not None, call it to initialize the table
         else:
             # Call the function to obtain the data
-            self._data = import_func(self)
+            data = import_func(self)
+
+            # If data is a backend, it already holds all data
+            if isinstance(data, BaseBackend):
+                self._backend = data
 
-            # Check if the data frame has the proper column names
-            if self._data.columns.dtype.type is np.int64:
-                renames = {i: to_base_26(i+1) for i in self._data.columns}
-                self._data.rename(columns=renames, inplace=True)
+            # Else, store the data in a new backend
+            else:
+                # If data is not a data frame, it is a stream of data frames
+                if isinstance(data, pd.DataFrame):
+                    data_frame = data
+                else:
+                    # Use the first chunk to initialize the table
+                    stream = iter(data)
+                    data_frame = next(stream, pd.DataFrame([]))
+
+                    # Read all remaining chunks in a separate thread
+                    self._stream_reader = StreamReader(stream, self)
+                    self._stream_reader.chunkRead.connect(self.fetchMore)
+                    self._stream_reader.finished.connect(
+                        self._stream_reader.deleteLater)
+
+                # Check if the data frame has the proper column names
+                # Columns without names use the default name of their position
+                if data_frame.columns.dtype.type is np.int64:
+                    data_frame = data_frame.set_axis(
+                        ['']*len(data_frame.columns), axis=1)
+
+                # Dictionary-encode all string columns with few unique values
+                data_frame = categorize_frame(data_frame)
+
+                # Store the data frame in the backend
+                self._backend = backend_class.from_frame(data_frame)
+
+            # Initialize the precisions and formulas of all columns
+            self._precisions = [None]*self.columnCount()
+            self._formulas = [None]*self.columnCount()
 
             # Notify other functions that columns have been inserted
             self.beginInsertColumns(QC.QModelIndex(), 0, self.columnCount()-1)
@@ -98,6 +224,18 @@ class DataTableModel(QC.QAbstractTableModel):
             self.beginInsertRows(QC.QModelIndex(), 0, self.rowCount()-1)
             self.endInsertRows()
 
+            # If there are rows left in the stream, start reading them
+            if self._stream_reader is not None:
+                self._stream_reader.start()
+                self.fetchingChanged.emit(True)
+
+        # Remove the initialization of the table from the history
+        self._undo_stack.clear()
+
+        # Record all changes that are made to the backend from now on
+        self._backend = JournalBackend(self._backend, self._recordChange)
+        self._modified = False
+
     # This function emits proper signals when columns have been inserted
     @QC.Slot(QC.QModelIndex, int, int)
     def emitColumnsInsertedSignals(self, parent, first, last):
@@ -152,13 +290,182 @@ class DataTableModel(QC.QAbstractTableModel):
 
         """
 
-        # If index is an int, return the column with that index
-        if isinstance(index, int):
-            return(self._data.iloc[:, index])
+        # If index is a str, check what column index that is
+        if isinstance(index, str):
+            index = self.columnNames().index(index)
+
+        # Obtain the data and name of the requested column
+        data = self._backend.get_column(index)
+        name = self.columnName(index)
+
+        # Return the data column, wrapping the data without copying it
+        return(pd.Series(data, name=name, copy=False))
+
+    # This function returns all data stored in this model as a data frame
+    @QC.Slot()
+    def dataFrame(self):
+        """
+        Returns a :obj:`~pandas.DataFrame` object that contains all data stored
+        in this model.
+
+        Returns
+        -------
+        data_frame : :obj:`~pandas.DataFrame`
+            The data frame containing all data columns.
+
+        """
+
+        # Return the data frame obtained from the backend with all names
+        return(self._backend.to_frame().set_axis(self.columnNames(), axis=1))
+
+    # This function returns the index a row is stored at
+    def mapToSource(self, row):
+        """
+        Returns the index in the backend of the row that is shown at the
+        provided `row`.
+
+        """
+
+        # If the rows are not reordered, return row itself
+        if self._row_map is None:
+            return(row)
+
+        # Else, return the stored index of this row
+        return(int(self._row_map[row]))
+
+    # This function returns the data of a rectangular block of cells
+    def dataBlock(self, row, col, n_rows, n_cols):
+        """
+        Returns the data of the rectangular block of cells whose top-left cell
+        is at the given `row` and `col`, and whose shape is
+        `(n_rows, n_cols)`.
+
+        The rows in the block are given in the order they are shown in.
+
+        Returns
+        -------
+        block : list of :obj:`~numpy.ndarray` objects
+            List containing the values of every column in the block.
+
+        """
+
+        # If the rows are not reordered, return the block directly
+        if self._row_map is None:
+            return(self._backend.get_block(row, col, n_rows, n_cols))
+
+        # Else, take the rows from wherever they are stored
+        return(self._backend.get_rows(self._row_map[row:row+n_rows], col,
+                                      n_cols))
+
+    # This function returns a copy of the values in a block of stored rows
+    def _copyStoredBlock(self, rows, col, n_cols):
+        # If the rows are a slice, copy the block
+        # Constant (empty) regions are read-only and are kept without copying
+        if isinstance(rows, slice):
+            return([values if is_constant(values) else np.array(values)
+                    for values in self._backend.get_block(
+                        rows.start, col, rows.stop-rows.start, n_cols)])
+
+        # Else, take the rows, which copies them
+        else:
+            return(self._backend.get_rows(rows, col, n_cols))
+
+    # This function returns the undo stack of this model
+    @QC.Slot()
+    def undoStack(self):
+        """
+        Returns the :obj:`~guipy.plugins.data_table.widgets.UndoStack` object
+        that holds the history of all changes made to this model.
+
+        """
+
+        return(self._undo_stack)
+
+    # This function returns the storage backend used by this model
+    @QC.Slot()
+    def backend(self):
+        """
+        Returns the storage backend that holds the data of this model.
+
+        Returns
+        -------
+        backend : :obj:`~guipy.plugins.data_table.backends.BaseBackend` object
+            The backend that is used by this model.
+
+        """
+
+        # Return backend
+        return(self._backend)
+
+    # This function makes sure the backend can store many empty cells
+    def _reserveEmptyCells(self, n_cells):
+        """
+        Makes sure that `n_cells` empty cells can be inserted into the backend
+        of this model without allocating them.
+
+        If the backend stores empty cells like any other values and `n_cells`
+        is larger than :attr:`~MAX_DENSE_EMPTY_CELLS`, all data is moved to
+        the 'Columnar' backend first, which shares the data of the columns
+        until they are modified.
+
+        """
+
+        # If the backend can store the empty cells, return
+        if(n_cells <= MAX_DENSE_EMPTY_CELLS or self._backend.IMPLICIT_EMPTY):
+            return
+
+        # Else, move all data to the 'Columnar' backend
+        backend = self._backend.backend
+        self._backend.backend = get_backend('Columnar').from_frame(
+            backend.to_frame())
+        backend.close()
+
+    # This function records a change that was made to the backend
+    def _recordChange(self, method, args):
+        # Mark this model as modified
+        self.setModified(True)
+
+        # Report the change to the journal if there is one
+        if self._journal is not None:
+            self._journal(method, args)
+
+    # This function sets the journal of this model
+    def setJournal(self, journal):
+        """
+        Sets the function that every change made to the backend of this model
+        is reported to, as described in
+        :class:`~guipy.plugins.data_table.backends.JournalBackend`, to
+        `journal`. If `journal` is *None*, changes are not reported.
+
+        """
+
+        self._journal = journal
+
+    # This function returns whether this model was modified
+    @QC.Slot()
+    def isModified(self):
+        """
+        Returns whether the data or column properties of this model were
+        modified since it was created or last marked as unmodified with
+        :meth:`~setModified`.
+
+        """
 
-        # Else if index is a str, check what column that is and return it
-        elif isinstance(index, str):
-            return(self._data.loc[:, index])
+        return(self._modified)
+
+    # This function sets whether this model was modified
+    @QC.Slot(bool)
+    def setModified(self, modified):
+        """
+        Sets whether the data or column properties of this model were
+        modified to `modified`, like after the model was saved.
+
+        """
+
+        # If the modified state changed, set it and emit modifiedChanged
+        if(self._modified != modified):
+            self._modified = modified
+            self.modifiedChanged.emit(modified)
 
     # This function returns a list with all data column names
     @QC.Slot()
@@ -174,11 +481,31 @@ class DataTableModel(QC.QAbstractTableModel):
 
         """
 
-        # Return list of data column names
-        return(list(self._data.columns))
+        # Return list of data column names, using default names where needed
+        return([name or to_base_26(i+1)
+                for i, name in enumerate(self._backend.column_names())])
+
+    # This function returns the name of a single column
+    def columnName(self, col):
+        """
+        Returns the name of the column with index `col`.
+
+        Columns that were not given a name use the base-26 name of their
+        position ('A', 'B', ..., 'Z', 'AA', ...). These default names are not
+        stored, such that they never have to be updated when columns are
+        inserted or removed.
+
+        """
+
+        return(self._backend.column_name(col) or to_base_26(col+1))
 
     # Override headerData function
     def headerData(self, section, orientation, role):
+        # If the formula of a column is requested, return it if it has one
+        if((role == QC.Qt.ToolTipRole) and (orientation == QC.Qt.Horizontal)
+           and self._formulas[section] is not None):
+            return("= %s" % (self._formulas[section]))
+
         # If role is not DisplayRole, return empty QVariant
         if(role != QC.Qt.DisplayRole):
             return(QC.QVariant())
@@ -186,19 +513,26 @@ class DataTableModel(QC.QAbstractTableModel):
         # If the horizontal header information is requested
         if(orientation == QC.Qt.Horizontal):
             # Return the corresponding column name
-            return(self._data.columns[section])
+            return(self.columnName(section))
 
         # If the vertical header information is requested
         else:
-            # Return the corresponding row name
-            return(self._data.index[section])
+            # Return the index the corresponding row is stored at
+            return(self.mapToSource(section))
 
     # Override data function
     def data(self, index, role):
-        # If this index is valid
-        if index.isValid() and role in (QC.Qt.DisplayRole, QC.Qt.EditRole):
+        # If this index is valid and its value is displayed
+        if index.isValid() and (role == QC.Qt.DisplayRole):
+            # Obtain the formatted value from the display cache
+            # An empty value is None, which is converted to an empty QVariant
+            data_point = self._display_cache.value(index.row(), index.column())
+
+        # Else, if this index is valid and its value is edited
+        elif index.isValid() and (role == QC.Qt.EditRole):
             # Obtain the requested value
-            value = self._data.iat[index.row(), index.column()]
+            value = self._backend.get_value(self.mapToSource(index.row()),
+                                            index.column())
 
             # Convert value to a Python scalar
             if isinstance(value, np.generic):
@@ -221,8 +555,8 @@ class DataTableModel(QC.QAbstractTableModel):
 
     # Override flags function
     def flags(self, index):
-        # If this index is valid, this item is editable
-        if index.isValid():
+        # If this index is valid, this item is editable unless computed
+        if index.isValid() and self._formulas[index.column()] is None:
             return(QC.Qt.ItemIsEnabled |
                    QC.Qt.ItemIsSelectable |
                    QC.Qt.ItemIsEditable)
@@ -233,40 +567,310 @@ class DataTableModel(QC.QAbstractTableModel):
 
     # Override setData function
     def setData(self, index, value, role):
-        # If this index is valid and the role is editing
+        # If this index is valid and the role is editing, set the value
         if index.isValid() and (role == QC.Qt.EditRole):
-            # Set the value
-            self._data.iat[index.row(), index.column()] = value
+            return(self.setDataBlock(index.row(), index.column(), [[value]]))
 
-            # Emit dataChanged signal
-            self.dataChanged.emit(index, index, [role])
+        # Else, return that operation did not finish successfully
+        else:
+            return(False)
+
+    # This function sets the data of a rectangular block of cells
+    @QC.Slot(int, int, object)
+    def setDataBlock(self, top, left, block):
+        """
+        Sets the data of the rectangular block of cells whose top-left cell is
+        at the given `top` row and `left` column to `block`.
+
+        All values in a column are coerced to the data type of that column in
+        a single step, and a single `dataChanged` signal is emitted for the
+        entire block.
+
+        Parameters
+        ----------
+        top, left : int
+            The indices of the top-left cell of the block.
+        block : 2D array_like, :obj:`~pandas.DataFrame` object or list of \
+            1D array_like
+            The values that must be set. If `block` is a data frame or a list,
+            every item in it is interpreted as a column. Else, `block` is
+            interpreted as an array with shape `(n_rows, n_cols)`.
+
+        Returns
+        -------
+        success : bool
+            Whether the values were set successfully.
+
+        """
 
-            # Return that operation finished successfully
+        # Convert block to a list of column arrays
+        if isinstance(block, pd.DataFrame):
+            columns = [values.to_numpy() for _, values in block.items()]
+        elif isinstance(block, list):
+            columns = [np.asarray(values) for values in block]
+        else:
+            block = np.asarray(block)
+            columns = list(block.reshape(len(block), -1).T)
+
+        # If the block is empty, return
+        if not columns or not len(columns[0]):
             return(True)
 
-        # Else, return that operation did not finish successfully
+        # If the block does not fit in this model, raise error
+        bottom = top+len(columns[0])-1
+        right = left+len(columns)-1
+        if((top < 0) or (left < 0) or (bottom >= self.rowCount()) or
+           (right >= self.columnCount())):
+            raise IndexError("Block of shape (%i, %i) at (%i, %i) does not "
+                             "fit in data table of shape (%i, %i)!"
+                             % (len(columns[0]), len(columns), top, left,
+                                self.rowCount(), self.columnCount()))
+
+        # Coerce the values of every column to the dtype of that column
+        # Dictionary-encoded columns encode the values themselves
+        # Nullable columns are coerced to the dtype of their values
+        for i, values in enumerate(columns):
+            dtype = self._backend.column_dtype(left+i)
+            dtype = getattr(dtype, 'numpy_dtype', dtype)
+            if(isinstance(dtype, np.dtype) and (values.dtype.kind in 'OU') and
+               (dtype != values.dtype)):
+                try:
+                    values = convert_values(values, dtype)
+                except ConversionError:
+                    continue
+                columns[i] = (unmask_values(*mask_values(values))
+                              if is_nullable(values.dtype) else values)
+
+        # Determine the rows the values are stored in
+        if self._row_map is None:
+            rows = slice(top, bottom+1)
         else:
+            rows = self._row_map[top:bottom+1]
+
+        # Set the values and record the values they replaced
+        old_columns = self._setStoredBlock(rows, left, columns)
+        self._undo_stack.push(BlockCommand("Set values", rows, left,
+                                           old_columns))
+
+        # Return that operation finished successfully
+        return(True)
+
+    # This function sets the values in a block of stored rows
+    def _setStoredBlock(self, rows, left, columns):
+        """
+        Sets the values in the stored `rows` of the columns starting at `left`
+        to `columns`, and returns the values that were replaced.
+
+        If the undo stack is disabled, *None* is returned instead.
+
+        """
+
+        # Copy the values that are replaced if they can be undone
+        cols = range(left, left+len(columns))
+        if self._undo_stack.isEnabled():
+            old_columns = self._copyStoredBlock(rows, left, len(columns))
+        else:
+            old_columns = None
+
+        # Set the values, updating the statistics of all columns
+        self._updateStatistics(self._statistics.remove, rows, cols)
+        if isinstance(rows, slice):
+            self._backend.set_block(rows.start, left, columns)
+            start, stop = rows.start, rows.stop
+        else:
+            self._backend.set_rows(rows, left, columns)
+            start, stop = int(rows.min()), int(rows.max())+1
+        self._updateStatistics(self._statistics.add, rows, cols)
+
+        # Emit dataChanged signal for the rows that are shown
+        if self._row_map is None:
+            top, bottom = start, stop-1
+        else:
+            top, bottom = 0, self.rowCount()-1
+        self.dataChanged.emit(self.index(top, left),
+                              self.index(bottom, cols[-1]),
+                              [QC.Qt.EditRole])
+
+        # Recompute all formulas that depend on these values
+        self._recomputeFormulas(cols, start, stop)
+
+        # Return the values that were replaced
+        return(old_columns)
+
+    # Override canFetchMore function
+    @QC.Slot()
+    @QC.Slot(QC.QModelIndex)
+    def canFetchMore(self, parent=None):
+        # Return whether there are still rows that have not been loaded
+        return(self._stream_reader is not None)
+
+    # Override fetchMore function
+    @QC.Slot()
+    @QC.Slot(QC.QModelIndex)
+    def fetchMore(self, parent=None):
+        """
+        Loads all chunks of rows that have been read from the stream that was
+        provided when this model was created, if there are any rows left.
+
+        The stream is read in a separate thread, which calls this method
+        whenever it has read another chunk of rows. This method never waits
+        for rows that have not been read yet.
+
+        """
+
+        # Load chunks until none are available
+        while self._fetchChunk(False):
+            pass
+
+    # This function loads all rows that have not been loaded yet
+    @QC.Slot()
+    def fetchAll(self):
+        """
+        Loads all rows from the stream that was provided when this model was
+        created that have not been loaded yet, waiting until they have all
+        been read.
+
+        """
+
+        # Keep loading chunks until there are none left
+        while self._fetchChunk(True):
+            pass
+
+    # This function loads the next chunk of rows from the stream
+    def _fetchChunk(self, block):
+        # If there is no stream to fetch rows from, return False
+        if self._stream_reader is None:
             return(False)
 
+        # Obtain the next chunk of rows
+        try:
+            data_frame = self._stream_reader.get(block)
+
+        # If the stream is exhausted, stop fetching
+        except StopIteration:
+            self.stopFetching()
+            return(False)
+
+        # If the stream raised an error, stop fetching and reraise it
+        except Exception:
+            self.stopFetching()
+            raise
+
+        # If no chunk has been read yet, return False
+        if data_frame is None:
+            return(False)
+
+        # Append the rows in this chunk, unless it is empty
+        if len(data_frame):
+            self._appendFetchedRows(data_frame)
+
+        # Emit fetchProgressChanged signal and return True
+        self.fetchProgressChanged.emit(self.fetchProgress())
+        return(True)
+
+    # This function appends a chunk of rows that was fetched
+    def _appendFetchedRows(self, data_frame):
+        # Notify other functions that rows are going to be inserted
+        row = self.rowCount()
+        self.beginInsertRows(QC.QModelIndex(), row, row+len(data_frame)-1)
+
+        # Append the rows to the backend and show them at the end
+        # Loading rows does not modify this model
+        n_rows = self._backend.row_count()
+        modified = self._modified
+        self._backend.append_frame(data_frame)
+        self.setModified(modified)
+        if self._row_map is not None:
+            self._row_map = np.append(
+                self._row_map, np.arange(n_rows, self._backend.row_count()))
+            self._showSourceRows(self._backend.row_count()-n_rows)
+
+        # Add the new rows to the statistics of all columns
+        self._updateStatistics(
+            self._statistics.add, slice(n_rows, self._backend.row_count()))
+
+        # Notify other functions that rows have been inserted
+        self.endInsertRows()
+
+        # Compute the formulas for the new rows
+        self._recomputeFormulas(range(self.columnCount()), n_rows,
+                                self._backend.row_count())
+
+    # This function stops fetching rows
+    @QC.Slot()
+    def stopFetching(self):
+        """
+        Stops fetching rows from the stream that was provided when this model
+        was created, keeping all rows that have been loaded so far and
+        discarding all others.
+
+        If the rows are sorted, the loaded rows are sorted again, as all rows
+        that were loaded while sorted are shown at the end.
+
+        """
+
+        # If there is no stream to fetch rows from, return
+        if self._stream_reader is None:
+            return
+
+        # Stop reading the stream, which closes it, and remove its reader
+        self._stream_reader.requestInterruption()
+        self._stream_reader = None
+
+        # Emit fetchingChanged signal
+        self.fetchingChanged.emit(False)
+
+        # Sort all rows that were loaded while sorted
+        if self._sort_keys:
+            self._updateRowMap(self.VerticalSortHint)
+
+    # This function returns whether rows are still being fetched
+    @QC.Slot()
+    def isFetching(self):
+        """
+        Returns whether there are still rows that are being loaded into this
+        model.
+
+        """
+
+        return(self._stream_reader is not None)
+
+    # This function returns how much of the stream has been loaded
+    @QC.Slot()
+    def fetchProgress(self):
+        """
+        Returns the fraction of the stream that was provided when this model
+        was created that has been loaded, or -1 if this is unknown.
+
+        If no rows are being loaded, 1 is returned.
+
+        """
+
+        # If no rows are being loaded, return 1
+        if self._stream_reader is None:
+            return(1.0)
+
+        # Else, return the progress of the stream reader
+        return(self._stream_reader.progress())
+
     # Override rowCount function
     @QC.Slot()
     @QC.Slot(QC.QModelIndex)
     def rowCount(self, parent=None):
-        # Return row count
-        if self._data.empty:
-            return(0)
+        # Return row count, including rows whose removal is being announced
+        if self._row_map is None:
+            return(self._backend.row_count()+self._pending_rows)
         else:
-            return(self._data.shape[0])
+            return(len(self._row_map)+self._pending_rows)
 
     # Override columnCount function
     @QC.Slot()
     @QC.Slot(QC.QModelIndex)
     def columnCount(self, parent=None):
         # Return column count
-        return(self._data.shape[1])
+        return(self._backend.column_count())
 
     # This function inserts rows before given row
-    # Vaex: df.concat
     @QC.Slot()
     @QC.Slot(int)
     @QC.Slot(int, int)
@@ -280,20 +884,39 @@ class DataTableModel(QC.QAbstractTableModel):
         if parent is None:
             parent = QC.QModelIndex()
 
+        # Make sure that the backend can store the empty cells
+        self._reserveEmptyCells(count*self.columnCount())
+
         # Notify other functions that rows are going to be inserted
         self.beginInsertRows(parent, row, row+count-1)
 
-        # Create dataframe with the required shape
-        insert_df = pd.DataFrame(np.full((count, self.columnCount()), np.nan),
-                                 columns=self._data.columns)
+        # If the rows are reordered, append the rows to the backend
+        if self._row_map is not None:
+            start = self._backend.row_count()
+            self._backend.insert_rows(start, count)
+            self._row_map = np.insert(
+                self._row_map, row, np.arange(start, start+count))
+            self._showSourceRows(count)
 
-        # Concatenate the current dataframe and insert_df
-        self._data = pd.concat([self._data[:row], insert_df, self._data[row:]],
-                               ignore_index=True)
+        # Else, insert the rows into the backend
+        else:
+            start = row
+            self._backend.insert_rows(row, count)
+
+        # Add the new rows to the statistics of all columns
+        self._updateStatistics(self._statistics.add,
+                               slice(start, start+count))
 
         # Notify other functions that rows have been inserted
         self.endInsertRows()
 
+        # Record where the rows were inserted
+        self._undo_stack.push(InsertRowsCommand(
+            "Insert rows", slice(start, start+count)))
+
+        # Compute the formulas for the new rows
+        self._recomputeFormulas(range(self.columnCount()), start, start+count)
+
         # Emit rowCountChanged signal
         self.rowCountChanged.emit(self.rowCount())
 
@@ -301,7 +924,6 @@ class DataTableModel(QC.QAbstractTableModel):
         return(True)
 
     # This function removes rows starting at given row
-    # Vaex: df.take + df.to_copy?
     @QC.Slot()
     @QC.Slot(int)
     @QC.Slot(int, int)
@@ -315,13 +937,23 @@ class DataTableModel(QC.QAbstractTableModel):
         if parent is None:
             parent = QC.QModelIndex()
 
+        # If the rows are reordered, they may be stored anywhere
+        if self._row_map is not None:
+            return(self.removeRowSet(np.arange(row, row+count), parent))
+
+        # Record the values in the rows that are removed
+        if self._undo_stack.isRecording():
+            self._undo_stack.push(RemoveRowsCommand(
+                "Remove rows", np.arange(row, row+count),
+                self._copyStoredBlock(slice(row, row+count), 0,
+                                      self.columnCount())))
+
         # Notify other functions that rows are going to be removed
         self.beginRemoveRows(parent, row, row+count-1)
 
-        # Remove the rows
-        indexes = chain(range(0, row), range(row+count, self.rowCount()))
-        self._data = self._data.reindex(index=indexes)
-        self._data.reset_index(drop=True, inplace=True)
+        # Remove the rows from the statistics of all columns and the backend
+        self._removeStatistics(slice(row, row+count))
+        self._backend.remove_rows(row, count)
 
         # Notify other functions that rows have been removed
         self.endRemoveRows()
@@ -332,19 +964,233 @@ class DataTableModel(QC.QAbstractTableModel):
         # Return that operation was successful
         return(True)
 
+    # This function removes an arbitrary set of rows
+    def removeRowSet(self, rows, parent=None):
+        """
+        Removes all rows given by `rows` in a single vectorized pass.
+
+        Parameters
+        ----------
+        rows : 1D array_like of int or bool
+            If int, the indices of all rows that must be removed.
+            If bool, a mask with the length of :meth:`~rowCount` that is *True*
+            for every row that must be removed.
+
+        Optional
+        --------
+        parent : :obj:`~PyQt5.QtCore.QModelIndex` object or None. Default: None
+            The parent index of the rows.
+            If *None*, :obj:`~PyQt5.QtCore.QModelIndex` is used.
+
+        Returns
+        -------
+        success : bool
+            Whether the operation was successful.
+
+        """
+
+        # If parent is None, set it to QC.QModelIndex()
+        if parent is None:
+            parent = QC.QModelIndex()
+
+        # Convert rows to a mask of all rows that must be removed
+        rows = np.asarray(rows)
+        if(rows.dtype == bool):
+            mask = rows
+        else:
+            mask = np.zeros(self.rowCount(), dtype=bool)
+            mask[rows] = True
+
+        # Determine the contiguous ranges of rows that must be removed
+        ranges = mask_to_ranges(mask)
+
+        # If no rows must be removed, return
+        if not ranges:
+            return(True)
+
+        # Determine which stored rows must be removed
+        if self._row_map is None:
+            source_mask = mask
+        else:
+            source_mask = np.zeros(self._backend.row_count(), dtype=bool)
+            source_mask[self._row_map[mask]] = True
+
+        # Record the values in the rows that are removed
+        if self._undo_stack.isRecording():
+            source_rows = np.flatnonzero(source_mask)
+            self._undo_stack.push(RemoveRowsCommand(
+                "Remove rows", source_rows,
+                self._backend.get_rows(source_rows, 0, self.columnCount())))
+
+        # If there are many ranges, remove them all at once with a reset
+        # This is done as announcing a single range costs O(N) for the views
+        if(len(ranges) > MAX_REMOVE_RANGES):
+            self.beginResetModel()
+            self._removeSourceRows(source_mask)
+            self.endResetModel()
+
+        # Else, announce the removed rows range by range
+        else:
+            # Remove all rows from the backend in one go
+            n_rows = self.rowCount()
+            self._removeSourceRows(source_mask)
+
+            # Announce the ranges, starting at the back
+            # As long as not all ranges have been announced, rowCount still
+            # includes the rows of the ranges that are pending
+            self._pending_rows = n_rows-self.rowCount()
+            for start, stop in reversed(ranges):
+                self.beginRemoveRows(parent, start, stop-1)
+                self._pending_rows -= stop-start
+                self.endRemoveRows()
+
+        # Emit rowCountChanged signal
+        self.rowCountChanged.emit(self.rowCount())
+
+        # Return that operation was successful
+        return(True)
+
+    # This function removes the stored rows given by a mask from the backend
+    def _removeSourceRows(self, source_mask):
+        # Remove the rows from the statistics of all columns and the backend
+        self._removeStatistics(np.flatnonzero(source_mask))
+        self._backend.remove_rows_mask(source_mask)
+
+        # If the rows are not reordered, return
+        if self._row_map is None:
+            return
+
+        # Determine where all remaining rows are stored now
+        new_rows = np.cumsum(~source_mask)-1
+        self._row_map = new_rows[self._row_map[~source_mask[self._row_map]]]
+        if self._filter_mask is not None:
+            self._filter_mask = self._filter_mask[~source_mask]
+
+        # If there are no rows left, show all rows in their stored order again
+        if not self._backend.row_count():
+            self._row_map = None
+            self._filter_mask = None
+            self._setSortKeys([])
+
+    # This function removes rows given by the indices they are stored at
+    def _removeStoredRows(self, rows):
+        # Create mask of all stored rows that must be removed
+        source_mask = np.zeros(self._backend.row_count(), dtype=bool)
+        source_mask[rows] = True
+
+        # If the rows are not reordered, remove them like any other rows
+        if self._row_map is None:
+            self.removeRowSet(source_mask)
+
+        # Else, remove them with a reset, as they may not be shown
+        else:
+            self.beginResetModel()
+            self._removeSourceRows(source_mask)
+            self.endResetModel()
+            self.rowCountChanged.emit(self.rowCount())
+
+    # This function inserts rows at the indices they must be stored at
+    def _insertStoredRows(self, rows, columns=None):
+        # Determine the ranges of rows that must be inserted
+        if isinstance(rows, slice):
+            rows = np.arange(rows.start, rows.stop)
+        mask = np.zeros(self._backend.row_count()+len(rows), dtype=bool)
+        mask[rows] = True
+        ranges = mask_to_ranges(mask)
+
+        # Announce the ranges separately if the rows are not reordered
+        announce = self._row_map is None and len(ranges) <= MAX_REMOVE_RANGES
+        if not announce:
+            self.beginResetModel()
+
+        # Insert every range in order, such that its indices are final
+        n_inserted = 0
+        for start, stop in ranges:
+            # Insert the rows and set their values if provided
+            if announce:
+                self.beginInsertRows(QC.QModelIndex(), start, stop-1)
+            self._backend.insert_rows(start, stop-start)
+            if columns is not None:
+                self._backend.set_block(start, 0, [
+                    values[n_inserted:n_inserted+stop-start]
+                    for values in columns])
+            n_inserted += stop-start
+
+            # Add the rows to the statistics of all columns
+            self._updateStatistics(self._statistics.add, slice(start, stop))
+            if announce:
+                self.endInsertRows()
+
+        # If the rows are reordered, show the new rows as well
+        if self._row_map is not None:
+            if self._filter_mask is not None:
+                filter_mask = np.ones(len(mask), dtype=bool)
+                filter_mask[~mask] = self._filter_mask
+                self._filter_mask = filter_mask
+            self._sort_index.clear()
+            self._row_map = self._sortedRowMap()
+        if not announce:
+            self.endResetModel()
+
+        # If the rows are empty, compute their formulas
+        if columns is None:
+            for start, stop in ranges:
+                self._recomputeFormulas(range(self.columnCount()), start,
+                                        stop)
+
+        # Emit rowCountChanged signal
+        self.rowCountChanged.emit(self.rowCount())
+
+    # This function makes rows that were appended to the backend pass a filter
+    def _showSourceRows(self, count):
+        # If there is a filter, append the rows to its mask
+        if self._filter_mask is not None:
+            self._filter_mask = np.append(self._filter_mask,
+                                          np.ones(count, dtype=bool))
+
     # This function clears rows starting at given row
     @QC.Slot(int)
     @QC.Slot(int, int)
     @QC.Slot(int, int, QC.QModelIndex)
     def clearRows(self, row, count=1, parent=None):
-        # Clear the rows
-        self._data.iloc[row:row+count] = np.nan
+        # If the rows are reordered, clear every range they are stored in
+        if self._row_map is not None:
+            mask = np.zeros(self._backend.row_count(), dtype=bool)
+            mask[self._row_map[row:row+count]] = True
+            ranges = mask_to_ranges(mask)
+
+        # Else, clear the rows directly
+        else:
+            ranges = [(row, row+count)]
+
+        # Record the values in the rows that are cleared
+        if self._undo_stack.isRecording():
+            rows = (slice(row, row+count) if self._row_map is None
+                    else np.flatnonzero(mask))
+            self._undo_stack.push(BlockCommand(
+                "Clear rows", rows, 0,
+                self._copyStoredBlock(rows, 0, self.columnCount())))
+
+        # Clear every range, updating the statistics of all columns
+        for start, stop in ranges:
+            self._updateStatistics(self._statistics.remove,
+                                   slice(start, stop))
+            self._backend.clear_rows(start, stop-start)
+            self._updateStatistics(self._statistics.add, slice(start, stop))
+
+        # Emit dataChanged signal
+        self.dataChanged.emit(self.index(row, 0),
+                              self.index(row+count-1, self.columnCount()-1),
+                              [QC.Qt.EditRole])
+
+        # Recompute all formulas for the cleared rows
+        for start, stop in ranges:
+            self._recomputeFormulas(range(self.columnCount()), start, stop)
 
         # Return that operation was successful
         return(True)
 
     # This function inserts columns before given col
-    # Vaex: df.add_column
     @QC.Slot()
     @QC.Slot(int)
     @QC.Slot(int, int)
@@ -358,28 +1204,35 @@ class DataTableModel(QC.QAbstractTableModel):
         if parent is None:
             parent = QC.QModelIndex()
 
-        # Notify other functions that columns are going to be inserted
-        self.beginInsertColumns(parent, col, col+count-1)
+        # Make sure that all rows have been loaded before changing the columns
+        self.fetchAll()
 
-        # Create dict with all renames required
-        renames = {to_base_26(i+1): to_base_26(i+1+count)
-                   for i in range(col, self.columnCount())}
+        # Make sure that the backend can store the empty cells
+        self._reserveEmptyCells(count*self._backend.row_count())
 
-        # Rename all columns that require renaming
-        self._data.rename(columns=renames, inplace=True)
+        # Notify other functions that columns are going to be inserted
+        self.beginInsertColumns(parent, col, col+count-1)
 
-        # Create as many columns as required
-        for i in reversed(range(col, col+count)):
-            self._data.insert(col, to_base_26(i+1), np.nan)
+        # Create as many columns as required, all using their default names
+        self._backend.insert_columns(col, ['']*count)
+        self._precisions[col:col] = [None]*count
+        self._formulas[col:col] = [None]*count
 
         # Notify other functions that columns have been inserted
         self.endInsertColumns()
 
+        # Record where the columns were inserted
+        self._undo_stack.push(InsertColumnsCommand("Insert columns", col,
+                                                   count))
+
+        # Shift the sort keys of all columns after the inserted ones
+        self._setSortKeys([(i+count if(i >= col) else i, order)
+                           for i, order in self._sort_keys])
+
         # Return that operation was successful
         return(True)
 
     # This function removes columns starting at given col
-    # Vaex: df.drop
     @QC.Slot()
     @QC.Slot(int)
     @QC.Slot(int, int)
@@ -393,64 +1246,972 @@ class DataTableModel(QC.QAbstractTableModel):
         if parent is None:
             parent = QC.QModelIndex()
 
+        # Make sure that all rows have been loaded before changing the columns
+        self.fetchAll()
+
+        # Record all changes as a single change
+        self._undo_stack.beginMacro("Remove columns")
+
         # If count is equal to columnCount, remove all rows first
         if(self.columnCount() == count):
+            self.filterRows('')
             self.removeRows(count=self.rowCount())
 
+        # Record the values and properties of the columns that are removed
+        if self._undo_stack.isRecording():
+            self._undo_stack.push(RemoveColumnsCommand(
+                "Remove columns", col,
+                [self._backend.copy_column(i) for i in range(col, col+count)],
+                self._backend.column_names()[col:col+count],
+                self._precisions[col:col+count],
+                self._formulas[col:col+count]))
+
         # Notify other functions that columns are going to be removed
         self.beginRemoveColumns(parent, col, col+count-1)
 
-        # Create dict with all renames required
-        renames = {to_base_26(i+1): to_base_26(i+1-count)
-                   for i in range(col+count, self.columnCount())}
-
         # Delete as many columns as required
-        for name in self._data.columns[col:col+count]:
-            self._data.pop(name)
-
-        # Rename the remaining columns
-        self._data.rename(columns=renames, inplace=True)
+        self._backend.remove_columns(col, count)
+        del self._precisions[col:col+count]
+        del self._formulas[col:col+count]
 
         # Notify other functions that columns have been removed
         self.endRemoveColumns()
 
+        # Remove the sort keys of the removed columns and shift the others
+        self._setSortKeys([(i-count if(i >= col) else i, order)
+                           for i, order in self._sort_keys
+                           if not (col <= i < col+count)])
+
+        # Stop recording the changes
+        self._undo_stack.endMacro()
+
         # Return that operation was successful
         return(True)
 
+    # This function inserts columns with given values and properties
+    def _restoreColumns(self, col, columns, names, precisions, formulas):
+        # Insert empty columns and set their values
+        count = len(columns)
+        self.insertColumns(col, count)
+        for i, values in enumerate(columns):
+            self._backend.set_column(col+i, values)
+        self._statistics.invalidate(range(col, col+count))
+
+        # Set the properties of these columns
+        all_names = self._backend.column_names()
+        all_names[col:col+count] = names
+        self._backend.set_column_names(all_names)
+        self._precisions[col:col+count] = precisions
+        self._formulas[col:col+count] = formulas
+
+        # Emit signals
+        self.headerDataChanged.emit(QC.Qt.Horizontal, col, col+count-1)
+        for i in range(col, col+count):
+            self.columnNameChanged.emit(i, self.columnName(i))
+        self.dataChanged.emit(self.index(0, col),
+                              self.index(self.rowCount()-1, col+count-1),
+                              [QC.Qt.EditRole])
+
+        # Recompute all formulas that depend on these columns
+        self._recomputeFormulas(range(col, col+count), dependents_only=True)
+
+    # This function swaps the values and formulas of columns
+    def _swapColumns(self, cols, columns, formulas):
+        """
+        Replaces the values and formulas of all columns in `cols` by the
+        provided `columns` and `formulas`, and returns the ones they replaced.
+
+        If the values of a column are *None*, only its formula is replaced.
+
+        """
+
+        # Obtain the current values and formulas
+        old_columns = [None if values is None
+                       else self._backend.copy_column(col)
+                       for col, values in zip(cols, columns)]
+        old_formulas = [self._formulas[col] for col in cols]
+
+        # Replace the values and formulas of every column
+        for col, values, formula in zip(cols, columns, formulas):
+            if values is not None:
+                self._backend.set_column(col, values)
+            self._formulas[col] = formula
+        self._statistics.invalidate(cols)
+
+        # Emit signals
+        first, last = min(cols), max(cols)
+        self.headerDataChanged.emit(QC.Qt.Horizontal, first, last)
+        self.dataChanged.emit(self.index(0, first),
+                              self.index(self.rowCount()-1, last),
+                              [QC.Qt.EditRole])
+
+        # Recompute all formulas that depend on these columns
+        self._recomputeFormulas(cols, dependents_only=True)
+
+        # Return the old values and formulas
+        return(old_columns, old_formulas)
+
     # This function clears columns starting at given col
     @QC.Slot(int)
     @QC.Slot(int, int)
     @QC.Slot(int, int, QC.QModelIndex)
     def clearColumns(self, col, count=1, parent=None):
-        # Clear the columns
-        self._data.iloc[:, col:col+count] = np.nan
+        # Record the values and formulas of the columns that are cleared
+        if self._undo_stack.isRecording():
+            self._undo_stack.push(ColumnCommand(
+                "Clear columns", list(range(col, col+count)),
+                [self._backend.copy_column(i) for i in range(col, col+count)],
+                self._formulas[col:col+count]))
+
+        # Clear the columns and remove their formulas
+        self._backend.clear_columns(col, count)
+        self._statistics.invalidate(range(col, col+count))
+        self._formulas[col:col+count] = [None]*count
+        self.headerDataChanged.emit(QC.Qt.Horizontal, col, col+count-1)
+
+        # Emit dataChanged signal
+        self.dataChanged.emit(self.index(0, col),
+                              self.index(self.rowCount()-1, col+count-1),
+                              [QC.Qt.EditRole])
+
+        # Recompute all formulas that depend on these columns
+        self._recomputeFormulas(range(col, col+count))
 
         # Return that operation was successful
         return(True)
 
     # This function sets the name of a column
-    # Vaex: df.rename_column
     @QC.Slot(int, str)
     def setColumnName(self, col, name):
-        # If no name was given, use the base name
-        if not name:
-            name = to_base_26(col+1)
+        # Set column name, where no name means that the base name is used
+        names = self._backend.column_names()
+        old_name, names[col] = names[col], name
+        self._backend.set_column_names(names)
 
-        # Set column name
-        self._data.rename(
-            columns={self._data.columns[col]: name}, inplace=True)
+        # Record the name that was replaced
+        self._undo_stack.push(ColumnPropertyCommand(
+            "Rename column", 'setColumnName', col, old_name, name))
 
         # Emit a signal stating that a column changed its name
-        self.columnNameChanged.emit(col, name)
+        self.columnNameChanged.emit(col, self.columnName(col))
 
     # This function sets the dtype of a column
-    # TODO: If auto-conversion is not possible, ask user if the column should
-    # be cleared first instead
     @QC.Slot(int, str)
-    def setColumnDataType(self, col, dtype):
+    @QC.Slot(int, str, bool)
+    def setColumnDataType(self, col, dtype, clear=False):
+        """
+        Converts the column with index `col` to the data type `dtype`.
+
+        Only this column is converted, in chunks on a pool of threads. While
+        converting, the `conversionProgress` signal is emitted with the number
+        of chunks that have been converted and the total number of chunks.
+
+        Parameters
+        ----------
+        col : int
+            The index of the column that must be converted.
+        dtype : str
+            The data type the column must be converted to. This is any of the
+            values in :attr:`~dtypes`, like 'int', 'int8', 'uint32', 'float',
+            'float32', 'bool', 'datetime', 'str' or 'category'. Columns of type
+            'category' store their values dictionary-encoded, which makes
+            string columns with few unique values much smaller. Integer and
+            boolean columns that contain empty values store which values are
+            valid in a separate mask.
+
+        Optional
+        --------
+        clear : bool. Default: False
+            Whether the column must be cleared before it is converted, such
+            that the conversion cannot fail.
+
+        Raises
+        ------
+        ConversionError
+            If any value in the column cannot be converted to `dtype`. Its
+            `rows` attribute holds the stored indices of these values. The
+            column is left unchanged.
+
+        """
+
+        # If the column already has this data type, return
+        old_dtype = self._backend.column_dtype(col)
+        if(self.dtypes.get(old_dtype.type) == dtype) and not clear:
+            return
+
+        # Determine how this conversion can be undone
+        # Lossless conversions are undone by converting back
+        command = None
+        if self._undo_stack.isRecording():
+            old_name = self.dtypes.get(old_dtype.type)
+            if not clear and self._isLosslessConversion(col, old_name, dtype):
+                command = DataTypeCommand("Convert column", col, old_name,
+                                          dtype)
+            else:
+                command = ColumnCommand(
+                    "Convert column", [col], [self._backend.copy_column(col)],
+                    [self._formulas[col]])
+
+        # If requested, clear the column first
+        if clear:
+            self._backend.clear_columns(col, 1)
+            self._statistics.invalidate([col])
+
         # Set the requested data type
-        self._data = self._data.astype({self._data.columns[col]: dtype},
-                                       copy=False)
+        self._backend.set_column_dtype(col, DTYPE_ALIASES.get(dtype, dtype),
+                                       self.conversionProgress.emit)
+        self._statistics.invalidate([col])
+
+        # Emit dataChanged signal
+        self.dataChanged.emit(self.index(0, col),
+                              self.index(self.rowCount()-1, col),
+                              [QC.Qt.EditRole])
+
+        # If the values changed, recompute all formulas that depend on them
+        if clear or (self._backend.column_dtype(col) != old_dtype):
+            self._recomputeFormulas([col], dependents_only=True)
+
+        # Record the conversion
+        if command is not None:
+            self._undo_stack.push(command)
+
+    # This function returns whether a conversion does not lose information
+    def _isLosslessConversion(self, col, old_dtype, new_dtype):
+        # If this conversion never loses information, return True
+        if (old_dtype, new_dtype) in LOSSLESS_CONVERSIONS:
+            return(True)
+
+        # If this is not a conversion between numbers, return False
+        types = {value: key for key, value in self.dtypes.items()}
+        if not all(issubclass(types.get(dtype, object), (np.bool_, np.number))
+                   for dtype in (old_dtype, new_dtype)):
+            return(False)
+        old_dtype = np.dtype(types[old_dtype])
+        new_dtype = np.dtype(types[new_dtype])
+
+        # Safe conversions are lossless, except for integers to floats
+        if(np.can_cast(old_dtype, new_dtype, 'safe') and
+           not (old_dtype.kind in 'iu' and new_dtype.kind == 'f')):
+            return(True)
+
+        # Else, the values must fit in the new dtype
+        # Floats may be rounded, so these are only converted back if empty
+        stats = self._statistics.get(col)
+        if stats['min'] is None:
+            return(True)
+        elif(old_dtype.kind == 'f'):
+            return(False)
+        elif(new_dtype.kind == 'b'):
+            return(0 <= stats['min'] and stats['max'] <= 1)
+        elif(new_dtype.kind == 'f'):
+            limit = 2**(np.finfo(new_dtype).nmant+1)
+            return(max(-stats['min'], stats['max']) <= limit)
+        else:
+            info = np.iinfo(new_dtype)
+            return(info.min <= stats['min'] and stats['max'] <= info.max)
+
+    # This function converts all columns to their most compact data types
+    @QC.Slot()
+    def optimizeMemory(self):
+        """
+        Converts every column to the data type that uses the least memory
+        while still holding all of its values exactly.
+
+        Integer columns use the smallest integer type that holds all of their
+        values, float columns use 'float32' if none of their values is rounded
+        by it and string columns with few unique values are converted to
+        'category'. Computed columns are left unchanged. All conversions are
+        undone at once.
+
+        """
+
+        # Convert every column that can use a more compact data type
+        self._undo_stack.beginMacro("Optimize memory")
+        for col in range(self.columnCount()):
+            dtype = self._compactDataType(col)
+            if dtype is not None:
+                self.setColumnDataType(col, dtype)
+        self._undo_stack.endMacro()
+
+    # This function returns the most compact data type of a column
+    def _compactDataType(self, col):
+        # If this column is computed, its data type is set by its formula
+        dtype = self._backend.column_dtype(col)
+        dtype = getattr(dtype, 'numpy_dtype', dtype)
+        if((self._formulas[col] is not None) or
+           not isinstance(dtype, np.dtype)):
+            return(None)
+
+        # Integers use the smallest integer dtype that holds their range
+        if(dtype.kind in 'iu'):
+            stats = self._statistics.get(col)
+            if stats['min'] is None:
+                dtype = np.dtype(np.int8)
+            else:
+                dtype = compact_int_dtype(stats['min'], stats['max'])
+            return(None if dtype is None else self.dtypes[dtype.type])
+
+        # Doubles use single precision if that does not round any value
+        elif(dtype == np.float64):
+            n_rows = self._backend.row_count()
+            for row in range(0, n_rows, FORMULA_CHUNK_ROWS):
+                values = self._backend.get_block(
+                    row, col, min(FORMULA_CHUNK_ROWS, n_rows-row), 1)[0]
+                with np.errstate(over='ignore'):
+                    if not np.array_equal(values.astype(np.float32), values,
+                                          equal_nan=True):
+                        return(None)
+            return('float32')
+
+        # Strings are dictionary-encoded if they have few unique values
+        elif(dtype.kind == 'O'):
+            values = pd.Series(self._backend.get_column(col), copy=False)
+            return(None if categorize_values(values) is None else 'category')
+
+        # Else, this column cannot be made more compact
+        else:
+            return(None)
+
+    # This function returns the display precision of a column
+    @QC.Slot(int)
+    def columnPrecision(self, col):
+        """
+        Returns the number of significant digits that is used for displaying
+        the floats in the column with index `col`.
+
+        Parameters
+        ----------
+        col : int
+            The index of the column whose precision is requested.
+
+        Returns
+        -------
+        precision : int or None
+            The precision of the column, or *None* if the default precision is
+            used.
+
+        """
+
+        # Return the precision of this column
+        return(self._precisions[col])
+
+    # This function sets the display precision of a column
+    @QC.Slot(int, int)
+    def setColumnPrecision(self, col, precision):
+        """
+        Sets the number of significant digits that is used for displaying the
+        floats in the column with index `col` to `precision`.
+
+        Parameters
+        ----------
+        col : int
+            The index of the column whose precision must be set.
+        precision : int or None
+            The number of significant digits to use.
+            If *None*, the default precision is used.
+
+        """
+
+        # If the precision did not change, return
+        if(self._precisions[col] == precision):
+            return
+
+        # Set the precision of this column and record the old precision
+        self._undo_stack.push(ColumnPropertyCommand(
+            "Set precision", 'setColumnPrecision', col,
+            self._precisions[col], precision))
+        self._precisions[col] = precision
+        self.setModified(True)
+
+        # Emit dataChanged signal
+        self.dataChanged.emit(self.index(0, col),
+                              self.index(self.rowCount()-1, col),
+                              [QC.Qt.DisplayRole])
+
+    # This function returns the formula of a column
+    @QC.Slot(int)
+    def columnFormula(self, col):
+        """
+        Returns the formula that computes the values of the column with index
+        `col`, or *None* if this column has no formula.
+
+        """
+
+        return(self._formulas[col])
+
+    # This function sets the formula of a column
+    @QC.Slot(int, str)
+    def setColumnFormula(self, col, formula, evaluate=True):
+        """
+        Sets the formula that computes the values of the column with index
+        `col` to `formula`, and computes these values.
+
+        A formula is an expression like ``A * 2 + B``, which is evaluated for
+        every row with :meth:`~pandas.DataFrame.eval`. It refers to other
+        columns by their names, and names that are not valid Python
+        identifiers must be enclosed in backticks. The data type of the column
+        is set to the data type of the result.
+
+        Columns with a formula cannot be edited. Whenever values in the
+        columns a formula depends on change, only the rows that changed are
+        recomputed, for all formulas that depend on them directly or
+        indirectly. Formulas are evaluated in chunks of rows, such that no
+        temporary copies of entire columns are required.
+
+        Parameters
+        ----------
+        col : int
+            The index of the column whose formula must be set.
+        formula : str or None
+            The formula of the column. If empty or *None*, the formula is
+            removed, and the column keeps its current values.
+
+        Optional
+        --------
+        evaluate : bool. Default: True
+            Whether the formula must be computed. If *False*, the column is
+            assumed to hold the values of the formula already, like when its
+            values were restored from a project file.
+
+        Raises
+        ------
+        ValueError
+            If `formula` depends on the column itself.
+
+        """
+
+        # Obtain the formula
+        formula = (formula or '').strip() or None
+
+        # If the formula would depend on this column, raise error
+        if formula is not None and col in self._formulaDependencies(
+                formula, recursive=True):
+            raise ValueError("Formula %r of column %r depends on itself!"
+                             % (formula, self.columnName(col)))
+
+        # Copy the values of this column if the formula replaces them
+        if(self._undo_stack.isRecording() and formula is not None and
+           evaluate):
+            old_values = self._backend.copy_column(col)
+        else:
+            old_values = None
+
+        # Set the formula of this column
+        old_formula = self._formulas[col]
+        self._formulas[col] = formula
+        self.setModified(True)
+        self.headerDataChanged.emit(QC.Qt.Horizontal, col, col)
+
+        # If there is a formula that must be evaluated, compute it
+        if formula is not None and evaluate:
+            # Compute the values of this column, restoring the old formula if
+            # this fails
+            try:
+                self._evaluateFormula(col, 0, self._backend.row_count())
+            except Exception:
+                self._formulas[col] = old_formula
+                self.headerDataChanged.emit(QC.Qt.Horizontal, col, col)
+                raise
+
+            # Emit dataChanged signal
+            self.dataChanged.emit(self.index(0, col),
+                                  self.index(self.rowCount()-1, col),
+                                  [QC.Qt.EditRole])
+
+            # Recompute all formulas that depend on this column
+            self._recomputeFormulas([col], dependents_only=True)
+
+        # Record the values and formula that were replaced
+        self._undo_stack.push(ColumnCommand("Set formula", [col], [old_values],
+                                            [old_formula]))
+
+    # This function returns the columns a formula depends on
+    def _formulaDependencies(self, formula, recursive=False):
+        # Obtain the indices of all columns that are used in the formula
+        names = self.columnNames()
+        cols = [names.index(name)
+                for name in get_expression_names(formula, names)]
+
+        # If requested, add the columns these columns depend on as well
+        if recursive:
+            for i in cols:
+                if self._formulas[i] is not None:
+                    cols.extend(set(self._formulaDependencies(
+                        self._formulas[i])).difference(cols))
+
+        # Return cols
+        return(cols)
+
+    # This function determines which formulas depend on a set of columns
+    def _formulaOrder(self, cols, dependents_only=False):
+        # Obtain the columns that every formula depends on
+        dependencies = {i: set(self._formulaDependencies(formula))
+                        for i, formula in enumerate(self._formulas)
+                        if formula is not None}
+
+        # Determine all formulas that depend on the columns
+        changed = set(cols)
+        affected = set() if dependents_only else changed & set(dependencies)
+        n_affected = -1
+        while(len(affected) != n_affected):
+            n_affected = len(affected)
+            affected.update(i for i, deps in dependencies.items()
+                            if deps & (changed | affected))
+
+        # Sort these formulas such that they come after their dependencies
+        order = []
+        while affected:
+            ready = sorted(i for i in affected
+                           if not dependencies[i] & (affected-{i}))
+            if not ready:
+                break
+            order.extend(ready)
+            affected.difference_update(ready)
+
+        # Return order
+        return(order)
+
+    # This function recomputes the formulas that depend on changed values
+    def _recomputeFormulas(self, cols, start=0, stop=None,
+                           dependents_only=False):
+        # Determine all formulas that must be recomputed
+        order = self._formulaOrder(cols, dependents_only)
+
+        # If there are none, return
+        if not order:
+            return
+
+        # Recompute all formulas for the given range of stored rows
+        if stop is None:
+            stop = self._backend.row_count()
+        for col in order:
+            # Try to recompute this formula
+            # If it can no longer be evaluated, it keeps its current values
+            try:
+                self._evaluateFormula(col, start, stop)
+            except Exception:
+                continue
+
+            # Emit dataChanged signal for the rows that are shown
+            if self._row_map is None:
+                top, bottom = start, stop-1
+            else:
+                top, bottom = 0, self.rowCount()-1
+            self.dataChanged.emit(self.index(top, col),
+                                  self.index(bottom, col),
+                                  [QC.Qt.EditRole])
+
+    # This function evaluates the formula of a column for a range of rows
+    def _evaluateFormula(self, col, start, stop):
+        # Obtain the columns the formula depends on
+        formula = self._formulas[col]
+        names = self.columnNames()
+        used_names = get_expression_names(formula, names)
+
+        # Evaluate the formula chunk by chunk
+        for row in range(start, stop, FORMULA_CHUNK_ROWS):
+            # Evaluate the formula for this chunk
+            n_rows = min(FORMULA_CHUNK_ROWS, stop-row)
+            columns = {
+                name: self._backend.get_block(row, names.index(name),
+                                              n_rows, 1)[0]
+                for name in used_names}
+            values = evaluate_expression(formula, columns, n_rows)
+
+            # Make sure that the column can hold the values
+            if(row == start):
+                self._setFormulaDataType(
+                    col, values.dtype,
+                    (start, stop) == (0, self._backend.row_count()))
+
+            # Store the values, updating the statistics of the column
+            rows = slice(row, row+n_rows)
+            self._updateStatistics(self._statistics.remove, rows, [col])
+            self._backend.set_block(row, col, [values])
+            self._updateStatistics(self._statistics.add, rows, [col])
+
+    # This function sets the dtype of a formula column to that of its values
+    def _setFormulaDataType(self, col, dtype, exact):
+        # Determine the data type that can hold values of this dtype
+        if(dtype.kind in 'biuf'):
+            dtype = {'b': 'bool', 'i': 'int', 'u': 'int', 'f': 'float'}[
+                dtype.kind]
+        else:
+            dtype = 'str'
+        dtype = np.dtype(next(key for key, value in self.dtypes.items()
+                              if(value == dtype)))
+
+        # If all values are computed, use this data type
+        # Else, only change the data type if it cannot hold the values
+        # Dictionary-encoded columns can hold any object
+        old_dtype = self._backend.column_dtype(col)
+        if isinstance(old_dtype, np.dtype):
+            can_hold = np.can_cast(dtype, old_dtype, 'same_kind')
+        else:
+            can_hold = (dtype.kind == 'O')
+        if((old_dtype != dtype) and (exact or not can_hold)):
+            dtype = self.dtypes[dtype.type]
+            self._backend.set_column_dtype(col,
+                                           DTYPE_ALIASES.get(dtype, dtype))
+            self._statistics.invalidate([col])
+
+    # This function returns the statistics of a column
+    @QC.Slot(int)
+    @QC.Slot(str)
+    def columnStatistics(self, index):
+        """
+        Returns the statistics of the column with the provided column `index`.
+
+        The statistics are maintained incrementally whenever values change,
+        such that they are usually available in constant time.
+
+        Parameters
+        ----------
+        index : int or str
+            If int, the index of the column whose statistics are requested.
+            If str, the name of this column.
+
+        Returns
+        -------
+        statistics : dict
+            Dict containing the number of values that are not empty
+            ('count'), the number of empty values ('nan_count') and the data
+            type ('dtype') of the column. For numerical columns, it also
+            contains the 'min', 'max', 'sum', 'mean' and sample variance
+            ('var') of all finite values. These are *None* for all other
+            columns.
+
+        """
+
+        # If index is a str, check what column index that is
+        if isinstance(index, str):
+            index = self.columnNames().index(index)
+
+        # Return the statistics of this column
+        return(self._statistics.get(index))
+
+    # This function returns the version of a column
+    @QC.Slot(int)
+    @QC.Slot(str)
+    def columnVersion(self, index):
+        """
+        Returns the version of the column with the provided column `index`.
+
+        The version of a column changes whenever any of its values change,
+        and allows for checking whether a column changed in constant time.
+
+        """
+
+        # If index is a str, check what column index that is
+        if isinstance(index, str):
+            index = self.columnNames().index(index)
+
+        # Return the version of this column
+        return(self._statistics.version(index))
+
+    # This function reports the values in stored rows to the statistics
+    def _updateStatistics(self, update, rows, cols=None):
+        # If cols is None, report the values of all columns
+        if cols is None:
+            cols = range(self.columnCount())
+
+        # Report the values of every column whose statistics are tracked
+        for col in cols:
+            if not self._statistics.is_tracked(col):
+                continue
+            elif isinstance(rows, slice):
+                values = self._backend.get_block(
+                    rows.start, col, rows.stop-rows.start, 1)[0]
+            else:
+                values = self._backend.get_rows(rows, col, 1)[0]
+            update(col, values)
+
+    # This function removes stored rows from the statistics of all columns
+    def _removeStatistics(self, rows):
+        # If most rows are removed, compute the statistics again when required
+        n_rows = (rows.stop-rows.start if isinstance(rows, slice)
+                  else len(rows))
+        if(2*n_rows > self._backend.row_count()):
+            self._statistics.invalidate(range(self.columnCount()))
+
+        # Else, remove the values of these rows from the statistics
+        else:
+            self._updateStatistics(self._statistics.remove, rows)
+
+    # Override sort function
+    @QC.Slot(int)
+    @QC.Slot(int, QC.Qt.SortOrder)
+    def sort(self, column, order=QC.Qt.AscendingOrder):
+        # If column is negative, show all rows in their stored order
+        if(column < 0):
+            self.sortByColumns([])
+
+        # Else, sort all rows on this column only
+        else:
+            self.sortByColumns([(column, order)])
+
+    # This function sorts the rows on several columns
+    @QC.Slot(list)
+    def sortByColumns(self, keys):
+        """
+        Sorts all rows in this model on the provided `keys`.
+
+        Sorting does not move any data. Instead, a permutation of all rows is
+        computed, after which every row is read from the index it is stored
+        at. The permutation of every column is cached, such that sorting a
+        column again or in the opposite order is nearly instantaneous.
+        Sorting is stable and empty values are always sorted to the end.
+        Rows that are loaded while sorted are shown at the end, until all rows
+        have been loaded.
+
+        Parameters
+        ----------
+        keys : list of tuple(int, :obj:`~PyQt5.QtCore.Qt.SortOrder`)
+            List with the index and sort order of every column to sort on,
+            with the primary key first.
+            If empty, all rows are shown in the order they are stored in.
+
+        """
+
+        # Show the rows in their new order
+        self._setSortKeys([(col, QC.Qt.SortOrder(order))
+                           for col, order in keys])
+        self._updateRowMap(self.VerticalSortHint)
+
+    # This function returns the keys the rows are currently sorted on
+    @QC.Slot()
+    def sortKeys(self):
+        """
+        Returns a list with the index and sort order of every column the rows
+        in this model were last sorted on, with the primary key first.
+
+        """
+
+        return(list(self._sort_keys))
+
+    # This function sets the sort keys and emits a signal if they changed
+    def _setSortKeys(self, keys):
+        # If the keys did not change, return
+        if(keys == self._sort_keys):
+            return
+
+        # Set the sort keys and emit signal
+        self._sort_keys = keys
+        self.sortKeysChanged.emit(self.sortKeys())
+
+    # This function filters the rows using an expression
+    @QC.Slot(str)
+    def filterRows(self, expression):
+        """
+        Only shows the rows for which the provided filter `expression` holds.
+
+        The expression is evaluated on the data columns of this model in a
+        separate thread, using
+        :func:`~guipy.plugins.data_table.widgets.evaluate_filter`. Calling this
+        method again before the evaluation has finished cancels it. Once the
+        evaluation finishes, the filter is applied with :meth:`~setRowFilter`.
+        If the evaluation fails, `filterFailed` is emitted and the current
+        filter is kept.
+
+        Parameters
+        ----------
+        expression : str
+            The expression that must be evaluated for every row, like
+            ``A > 3 & B < 1e5``. If empty, all rows are shown.
+
+        """
+
+        # Cancel the evaluation of the previous expression
+        filtering = self._cancelRowFilter()
+        self._filter_expression = expression = expression.strip()
+
+        # If the expression is empty, show all rows
+        if not expression:
+            self.setRowFilter(None)
+            if filtering:
+                self.filteringChanged.emit(False)
+            return
+
+        # Make sure that all rows have been loaded before filtering them
+        self.fetchAll()
+
+        # Evaluate the expression on all data columns in a separate thread
+        # Dictionary-encoded columns are compared using their codes
+        columns = {}
+        for i, name in enumerate(self.columnNames()):
+            values = self._backend.get_categorical(i)
+            columns[name] = (self._backend.get_column(i) if values is None
+                             else values)
+        row_filter = RowFilter(expression, columns, self)
+        row_filter.evaluated.connect(self._finishRowFilter)
+        row_filter.failed.connect(self._failRowFilter)
+        row_filter.finished.connect(row_filter.deleteLater)
+        self._row_filter = row_filter
+        row_filter.start()
+
+        # Emit filteringChanged signal
+        if not filtering:
+            self.filteringChanged.emit(True)
+
+    # This function cancels the evaluation of the current filter expression
+    def _cancelRowFilter(self):
+        # If no expression is being evaluated, return False
+        if self._row_filter is None:
+            return(False)
+
+        # Request the evaluation to stop and ignore its results
+        self._row_filter.requestInterruption()
+        self._row_filter = None
+        return(True)
+
+    # This function applies the mask of an evaluated filter expression
+    @QC.Slot(object)
+    def _finishRowFilter(self, mask):
+        # If this is not the current evaluation, ignore it
+        if self.sender() is not self._row_filter:
+            return
+        self._row_filter = None
+
+        # If rows were added or removed in the meantime, evaluate it again
+        if(len(mask) != self._backend.row_count()):
+            self._filter_expression, expression = '', self._filter_expression
+            self.filterRows(expression)
+            return
+
+        # Apply the filter
+        self.setRowFilter(mask)
+        self.filteringChanged.emit(False)
+
+    # This function handles a filter expression that could not be evaluated
+    @QC.Slot(str)
+    def _failRowFilter(self, message):
+        # If this is not the current evaluation, ignore it
+        if self.sender() is not self._row_filter:
+            return
+        self._row_filter = None
+
+        # Emit the signals
+        self.filteringChanged.emit(False)
+        self.filterFailed.emit(message)
+
+    # This function returns the current filter expression
+    @QC.Slot()
+    def filterExpression(self):
+        """
+        Returns the expression that was last provided to :meth:`~filterRows`.
+
+        """
+
+        return(self._filter_expression)
+
+    # This function returns whether a filter expression is being evaluated
+    @QC.Slot()
+    def isFiltering(self):
+        """
+        Returns whether a filter expression is currently being evaluated.
+
+        """
+
+        return(self._row_filter is not None)
+
+    # This function sets which rows are shown
+    def setRowFilter(self, mask):
+        """
+        Only shows the rows for which the provided boolean `mask` is *True*.
+
+        The rows that are shown keep their current sort order, and the
+        vertical header keeps showing their original row numbers. No data is
+        copied or moved.
+
+        Parameters
+        ----------
+        mask : 1D array_like of bool or None
+            Mask with the length of the number of rows stored in this model.
+            If *None*, all rows are shown.
+
+        """
+
+        # Make sure that all rows have been loaded before filtering them
+        self.fetchAll()
+
+        # Check if the mask has the proper length
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if(len(mask) != self._backend.row_count()):
+                raise ValueError("Filter mask has length %i, but data table "
+                                 "has %i rows!"
+                                 % (len(mask), self._backend.row_count()))
+
+        # Set the mask and show the rows that pass it
+        self._filter_mask = mask
+        self._updateRowMap(self.NoLayoutChangeHint)
+
+    # This function returns the mask of the rows that are shown
+    @QC.Slot()
+    def rowFilter(self):
+        """
+        Returns the boolean mask of all stored rows that are shown, or *None*
+        if all rows are shown.
+
+        """
+
+        return(self._filter_mask)
+
+    # This function determines the order in which the rows are shown
+    def _updateRowMap(self, hint):
+        self._setRowMap(self._sortedRowMap(), hint)
+
+    # This function returns the rows that are shown in the order they are shown
+    def _sortedRowMap(self):
+        # Determine the order of all stored rows
+        if self._sort_keys and self._backend.row_count():
+            row_map = self._sort_index.permutation(self._sort_keys)
+        else:
+            row_map = None
+
+        # Remove all rows that do not pass the filter
+        if self._filter_mask is not None:
+            if row_map is None:
+                row_map = np.flatnonzero(self._filter_mask)
+            else:
+                row_map = row_map[self._filter_mask[row_map]]
+
+        # Return row_map
+        return(row_map)
+
+    # This function sets the order in which the rows are shown
+    def _setRowMap(self, row_map, hint):
+        # Notify other functions that the rows are going to be reordered
+        n_rows = self.rowCount()
+        self.layoutAboutToBeChanged.emit([], hint)
+
+        # Determine the stored indices of all persistent indices
+        old_indices = self.persistentIndexList()
+        rows = [index.row() for index in old_indices]
+        if self._row_map is not None:
+            rows = self._row_map[rows].tolist()
+
+        # Determine where these rows are shown after reordering
+        # Rows that are no longer shown obtain an invalid index
+        if row_map is not None and rows:
+            positions = np.full(self._backend.row_count(), -1)
+            positions[row_map] = np.arange(len(row_map))
+            rows = positions[rows].tolist()
+
+        # Set the new order of the rows
+        self._row_map = row_map
+
+        # Update all persistent indices
+        new_indices = [self.index(row, index.column())
+                       for row, index in zip(rows, old_indices)]
+        self.changePersistentIndexList(old_indices, new_indices)
+
+        # Notify other functions that the rows have been reordered
+        self.layoutChanged.emit([], hint)
+
+        # If the number of rows changed, emit rowCountChanged signal
+        if(self.rowCount() != n_rows):
+            self.rowCountChanged.emit(self.rowCount())
 
 
 # %% FUNCTION DEFINITIONS
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Row Filter
+=====================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+import re
+
+# Package imports
+import numpy as np
+import pandas as pd
+from qtpy import QtCore as QC
+
+# GuiPy imports
+
+# All declaration
+__all__ = ['RowFilter', 'evaluate_expression', 'evaluate_filter',
+           'get_expression_names']
+
+
+# %% GLOBALS
+# Number of rows for which a filter expression is evaluated at once
+FILTER_CHUNK_ROWS = 2**20
+
+
+# %% CLASS DEFINITIONS
+# Define thread that evaluates a filter expression
+class RowFilter(QC.QThread):
+    """
+    Evaluates a filter expression on a set of data columns in a separate
+    thread, using :func:`~evaluate_filter`.
+
+    The evaluation can be cancelled with :meth:`~requestInterruption`, after
+    which neither of its signals is emitted.
+
+    """
+
+    # Signals
+    evaluated = QC.Signal(object)
+    failed = QC.Signal(str)
+
+    # Initialize RowFilter class
+    def __init__(self, expression, columns, parent=None):
+        # Call super constructor
+        super().__init__(parent)
+
+        # Save provided expression and columns
+        self.expression = expression
+        self.columns = columns
+
+    # Override run to evaluate the expression
+    def run(self):
+        # Try to evaluate the expression
+        try:
+            mask = evaluate_filter(self.expression, self.columns,
+                                   self.isInterruptionRequested)
+
+        # If that fails, emit the error message unless cancelled
+        except Exception as error:
+            if not self.isInterruptionRequested():
+                self.failed.emit(str(error))
+
+        # Else, emit the mask unless cancelled
+        else:
+            if mask is not None:
+                self.evaluated.emit(mask)
+
+
+# %% FUNCTION DEFINITIONS
+# This function evaluates an expression on a set of columns
+def evaluate_expression(expression, columns, n_rows):
+    """
+    Evaluates the provided `expression` on the provided `columns` with
+    :meth:`~pandas.DataFrame.eval`, and returns the value it has for every
+    row.
+
+    Parameters
+    ----------
+    expression : str
+        The expression that must be evaluated.
+    columns : dict of {str: 1D array_like}
+        Dict containing the values of all columns the expression refers to.
+    n_rows : int
+        The number of rows the columns have.
+
+    Returns
+    -------
+    values : :obj:`~numpy.ndarray` object
+        Array of length `n_rows` with the value of `expression` for every row.
+
+    """
+
+    # Evaluate the expression
+    result = np.asarray(pd.DataFrame(columns).eval(expression))
+
+    # If the expression does not depend on any row, use its value for all rows
+    if not result.ndim:
+        result = np.full(n_rows, result)
+
+    # Return result
+    return(result)
+
+
+# This function evaluates a filter expression on a set of columns
+def evaluate_filter(expression, columns, is_interrupted=None):
+    """
+    Evaluates the provided filter `expression` on the provided `columns`, and
+    returns the resulting boolean mask.
+
+    The expression is evaluated with :meth:`~pandas.DataFrame.eval` in chunks
+    of rows, using only the columns it refers to. Columns are referred to by
+    their names, and names that are not valid Python identifiers must be
+    enclosed in backticks. The operators `&` and `|` bind less tightly than
+    comparisons, such that ``A > 3 & B < 1e5`` is valid.
+
+    Parameters
+    ----------
+    expression : str
+        The expression that must be evaluated for every row.
+    columns : dict of {str: 1D array_like}
+        Dict containing the values of all columns the expression may refer
+        to. All columns must have the same length. Dictionary-encoded columns
+        can be given as :obj:`~pandas.Categorical` objects.
+
+    Optional
+    --------
+    is_interrupted : callable or None. Default: None
+        If not *None*, a function that is called before every chunk of rows,
+        which returns whether the evaluation must be cancelled.
+
+    Returns
+    -------
+    mask : :obj:`~numpy.ndarray` object of bool or None
+        Mask that is *True* for every row for which `expression` holds.
+        If the evaluation was cancelled, *None* is returned instead.
+
+    Raises
+    ------
+    ValueError
+        If `expression` does not evaluate to a boolean value for every row.
+
+    """
+
+    # Obtain the number of rows
+    n_rows = len(next(iter(columns.values()))) if columns else 0
+
+    # Only use the columns that are referred to by the expression
+    # Categoricals are kept, as pandas compares them using their codes
+    columns = {name: (columns[name] if isinstance(columns[name],
+                                                  pd.Categorical)
+                      else np.asarray(columns[name]))
+               for name in get_expression_names(expression, columns)}
+
+    # Evaluate the expression chunk by chunk
+    mask = np.zeros(n_rows, dtype=bool)
+    for start in range(0, n_rows, FILTER_CHUNK_ROWS):
+        # If the evaluation was cancelled, return None
+        if is_interrupted is not None and is_interrupted():
+            return(None)
+
+        # Evaluate the expression for this chunk
+        stop = min(start+FILTER_CHUNK_ROWS, n_rows)
+        result = evaluate_expression(
+            expression, {name: values[start:stop]
+                         for name, values in columns.items()}, stop-start)
+
+        # Check if the result is a boolean mask
+        if(result.dtype != bool):
+            raise ValueError("Filter expression %r does not evaluate to a "
+                             "boolean value for every row!" % (expression))
+
+        # Add result to the mask
+        mask[start:stop] = result
+
+    # Return mask
+    return(mask)
+
+
+# This function returns the names of all columns used in an expression
+def get_expression_names(expression, names):
+    """
+    Returns a list of all `names` that are referred to in the provided
+    `expression`, either directly or enclosed in backticks.
+
+    """
+
+    # Obtain all words and backtick-quoted names in the expression
+    words = re.findall(r'`([^`]+)`|(\w+)', expression)
+    words = {word for pair in words for word in pair}
+
+    # Return all names that are used
+    return([name for name in names if name in words])
@@ -23,4 +23,27 @@ __all__ = ['DataTableSelectionModel']
 # Define model for the DataTable widget
 # HINT: https://doc.qt.io/qt-5/model-view-programming.html
 class DataTableSelectionModel(QC.QItemSelectionModel):
-    pass
+    # This function returns the block that contains all selected items
+    def selectedBlock(self):
+        """
+        Returns the smallest rectangular block that contains all selected
+        items, as a `(row, col, n_rows, n_cols)` tuple.
+        If no items are selected, *None* is returned instead.
+
+        """
+
+        # Obtain all selection ranges
+        selection = self.selection()
+
+        # If nothing is selected, return None
+        if selection.isEmpty():
+            return(None)
+
+        # Determine the bounding box of all selection ranges
+        top = min(selection_range.top() for selection_range in selection)
+        left = min(selection_range.left() for selection_range in selection)
+        bottom = max(selection_range.bottom() for selection_range in selection)
+        right = max(selection_range.right() for selection_range in selection)
+
+        # Return block
+        return(top, left, bottom-top+1, right-left+1)
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Sort Index
+=====================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from collections import OrderedDict
+
+# Package imports
+import numpy as np
+import pandas as pd
+from qtpy import QtCore as QC
+
+# GuiPy imports
+
+# All declaration
+__all__ = ['SortIndex']
+
+
+# %% CLASS DEFINITIONS
+# Define class that caches the sorting permutations of the columns of a model
+class SortIndex(object):
+    """
+    Caches the stable, ascending sorting permutations of the columns of a
+    :class:`~guipy.plugins.data_table.widgets.DataTableModel`, and uses them
+    to determine the order of its rows when sorted on one or more columns.
+
+    Only the permutations of the most recently sorted columns are cached.
+    Sorting a column in descending order or toggling between orders reuses
+    the cached permutation, and costs a single linear pass over the column.
+
+    The cache is invalidated precisely by the signals the model emits.
+
+    """
+
+    # Maximum number of columns whose permutations are cached
+    MAX_COLUMNS = 4
+
+    # Initialize SortIndex class
+    def __init__(self, model):
+        # Save provided model
+        self.model = model
+
+        # Initialize empty cache
+        self._argsorts = OrderedDict()
+
+        # Connect signals of the model that invalidate the cache
+        model.dataChanged.connect(self.invalidate_data)
+        model.rowsInserted.connect(self.clear)
+        model.rowsRemoved.connect(self.clear)
+        model.columnsInserted.connect(self.clear)
+        model.columnsRemoved.connect(self.clear)
+        model.modelReset.connect(self.clear)
+
+    # This function returns the ascending permutation of a column
+    def argsort(self, col):
+        """
+        Returns the indices that sort the column with index `col` in a stable,
+        ascending way, with all empty values at the end.
+
+        """
+
+        # Obtain the permutation of this column, calculating it if required
+        argsort = self._argsorts.pop(col, None)
+        if argsort is None:
+            argsort = stable_argsort(sort_values(self.model.backend(), col))
+
+        # Add permutation to the cache, removing the oldest one if required
+        self._argsorts[col] = argsort
+        if(len(self._argsorts) > self.MAX_COLUMNS):
+            self._argsorts.popitem(last=False)
+
+        # Return argsort
+        return(argsort)
+
+    # This function determines the groups of equal values in a column
+    def _groups(self, col):
+        # Obtain the ascending permutation and the sorted values of the column
+        argsort = self.argsort(col)
+        values = sort_values(self.model.backend(), col)[argsort]
+
+        # Determine the number of values that are not empty
+        # As empty values are sorted to the end, all of them come after these
+        n_valid = len(values)-int(np.count_nonzero(pd.isna(values)))
+
+        # Determine where every group of equal values starts
+        starts = np.ones(n_valid, dtype=bool)
+        starts[1:] = (values[1:n_valid] != values[:max(n_valid-1, 0)])
+
+        # Return argsort, n_valid and starts
+        return(argsort, n_valid, starts)
+
+    # This function returns the rows of a column in sorted order
+    def sorted_rows(self, col, order=QC.Qt.AscendingOrder):
+        """
+        Returns the indices that sort the column with index `col` in the given
+        `order`.
+
+        Sorting is stable in both orders, and empty values are always sorted
+        to the end.
+
+        """
+
+        # If the order is ascending, return the cached permutation
+        if(order == QC.Qt.AscendingOrder):
+            return(self.argsort(col))
+
+        # Obtain the groups of equal values in this column
+        argsort, n_valid, starts = self._groups(col)
+
+        # Reverse the order of the groups, but not the order within them
+        group = np.cumsum(starts)-1
+        first = np.flatnonzero(starts)
+        last = np.append(first[1:], n_valid)
+        positions = n_valid-last[group]+np.arange(n_valid)-first[group]
+
+        # Create the descending permutation, keeping empty values at the end
+        rows = np.empty_like(argsort)
+        rows[positions] = argsort[:n_valid]
+        rows[n_valid:] = argsort[n_valid:]
+
+        # Return rows
+        return(rows)
+
+    # This function returns the dense ranks of the values in a column
+    def ranks(self, col, order=QC.Qt.AscendingOrder):
+        """
+        Returns the dense ranks of the values in the column with index `col`
+        when sorted in the given `order`.
+
+        Equal values have equal ranks, and empty values always have the
+        highest rank.
+
+        """
+
+        # Obtain the groups of equal values in this column
+        argsort, n_valid, starts = self._groups(col)
+
+        # Determine the rank of every sorted value
+        sorted_ranks = np.empty(len(argsort), dtype=np.int64)
+        np.cumsum(starts, out=sorted_ranks[:n_valid])
+        n_groups = sorted_ranks[n_valid-1] if n_valid else 0
+        if(order == QC.Qt.AscendingOrder):
+            sorted_ranks[:n_valid] -= 1
+        else:
+            sorted_ranks[:n_valid] = n_groups-sorted_ranks[:n_valid]
+        sorted_ranks[n_valid:] = n_groups
+
+        # Assign the ranks to the unsorted values
+        ranks = np.empty_like(sorted_ranks)
+        ranks[argsort] = sorted_ranks
+
+        # Return ranks
+        return(ranks)
+
+    # This function returns the rows of the model sorted on several columns
+    def permutation(self, keys):
+        """
+        Returns the indices that sort the rows of the model on all provided
+        `keys`.
+
+        Parameters
+        ----------
+        keys : list of tuple(int, :obj:`~PyQt5.QtCore.Qt.SortOrder`)
+            List with the index and sort order of every column to sort on,
+            with the primary key first.
+
+        Returns
+        -------
+        rows : :obj:`~numpy.ndarray` object
+            The indices of the rows in sorted order.
+
+        """
+
+        # If there is a single key, return the rows of that column directly
+        if(len(keys) == 1):
+            return(self.sorted_rows(*keys[0]))
+
+        # Obtain the ranks of all columns
+        ranks = [self.ranks(col, order) for col, order in keys]
+
+        # If possible, combine all ranks into a single integer key
+        sizes = [int(values.max())+1 if len(values) else 1
+                 for values in ranks]
+        if(np.prod(sizes, dtype=float) < 2**63):
+            key = ranks[0]
+            for values, size in zip(ranks[1:], sizes[1:]):
+                key = key*size+values
+            return(np.argsort(key, kind='stable'))
+
+        # Else, sort on the ranks of all columns, with the primary key last
+        return(np.lexsort(ranks[::-1]))
+
+    # This function invalidates the permutations of changed columns
+    def invalidate_data(self, top_left, bottom_right, roles=None):
+        """
+        Invalidates the permutations of all columns that are between
+        `top_left` and `bottom_right`.
+
+        Changes that only affect how values are displayed are ignored.
+
+        """
+
+        # If only the display of the values changed, return
+        if roles and all(role == QC.Qt.DisplayRole for role in roles):
+            return
+
+        # Remove the permutations of all changed columns
+        for col in range(top_left.column(), bottom_right.column()+1):
+            self._argsorts.pop(col, None)
+
+    # This function clears the entire cache
+    def clear(self, *args):
+        """
+        Invalidates all permutations in this cache.
+
+        """
+
+        self._argsorts.clear()
+
+
+# %% FUNCTION DEFINITIONS
+# This function returns values that sort like the values of a column
+def sort_values(backend, col):
+    """
+    Returns the values of the column with index `col` in the provided
+    `backend`, for use in :func:`~stable_argsort`.
+
+    The values of dictionary-encoded columns are replaced by the ranks of
+    their categories as floats, using NaN for empty values. These sort and
+    compare like the values themselves, without comparing any objects.
+
+    """
+
+    # If this column is not dictionary-encoded, return its values
+    categories = backend.get_categories(col)
+    if categories is None:
+        return(backend.get_column(col))
+
+    # Determine the rank of every category, ranking empty values last
+    ranks = np.empty(len(categories)+1, dtype=np.float64)
+    ranks[stable_argsort(categories)] = np.arange(len(categories))
+    ranks[-1] = np.nan
+
+    # Return the rank of every value
+    return(ranks[backend.get_codes(col)])
+
+
+# This function returns the indices that stably sort an array
+def stable_argsort(values):
+    """
+    Returns the indices that sort the provided `values` in a stable, ascending
+    way, with all empty values at the end.
+
+    Values of an object dtype that cannot be compared with each other are
+    sorted on their string representations instead.
+
+    """
+
+    # If values are not objects, NumPy can sort them directly
+    if(values.dtype.kind != 'O'):
+        return(np.argsort(values, kind='stable'))
+
+    # Else, sort the values with pandas, which handles empty values
+    series = pd.Series(values, copy=False).reset_index(drop=True)
+    try:
+        series = series.sort_values(kind='stable', na_position='last')
+    except TypeError:
+        series = series.where(series.isna(), series.astype(str))
+        series = series.sort_values(kind='stable', na_position='last')
+
+    # Return the indices of the sorted values
+    return(series.index.to_numpy(dtype=np.int64))
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Statistics
+=====================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from itertools import count
+
+# Package imports
+import numpy as np
+import pandas as pd
+from qtpy import QtCore as QC
+
+# GuiPy imports
+
+# All declaration
+__all__ = ['ColumnStatistics']
+
+
+# %% GLOBALS
+# Counter that provides every modification of a column with a unique version
+_versions = count(1)
+
+
+# %% CLASS DEFINITIONS
+# Define class that maintains the statistics of all columns of a model
+class ColumnStatistics(object):
+    """
+    Maintains the statistics of every column of a
+    :class:`~guipy.plugins.data_table.widgets.DataTableModel`.
+
+    The statistics of a column are computed in a single chunked pass the first
+    time they are requested. Afterward, the model reports every change of the
+    values in that column, and the statistics are updated incrementally by
+    merging or unmerging the moments of the changed values. Only when the
+    minimum or maximum of a column is removed, the column is scanned again the
+    next time its statistics are requested.
+
+    Values that are changed must be removed with :meth:`~remove` before they
+    are changed, and added again with :meth:`~add` afterward.
+
+    Every column also has a version, which changes whenever any of its values
+    change. Comparing versions allows for checking whether a column changed in
+    constant time.
+
+    """
+
+    # Number of rows that are summarized at once when scanning a column
+    CHUNK_ROWS = 2**20
+
+    # Initialize ColumnStatistics class
+    def __init__(self, model):
+        # Save provided model
+        self.model = model
+
+        # Initialize empty statistics and versions of all columns
+        self._stats = []
+        self._versions = []
+
+        # Connect signals of the model that change the columns
+        model.dataChanged.connect(self.touch_data)
+        model.rowsInserted.connect(self.touch_all)
+        model.rowsRemoved.connect(self.touch_all)
+        model.modelReset.connect(self.touch_all)
+        model.columnsInserted.connect(self.insert_columns)
+        model.columnsRemoved.connect(self.remove_columns)
+
+    # This function returns the statistics of a column
+    def get(self, col):
+        """
+        Returns a dict with the statistics of the column with index `col`.
+
+        The dict contains the number of values that are not empty ('count'),
+        the number of empty values ('nan_count') and the data type of the
+        column ('dtype'). For numerical columns, it also contains the 'min',
+        'max', 'sum', 'mean' and sample variance ('var') of all finite values.
+        These are *None* for all other columns.
+
+        """
+
+        # If the statistics of this column are not known, compute them
+        stats = self._stats[col]
+        if stats is None or stats['stale']:
+            stats = self._compute(col)
+            self._stats[col] = stats
+
+        # Return the public statistics of this column
+        numeric = stats['numeric']
+        n = stats['n_finite']
+        return({
+            'count': stats['count'],
+            'nan_count': stats['nan_count'],
+            'min': stats['min'] if numeric and n else None,
+            'max': stats['max'] if numeric and n else None,
+            'sum': stats['mean']*n if numeric else None,
+            'mean': stats['mean'] if numeric and n else None,
+            'var': stats['m2']/(n-1) if numeric and (n > 1) else None,
+            'dtype': self.model.backend().column_dtype(col)})
+
+    # This function returns the version of a column
+    def version(self, col):
+        """
+        Returns the version of the column with index `col`, which is unique
+        for its current values.
+
+        """
+
+        return(self._versions[col])
+
+    # This function returns whether the statistics of a column are tracked
+    def is_tracked(self, col):
+        """
+        Returns whether the statistics of the column with index `col` are
+        known, and thus whether changes to its values must be reported.
+
+        """
+
+        return(self._stats[col] is not None)
+
+    # This function computes the statistics of a column from scratch
+    def _compute(self, col):
+        # Summarize the column chunk by chunk
+        backend = self.model.backend()
+        n_rows = backend.row_count()
+        stats = summarize(backend.get_block(0, col, 0, 1)[0])
+        for row in range(0, n_rows, self.CHUNK_ROWS):
+            n = min(self.CHUNK_ROWS, n_rows-row)
+            stats = merge(stats, summarize(
+                backend.get_block(row, col, n, 1)[0]))
+
+        # Return stats
+        return(stats)
+
+    # This function adds values to the statistics of a column
+    def add(self, col, values):
+        """
+        Adds the provided `values` to the statistics of the column with index
+        `col`.
+
+        """
+
+        # If this column is tracked, merge the values into its statistics
+        if self.is_tracked(col):
+            self._stats[col] = merge(self._stats[col], summarize(values))
+
+    # This function removes values from the statistics of a column
+    def remove(self, col, values):
+        """
+        Removes the provided `values` from the statistics of the column with
+        index `col`.
+
+        """
+
+        # If this column is tracked, unmerge the values from its statistics
+        if self.is_tracked(col):
+            self._stats[col] = unmerge(self._stats[col], summarize(values))
+
+    # This function invalidates the statistics of columns
+    def invalidate(self, cols):
+        """
+        Invalidates the statistics of all columns with an index in `cols`,
+        such that they are computed again when requested.
+
+        """
+
+        for col in cols:
+            self._stats[col] = None
+
+    # This function changes the versions of columns with changed values
+    def touch_data(self, top_left, bottom_right, roles=None):
+        # If only the display of the values changed, return
+        if roles and all(role == QC.Qt.DisplayRole for role in roles):
+            return
+
+        # If the changed cells are unknown, change the versions of all columns
+        if not top_left.isValid() or not bottom_right.isValid():
+            self.touch_all()
+            return
+
+        # Change the versions of all changed columns
+        for col in range(top_left.column(), bottom_right.column()+1):
+            self._versions[col] = next(_versions)
+
+    # This function changes the versions of all columns
+    def touch_all(self, *args):
+        self._versions = [next(_versions) for _ in self._versions]
+
+    # This function adds inserted columns
+    def insert_columns(self, parent, first, last):
+        self._stats[first:first] = [None]*(last-first+1)
+        self._versions[first:first] = [next(_versions)
+                                       for _ in range(first, last+1)]
+
+    # This function removes removed columns
+    def remove_columns(self, parent, first, last):
+        del self._stats[first:last+1]
+        del self._versions[first:last+1]
+
+
+# %% FUNCTION DEFINITIONS
+# This function summarizes an array of values
+def summarize(values):
+    """
+    Returns the statistics of the provided `values`, as used by
+    :class:`~ColumnStatistics`.
+
+    Infinite values are counted, but are ignored for all other statistics.
+
+    """
+
+    # If values are not numerical, only count the empty values
+    values = np.asarray(values)
+    if(values.dtype.kind not in 'biuf'):
+        nan_count = int(np.count_nonzero(pd.isna(values)))
+        return({'numeric': False, 'count': len(values)-nan_count,
+                'nan_count': nan_count, 'n_finite': 0, 'mean': 0.0,
+                'm2': 0.0, 'min': np.inf, 'max': -np.inf, 'stale': False})
+
+    # Determine which values are empty and which are finite
+    values = values.astype(np.float64, copy=False)
+    nan_count = int(np.count_nonzero(np.isnan(values)))
+    finite = values[np.isfinite(values)]
+
+    # Determine the moments and extrema of the finite values
+    if len(finite):
+        mean = float(finite.mean())
+        m2 = float(np.square(finite-mean).sum())
+        min_val, max_val = float(finite.min()), float(finite.max())
+    else:
+        mean, m2, min_val, max_val = 0.0, 0.0, np.inf, -np.inf
+
+    # Return statistics
+    return({'numeric': True, 'count': len(values)-nan_count,
+            'nan_count': nan_count, 'n_finite': len(finite), 'mean': mean,
+            'm2': m2, 'min': min_val, 'max': max_val, 'stale': False})
+
+
+# This function merges the statistics of two sets of values
+def merge(a, b):
+    """
+    Returns the statistics of the union of the values summarized by `a` and
+    `b`.
+
+    """
+
+    # Combine the moments of both sets
+    n = a['n_finite']+b['n_finite']
+    delta = b['mean']-a['mean']
+    mean = a['mean']+delta*b['n_finite']/n if n else 0.0
+    m2 = (a['m2']+b['m2']+delta**2*a['n_finite']*b['n_finite']/n
+          if n else 0.0)
+
+    # Return statistics
+    return({'numeric': a['numeric'] and b['numeric'],
+            'count': a['count']+b['count'],
+            'nan_count': a['nan_count']+b['nan_count'], 'n_finite': n,
+            'mean': mean, 'm2': m2, 'min': min(a['min'], b['min']),
+            'max': max(a['max'], b['max']),
+            'stale': a['stale'] or b['stale']})
+
+
+# This function removes the statistics of a subset of values
+def unmerge(a, b):
+    """
+    Returns the statistics of the values summarized by `a` after removing the
+    values summarized by `b` from it.
+
+    """
+
+    # Remove the moments of b from a
+    n = a['n_finite']-b['n_finite']
+    if n > 0:
+        mean = (a['n_finite']*a['mean']-b['n_finite']*b['mean'])/n
+        delta = b['mean']-mean
+        m2 = max(0.0, a['m2']-b['m2']-delta**2*n*b['n_finite']/a['n_finite'])
+    else:
+        n, mean, m2 = 0, 0.0, 0.0
+
+    # If an extreme value was removed, the extrema must be determined again
+    stale = (a['stale'] or (b['n_finite'] and (b['min'] <= a['min'] or
+                                               b['max'] >= a['max'])))
+
+    # Return statistics
+    return({'numeric': a['numeric'], 'count': a['count']-b['count'],
+            'nan_count': a['nan_count']-b['nan_count'], 'n_finite': n,
+            'mean': mean, 'm2': m2, 'min': a['min'], 'max': a['max'],
+            'stale': bool(stale)})
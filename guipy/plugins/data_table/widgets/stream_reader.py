@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Stream Reader
+========================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+from queue import Empty, Full, Queue
+
+# Package imports
+from qtpy import QtCore as QC
+
+# GuiPy imports
+
+# All declaration
+__all__ = ['StreamReader']
+
+
+# %% GLOBALS
+# Maximum number of chunks that are read ahead of the model
+READ_AHEAD_CHUNKS = 2
+
+# Number of seconds after which a full queue is checked for interruptions
+QUEUE_TIMEOUT = 0.05
+
+
+# %% CLASS DEFINITIONS
+# Define thread that reads the chunks of a stream of data frames
+class StreamReader(QC.QThread):
+    """
+    Reads the chunks of a stream of :obj:`~pandas.DataFrame` objects in a
+    separate thread, such that the file they are read from is parsed while
+    the rows that were read before are already being used.
+
+    At most :attr:`~READ_AHEAD_CHUNKS` chunks are kept until they are obtained
+    with :meth:`~get`, after which reading continues. Whenever a chunk was
+    read, the `chunkRead` signal is emitted.
+    Reading can be cancelled with :meth:`~requestInterruption`, after which
+    the stream is closed.
+
+    If the stream has a `progress` method, it is called after every chunk to
+    obtain the fraction of the stream that has been read.
+
+    """
+
+    # Signals
+    chunkRead = QC.Signal()
+
+    # Initialize StreamReader class
+    def __init__(self, stream, parent=None):
+        # Call super constructor
+        super().__init__(parent)
+
+        # Save provided stream
+        self.stream = stream
+
+        # Initialize the queue of chunks that were read
+        self._queue = Queue(READ_AHEAD_CHUNKS)
+
+        # Initialize the fraction of the stream that has been obtained
+        self._progress = -1.0
+
+    # Override run to read all chunks in the stream
+    def run(self):
+        # Obtain function that returns how much of the stream was read
+        progress = getattr(self.stream, 'progress', lambda: -1.0)
+
+        # Read all chunks and add them to the queue until cancelled
+        try:
+            for data_frame in self.stream:
+                if not self._put((data_frame, progress())):
+                    return
+                self.chunkRead.emit()
+
+        # If that fails, add the error to the queue
+        except Exception as error:
+            self._put((error, 1.0))
+
+        # Else, add that the stream is exhausted
+        else:
+            self._put((None, 1.0))
+
+        # Close the stream and inform the model that it can be obtained
+        finally:
+            if hasattr(self.stream, 'close'):
+                self.stream.close()
+            self.chunkRead.emit()
+
+    # This function adds an item to the queue unless reading is cancelled
+    def _put(self, item):
+        # Keep trying to add the item until it fits or reading is cancelled
+        while not self.isInterruptionRequested():
+            try:
+                self._queue.put(item, timeout=QUEUE_TIMEOUT)
+            except Full:
+                continue
+            else:
+                return(True)
+
+        # Return that reading was cancelled
+        return(False)
+
+    # This function returns the next chunk that was read
+    def get(self, block=True):
+        """
+        Returns the next chunk of rows that was read from the stream.
+
+        Optional
+        --------
+        block : bool. Default: True
+            Whether to wait for the next chunk if it has not been read yet.
+            If *False* and no chunk is available, *None* is returned.
+
+        Returns
+        -------
+        data_frame : :obj:`~pandas.DataFrame` object or None
+            The next chunk of rows, or *None* if none is available.
+
+        Raises
+        ------
+        StopIteration
+            If all chunks have been obtained.
+        Exception
+            Any exception that was raised while reading the stream.
+
+        """
+
+        # Obtain the next item in the queue
+        try:
+            item, self._progress = self._queue.get(block)
+        except Empty:
+            return(None)
+
+        # If the stream is exhausted, raise StopIteration
+        if item is None:
+            raise StopIteration
+
+        # If reading the stream failed, raise its error
+        if isinstance(item, Exception):
+            raise item
+
+        # Return the chunk
+        return(item)
+
+    # This function returns the fraction of the stream that was obtained
+    def progress(self):
+        """
+        Returns the fraction of the stream that has been obtained with
+        :meth:`~get`, or -1 if the stream cannot tell how much it has read.
+
+        """
+
+        return(self._progress)
@@ -0,0 +1,622 @@
+# -*- coding: utf-8 -*-
+
+"""
+Data Table Undo Stack
+=====================
+
+"""
+
+
+# %% IMPORTS
+# Built-in imports
+
+# Package imports
+import pandas as pd
+from qtpy import QtCore as QC
+
+# GuiPy imports
+from guipy.plugins.data_table.backends import is_constant
+
+# All declaration
+__all__ = ['BlockCommand', 'ColumnCommand', 'ColumnPropertyCommand',
+           'DataTypeCommand', 'InsertColumnsCommand', 'InsertRowsCommand',
+           'MacroCommand', 'RemoveColumnsCommand', 'RemoveRowsCommand',
+           'UndoCommand', 'UndoStack']
+
+
+# %% GLOBALS
+# Estimated number of bytes used by a single Python object in an object array
+OBJECT_NBYTES = 56
+
+
+# %% CLASS DEFINITIONS
+# Define class that keeps the history of changes made to a model
+class UndoStack(QC.QObject):
+    """
+    Keeps a history of the changes made to a
+    :class:`~guipy.plugins.data_table.widgets.DataTableModel`, such that they
+    can be undone and redone.
+
+    Every change is stored as an :class:`~UndoCommand`, which only holds the
+    data that is required to revert it, like the old values of the cells that
+    were changed. Undoing or redoing a command swaps these values with the
+    current ones, and is therefore as expensive as the change itself.
+
+    The total size of all commands is limited by :attr:`~memory_limit`. When
+    this limit is exceeded, the oldest commands are removed first.
+
+    """
+
+    # Signals
+    canUndoChanged = QC.Signal(bool)
+    canRedoChanged = QC.Signal(bool)
+    undoTextChanged = QC.Signal(str)
+    redoTextChanged = QC.Signal(str)
+
+    # Maximum number of bytes all commands may use (0 to disable history)
+    memory_limit = 2**28
+
+    # Initialize UndoStack class
+    def __init__(self, model, parent=None):
+        # Call super constructor
+        super().__init__(parent)
+
+        # Save provided model
+        self.model = model
+
+        # Initialize empty history
+        self._undo_commands = []
+        self._redo_commands = []
+        self._nbytes = 0
+
+        # Initialize the macros that are being recorded
+        self._macros = []
+
+        # Set that no command is being undone or redone
+        self._replaying = False
+
+    # This function returns whether this stack keeps a history
+    @QC.Slot()
+    def isEnabled(self):
+        """
+        Returns whether this stack keeps a history of changes, which is not
+        the case if :attr:`~memory_limit` is zero.
+
+        """
+
+        return(self.memory_limit > 0)
+
+    # This function returns whether changes are recorded
+    @QC.Slot()
+    def isRecording(self):
+        """
+        Returns whether changes made to the model must be pushed to this
+        stack, which is not the case while a command is being undone or
+        redone, or if this stack is disabled.
+
+        """
+
+        return(not self._replaying and self.isEnabled())
+
+    # This function sets the memory limit of this stack
+    @QC.Slot(int)
+    def setMemoryLimit(self, nbytes):
+        """
+        Sets the maximum number of bytes the commands in this stack may use to
+        `nbytes`, removing the oldest commands if required.
+
+        If `nbytes` is zero, no changes are recorded and the history is
+        cleared.
+
+        """
+
+        self.memory_limit = nbytes
+        self._evict()
+
+    # This function returns the number of bytes used by this stack
+    @QC.Slot()
+    def memoryUsage(self):
+        """
+        Returns the estimated number of bytes used by all commands in this
+        stack.
+
+        """
+
+        return(self._nbytes)
+
+    # This function pushes a command onto the stack
+    def push(self, command):
+        """
+        Pushes the provided `command`, which describes a change that was just
+        made to the model, onto this stack.
+
+        All commands that could be redone are removed. If a macro is being
+        recorded, the command is added to that macro instead.
+
+        """
+
+        # If changes are not recorded, return
+        if not self.isRecording():
+            return
+
+        # If a macro is being recorded, add the command to it
+        if self._macros:
+            self._macros[-1].commands.append(command)
+            return
+
+        # Remove all commands that could be redone
+        self._redo_commands.clear()
+
+        # Add command to the history and remove old commands if required
+        self._undo_commands.append(command)
+        self._nbytes = sum(command.nbytes for command in self._undo_commands)
+        self._evict()
+
+    # This function removes the oldest commands until the history fits
+    def _evict(self):
+        # If this stack is disabled, remove all commands
+        if not self.isEnabled():
+            self._undo_commands.clear()
+            self._redo_commands.clear()
+            self._nbytes = 0
+
+        # Remove oldest commands until the history uses less than the limit
+        while(self._nbytes > self.memory_limit):
+            if self._undo_commands:
+                command = self._undo_commands.pop(0)
+            elif self._redo_commands:
+                command = self._redo_commands.pop(0)
+            else:
+                break
+            self._nbytes -= command.nbytes
+
+        # Emit signals
+        self._emitChanged()
+
+    # This function starts recording a macro
+    def beginMacro(self, text):
+        """
+        Starts recording a macro with the provided `text`, such that all
+        commands that are pushed until :meth:`~endMacro` is called are undone
+        and redone as a single command.
+
+        Macros can be nested.
+
+        """
+
+        # If changes are not recorded, return
+        if not self.isRecording():
+            return
+
+        # Start a new macro
+        self._macros.append(MacroCommand(text))
+
+    # This function stops recording a macro
+    def endMacro(self):
+        """
+        Stops recording the macro that was started last with
+        :meth:`~beginMacro`, and pushes it onto the stack.
+
+        """
+
+        # If no macro is being recorded, return
+        if not self._macros:
+            return
+
+        # Push the macro if it contains any commands
+        macro = self._macros.pop()
+        if(len(macro.commands) == 1):
+            self.push(macro.commands[0])
+        elif macro.commands:
+            self.push(macro)
+
+    # This function undoes the last command
+    @QC.Slot()
+    def undo(self):
+        """
+        Undoes the command that was pushed last and was not undone yet.
+
+        """
+
+        # If there is no command to undo, return
+        if not self._undo_commands:
+            return
+
+        # Undo the last command
+        command = self._undo_commands.pop()
+        self._replay(command.undo)
+        self._redo_commands.append(command)
+        self._emitChanged()
+
+    # This function redoes the last command that was undone
+    @QC.Slot()
+    def redo(self):
+        """
+        Redoes the command that was undone last.
+
+        """
+
+        # If there is no command to redo, return
+        if not self._redo_commands:
+            return
+
+        # Redo the last undone command
+        command = self._redo_commands.pop()
+        self._replay(command.redo)
+        self._undo_commands.append(command)
+        self._emitChanged()
+
+    # This function undoes or redoes a command without recording its changes
+    def _replay(self, func):
+        # Make sure that all rows have been loaded
+        self.model.fetchAll()
+
+        # Call the function without recording the changes it makes
+        self._replaying = True
+        try:
+            func(self.model)
+        finally:
+            self._replaying = False
+
+        # Update the number of bytes used by all commands
+        self._nbytes = sum(command.nbytes for command in
+                           (*self._undo_commands, *self._redo_commands))
+
+    # This function removes all commands
+    @QC.Slot()
+    def clear(self):
+        """
+        Removes all commands from this stack.
+
+        """
+
+        self._undo_commands.clear()
+        self._redo_commands.clear()
+        self._macros.clear()
+        self._nbytes = 0
+        self._emitChanged()
+
+    # This function returns whether there is a command to undo
+    @QC.Slot()
+    def canUndo(self):
+        return(bool(self._undo_commands))
+
+    # This function returns whether there is a command to redo
+    @QC.Slot()
+    def canRedo(self):
+        return(bool(self._redo_commands))
+
+    # This function returns the text of the command that can be undone
+    @QC.Slot()
+    def undoText(self):
+        return(self._undo_commands[-1].text if self._undo_commands else '')
+
+    # This function returns the text of the command that can be redone
+    @QC.Slot()
+    def redoText(self):
+        return(self._redo_commands[-1].text if self._redo_commands else '')
+
+    # This function emits all signals describing the state of this stack
+    def _emitChanged(self):
+        self.canUndoChanged.emit(self.canUndo())
+        self.canRedoChanged.emit(self.canRedo())
+        self.undoTextChanged.emit(self.undoText())
+        self.redoTextChanged.emit(self.redoText())
+
+
+# Define base class for all commands
+class UndoCommand(object):
+    """
+    Base class for a single change made to a
+    :class:`~guipy.plugins.data_table.widgets.DataTableModel` that can be
+    undone and redone with an :class:`~UndoStack`.
+
+    Rows are always referred to by the indices they are stored at in the
+    backend of the model, such that commands are not affected by sorting or
+    filtering the rows.
+
+    """
+
+    # Text describing the change
+    text = ''
+
+    # This function returns the number of bytes used by this command
+    @property
+    def nbytes(self):
+        return(0)
+
+    # This function undoes this command
+    def undo(self, model):
+        """
+        Reverts the change described by this command in the given `model`.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "UndoCommand subclass!")
+
+    # This function redoes this command
+    def redo(self, model):
+        """
+        Makes the change described by this command in the given `model` again.
+
+        """
+
+        # Raise NotImplementedError if only super() was called
+        raise NotImplementedError("This method must be overridden in the "
+                                  "UndoCommand subclass!")
+
+
+# Define command that consists of several other commands
+class MacroCommand(UndoCommand):
+    """
+    Command that undoes and redoes several commands at once.
+
+    """
+
+    # Initialize MacroCommand class
+    def __init__(self, text):
+        self.text = text
+        self.commands = []
+
+    # Override nbytes property
+    @property
+    def nbytes(self):
+        return(sum(command.nbytes for command in self.commands))
+
+    # Override undo method
+    def undo(self, model):
+        for command in reversed(self.commands):
+            command.undo(model)
+
+    # Override redo method
+    def redo(self, model):
+        for command in self.commands:
+            command.redo(model)
+
+
+# Define command that changes the values of a block of cells
+class BlockCommand(UndoCommand):
+    """
+    Command that changes the values in a set of rows of consecutive columns.
+
+    Only the values that were replaced are stored. Undoing or redoing this
+    command swaps them with the values that are stored in the model.
+
+    """
+
+    # Initialize BlockCommand class
+    def __init__(self, text, rows, col, columns):
+        self.text = text
+        self.rows = rows
+        self.col = col
+        self.columns = columns
+
+    # Override nbytes property
+    @property
+    def nbytes(self):
+        return(columns_nbytes(self.columns) + getattr(self.rows, 'nbytes', 0))
+
+    # Override undo method
+    def undo(self, model):
+        self.columns = model._setStoredBlock(self.rows, self.col, self.columns)
+
+    # Override redo method
+    redo = undo
+
+
+# Define command that replaces entire columns and their formulas
+class ColumnCommand(UndoCommand):
+    """
+    Command that replaces all values and the formulas of a set of columns.
+
+    If the values of a column did not change, only its formula is swapped.
+
+    """
+
+    # Initialize ColumnCommand class
+    def __init__(self, text, cols, columns, formulas):
+        self.text = text
+        self.cols = cols
+        self.columns = columns
+        self.formulas = formulas
+
+    # Override nbytes property
+    @property
+    def nbytes(self):
+        return(columns_nbytes(self.columns))
+
+    # Override undo method
+    def undo(self, model):
+        self.columns, self.formulas = model._swapColumns(
+            self.cols, self.columns, self.formulas)
+
+    # Override redo method
+    redo = undo
+
+
+# Define command that converts a column to another data type
+class DataTypeCommand(UndoCommand):
+    """
+    Command that converts a column to another data type without losing any
+    information, such that it can be undone by converting it back.
+
+    """
+
+    # Initialize DataTypeCommand class
+    def __init__(self, text, col, old_dtype, new_dtype):
+        self.text = text
+        self.col = col
+        self.old_dtype = old_dtype
+        self.new_dtype = new_dtype
+
+    # Override undo method
+    def undo(self, model):
+        model.setColumnDataType(self.col, self.old_dtype)
+
+    # Override redo method
+    def redo(self, model):
+        model.setColumnDataType(self.col, self.new_dtype)
+
+
+# Define command that changes a property of a column
+class ColumnPropertyCommand(UndoCommand):
+    """
+    Command that changes a property of a column, like its name, using the
+    setter method of the model with the given `name`.
+
+    """
+
+    # Initialize ColumnPropertyCommand class
+    def __init__(self, text, name, col, old_value, new_value):
+        self.text = text
+        self.name = name
+        self.col = col
+        self.old_value = old_value
+        self.new_value = new_value
+
+    # Override undo method
+    def undo(self, model):
+        getattr(model, self.name)(self.col, self.old_value)
+
+    # Override redo method
+    def redo(self, model):
+        getattr(model, self.name)(self.col, self.new_value)
+
+
+# Define command that inserts rows
+class InsertRowsCommand(UndoCommand):
+    """
+    Command that inserts empty rows at the given stored indices, which are
+    given as a slice if they are contiguous.
+
+    """
+
+    # Initialize InsertRowsCommand class
+    def __init__(self, text, rows):
+        self.text = text
+        self.rows = rows
+
+    # Override nbytes property
+    @property
+    def nbytes(self):
+        return(getattr(self.rows, 'nbytes', 0))
+
+    # Override undo method
+    def undo(self, model):
+        model._removeStoredRows(self.rows)
+
+    # Override redo method
+    def redo(self, model):
+        model._insertStoredRows(self.rows)
+
+
+# Define command that removes rows
+class RemoveRowsCommand(UndoCommand):
+    """
+    Command that removes the rows at the given stored indices, storing the
+    values of every column in these rows.
+
+    """
+
+    # Initialize RemoveRowsCommand class
+    def __init__(self, text, rows, columns):
+        self.text = text
+        self.rows = rows
+        self.columns = columns
+
+    # Override nbytes property
+    @property
+    def nbytes(self):
+        return(columns_nbytes(self.columns) + self.rows.nbytes)
+
+    # Override undo method
+    def undo(self, model):
+        model._insertStoredRows(self.rows, self.columns)
+
+    # Override redo method
+    def redo(self, model):
+        model._removeStoredRows(self.rows)
+
+
+# Define command that inserts columns
+class InsertColumnsCommand(UndoCommand):
+    """
+    Command that inserts empty columns.
+
+    """
+
+    # Initialize InsertColumnsCommand class
+    def __init__(self, text, col, count):
+        self.text = text
+        self.col = col
+        self.count = count
+
+    # Override undo method
+    def undo(self, model):
+        model.removeColumns(self.col, self.count)
+
+    # Override redo method
+    def redo(self, model):
+        model.insertColumns(self.col, self.count)
+
+
+# Define command that removes columns
+class RemoveColumnsCommand(UndoCommand):
+    """
+    Command that removes columns, storing their values and properties.
+
+    """
+
+    # Initialize RemoveColumnsCommand class
+    def __init__(self, text, col, columns, names, precisions, formulas):
+        self.text = text
+        self.col = col
+        self.columns = columns
+        self.names = names
+        self.precisions = precisions
+        self.formulas = formulas
+
+    # Override nbytes property
+    @property
+    def nbytes(self):
+        return(columns_nbytes(self.columns))
+
+    # Override undo method
+    def undo(self, model):
+        model._restoreColumns(self.col, self.columns, self.names,
+                              self.precisions, self.formulas)
+
+    # Override redo method
+    def redo(self, model):
+        model.removeColumns(self.col, len(self.columns))
+
+
+# %% FUNCTION DEFINITIONS
+# This function estimates the number of bytes used by a list of columns
+def columns_nbytes(columns):
+    """
+    Returns the estimated number of bytes used by the provided list of
+    `columns`, including the objects stored in object arrays.
+
+    Columns that are *None* are ignored.
+
+    """
+
+    # Sum the sizes of all arrays
+    # Categoricals only hold objects for their categories, and constant
+    # arrays only hold a single value
+    nbytes = 0
+    for values in columns:
+        if is_constant(values):
+            nbytes += values.itemsize
+        elif values is not None:
+            nbytes += values.nbytes
+            if isinstance(values, pd.Categorical):
+                nbytes += len(values.categories)*OBJECT_NBYTES
+            elif(values.dtype.kind == 'O'):
+                nbytes += len(values)*OBJECT_NBYTES
+
+    # Return nbytes
+    return(nbytes)
@@ -9,12 +9,17 @@ Data Table View
 
 # %% IMPORTS
 # Built-in imports
+import re
 
 # Package imports
+import numpy as np
 from qtpy import QtCore as QC, QtGui as QG, QtWidgets as QW
 
 # GuiPy imports
 from guipy import layouts as GL, widgets as GW
+from guipy.plugins.data_table.backends import ConversionError
+from guipy.plugins.data_table.widgets.clipboard import (
+    ClipboardParser, block_to_text)
 from guipy.plugins.data_table.widgets.headers import (
     HorizontalHeaderView, VerticalHeaderView)
 from guipy.plugins.data_table.widgets.model import DataTableModel, to_base_26
@@ -40,9 +45,9 @@ class DataTableView(GW.QTableView):
         self.init(*args, **kwargs)
 
     # This function sets up the data table widget
-    def init(self, import_func=None):
+    def init(self, import_func=None, backend=None):
         # Set model for the data table widget
-        self.setModel(DataTableModel(self, import_func))
+        self.setModel(DataTableModel(self, import_func, backend))
 
         # Create selection model for the data table widget
         selection_model = DataTableSelectionModel(self.model(), self)
@@ -54,6 +59,12 @@ class DataTableView(GW.QTableView):
         # Create headers
         self.create_headers()
 
+        # Create clipboard actions
+        self.create_clipboard_actions()
+
+        # Create undo/redo actions
+        self.create_undo_actions()
+
     # Override closeEvent to do automatic clean-up
     def closeEvent(self, *args, **kwargs):
         # Delete the model
@@ -119,6 +130,158 @@ class DataTableView(GW.QTableView):
         self.setHorizontalHeader(self.h_header)
         self.setVerticalHeader(self.v_header)
 
+        # Show the keys the rows are sorted on in the horizontal header
+        self.model().sortKeysChanged.connect(self.set_sort_indicator)
+        self.set_sort_indicator(self.model().sortKeys())
+
+    # This function creates the actions for using the clipboard
+    def create_clipboard_actions(self):
+        # Create copy action
+        copy_act = GW.QAction(
+            self, "Copy",
+            shortcut=QG.QKeySequence.Copy,
+            statustip="Copy the selected cells to the clipboard",
+            triggered=self.copy_selection)
+        copy_act.setShortcutContext(QC.Qt.WidgetWithChildrenShortcut)
+        self.addAction(copy_act)
+
+        # Create paste action
+        paste_act = GW.QAction(
+            self, "Paste",
+            shortcut=QG.QKeySequence.Paste,
+            statustip="Paste the clipboard into the selected cells",
+            triggered=self.paste_clipboard)
+        paste_act.setShortcutContext(QC.Qt.WidgetWithChildrenShortcut)
+        self.addAction(paste_act)
+
+        # Set that no clipboard text is being parsed
+        self._clipboard_parser = None
+
+    # This function creates the actions for undoing and redoing changes
+    def create_undo_actions(self):
+        # Obtain the undo stack of the model
+        undo_stack = self.model().undoStack()
+
+        # Create undo action
+        undo_act = GW.QAction(
+            self, "Undo",
+            shortcut=QG.QKeySequence.Undo,
+            statustip="Undo the last change made to this data table",
+            triggered=undo_stack.undo)
+        undo_act.setShortcutContext(QC.Qt.WidgetWithChildrenShortcut)
+        undo_act.setEnabled(undo_stack.canUndo())
+        undo_stack.canUndoChanged.connect(undo_act.setEnabled)
+        self.addAction(undo_act)
+
+        # Create redo action
+        redo_act = GW.QAction(
+            self, "Redo",
+            shortcut=QG.QKeySequence.Redo,
+            statustip="Redo the last change that was undone",
+            triggered=undo_stack.redo)
+        redo_act.setShortcutContext(QC.Qt.WidgetWithChildrenShortcut)
+        redo_act.setEnabled(undo_stack.canRedo())
+        undo_stack.canRedoChanged.connect(redo_act.setEnabled)
+        self.addAction(redo_act)
+
+    # This function copies the selected cells to the clipboard
+    @QC.Slot()
+    def copy_selection(self):
+        # Obtain the block of selected cells
+        block = self.selectionModel().selectedBlock()
+
+        # If no cells are selected, return
+        if block is None:
+            return
+
+        # Format the block as tab-separated values and put it on the clipboard
+        text = block_to_text(self.model(), *block)
+        QW.QApplication.clipboard().setText(text)
+
+    # This function pastes the clipboard into the selected cells
+    @QC.Slot()
+    def paste_clipboard(self):
+        # If the clipboard is already being pasted, return
+        if self._clipboard_parser is not None:
+            return
+
+        # Obtain the text on the clipboard
+        text = QW.QApplication.clipboard().text()
+
+        # If there is no text, return
+        if not text:
+            return
+
+        # Obtain the cell in which the clipboard must be pasted
+        block = self.selectionModel().selectedBlock()
+        if block is None:
+            index = self.currentIndex()
+            row, col = max(0, index.row()), max(0, index.column())
+        else:
+            row, col = block[:2]
+
+        # Parse the text in a separate thread
+        parser = ClipboardParser(text, self)
+        parser.parsed.connect(lambda x: self.set_clipboard_block(row, col, x))
+        parser.failed.connect(self.show_clipboard_error)
+        parser.finished.connect(self.finish_clipboard_parser)
+        self._clipboard_parser = parser
+        QW.QApplication.setOverrideCursor(QC.Qt.BusyCursor)
+        parser.start()
+
+    # This function writes a parsed clipboard block into the model
+    def set_clipboard_block(self, row, col, data_frame):
+        """
+        Writes the provided `data_frame` into the model, starting at the given
+        `row` and `col`.
+
+        If the data frame does not fit in the model, rows and columns are
+        appended to the model first.
+
+        """
+
+        # If data_frame is empty, return
+        if data_frame.empty:
+            return
+
+        # Record all changes as a single change
+        undo_stack = self.model().undoStack()
+        undo_stack.beginMacro("Paste")
+
+        # Make sure that the model is large enough to hold the block
+        n_rows, n_cols = data_frame.shape
+        if(self.rowCount() < row+n_rows):
+            self.setRowCount(row+n_rows)
+        if(self.columnCount() < col+n_cols):
+            self.setColumnCount(col+n_cols)
+
+        # Write the block into the model
+        self.model().setDataBlock(row, col, data_frame)
+        undo_stack.endMacro()
+
+        # Select the block that was pasted
+        self.selectionModel().select(
+            QC.QItemSelection(self.model().index(row, col),
+                              self.model().index(row+n_rows-1, col+n_cols-1)),
+            QC.QItemSelectionModel.ClearAndSelect)
+
+    # This function shows an error that occurred while parsing the clipboard
+    @QC.Slot(str)
+    def show_clipboard_error(self, message):
+        GW.QMessageBox.warning(
+            self, "Paste error",
+            "The clipboard could not be pasted: %s" % (message))
+
+    # This function cleans up after the clipboard has been parsed
+    @QC.Slot()
+    def finish_clipboard_parser(self):
+        # Remove the parser
+        self._clipboard_parser.deleteLater()
+        self._clipboard_parser = None
+
+        # Restore the cursor
+        QW.QApplication.restoreOverrideCursor()
+
     # This function creates the header context menus
     def create_header_context_menus(self):
         self.create_horizontal_header_context_menu()
@@ -164,6 +327,57 @@ class DataTableView(GW.QTableView):
             triggered=self.hide_cols)
 #        menu.addAction(hide_act)
 
+        # Add separator
+        menu.addSeparator()
+
+        # Add sort_ascending action to menu
+        sort_asc_act = GW.QAction(
+            self, "Sort ascending",
+            statustip="Sort all rows on this column in ascending order",
+            triggered=lambda: self.sort_rows(QC.Qt.AscendingOrder))
+        menu.addAction(sort_asc_act)
+
+        # Add sort_descending action to menu
+        sort_desc_act = GW.QAction(
+            self, "Sort descending",
+            statustip="Sort all rows on this column in descending order",
+            triggered=lambda: self.sort_rows(QC.Qt.DescendingOrder))
+        menu.addAction(sort_desc_act)
+
+        # Add then_sort_ascending action to menu
+        then_sort_asc_act = GW.QAction(
+            self, "Then sort ascending",
+            statustip=("Sort all rows with equal values in the current sort "
+                       "columns on this column in ascending order"),
+            triggered=lambda: self.sort_rows(QC.Qt.AscendingOrder, True))
+        menu.addAction(then_sort_asc_act)
+
+        # Add then_sort_descending action to menu
+        then_sort_desc_act = GW.QAction(
+            self, "Then sort descending",
+            statustip=("Sort all rows with equal values in the current sort "
+                       "columns on this column in descending order"),
+            triggered=lambda: self.sort_rows(QC.Qt.DescendingOrder, True))
+        menu.addAction(then_sort_desc_act)
+
+        # Add unsort action to menu
+        unsort_act = GW.QAction(
+            self, "Restore original order",
+            statustip="Show all rows in the order they were added in",
+            triggered=self.unsort_rows)
+        menu.addAction(unsort_act)
+
+        # Add separator
+        menu.addSeparator()
+
+        # Add optimize_memory action to menu
+        optimize_act = GW.QAction(
+            self, "Optimize memory usage",
+            statustip=("Convert all columns to the smallest data types that "
+                       "hold their values exactly"),
+            triggered=self.optimize_memory)
+        menu.addAction(optimize_act)
+
         # Set last requested col to 0
         self._last_context_col = 0
 
@@ -192,7 +406,7 @@ class DataTableView(GW.QTableView):
         # Add remove action to menu
         remove_act = GW.QAction(
             self, "Remove row",
-            statustip="Remove this row",
+            statustip="Remove this row or all selected rows",
             triggered=self.remove_rows)
         menu.addAction(remove_act)
 
@@ -279,6 +493,39 @@ class DataTableView(GW.QTableView):
     def hide_cols(self, n_cols=1):
         self.model().hideColumns(self._last_context_col, n_cols)
 
+    # This function sorts all rows in the data table on a given column
+    @QC.Slot(QC.Qt.SortOrder)
+    @QC.Slot(QC.Qt.SortOrder, bool)
+    def sort_rows(self, order, append=False):
+        # Obtain the keys the rows must be sorted on
+        keys = self.model().sortKeys() if append else []
+        keys = [key for key in keys if(key[0] != self._last_context_col)]
+        keys.append((self._last_context_col, order))
+
+        # Sort the rows
+        self.model().sortByColumns(keys)
+
+    # This function shows all rows in the data table in their original order
+    @QC.Slot()
+    def unsort_rows(self):
+        self.model().sortByColumns([])
+
+    # This function converts all columns to their most compact data types
+    @QC.Slot()
+    def optimize_memory(self):
+        self.model().optimizeMemory()
+
+    # This function shows the primary sort key in the horizontal header
+    @QC.Slot(list)
+    def set_sort_indicator(self, keys):
+        # If there are no sort keys, hide the sort indicator
+        if not keys:
+            self.h_header.setSortIndicator(-1, QC.Qt.AscendingOrder)
+
+        # Else, show the sort indicator on the primary key
+        else:
+            self.h_header.setSortIndicator(*keys[0])
+
     # This function inserts rows into the data table before given row
     @QC.Slot()
     @QC.Slot(int)
@@ -295,7 +542,34 @@ class DataTableView(GW.QTableView):
     @QC.Slot()
     @QC.Slot(int)
     def remove_rows(self, n_rows=1):
-        self.model().removeRows(self._last_context_row, n_rows)
+        # Obtain a mask of all rows that are currently selected
+        mask = self.selected_rows_mask()
+
+        # If the requested row is selected, remove all selected rows
+        if mask[self._last_context_row]:
+            self.model().removeRowSet(mask)
+
+        # Else, only remove the requested rows
+        else:
+            self.model().removeRows(self._last_context_row, n_rows)
+
+    # This function returns a mask of all rows that contain selected items
+    def selected_rows_mask(self):
+        """
+        Returns a boolean mask that is *True* for every row in the data table
+        that contains at least one selected item.
+
+        """
+
+        # Create empty mask
+        mask = np.zeros(self.rowCount(), dtype=bool)
+
+        # Add all selection ranges to the mask
+        for selection_range in self.selectionModel().selection():
+            mask[selection_range.top():selection_range.bottom()+1] = True
+
+        # Return mask
+        return(mask)
 
     # This function clears a given row in the data table
     @QC.Slot()
@@ -330,24 +604,36 @@ class HorizontalHeaderPopup(GW.QDialog):
         # Save which column index was requested
         self.col = col
 
-        # Get the column that was requested
-        column = self.model.dataColumn(col)
+        # Get the name and statistics of the column that was requested
+        name = self.model.columnName(col)
+        stats = self.model.columnStatistics(col)
 
         # Get the dtype of this column
-        dtype = self.model.dtypes[column.dtype.type]
+        dtype = self.model.dtypes[stats['dtype'].type]
 
         # Determine the names of all other columns
         used_column_names = set(self.model.columnNames())
-        used_column_names.difference_update(['', column.name])
+        used_column_names.difference_update(['', name])
         self.used_column_names = used_column_names
 
         # Set the base name, name and dtype of this column
         base_name = "Column %s" % (to_base_26(col+1))
         set_box_value(self.base_name_label, base_name)
-        set_box_value(self.n_val_box, column.count())
-        set_box_value(self.name_box, column.name)
+        set_box_value(self.n_val_box, stats['count'])
+        set_box_value(self.name_box, name)
         set_box_value(self.dtype_box, dtype)
 
+        # Set the formula of this column
+        # The data type of a column with a formula is set by that formula
+        formula = self.model.columnFormula(col)
+        set_box_value(self.formula_box, '' if formula is None else formula)
+        self.dtype_box.setEnabled(formula is None)
+
+        # Set the display precision of this column
+        precision = self.model.columnPrecision(col)
+        set_box_value(self.precision_box,
+                      'default' if precision is None else precision)
+
         # Set keyboard focus to the name_box and select it
         self.name_box.setFocus(True)
         self.name_box.selectAll()
@@ -356,7 +642,6 @@ class HorizontalHeaderPopup(GW.QDialog):
         self.show()
 
     # This function sets up the horizontal header popup editor
-    # TODO: Allow for a simple formula to be given for a column?
     def init(self):
         # Install event filter to catch events that should close the popup
         self.installEventFilter(self)
@@ -402,6 +687,28 @@ class HorizontalHeaderPopup(GW.QDialog):
         layout.addRow("Data type", dtype_box)
         self.dtype_box = dtype_box
 
+        # Create a formula line-edit
+        formula_box = GW.QLineEdit()
+        formula_box.setPlaceholderText("e.g. A * 2 + B")
+        formula_box.setToolTip("Set an expression that computes the values of "
+                               "this column from other columns, or leave "
+                               "empty to edit its values directly")
+
+        # Add it to the layout
+        layout.addRow("Formula", formula_box)
+        self.formula_box = formula_box
+
+        # Create a precision spinbox
+        precision_box = GW.QSpinBox()
+        precision_box.setRange(0, 17)
+        precision_box.setSpecialValueText('default')
+        precision_box.setToolTip("Set the number of significant digits used "
+                                 "for displaying floats in this column")
+
+        # Add it to the layout
+        layout.addRow("Precision", precision_box)
+        self.precision_box = precision_box
+
     # Override eventFilter to filter out clicks, ESC and Enter
     def eventFilter(self, widget, event):
         # Check if the event involves anything for which the popup should close
@@ -422,9 +729,12 @@ class HorizontalHeaderPopup(GW.QDialog):
 
     # Override hideEvent to automatically update the header
     def hideEvent(self, *args, **kwargs):
-        # Set the column name and dtype
+        # Set the column name, formula and dtype
         self.set_column_name(get_box_value(self.name_box))
-        self.set_column_dtype(get_box_value(self.dtype_box))
+        self.set_column_formula(get_box_value(self.formula_box))
+        if self.model.columnFormula(self.col) is None:
+            self.set_column_dtype(get_box_value(self.dtype_box))
+        self.set_column_precision(get_box_value(self.precision_box))
 
         # Tell data table to update the header of the requested column
         self.data_table.h_header.headerDataChanged(QC.Qt.Horizontal,
@@ -457,9 +767,8 @@ class HorizontalHeaderPopup(GW.QDialog):
         if not name:
             return(True)
 
-        # Check if name consists out of one or two capital letters
-        # TODO: This assumes a maximum of 702 columns, decreasing modularity
-        elif name.isalpha() and name.isupper() and (len(name) <= 2):
+        # Check if name consists out of capital letters only
+        elif re.fullmatch(r'[A-Z]+', name):
             # If so, it is invalid as these are default column names
             return(False)
 
@@ -474,8 +783,79 @@ class HorizontalHeaderPopup(GW.QDialog):
         if self.check_column_name(name):
             self.model.setColumnName(self.col, name)
 
+    # This function is called when the column formula is being set
+    @QC.Slot(str)
+    def set_column_formula(self, formula):
+        # If the formula did not change, return
+        if((formula.strip() or None) == self.model.columnFormula(self.col)):
+            return
+
+        # Try to set the column formula
+        try:
+            self.model.setColumnFormula(self.col, formula)
+
+        # If that fails, inform the user
+        except Exception as error:
+            GW.QMessageBox.warning(
+                self.data_table, "Formula error",
+                "The formula could not be set: %s" % (error))
+
     # This function is called when the column dtype is being set
     @QC.Slot(str)
     def set_column_dtype(self, dtype):
-        # Set the column dtype
-        self.model.setColumnDataType(self.col, dtype)
+        # Try to set the column dtype
+        try:
+            self.convert_column(dtype)
+
+        # If that fails, ask the user if the column should be cleared first
+        except ConversionError as error:
+            # Create a list of the first rows that could not be converted
+            rows = ", ".join(map(str, error.rows[:10].tolist()))
+            if(len(error.rows) > 10):
+                rows += ", ..."
+
+            # Show a question asking what to do
+            button_clicked = GW.QMessageBox.question(
+                self.data_table, "Data type error",
+                ("%i values in column <b>%s</b> cannot be converted to %s "
+                 "(rows %s). Do you want to clear the column and convert it "
+                 "anyway?" % (len(error.rows), self.model.columnName(
+                     self.col), dtype, rows)),
+                GW.QMessageBox.Yes | GW.QMessageBox.No, GW.QMessageBox.No)
+
+            # If the user answered 'yes', clear the column and convert it
+            if(button_clicked == GW.QMessageBox.Yes):
+                self.convert_column(dtype, clear=True)
+
+    # This function converts the column while showing its progress
+    def convert_column(self, dtype, clear=False):
+        # Create a progress dialog, which is only shown if converting is slow
+        progress_dialog = QW.QProgressDialog(
+            "Converting column to %s..." % (dtype), None, 0, 0,
+            self.data_table)
+        progress_dialog.setWindowModality(QC.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+
+        # Update the progress dialog whenever a chunk has been converted
+        def update_progress(n_done, n_total):
+            progress_dialog.setMaximum(n_total)
+            progress_dialog.setValue(n_done)
+
+        # Set the column dtype, removing the progress dialog afterward
+        self.model.conversionProgress.connect(update_progress)
+        try:
+            self.model.setColumnDataType(self.col, dtype, clear)
+        finally:
+            self.model.conversionProgress.disconnect(update_progress)
+            progress_dialog.close()
+
+    # This function is called when the column precision is being set
+    @QC.Slot(int)
+    @QC.Slot(str)
+    def set_column_precision(self, precision):
+        # If the default precision is requested, use None
+        if(precision == 'default'):
+            precision = None
+
+        # Set the column precision
+        self.model.setColumnPrecision(self.col, precision)
@@ -42,6 +42,10 @@ class Figure(GP.BasePluginWidget):
         # Extract data_table_obj
         self.data_table = self.req_plugins['Data table']
 
+        # Store all figures in the project files of the data table plugin
+        self.data_table.register_project_section(
+            'figures', self.get_project_state, self.set_project_state)
+
         # Set up the figure plugin
         self.init()
 
@@ -135,6 +139,9 @@ class Figure(GP.BasePluginWidget):
         # Switch focus to the new tab
         set_box_value(self.tab_widget, index)
 
+        # Return figure
+        return(figure)
+
     # This function closes a figure widget
     @QC.Slot(int)
     def close_tab(self, index):
@@ -155,3 +162,29 @@ class Figure(GP.BasePluginWidget):
 
         # Set its name
         figure.tab_name = name
+
+    # This function returns the state of all figures
+    def get_project_state(self, data_tables):
+        """
+        Returns a list with the name and state of every figure, as stored in
+        project files of the data table plugin.
+
+        """
+
+        return([{'name': figure.tab_name,
+                 'plots': figure.get_state(data_tables)}
+                for figure in map(self.tab_widget.widget,
+                                  range(self.tab_widget.count()))])
+
+    # This function restores figures
+    def set_project_state(self, state, data_tables):
+        """
+        Adds a figure for every figure in the provided `state`, as returned by
+        :meth:`~get_project_state`.
+
+        """
+
+        # Add and restore all figures
+        for figure_state in state:
+            figure = self.add_tab(figure_state['name'])
+            figure.set_state(figure_state['plots'], data_tables)
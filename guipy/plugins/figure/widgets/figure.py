@@ -20,6 +20,8 @@ from guipy.plugins.figure.widgets.canvas import FigureCanvas
 from guipy.plugins.figure.widgets.manager import FigureManager
 from guipy.plugins.figure.widgets.options import FigureOptionsDialog
 from guipy.plugins.figure.widgets.toolbar import FigureToolbar
+from guipy.plugins.figure.widgets.types.props import (
+    decode_value, encode_value)
 
 # All declaration
 __all__ = ['FigureWidget']
@@ -42,6 +44,9 @@ class FigureWidget(GW.QWidget):
 
     # This function sets up the figure widget
     def init(self):
+        # Save that there is no state that must be restored once shown
+        self._pending_state = None
+
         # Create a layout
         layout = GL.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -78,3 +83,55 @@ class FigureWidget(GW.QWidget):
 
         # Return all
         return(figure, canvas, manager, options, toolbar)
+
+    # Override showEvent to restore a pending state
+    def showEvent(self, *args, **kwargs):
+        # Call super event
+        super().showEvent(*args, **kwargs)
+
+        # Restore the state that is pending if there is any
+        self._restore_state()
+
+    # This function restores the state that is pending
+    def _restore_state(self):
+        # If there is a state that must be restored, restore it
+        if self._pending_state is not None:
+            state, data_tables = self._pending_state
+            self._pending_state = None
+            self.options.set_plots_state(state, data_tables)
+
+    # This function returns the state of this figure
+    def get_state(self, data_tables):
+        """
+        Returns a JSON-serializable list with the state of all plot entries in
+        this figure, referring to the provided `data_tables` by their index in
+        this list.
+
+        """
+
+        # If the state of this figure was not restored yet, convert it
+        if self._pending_state is not None:
+            state, old_data_tables = self._pending_state
+            return(encode_value(decode_value(state, old_data_tables),
+                                data_tables))
+
+        # Else, return the state of all plot entries
+        return(self.options.get_plots_state(data_tables))
+
+    # This function restores the state of this figure
+    def set_state(self, state, data_tables):
+        """
+        Restores all plot entries in the provided `state`, as returned by
+        :meth:`~get_state`, using the provided `data_tables`.
+
+        The plot entries are only restored once this figure is shown, such that
+        no data is read for figures that are never shown.
+
+        """
+
+        # Save the state until this figure is shown
+        self._pending_state = (state, data_tables)
+
+        # If this figure is shown already, restore it now
+        if self.isVisible():
+            self._restore_state()
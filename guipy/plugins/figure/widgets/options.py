@@ -13,6 +13,7 @@ Figure Options
 # Package imports
 import matplotlib as mpl
 from matplotlib import rcParams
+import numpy as np
 from qtpy import QtCore as QC, QtGui as QG, QtWidgets as QW
 
 # GuiPy imports
@@ -425,6 +426,35 @@ class FigureOptionsDialog(GW.QDialog):
         # Set the shown entry to the new entry
         set_box_value(self.plot_entries, index)
 
+    # This function returns the state of all plot entries
+    def get_plots_state(self, data_tables):
+        """
+        Returns a list with the state of every plot entry, as returned by
+        :meth:`~guipy.plugins.figure.widgets.FigurePlotEntry.get_state`.
+
+        """
+
+        return([self.plot_pages.widget(i).get_state(data_tables)
+                for i in range(self.plot_pages.count())])
+
+    # This function restores plot entries
+    def set_plots_state(self, state, data_tables):
+        """
+        Adds a plot entry for every entry in the provided `state`, as returned
+        by :meth:`~get_plots_state`, and draws them.
+
+        """
+
+        # Add and restore all plot entries
+        for entry_state in state:
+            self.add_entry()
+            self.plot_pages.widget(self.plot_pages.count()-1).set_state(
+                entry_state, data_tables)
+
+        # Draw the restored plots and apply their options
+        self.refresh_figure()
+        self.apply_options()
+
     # This function removes a plot entry
     @QC.Slot()
     def remove_entry(self):
@@ -478,12 +508,44 @@ class FigureOptionsDialog(GW.QDialog):
         self.set_legend()
 
         # Process figure axes limits
-        self.axis.relim()
+        self.set_data_limits()
         self.axis.autoscale_view(None, True, True)
 
         # Draw canvas
         self.canvas.draw()
 
+    # This function sets the data limits of the figure
+    def set_data_limits(self):
+        """
+        Sets the data limits of the figure axes, which are used for
+        autoscaling them.
+
+        If all plots know the limits of their data, these are combined
+        directly. Else, the limits are determined from all plotted data.
+
+        """
+
+        # Obtain the data limits of all plots
+        limits = []
+        for i in range(self.plot_pages.count()):
+            plot_entry = self.plot_pages.widget(i).plot_entry
+            if getattr(plot_entry, 'plot', None) is not None:
+                limits.append(plot_entry.data_limits())
+
+        # If not all limits are known, determine them from the plotted data
+        if not limits or None in limits:
+            self.axis.relim()
+
+        # Else, combine the limits of all plots
+        else:
+            xlims, ylims = zip(*limits)
+            self.axis.dataLim.set_points(np.array(
+                [[min(xlim[0] for xlim in xlims),
+                  min(ylim[0] for ylim in ylims)],
+                 [max(xlim[1] for xlim in xlims),
+                  max(ylim[1] for ylim in ylims)]]))
+            self.axis.ignore_existing_data_limits = False
+
     # This function sets the legend of the figure
     @QC.Slot()
     def set_legend(self):
@@ -16,7 +16,7 @@ from qtpy import QtCore as QC, QtGui as QG, QtWidgets as QW
 # GuiPy imports
 from guipy import layouts as GL, widgets as GW
 from guipy.plugins.figure.widgets.types import PLOT_TYPES
-from guipy.widgets import get_modified_signal, set_box_value
+from guipy.widgets import get_box_value, get_modified_signal, set_box_value
 
 # All declaration
 __all__ = ['FigurePlotEntry']
@@ -132,6 +132,49 @@ class FigurePlotEntry(GW.BaseBox):
         # Save new entry name
         set_box_value(self.name_box, entry_name)
 
+    # This function returns the state of this plot entry
+    def get_state(self, data_tables):
+        """
+        Returns a JSON-serializable dict with the name, plot type and the
+        state of all plot properties of this plot entry.
+
+        Parameters
+        ----------
+        data_tables : list of \
+            :obj:`~guipy.plugins.data_table.widgets.DataTableWidget` objects
+            The data tables that can be referred to, by their index in this
+            list.
+
+        """
+
+        # Obtain the plot properties of the current plot type
+        props = getattr(self.plot_entry, 'props', [])
+
+        # Return state
+        return({'name': get_box_value(self.name_box),
+                'type': get_box_value(self.plot_types, str),
+                'props': [prop.get_state(data_tables) for prop in props]})
+
+    # This function restores the state of this plot entry
+    def set_state(self, state, data_tables):
+        """
+        Restores the name, plot type and plot properties of this plot entry
+        from the provided `state`, as returned by :meth:`~get_state`.
+
+        """
+
+        # Set the plot type
+        if state['type']:
+            set_box_value(self.plot_types, state['type'])
+
+        # Set the state of all plot properties
+        props = getattr(self.plot_entry, 'props', [])
+        for prop, prop_state in zip(props, state['props']):
+            prop.set_state(prop_state, data_tables)
+
+        # Set the name
+        set_box_value(self.name_box, state['name'])
+
     # Override closeEvent to remove the plot from the figure when closed
     def closeEvent(self, *args, **kwargs):
         # Close the plot_type
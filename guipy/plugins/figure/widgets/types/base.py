@@ -74,6 +74,10 @@ class BasePlotType(GW.QWidget):
         # Save that currently no line exists
         self.plot = None
 
+        # Save that the versions and limits of the plotted data are unknown
+        self.data_versions = None
+        self.limits = None
+
         # Attempt to update the plot to check if that does not raise errors
         self.update_plot()
 
@@ -121,6 +125,21 @@ class BasePlotType(GW.QWidget):
 
         raise NotImplementedError(self.__class__)
 
+    # This function returns the limits of the plotted data
+    def data_limits(self):
+        """
+        Returns the limits of the data in the current plot, formatted as
+        `((xmin, xmax), (ymin, ymax))`, or *None* if these are not known.
+
+        If the limits of all plots are known, the figure uses them for
+        autoscaling its axes instead of determining them from all plotted
+        data. Plot types can set the `limits` attribute to provide them.
+
+        """
+
+        # Return limits if there is a plot
+        return(None if self.plot is None else self.limits)
+
     # Define remove_plot method
     @QC.Slot()
     def remove_plot(self):
@@ -57,7 +57,8 @@ class LineType(BasePlotType):
             ycol = get_box_value(self.y_data_box)[1]
 
             # Check if the x column is currently enabled
-            if get_box_value(self.x_data_box, bool):
+            x_flag = get_box_value(self.x_data_box, bool)
+            if x_flag:
                 # If so, obtain xcol
                 xcol = get_box_value(self.x_data_box)[1][1]
             else:
@@ -79,6 +80,10 @@ class LineType(BasePlotType):
             self.remove_plot()
             return
 
+        # Obtain the versions of both columns, which change with their values
+        versions = (self.x_data_box[1].get_column_version() if x_flag
+                    else None, self.y_data_box.get_column_version())
+
         # If the current saved line is not already in the figure, make one
         if self.plot not in self.axis.lines:
             # Make and update plot
@@ -108,17 +113,19 @@ class LineType(BasePlotType):
                 set_box_value(x_label_box, xname)
                 set_box_value(y_label_box, yname)
 
-        # If it does exist, check if it requires updating
-        else:
-            # Obtain the data currently used for this plot
-            xcol_cur = self.plot.get_xdata()
-            ycol_cur = self.plot.get_ydata()
-
-            # If there are differences, update plot
-            if not (xcol_cur == xcol).all():
-                self.plot.set_xdata(xcol)
-            if not (ycol_cur == ycol).all():
-                self.plot.set_ydata(ycol)
+        # Else, if the values of any column changed, update the plot
+        elif(versions != self.data_versions):
+            self.plot.set_data(xcol, ycol)
+
+        # Save the versions of the plotted columns
+        self.data_versions = versions
+
+        # Save the limits of the plotted data if they are known
+        xlims = (self.x_data_box[1].get_column_limits() if x_flag
+                 else (0, len(ycol)-1) if len(ycol) else None)
+        ylims = self.y_data_box.get_column_limits()
+        self.limits = (None if xlims is None or ylims is None
+                       else (xlims, ylims))
 
     # This function updates the 2D line plot
     @QC.Slot()
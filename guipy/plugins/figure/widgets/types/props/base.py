@@ -8,12 +8,17 @@ Base Plot Properties
 
 
 # %% IMPORTS
+# Package imports
+import numpy as np
+import pandas as pd
+
 # GuiPy imports
 from guipy import layouts as GL
-from guipy.widgets import get_modified_signal
+from guipy.plugins.data_table.widgets import DataTableWidget
+from guipy.widgets import get_box_value, get_modified_signal, set_box_value
 
 # All declaration
-__all__ = ['BasePlotProp']
+__all__ = ['BasePlotProp', 'decode_value', 'encode_value']
 
 
 # %% CLASS DEFINITIONS
@@ -96,6 +101,38 @@ class BasePlotProp(GL.QFormLayout):
             # Add widget to the layout
             self.addRow(*out)
 
+    # This function returns the state of this plot property
+    def get_state(self, data_tables):
+        """
+        Returns a JSON-serializable dict with the values of all widgets in this
+        plot property, as converted by :func:`~encode_value`.
+
+        Parameters
+        ----------
+        data_tables : list of \
+            :obj:`~guipy.plugins.data_table.widgets.DataTableWidget` objects
+            The data tables that can be referred to, by their index in this
+            list.
+
+        """
+
+        return({name: encode_value(get_box_value(widget), data_tables)
+                for name, widget in self.widgets.items()})
+
+    # This function restores the state of this plot property
+    def set_state(self, state, data_tables):
+        """
+        Sets the values of all widgets in this plot property to the values in
+        the provided `state`, as returned by :meth:`~get_state`.
+
+        """
+
+        # Set the values of all widgets that are in state
+        for name, value in state.items():
+            if name in self.widgets:
+                set_box_value(self.widgets[name],
+                              decode_value(value, data_tables))
+
     # Create a close method
     def close(self, *args, **kwargs):
         # Remove all widgets from options entries dict and close them
@@ -106,3 +143,72 @@ class BasePlotProp(GL.QFormLayout):
 
             # Close widget
             widget.close()
+
+
+# %% FUNCTION DEFINITIONS
+# This function converts a widget value to a JSON-serializable value
+def encode_value(value, data_tables):
+    """
+    Converts the provided widget `value` to a JSON-serializable value, and
+    returns it.
+
+    Data tables are replaced by their index in the provided list of
+    `data_tables`, or *None* if they are not in it. Data columns are replaced
+    by their name.
+
+    """
+
+    # Convert data tables and columns to references
+    if isinstance(value, DataTableWidget):
+        index = next((i for i, data_table in enumerate(data_tables)
+                      if data_table is value), None)
+        return({'data_table': index})
+    elif isinstance(value, pd.Series):
+        return({'data_column': value.name})
+
+    # Convert all values in containers
+    elif isinstance(value, dict):
+        return({key: encode_value(val, data_tables)
+                for key, val in value.items()})
+    elif isinstance(value, (list, tuple)):
+        return([encode_value(val, data_tables) for val in value])
+
+    # Convert NumPy scalars to Python scalars
+    elif isinstance(value, np.generic):
+        return(value.item())
+
+    # Else, return value as is
+    else:
+        return(value)
+
+
+# This function converts a JSON-serializable value back to a widget value
+def decode_value(value, data_tables):
+    """
+    Converts the provided `value` returned by :func:`~encode_value` back to a
+    widget value, and returns it.
+
+    References to data tables are replaced by the data table in the provided
+    list of `data_tables`, while references to data columns are replaced by
+    their name. Lists are converted to tuples.
+
+    """
+
+    # Convert references and all values in dicts
+    if isinstance(value, dict):
+        if(value.keys() == {'data_table'}):
+            index = value['data_table']
+            return(None if index is None else data_tables[index])
+        elif(value.keys() == {'data_column'}):
+            return(value['data_column'])
+        else:
+            return({key: decode_value(val, data_tables)
+                    for key, val in value.items()})
+
+    # Convert lists to tuples
+    elif isinstance(value, list):
+        return(tuple(decode_value(val, data_tables) for val in value))
+
+    # Else, return value as is
+    else:
+        return(value)
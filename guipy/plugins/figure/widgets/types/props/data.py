@@ -13,7 +13,8 @@ from qtpy import QtCore as QC, QtGui as QG, QtWidgets as QW
 
 # GuiPy imports
 from guipy import widgets as GW
-from guipy.plugins.figure.widgets.types.props import BasePlotProp
+from guipy.plugins.figure.widgets.types.props import (
+    BasePlotProp, decode_value)
 from guipy.widgets import get_box_value, get_modified_signal, set_box_value
 
 # All declaration
@@ -254,6 +255,21 @@ class MultiDataNDProp(BasePlotProp):
         # Check if there is now more than a single tab
         self.tab_widget.setTabsClosable(self.tab_widget.count() > 1)
 
+    # Override set_state method
+    def set_state(self, state, data_tables):
+        # Obtain the values of all data boxes
+        values = decode_value(state['multi_data_box'], data_tables)
+
+        # Add or remove data boxes until there is one for every value
+        while(self.tab_widget.count() < len(values)):
+            self.add_data_box()
+        while(self.tab_widget.count() > max(1, len(values))):
+            self.remove_data_box(self.tab_widget.count()-1)
+
+        # Set the values of all data boxes
+        for i, value in enumerate(values):
+            set_box_value(self.tab_widget, value, i)
+
     # This function removes a data box from the tab widget
     @QC.Slot(int)
     def remove_data_box(self, index):
@@ -595,6 +611,7 @@ class DataColumnBox(GW.DualComboBox):
                 self.columns_box.setItemText)
             self.model.columnNameChanged.disconnect(
                 self.set_columns_box_item_tooltip)
+            self.model.fetchingChanged.disconnect(self.set_table_fetching)
 
         # If currently a data table is selected, obtain its columns
         if(index != -1):
@@ -613,11 +630,45 @@ class DataColumnBox(GW.DualComboBox):
             self.model.columnNameChanged.connect(self.columns_box.setItemText)
             self.model.columnNameChanged.connect(
                 self.set_columns_box_item_tooltip)
+            self.model.fetchingChanged.connect(self.set_table_fetching)
+
+            # Check if rows are still being loaded into this data table
+            self.set_table_fetching(self.model.isFetching())
 
         # Else, set data_table and model to None
         else:
             self.data_table = None
             self.model = None
+            self.set_table_fetching(False)
+
+    # This function informs the user if rows are still being loaded
+    @QC.Slot(bool)
+    def set_table_fetching(self, fetching):
+        """
+        Sets whether rows are still being loaded into the currently selected
+        data table to `fetching`.
+
+        While rows are being loaded, only the rows that have been loaded so far
+        are available for plotting.
+        Once all rows have been loaded, the `modified` signal is emitted.
+
+        Parameters
+        ----------
+        fetching : bool
+            Whether rows are still being loaded into the data table.
+
+        """
+
+        # If rows are still being loaded, notify the user in the columns box
+        if fetching:
+            self.columns_box.setToolTip(
+                "Rows are still being loaded into this data table. Only the "
+                "rows that have been loaded so far are used")
+        # Else, remove the notification and signal that the data has changed
+        else:
+            self.columns_box.setToolTip("")
+            if self.model is not None:
+                self.modified.emit()
 
     # This function sets the tooltip of an item in the columns box
     @QC.Slot(int, str)
@@ -659,7 +710,7 @@ class DataColumnBox(GW.DualComboBox):
 
         # Insert all columns between first and last+1 to the columns box
         for i in range(first, last+1):
-            name = self.model.dataColumn(i).name
+            name = self.model.columnName(i)
             self.columns_box.insertItem(i, name)
             self.set_columns_box_item_tooltip(i, name)
 
@@ -716,6 +767,51 @@ class DataColumnBox(GW.DualComboBox):
         else:
             return(None, None)
 
+    # This function retrieves the version of the column currently selected
+    def get_column_version(self):
+        """
+        Returns the version of the currently selected column, which changes
+        whenever any of its values change, or *None* if no column is selected.
+
+        """
+
+        # Obtain the currently selected column
+        column_index = get_box_value(self.columns_box, int)
+
+        # If currently a valid column is selected, return its version
+        if(column_index != -1):
+            return(self.model.columnVersion(column_index))
+        # Else, return None
+        else:
+            return(None)
+
+    # This function retrieves the limits of the column currently selected
+    def get_column_limits(self):
+        """
+        Returns the minimum and maximum of all finite values in the currently
+        selected column, or *None* if these are not known.
+
+        The limits are obtained from the statistics that the data table
+        maintains for every column, and are thus available in constant time.
+
+        """
+
+        # Obtain the currently selected column
+        column_index = get_box_value(self.columns_box, int)
+
+        # If no valid column is selected, return None
+        if(column_index == -1):
+            return(None)
+
+        # Obtain the statistics of this column
+        stats = self.model.columnStatistics(column_index)
+
+        # Return its limits if it has any
+        if stats['min'] is None:
+            return(None)
+        else:
+            return(stats['min'], stats['max'])
+
     # This function sets the data table and column
     def set_box_value(self, value):
         """
@@ -726,16 +822,18 @@ class DataColumnBox(GW.DualComboBox):
         ----------
         value : tuple
             A tuple containing the data table and its associated column,
-            formatted as `(data_table, data_column)`.
+            formatted as `(data_table, data_column)`. The data column can also
+            be given by its name.
 
         """
 
-        # If value[0] is None, value is equal to (-1, -1)
-        if value[0] is None:
+        # If value[0] is None or closed, value is equal to (-1, -1)
+        if value[0] is None or (self.tab_widget.indexOf(value[0]) == -1):
             set_box_value(self.tables_box, -1)
             set_box_value(self.columns_box, -1)
         else:
             table_name = self.tab_widget.tabText(
                 self.tab_widget.indexOf(value[0]))
             set_box_value(self.tables_box, table_name)
-            set_box_value(self.columns_box, value[1].name)
+            set_box_value(self.columns_box, getattr(value[1], 'name',
+                                                    value[1]))
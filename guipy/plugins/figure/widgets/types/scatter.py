@@ -69,6 +69,10 @@ class ScatterType(BasePlotType):
             self.remove_plot()
             return
 
+        # Obtain the versions of both columns, which change with their values
+        versions = (self.x_data_box.get_column_version(),
+                    self.y_data_box.get_column_version())
+
         # If the current saved scatter is not already in the figure, make one
         if self.plot not in self.axis.lines:
             # Make and update plot
@@ -97,17 +101,18 @@ class ScatterType(BasePlotType):
                 set_box_value(x_label_box, xcol.name)
                 set_box_value(y_label_box, ycol.name)
 
-        # If it does exist, check if it requires updating
-        else:
-            # Obtain the data currently used for this plot
-            xcol_cur = self.plot.get_xdata()
-            ycol_cur = self.plot.get_ydata()
-
-            # If there are differences, update plot
-            if not (xcol_cur == xcol).all():
-                self.plot.set_xdata(xcol)
-            if not (ycol_cur == ycol).all():
-                self.plot.set_ydata(ycol)
+        # Else, if the values of any column changed, update the plot
+        elif(versions != self.data_versions):
+            self.plot.set_data(xcol, ycol)
+
+        # Save the versions of the plotted columns
+        self.data_versions = versions
+
+        # Save the limits of the plotted data if they are known
+        xlims = self.x_data_box.get_column_limits()
+        ylims = self.y_data_box.get_column_limits()
+        self.limits = (None if xlims is None or ylims is None
+                       else (xlims, ylims))
 
     # This function updates the 2D scatter plot
     @QC.Slot()